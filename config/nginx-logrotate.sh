@@ -0,0 +1,23 @@
+#!/bin/sh
+# DJ AI App - nginx Timing Log Rotation
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Keep the timing log dj-ai-exporter tails under TIMING_LOG_MAX_MB (runs from /docker-entrypoint.d)
+
+set -eu
+
+LOG=/var/log/nginx/timing/timing.log
+MAX_BYTES=$(( ${TIMING_LOG_MAX_MB:-64} * 1024 * 1024 ))
+INTERVAL=${TIMING_LOG_CHECK_INTERVAL:-60}
+
+# Rename, then let nginx reopen: lines are never cut from under the
+# exporter, which reads the old file to its end before following the new
+# one. One old generation is kept.
+(
+    while sleep "$INTERVAL"; do
+        size=$(stat -c %s "$LOG" 2>/dev/null || echo 0)
+        if [ "$size" -gt "$MAX_BYTES" ]; then
+            mv -f "$LOG" "$LOG.1" && nginx -s reopen || true
+        fi
+    done
+) &
+echo "$0: rotating $LOG past ${TIMING_LOG_MAX_MB:-64} MB"
@@ -0,0 +1,35 @@
+#!/bin/sh
+# DJ AI App - nginx TLS Switch
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Enable HTTPS with HTTP/2 when certificates are mounted (runs from /docker-entrypoint.d)
+
+set -eu
+
+CERT=/etc/nginx/ssl/cert.pem
+KEY=/etc/nginx/ssl/key.pem
+OUT=/etc/nginx/tls.d
+
+mkdir -p "$OUT"
+rm -f "$OUT/listen-443.conf"
+
+if [ ! -f "$CERT" ] || [ ! -f "$KEY" ]; then
+    echo "$0: no $CERT and $KEY, serving plain HTTP only"
+    exit 0
+fi
+
+# Included inside the port 80 server, so both ports share every location
+cat > "$OUT/listen-443.conf" <<CONF
+listen 443 ssl;
+http2 on;
+
+ssl_certificate $CERT;
+ssl_certificate_key $KEY;
+ssl_protocols TLSv1.2 TLSv1.3;
+ssl_prefer_server_ciphers off;
+
+# Returning visitors resume their session instead of a full handshake
+ssl_session_cache shared:SSL:10m;
+ssl_session_timeout 1d;
+ssl_session_tickets off;
+CONF
+echo "$0: HTTPS with HTTP/2 enabled on port 443"
@@ -0,0 +1,7 @@
+# DJ AI App - Orchestrator Services
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Python services that run next to dj-ai-core and dj-ai-frontend in the compose stack
+
+"""Python services for the DJ AI orchestrator."""
+
+__version__ = "1.1.0"
@@ -0,0 +1,9 @@
+# DJ AI App - Benchmarks
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Measurement tools for the compose stack (resource usage, latency)
+
+"""Benchmarks and measurements run against a local compose stack."""
+
+from .compose import COMPOSE_FILES, ComposeStack
+
+__all__ = ["COMPOSE_FILES", "ComposeStack"]
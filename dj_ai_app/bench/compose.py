@@ -0,0 +1,80 @@
+# DJ AI App - Compose Helpers
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Drive the dev and production compose stacks from measurement tools
+
+import os
+import subprocess
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
+
+# Same file sets and project names as scripts/start-dev.ps1 and start-prod.ps1
+COMPOSE_FILES = {
+    "dev": ["docker-compose.yml", "docker-compose.dev.yml"],
+    "prod": ["docker-compose.yml", "docker-compose.prod.yml"],
+}
+
+Runner = Callable[..., subprocess.CompletedProcess]
+
+
+class ComposeStack:
+    """One environment of the stack (``dev`` or ``prod``) under its own project name.
+
+    ``variables`` are exported to compose for ``${VAR}`` substitution, e.g.
+    ``{"GATEWAY_WARMUP": "false"}``.
+    """
+
+    def __init__(
+        self,
+        env: str,
+        compose: str = "docker-compose",
+        runner: Runner = subprocess.run,
+        variables: Optional[Mapping[str, str]] = None,
+    ):
+        if env not in COMPOSE_FILES:
+            raise ValueError(f"Unknown environment {env!r}; expected one of {', '.join(COMPOSE_FILES)}")
+        self.env = env
+        self.project = f"dj-ai-app-{env}"
+        self.compose = compose.split()
+        self.variables = dict(variables or {})
+        self._runner = runner
+
+    def command(self, *args: str) -> List[str]:
+        files: List[str] = []
+        for path in COMPOSE_FILES[self.env]:
+            files += ["-f", path]
+        return [*self.compose, *files, "-p", self.project, *args]
+
+    def _run(self, args: Sequence[str], **kwargs) -> subprocess.CompletedProcess:
+        env = {**os.environ, **self.variables} if self.variables else None
+        return self._runner(list(args), check=True, env=env, **kwargs)
+
+    def _output(self, args: Sequence[str]) -> str:
+        return self._run(args, capture_output=True, text=True).stdout
+
+    def build(self):
+        self._run(self.command("build"))
+
+    def up(self, build: bool = True):
+        self._run(self.command("up", "-d", *(["--build"] if build else [])))
+
+    def down(self):
+        self._run(self.command("down", "--remove-orphans"))
+
+    def stop(self):
+        self._run(self.command("stop"))
+
+    def services(self) -> List[str]:
+        """Services this environment starts (honours profiles and overlays)."""
+        return [line.strip() for line in self._output(self.command("config", "--services")).splitlines() if line.strip()]
+
+    def containers(self) -> Dict[str, str]:
+        """Map running container names to their compose service names."""
+        output = self._output([
+            "docker", "ps",
+            "--filter", f"label=com.docker.compose.project={self.project}",
+            "--format", '{{.Names}} {{.Label "com.docker.compose.service"}}',
+        ])
+        return dict(line.split(None, 1) for line in output.splitlines() if line.strip())
+
+    def stats(self, containers: Sequence[str]) -> str:
+        """One ``docker stats`` snapshot as JSON lines."""
+        return self._output(["docker", "stats", "--no-stream", "--format", "{{json .}}", *containers])
@@ -0,0 +1,139 @@
+# DJ AI App - First-Request Latency
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Compare the first analysis after a deploy with and without warm-up
+
+"""Measure first-request latency of dj-ai-core with and without warm-up.
+
+Usage::
+
+    python -m dj_ai_app.bench.first_request --env dev --track tracks/intro.mp3 --drop-caches
+
+For each mode the stack is recreated (``GATEWAY_WARMUP=false`` for "cold",
+``true`` for "warm"), the tool waits for ``/gateway/ready`` and then times
+two analyses sent straight to dj-ai-core: the first one a user would see
+after a deploy, and a second one as the steady-state reference.
+``--drop-caches`` empties the host page cache before each start (needs a
+privileged container), so the cold numbers include reading the models
+from disk.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import httpx
+
+from ..prewarm.warmup import synthetic_wav
+from .compose import COMPOSE_FILES, ComposeStack
+
+MODES = {"cold": "false", "warm": "true"}
+
+
+@dataclass
+class FirstRequestResult:
+    """Seconds until ready, and the latency of the first two analyses."""
+
+    mode: str
+    ready_after: float
+    first_request: float
+    second_request: float
+
+
+def drop_page_cache(runner=subprocess.run):
+    """Empty the Docker host's page cache (Linux or the Docker Desktop VM)."""
+    runner(
+        ["docker", "run", "--rm", "--privileged", "alpine", "sh", "-c", "sync && echo 3 > /proc/sys/vm/drop_caches"],
+        check=True,
+    )
+
+
+def wait_until_ready(client: httpx.Client, gateway_url: str, timeout: float, interval: float = 0.5,
+                     clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep) -> float:
+    """Poll /gateway/ready; return the seconds it took."""
+    started = clock()
+    while clock() - started < timeout:
+        try:
+            if client.get(f"{gateway_url}/gateway/ready").status_code == 200:
+                return clock() - started
+        except httpx.RequestError:
+            pass
+        sleep(interval)
+    raise TimeoutError(f"{gateway_url} was not ready after {timeout:.0f}s")
+
+
+def time_analysis(client: httpx.Client, backend_url: str, filename: str, audio: bytes,
+                  clock: Callable[[], float] = time.monotonic) -> float:
+    """Seconds for one /analyze-track round trip."""
+    started = clock()
+    response = client.post(f"{backend_url}/analyze-track", files={"file": (filename, audio)})
+    elapsed = clock() - started
+    response.raise_for_status()
+    return elapsed
+
+
+def measure(stack: ComposeStack, mode: str, filename: str, audio: bytes, backend_url: str, gateway_url: str,
+            ready_timeout: float, drop_caches: bool) -> FirstRequestResult:
+    stack.variables["GATEWAY_WARMUP"] = MODES[mode]
+    stack.down()
+    if drop_caches:
+        drop_page_cache()
+    started = time.monotonic()
+    stack.up(build=False)
+    with httpx.Client(timeout=600.0) as client:
+        wait_until_ready(client, gateway_url, ready_timeout)
+        ready_after = time.monotonic() - started
+        first = time_analysis(client, backend_url, filename, audio)
+        second = time_analysis(client, backend_url, filename, audio)
+    return FirstRequestResult(mode, round(ready_after, 2), round(first, 3), round(second, 3))
+
+
+def render(results: List[FirstRequestResult]) -> str:
+    """Markdown table of the comparison."""
+    lines = [
+        "| Mode | Ready after | First request | Second request |",
+        "|---|---|---|---|",
+    ]
+    for r in results:
+        lines.append(f"| {r.mode} | {r.ready_after:.2f}s | {r.first_request:.3f}s | {r.second_request:.3f}s |")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--env", default="dev", choices=sorted(COMPOSE_FILES))
+    parser.add_argument("--compose", default="docker-compose", help="Compose command (e.g. 'docker compose')")
+    parser.add_argument("--track", help="Audio file to analyse (default: a synthetic 5 s WAV)")
+    parser.add_argument("--mode", action="append", choices=sorted(MODES), help="Modes to run (default: cold and warm)")
+    parser.add_argument("--backend-url", default="http://localhost:8000")
+    parser.add_argument("--gateway-url", default="http://localhost:8080")
+    parser.add_argument("--ready-timeout", type=float, default=600.0)
+    parser.add_argument("--drop-caches", action="store_true", help="Empty the host page cache before each start")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    if args.track:
+        filename, audio = Path(args.track).name, Path(args.track).read_bytes()
+    else:
+        # Not byte-identical to the gateway's warm-up file
+        filename, audio = "benchmark.wav", synthetic_wav(bpm=128.0)
+
+    stack = ComposeStack(args.env, args.compose)
+    results = [
+        measure(stack, mode, filename, audio, args.backend_url, args.gateway_url, args.ready_timeout, args.drop_caches)
+        for mode in (args.mode or ["cold", "warm"])
+    ]
+
+    print(render(results))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
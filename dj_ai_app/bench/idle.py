@@ -0,0 +1,147 @@
+# DJ AI App - Idle Resource Usage
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Compare idle CPU and memory of the dev and production compose stacks
+
+"""Measure what each stack costs while nobody is using it.
+
+Usage::
+
+    python -m dj_ai_app.bench.idle --env dev --env prod --settle 60 --samples 12
+
+Each environment is brought up, left alone for ``--settle`` seconds, sampled
+with ``docker stats`` and torn down again (the stacks share container names,
+so they are measured one after the other).
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from .compose import COMPOSE_FILES, ComposeStack
+
+_SIZE_RE = re.compile(r"^\s*([\d.]+)\s*([KMGT]?i?B)\s*$", re.IGNORECASE)
+_UNITS = {
+    "b": 1,
+    "kb": 1000, "mb": 1000 ** 2, "gb": 1000 ** 3, "tb": 1000 ** 4,
+    "kib": 1024, "mib": 1024 ** 2, "gib": 1024 ** 3, "tib": 1024 ** 4,
+}
+
+
+def parse_size(text: str) -> int:
+    """Convert a docker stats size such as ``12.5MiB`` to bytes."""
+    match = _SIZE_RE.match(text)
+    if not match:
+        raise ValueError(f"Unrecognised size {text!r}")
+    return int(float(match.group(1)) * _UNITS[match.group(2).lower()])
+
+
+def parse_stats(output: str, services: Dict[str, str]) -> Dict[str, Dict[str, float]]:
+    """Read one ``docker stats --format '{{json .}}'`` snapshot per service."""
+    snapshot = {}
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        service = services.get(row["Name"], row["Name"])
+        snapshot[service] = {
+            "cpu_percent": float(row["CPUPerc"].rstrip("%") or 0),
+            "memory_bytes": parse_size(row["MemUsage"].split("/")[0]),
+        }
+    return snapshot
+
+
+@dataclass
+class IdleUsage:
+    """Idle samples of one environment, summarised per service."""
+
+    env: str
+    samples: Dict[str, List[Dict[str, float]]] = field(default_factory=dict)
+
+    def add(self, snapshot: Dict[str, Dict[str, float]]):
+        for service, values in snapshot.items():
+            self.samples.setdefault(service, []).append(values)
+
+    def cpu_percent(self, service: str) -> float:
+        return statistics.mean(s["cpu_percent"] for s in self.samples[service])
+
+    def memory_mib(self, service: str) -> float:
+        return statistics.mean(s["memory_bytes"] for s in self.samples[service]) / 1024 ** 2
+
+    @property
+    def services(self) -> List[str]:
+        return sorted(self.samples)
+
+    def totals(self):
+        return (
+            sum(self.cpu_percent(s) for s in self.services),
+            sum(self.memory_mib(s) for s in self.services),
+        )
+
+
+def measure(stack: ComposeStack, settle: float, samples: int, interval: float, keep: bool = False) -> IdleUsage:
+    """Bring ``stack`` up, wait for it to go idle and sample it."""
+    stack.up()
+    try:
+        time.sleep(settle)
+        containers = stack.containers()
+        usage = IdleUsage(stack.env)
+        for index in range(samples):
+            usage.add(parse_stats(stack.stats(list(containers)), containers))
+            if index < samples - 1:
+                time.sleep(interval)
+        return usage
+    finally:
+        if not keep:
+            stack.down()
+
+
+def render(results: Iterable[IdleUsage]) -> str:
+    """Markdown table with one column pair per environment."""
+    results = list(results)
+    services = sorted({s for usage in results for s in usage.services})
+    header = "| Service | " + " | ".join(f"{u.env} CPU % | {u.env} MiB" for u in results) + " |"
+    lines = [header, "|" + "---|" * (1 + 2 * len(results))]
+    for service in services:
+        cells = []
+        for usage in results:
+            if service in usage.samples:
+                cells.append(f"{usage.cpu_percent(service):.2f} | {usage.memory_mib(service):.1f}")
+            else:
+                cells.append("- | -")
+        lines.append(f"| {service} | " + " | ".join(cells) + " |")
+    totals = [f"**{cpu:.2f}** | **{mem:.1f}**" for cpu, mem in (u.totals() for u in results)]
+    lines.append("| **total** | " + " | ".join(totals) + " |")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--env", action="append", choices=sorted(COMPOSE_FILES), help="Environment to measure (repeatable)")
+    parser.add_argument("--settle", type=float, default=60.0, help="Seconds to wait after startup before sampling")
+    parser.add_argument("--samples", type=int, default=12, help="Number of docker stats snapshots")
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between snapshots")
+    parser.add_argument("--compose", default="docker-compose", help="Compose command (e.g. 'docker compose')")
+    parser.add_argument("--keep", action="store_true", help="Leave the last stack running")
+    parser.add_argument("--json", dest="json_path", help="Also write raw samples to this file")
+    args = parser.parse_args(argv)
+
+    envs = args.env or ["dev", "prod"]
+    results = []
+    for index, env in enumerate(envs):
+        keep = args.keep and index == len(envs) - 1
+        results.append(measure(ComposeStack(env, args.compose), args.settle, args.samples, args.interval, keep))
+
+    print(render(results))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({usage.env: usage.samples for usage in results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,317 @@
+# DJ AI App - Load Harness
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Drive weighted scenarios against the backend with concurrent virtual users
+
+"""Generate load scenarios from the backend's OpenAPI spec and run them.
+
+Usage::
+
+    python -m dj_ai_app.bench.load --list
+    python -m dj_ai_app.bench.load --users 20 --duration 60
+    python -m dj_ai_app.bench.load --users 20 --duration 120 --faults venue-wifi --profile-p99 2.0
+    python -m dj_ai_app.bench.load --weight "POST /analyze-track=5" --exclude "^/admin" --json load.json
+
+Every operation in ``/openapi.json`` becomes a weighted scenario with a
+schema-valid request: uploads get synthetic WAVs, and operations that take
+an id (``current_track_id``...) run after one that returns it, with the id
+carried over. New or changed endpoints are benchmarked without anyone
+writing a scenario. ``--faults`` sends the traffic through an in-process
+fault proxy; ``--profile-p99`` captures a CPU profile of dj-ai-core
+whenever the rolling p99 goes over budget.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import deque
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+
+from ..logs.aggregates import percentile
+from .openapi import RequestFactory, Scenario, load_spec, operations, scenarios
+from .profiler import ProfileTrigger, SamplingProfiler
+
+
+@dataclass
+class Sample:
+    """One request of a scenario step."""
+
+    operation: str
+    started: float
+    latency: float
+    status: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 0 < self.status < 400
+
+
+@dataclass
+class OperationStats:
+    operation: str
+    count: int
+    errors: int
+    rps: float
+    mean: Optional[float]
+    p50: Optional[float]
+    p95: Optional[float]
+    p99: Optional[float]
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+
+class LoadReport:
+    """Samples of one run, summarised per operation."""
+
+    def __init__(self, samples: List[Sample], duration: float):
+        self.samples = samples
+        self.duration = duration
+
+    def stats(self) -> List[OperationStats]:
+        by_operation: Dict[str, List[Sample]] = {}
+        for sample in self.samples:
+            by_operation.setdefault(sample.operation, []).append(sample)
+        rows = []
+        for name in sorted(by_operation):
+            group = by_operation[name]
+            latencies = sorted(s.latency for s in group)
+            rows.append(OperationStats(
+                operation=name, count=len(group), errors=sum(not s.ok for s in group),
+                rps=len(group) / self.duration if self.duration else 0.0,
+                mean=sum(latencies) / len(latencies), p50=percentile(latencies, 50),
+                p95=percentile(latencies, 95), p99=percentile(latencies, 99),
+            ))
+        return rows
+
+    @property
+    def error_rate(self) -> float:
+        return sum(not s.ok for s in self.samples) / len(self.samples) if self.samples else 0.0
+
+    def render(self) -> str:
+        """Markdown table, one row per operation."""
+        lines = [
+            "| Operation | Requests | Errors | Req/s | p50 | p95 | p99 |",
+            "|---|---|---|---|---|---|---|",
+        ]
+        for row in self.stats():
+            lines.append(
+                f"| {row.operation} | {row.count} | {row.errors} | {row.rps:.1f} | "
+                f"{row.p50 * 1000:.0f} ms | {row.p95 * 1000:.0f} ms | {row.p99 * 1000:.0f} ms |"
+            )
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "duration": round(self.duration, 3),
+            "requests": len(self.samples),
+            "error_rate": round(self.error_rate, 4),
+            "operations": [asdict(row) for row in self.stats()],
+        }
+
+
+class LoadRunner:
+    """``users`` virtual users picking weighted scenarios until ``duration`` runs out.
+
+    A user keeps the ids its responses returned, so a chained step uses an
+    id this user created. When a step fails the rest of its scenario is
+    skipped: later steps would only fail on the missing id. Every second
+    the p99 of the last ``window`` seconds goes to ``trigger``.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        plan: Sequence[Scenario],
+        factory: RequestFactory,
+        users: int = 10,
+        duration: float = 60.0,
+        think_time: float = 0.0,
+        timeout: float = 60.0,
+        iterations: Optional[int] = None,
+        trigger: Optional[ProfileTrigger] = None,
+        window: float = 10.0,
+        seed: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not plan:
+            raise ValueError("No scenarios to run")
+        self.base_url = base_url.rstrip("/")
+        self.plan = list(plan)
+        self.factory = factory
+        self.users = users
+        self.duration = duration
+        self.think_time = think_time
+        self.timeout = timeout
+        self.iterations = iterations
+        self.trigger = trigger
+        self.window = window
+        self.samples: List[Sample] = []
+        self._recent: Deque[Sample] = deque()
+        self._random = random.Random(seed)
+        self._transport = transport
+        self._clock = clock
+
+    def window_p99(self) -> Optional[float]:
+        cutoff = self._clock() - self.window
+        while self._recent and self._recent[0].started < cutoff:
+            self._recent.popleft()
+        return percentile(sorted(s.latency for s in self._recent), 99)
+
+    def _record(self, sample: Sample):
+        self.samples.append(sample)
+        self._recent.append(sample)
+
+    async def _step(self, client: httpx.AsyncClient, step, context: Dict[str, List[Any]]) -> bool:
+        request = self.factory.build(step, context)
+        started = self._clock()
+        sample = Sample(step.name, started, 0.0)
+        try:
+            response = await client.request(
+                request.method, request.path, params=request.params or None, json=request.json,
+                data=request.data, files=request.files,
+            )
+            sample.status = response.status_code
+            if response.headers.get("content-type", "").startswith("application/json"):
+                self.factory.remember(response.json(), context)
+        except (httpx.HTTPError, ValueError) as exc:
+            sample.error = type(exc).__name__
+        sample.latency = self._clock() - started
+        self._record(sample)
+        return sample.ok
+
+    async def _user(self, client: httpx.AsyncClient, deadline: float):
+        context: Dict[str, List[Any]] = {}
+        weights = [scenario.weight for scenario in self.plan]
+        done = 0
+        while self._clock() < deadline and (self.iterations is None or done < self.iterations):
+            scenario = self._random.choices(self.plan, weights)[0]
+            for step in scenario.steps:
+                if not await self._step(client, step, context):
+                    break
+            done += 1
+            if self.think_time:
+                await asyncio.sleep(self._random.uniform(0.5, 1.5) * self.think_time)
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(1.0)
+            self.trigger.check(self.window_p99())
+
+    async def run(self) -> LoadReport:
+        started = self._clock()
+        deadline = started + self.duration
+        limits = httpx.Limits(max_connections=self.users, max_keepalive_connections=self.users)
+        async with httpx.AsyncClient(
+            base_url=self.base_url, timeout=self.timeout, limits=limits, transport=self._transport,
+        ) as client:
+            watcher = asyncio.create_task(self._watch()) if self.trigger else None
+            try:
+                await asyncio.gather(*(self._user(client, deadline) for _ in range(self.users)))
+            finally:
+                if watcher is not None:
+                    watcher.cancel()
+        return LoadReport(self.samples, self._clock() - started)
+
+
+def parse_weights(values: Sequence[str]) -> Dict[str, float]:
+    """``["POST /analyze-track=5", "health_check=0"]`` into a mapping."""
+    weights = {}
+    for value in values:
+        name, sep, weight = value.rpartition("=")
+        if not sep or not name:
+            raise ValueError(f"Weight must look like 'METHOD /path=N' or 'operationId=N', got {value!r}")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+def render_plan(plan: Sequence[Scenario]) -> str:
+    total = sum(s.weight for s in plan) or 1.0
+    lines = []
+    for scenario in sorted(plan, key=lambda s: -s.weight):
+        lines.append(f"{scenario.weight / total:6.1%}  {scenario.name}")
+    return "\n".join(lines)
+
+
+def _faults_context(base_url: str, preset_name: Optional[str], seed: Optional[int]):
+    if not preset_name:
+        return nullcontext(None)
+    from ..faults import preset, run_proxy
+
+    parts = urlsplit(base_url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    return run_proxy(parts.hostname, port, preset(preset_name), seed=seed)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--spec", help="OpenAPI URL or file (default: <base-url>/openapi.json)")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds to run")
+    parser.add_argument("--iterations", type=int, help="Stop each user after this many scenarios")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between a user's scenarios")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--weight", action="append", default=[], help="'METHOD /path=N' or 'operationId=N'; 0 drops it")
+    parser.add_argument("--include", help="Only paths matching this regular expression")
+    parser.add_argument("--exclude", help="Skip paths matching this regular expression")
+    parser.add_argument("--audio-variants", type=int, default=4, help="Distinct synthetic WAVs to upload")
+    parser.add_argument("--faults", metavar="PRESET", help="Send traffic through a fault proxy with this preset")
+    parser.add_argument("--profile-p99", type=float, metavar="SECONDS", help="Profile dj-ai-core when p99 exceeds this")
+    parser.add_argument("--profile-seconds", type=float, default=15.0)
+    parser.add_argument("--max-error-rate", type=float, help="Exit with status 1 above this error rate")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--list", action="store_true", help="Print the generated scenarios and exit")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        spec = load_spec(args.spec or f"{args.base_url.rstrip('/')}/openapi.json")
+        plan = scenarios(operations(spec, parse_weights(args.weight), args.include, args.exclude))
+    except (httpx.HTTPError, OSError, ValueError) as exc:
+        print(f"Could not build scenarios: {exc}", file=sys.stderr)
+        return 1
+    if args.list or not plan:
+        print(render_plan(plan) if plan else "No operations with a positive weight")
+        return 0 if plan else 1
+
+    trigger = ProfileTrigger(SamplingProfiler(), args.profile_p99, args.profile_seconds) if args.profile_p99 else None
+    factory = RequestFactory(spec, seed=args.seed, audio_variants=args.audio_variants)
+    with _faults_context(args.base_url, args.faults, args.seed) as proxy:
+        # Keep any path prefix of the base URL (e.g. http://localhost/api behind nginx)
+        base_url = args.base_url
+        if proxy is not None:
+            base_url = urlunsplit(urlsplit(proxy.url)[:2] + urlsplit(args.base_url)[2:])
+        runner = LoadRunner(
+            base_url, plan, factory, users=args.users, duration=args.duration, think_time=args.think_time,
+            timeout=args.timeout, iterations=args.iterations, trigger=trigger, seed=args.seed,
+        )
+        report = asyncio.run(runner.run())
+    if trigger is not None:
+        trigger.wait()
+
+    print(report.render())
+    print(f"\n{len(report.samples)} requests in {report.duration:.1f}s, error rate {report.error_rate:.2%}")
+    if trigger is not None:
+        for result in trigger.results:
+            print(f"Profile: {result.files.get('flamegraph', result.directory)}")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    if args.max_error_rate is not None and report.error_rate > args.max_error_rate:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
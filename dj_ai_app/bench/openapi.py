@@ -0,0 +1,371 @@
+# DJ AI App - OpenAPI Load Scenarios
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Weighted load scenarios generated from the backend's published OpenAPI spec
+
+import json
+import random
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, MutableMapping, Optional, Sequence, Tuple
+
+import httpx
+
+from ..prewarm.warmup import synthetic_wav
+
+METHODS = ("get", "post", "put", "patch", "delete")
+
+# Relative frequency of an operation unless the spec (x-load-weight) or the caller says otherwise.
+# Deletes are off by default: they would remove the tracks later steps chain on.
+DEFAULT_WEIGHTS = {"GET": 3.0, "POST": 1.0, "PUT": 1.0, "PATCH": 1.0, "DELETE": 0.0}
+
+# Ids a virtual user remembers per name, newest last
+CONTEXT_IDS = 20
+
+_ID_NAME = re.compile(r"(^|_)ids?$")
+
+
+def is_id_name(name: str) -> bool:
+    """``id``, ``track_id``, ``current_track_id``, ``track_ids``..."""
+    return bool(_ID_NAME.search(name.lower()))
+
+
+def load_spec(source: str, timeout: float = 10.0) -> dict:
+    """The OpenAPI document at a URL or in a file."""
+    if source.startswith(("http://", "https://")):
+        response = httpx.get(source, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+    return json.loads(Path(source).read_text(encoding="utf-8"))
+
+
+def resolve(spec: Mapping[str, Any], schema: Optional[Mapping[str, Any]], depth: int = 0) -> Dict[str, Any]:
+    """Schema with local ``$ref`` followed and ``allOf`` merged; ``anyOf``/``oneOf`` take the first non-null branch."""
+    if not schema or depth > 20:
+        return {}
+    schema = dict(schema)
+    ref = schema.pop("$ref", None)
+    if ref:
+        target: Any = spec
+        for part in ref.lstrip("#/").split("/"):
+            target = target.get(part, {})
+        schema = {**resolve(spec, target, depth + 1), **schema}
+    for key in ("anyOf", "oneOf"):
+        branches = schema.pop(key, None)
+        if branches:
+            chosen = next((b for b in branches if resolve(spec, b, depth + 1).get("type") != "null"), branches[0])
+            schema = {**resolve(spec, chosen, depth + 1), **schema}
+    for part in schema.pop("allOf", None) or []:
+        part = resolve(spec, part, depth + 1)
+        merged_props = {**part.get("properties", {}), **schema.get("properties", {})}
+        required = list(dict.fromkeys(part.get("required", []) + schema.get("required", [])))
+        schema = {**part, **schema}
+        if merged_props:
+            schema["properties"] = merged_props
+        if required:
+            schema["required"] = required
+    return schema
+
+
+def is_binary(schema: Mapping[str, Any]) -> bool:
+    """A file field: ``format: binary`` in OpenAPI 3.0, ``contentMediaType`` in 3.1."""
+    return schema.get("format") == "binary" or "contentMediaType" in schema
+
+
+def _id_names(spec: Mapping[str, Any], schema: Mapping[str, Any], depth: int = 0) -> List[str]:
+    """Id-like property names anywhere in the first levels of a response schema."""
+    schema = resolve(spec, schema)
+    if depth > 3:
+        return []
+    if schema.get("type") == "array":
+        return _id_names(spec, schema.get("items", {}), depth + 1)
+    names = []
+    for name, prop in schema.get("properties", {}).items():
+        if is_id_name(name) and resolve(spec, prop).get("type") in ("string", "integer", None):
+            names.append(name.lower())
+        names.extend(_id_names(spec, prop, depth + 1))
+    return names
+
+
+@dataclass
+class Operation:
+    """One method and path of the spec, with what it needs and returns."""
+
+    method: str
+    path: str
+    operation_id: str
+    weight: float
+    parameters: List[Dict[str, Any]] = field(default_factory=list)
+    body: Dict[str, Any] = field(default_factory=dict)
+    # "json", "multipart" or "form"; None without a request body
+    body_type: Optional[str] = None
+    body_required: bool = False
+    # Id names found in the success response, and id names the request needs
+    produces: Tuple[str, ...] = ()
+    consumes: Tuple[str, ...] = ()
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}"
+
+    @property
+    def uploads(self) -> bool:
+        return self.body_type == "multipart" and any(
+            is_binary(prop) or is_binary(prop.get("items", {})) for prop in self.body.get("properties", {}).values()
+        )
+
+
+@dataclass
+class Scenario:
+    """Steps one virtual user runs in order; ids returned by a step feed the next ones."""
+
+    name: str
+    steps: List[Operation]
+    weight: float
+
+
+def _request_body(spec: Mapping[str, Any], operation: Mapping[str, Any]) -> Tuple[Optional[str], Dict[str, Any], bool]:
+    body = operation.get("requestBody")
+    if not body:
+        return None, {}, False
+    body = resolve(spec, body)
+    content = body.get("content", {})
+    for media_type, body_type in (("application/json", "json"), ("multipart/form-data", "multipart"),
+                                  ("application/x-www-form-urlencoded", "form")):
+        if media_type in content:
+            return body_type, resolve(spec, content[media_type].get("schema")), bool(body.get("required"))
+    return None, {}, False
+
+
+def _consumed(spec: Mapping[str, Any], parameters: Sequence[Mapping[str, Any]], body: Mapping[str, Any]) -> Tuple[str, ...]:
+    names = [p["name"] for p in parameters if is_id_name(p["name"]) and (p.get("required") or p.get("in") == "path")]
+    names += [name for name in body.get("required", []) if is_id_name(name)]
+    return tuple(dict.fromkeys(names))
+
+
+def operations(
+    spec: Mapping[str, Any],
+    weights: Optional[Mapping[str, float]] = None,
+    include: Optional[str] = None,
+    exclude: Optional[str] = None,
+) -> List[Operation]:
+    """Every operation of ``spec`` with a positive weight.
+
+    A weight comes from ``weights`` (keyed by operationId or ``"METHOD /path"``),
+    else the operation's ``x-load-weight``, else :data:`DEFAULT_WEIGHTS`.
+    ``include``/``exclude`` are regular expressions matched against the path.
+    """
+    weights = weights or {}
+    found = []
+    for path, item in spec.get("paths", {}).items():
+        if include and not re.search(include, path):
+            continue
+        if exclude and re.search(exclude, path):
+            continue
+        shared = item.get("parameters", [])
+        for method in METHODS:
+            operation = item.get(method)
+            if operation is None or operation.get("deprecated"):
+                continue
+            name = f"{method.upper()} {path}"
+            operation_id = operation.get("operationId") or name
+            weight = weights.get(operation_id, weights.get(name, operation.get("x-load-weight", DEFAULT_WEIGHTS[method.upper()])))
+            if weight <= 0:
+                continue
+            parameters = [resolve(spec, p) for p in list(shared) + list(operation.get("parameters", []))]
+            parameters = [p for p in parameters if p.get("in") in ("path", "query")]
+            body_type, body, body_required = _request_body(spec, operation)
+            responses = operation.get("responses", {})
+            success = next((resolve(spec, responses[code]) for code in sorted(responses) if code.startswith("2")), {})
+            response_schema = success.get("content", {}).get("application/json", {}).get("schema", {})
+            found.append(Operation(
+                method=method.upper(), path=path, operation_id=operation_id, weight=float(weight),
+                parameters=parameters, body=body, body_type=body_type, body_required=body_required,
+                produces=tuple(dict.fromkeys(_id_names(spec, response_schema))),
+                consumes=_consumed(spec, parameters, body),
+            ))
+    return found
+
+
+def id_source(name: str, available: Sequence[str]) -> Optional[str]:
+    """Which remembered id name fills the field ``name``.
+
+    Exact names first, then the longest remembered name ``name`` ends with
+    (``current_track_id`` takes ``track_id``); a plural takes its singular,
+    and a bare ``id`` takes any id.
+    """
+    name = name.lower()
+    if name.endswith("ids"):
+        name = name[:-1]
+    if name in available:
+        return name
+    suffixes = sorted((a for a in available if name.endswith("_" + a)), key=len, reverse=True)
+    if suffixes:
+        return suffixes[0]
+    if name == "id" and available:
+        return available[0]
+    return None
+
+
+def scenarios(ops: Sequence[Operation]) -> List[Scenario]:
+    """One scenario per operation; operations that need ids run after an operation that returns them.
+
+    Routes without a response model document no ids, so an operation whose
+    ids no documented response provides falls back to following an upload:
+    on this API ids are minted by analysing a track.
+    """
+    result = []
+    for op in ops:
+        steps = [op]
+        if op.consumes:
+            producer = next(
+                (p for p in ops if p is not op and all(id_source(name, p.produces) for name in op.consumes)), None,
+            ) or next((p for p in ops if p is not op and p.uploads), None)
+            if producer is not None:
+                steps = [producer, op]
+        result.append(Scenario(" -> ".join(step.name for step in steps), steps, op.weight))
+    return result
+
+
+@dataclass
+class PreparedRequest:
+    method: str
+    path: str
+    operation: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    json: Any = None
+    data: Optional[Dict[str, Any]] = None
+    files: Optional[Dict[str, Tuple[str, bytes, str]]] = None
+
+
+class RequestFactory:
+    """Valid requests for operations: schema-conforming values, synthetic audio, remembered ids.
+
+    Uploads cycle through ``audio_variants`` synthetic WAVs at different
+    tempos, so content-hash caches see a realistic mix of new and repeated
+    files rather than one file over and over.
+    """
+
+    def __init__(self, spec: Mapping[str, Any], seed: Optional[int] = None, audio_variants: int = 4,
+                 audio_seconds: float = 5.0):
+        self.spec = spec
+        self.random = random.Random(seed)
+        self.audio_variants = max(1, audio_variants)
+        self.audio_seconds = audio_seconds
+        self._audio: Dict[int, bytes] = {}
+
+    def audio(self) -> Tuple[str, bytes, str]:
+        variant = self.random.randrange(self.audio_variants)
+        if variant not in self._audio:
+            self._audio[variant] = synthetic_wav(self.audio_seconds, bpm=120.0 + 4 * variant)
+        return f"load-{variant}.wav", self._audio[variant], "audio/wav"
+
+    def remember(self, payload: Any, context: MutableMapping[str, List[Any]], depth: int = 0):
+        """Collect id-like values from a response into ``context``."""
+        if depth > 3:
+            return
+        if isinstance(payload, list):
+            for item in payload[:CONTEXT_IDS]:
+                self.remember(item, context, depth + 1)
+        elif isinstance(payload, dict):
+            for key, value in payload.items():
+                if is_id_name(key) and isinstance(value, (str, int)) and not isinstance(value, bool):
+                    ids = context.setdefault(key.lower(), [])
+                    ids.append(value)
+                    del ids[:-CONTEXT_IDS]
+                elif isinstance(value, (dict, list)):
+                    self.remember(value, context, depth + 1)
+
+    def _remembered(self, name: str, context: Mapping[str, List[Any]]) -> Optional[List[Any]]:
+        source = id_source(name, [key for key, ids in context.items() if ids])
+        return context[source] if source else None
+
+    def value(self, schema: Mapping[str, Any], name: str, context: Mapping[str, List[Any]], depth: int = 0) -> Any:
+        """A value valid for ``schema``, preferring remembered ids for id-like names."""
+        schema = resolve(self.spec, schema)
+        kind = schema.get("type") or ("object" if "properties" in schema else "string")
+        if is_id_name(name):
+            ids = self._remembered(name, context)
+            if ids:
+                if kind == "array":
+                    return ids[-max(1, schema.get("minItems", 1)):][::-1]
+                return ids[-1]
+        for key in ("example", "default"):
+            if key in schema and schema[key] is not None:
+                return schema[key]
+        if schema.get("examples"):
+            return schema["examples"][0]
+        if schema.get("enum"):
+            return self.random.choice(schema["enum"])
+        if depth > 6:
+            return None
+
+        if kind == "object":
+            properties = schema.get("properties", {})
+            return {
+                key: self.value(prop, key, context, depth + 1)
+                for key, prop in properties.items()
+                if key in schema.get("required", []) or (is_id_name(key) and self._remembered(key, context))
+            }
+        if kind == "array":
+            count = max(1, schema.get("minItems", 1))
+            singular = name[:-1] if name.endswith("s") else name
+            return [self.value(schema.get("items", {}), singular, context, depth + 1) for _ in range(count)]
+        if kind in ("integer", "number"):
+            return self._number(schema, kind == "integer")
+        if kind == "boolean":
+            return self.random.random() < 0.5
+        return self._string(schema, name)
+
+    def _number(self, schema: Mapping[str, Any], integer: bool) -> Any:
+        low = schema.get("minimum", schema.get("exclusiveMinimum", 1))
+        high = schema.get("maximum", schema.get("exclusiveMaximum", low + 10))
+        if integer:
+            low = int(low) + (1 if "exclusiveMinimum" in schema else 0)
+            high = int(high) - (1 if "exclusiveMaximum" in schema else 0)
+            return self.random.randint(low, max(low, high))
+        # Midpoint of a random sub-range: never on an exclusive bound
+        return round(low + (high - low) * self.random.uniform(0.25, 0.75), 3)
+
+    def _string(self, schema: Mapping[str, Any], name: str) -> str:
+        fmt = schema.get("format")
+        if fmt == "date-time":
+            return datetime.now(timezone.utc).isoformat()
+        if fmt == "date":
+            return datetime.now(timezone.utc).date().isoformat()
+        if fmt == "uuid" or is_id_name(name):
+            return str(uuid.UUID(int=self.random.getrandbits(128), version=4))
+        if fmt == "email":
+            return "load@example.com"
+        if fmt in ("uri", "url"):
+            return "http://localhost/"
+        text = f"load-{name or 'value'}"
+        text = text.ljust(schema.get("minLength", 0), "x")
+        return text[:schema["maxLength"]] if "maxLength" in schema else text
+
+    def build(self, op: Operation, context: Mapping[str, List[Any]]) -> PreparedRequest:
+        """The request for one step of a scenario."""
+        request = PreparedRequest(op.method, op.path, op.name)
+        for param in op.parameters:
+            if param["in"] == "path":
+                value = self.value(param.get("schema", {}), param["name"], context)
+                request.path = request.path.replace("{" + param["name"] + "}", str(value))
+            elif param.get("required") or (is_id_name(param["name"]) and self._remembered(param["name"], context)):
+                request.params[param["name"]] = self.value(param.get("schema", {}), param["name"], context)
+
+        if op.body_type == "json":
+            request.json = self.value(op.body, "", context)
+        elif op.body_type in ("multipart", "form"):
+            fields, files = {}, {}
+            for key, prop in op.body.get("properties", {}).items():
+                prop = resolve(self.spec, prop)
+                binary = is_binary(prop) or is_binary(resolve(self.spec, prop.get("items")))
+                if binary and op.body_type == "multipart":
+                    files[key] = self.audio()
+                elif key in op.body.get("required", []):
+                    fields[key] = self.value(prop, key, context)
+            request.data = fields or None
+            request.files = files or None
+        return request
@@ -0,0 +1,290 @@
+# DJ AI App - Page Load Benchmark
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Count the requests and bytes a frontend page load costs, first visit and repeat visit
+
+"""Measure the requests and transferred bytes of a page load, cold and warm.
+
+Usage::
+
+    python -m dj_ai_app.bench.pageload http://localhost:3000/ http://localhost/
+    python -m dj_ai_app.bench.pageload https://localhost/ --insecure --http2 --json pageload.json
+
+The page is fetched like a browser with an empty cache, followed by the
+assets it references (scripts, stylesheets, preloads, icons, images and
+CSS ``url()``/``@import``). The visit is then repeated with the cache the
+first one left behind: fresh responses (``max-age``, ``immutable``) cost
+no request and stale ones are revalidated with ``If-None-Match`` or
+``If-Modified-Since``. Give two URLs, e.g. the frontend server directly and
+then nginx, to compare the delivery paths side by side.
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+
+# <link rel=...> values a browser downloads during the page load
+FETCHED_LINK_RELS = {"stylesheet", "modulepreload", "preload", "icon", "shortcut icon", "apple-touch-icon", "manifest"}
+
+CSS_REFERENCE_RE = re.compile(r"""url\(\s*['"]?([^'")]+)['"]?\s*\)|@import\s+['"]([^'"]+)['"]""")
+MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+# Request headers of a browser without any cached state
+BROWSER_HEADERS = {"Accept": "text/html,application/xhtml+xml,*/*;q=0.8", "User-Agent": "dj-ai-pageload/1.0"}
+
+
+class _AssetParser(HTMLParser):
+    """Collects the URLs an HTML document makes the browser download."""
+
+    def __init__(self):
+        super().__init__()
+        self.urls: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script" and attrs.get("src"):
+            self.urls.append(attrs["src"])
+        elif tag == "link" and attrs.get("href") and (attrs.get("rel") or "").lower() in FETCHED_LINK_RELS:
+            self.urls.append(attrs["href"])
+        elif tag in ("img", "source") and attrs.get("src"):
+            self.urls.append(attrs["src"])
+
+
+def html_assets(html: str, base_url: str) -> List[str]:
+    parser = _AssetParser()
+    parser.feed(html)
+    return _resolve(parser.urls, base_url)
+
+
+def css_assets(css: str, base_url: str) -> List[str]:
+    return _resolve([url or imported for url, imported in CSS_REFERENCE_RE.findall(css)], base_url)
+
+
+def _resolve(urls: Sequence[str], base_url: str) -> List[str]:
+    resolved = []
+    for url in urls:
+        url = url.strip()
+        if url and not url.startswith(("data:", "blob:", "#")):
+            absolute = urljoin(base_url, url).split("#")[0]
+            if absolute not in resolved:
+                resolved.append(absolute)
+    return resolved
+
+
+def freshness(headers: httpx.Headers) -> float:
+    """Seconds a browser may reuse the response without asking (0: always revalidate)."""
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0.0
+    match = MAX_AGE_RE.search(cache_control)
+    return float(match.group(1)) if match else 0.0
+
+
+@dataclass
+class Fetch:
+    """One resource of a visit and what it cost on the wire."""
+
+    url: str
+    status: int
+    transferred: int
+    size: int
+    content_type: str = ""
+    encoding: str = ""
+    cache_control: str = ""
+    http_version: str = ""
+    # Served from the browser cache without a request
+    cached: bool = False
+
+
+@dataclass
+class Visit:
+    """All resources of one page load."""
+
+    url: str
+    fetches: List[Fetch] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def requests(self) -> int:
+        return sum(1 for f in self.fetches if not f.cached)
+
+    @property
+    def transferred(self) -> int:
+        return sum(f.transferred for f in self.fetches)
+
+    @property
+    def size(self) -> int:
+        return sum(f.size for f in self.fetches)
+
+    @property
+    def failed(self) -> List[Fetch]:
+        return [f for f in self.fetches if f.status >= 400]
+
+    def to_dict(self) -> Dict:
+        return {
+            "url": self.url, "requests": self.requests, "transferred": self.transferred, "size": self.size,
+            "seconds": round(self.seconds, 3), "fetches": [asdict(f) for f in self.fetches],
+        }
+
+
+@dataclass
+class _Cached:
+    response: httpx.Response
+    stored_at: float
+
+
+class PageLoad:
+    """A browser-like page load with an HTTP cache that survives between visits."""
+
+    def __init__(self, client: httpx.AsyncClient, clock=time.monotonic):
+        self.client = client
+        self.cache: Dict[str, _Cached] = {}
+        self._clock = clock
+
+    async def _fetch(self, url: str) -> Tuple[Fetch, httpx.Response]:
+        entry = self.cache.get(url)
+        if entry is not None and self._clock() - entry.stored_at < freshness(entry.response.headers):
+            return Fetch(url, entry.response.status_code, 0, len(entry.response.content),
+                         entry.response.headers.get("content-type", ""), cached=True), entry.response
+        headers = dict(BROWSER_HEADERS)
+        if entry is not None:
+            if "etag" in entry.response.headers:
+                headers["If-None-Match"] = entry.response.headers["etag"]
+            if "last-modified" in entry.response.headers:
+                headers["If-Modified-Since"] = entry.response.headers["last-modified"]
+        response = await self.client.get(url, headers=headers)
+        # Body bytes as received (still compressed), plus the response headers
+        body = response.num_bytes_downloaded or int(response.headers.get("content-length", 0))
+        wire = body + sum(len(k) + len(v) + 4 for k, v in response.headers.raw)
+        fetch = Fetch(
+            url, response.status_code, wire, len(response.content), response.headers.get("content-type", ""),
+            response.headers.get("content-encoding", ""), response.headers.get("cache-control", ""),
+            response.http_version,
+        )
+        if response.status_code == 304 and entry is not None:
+            entry.stored_at = self._clock()
+            return fetch, entry.response
+        if response.status_code == 200 and "no-store" not in fetch.cache_control.lower():
+            self.cache[url] = _Cached(response, self._clock())
+        return fetch, response
+
+    async def visit(self, url: str) -> Visit:
+        """Load ``url`` and everything it references, level by level like a browser."""
+        visit = Visit(url)
+        started = self._clock()
+        seen: Set[str] = set()
+        wave = [url]
+        while wave:
+            seen.update(wave)
+            results = await asyncio.gather(*(self._fetch(u) for u in wave))
+            wave = []
+            for fetch, response in results:
+                visit.fetches.append(fetch)
+                if response.status_code != 200:
+                    continue
+                content_type = response.headers.get("content-type", "")
+                if "html" in content_type:
+                    found = html_assets(response.text, fetch.url)
+                elif "css" in content_type:
+                    found = css_assets(response.text, fetch.url)
+                else:
+                    found = []
+                wave.extend(u for u in found if u not in seen and u not in wave)
+        visit.seconds = self._clock() - started
+        return visit
+
+
+@dataclass
+class PageLoadResult:
+    """First and repeat visit of one URL."""
+
+    url: str
+    cold: Visit
+    warm: Visit
+
+    def to_dict(self) -> Dict:
+        return {"url": self.url, "cold": self.cold.to_dict(), "warm": self.warm.to_dict()}
+
+
+async def measure(url: str, transport: Optional[httpx.AsyncBaseTransport] = None, verify: bool = True,
+                  http2: bool = False, timeout: float = 30.0) -> PageLoadResult:
+    async with httpx.AsyncClient(transport=transport, verify=verify, http2=http2, timeout=timeout,
+                                 follow_redirects=True) as client:
+        page = PageLoad(client)
+        cold = await page.visit(url)
+        warm = await page.visit(url)
+    return PageLoadResult(url, cold, warm)
+
+
+def _kib(n: int) -> str:
+    return f"{n / 1024:.1f}"
+
+
+def render(results: List[PageLoadResult]) -> str:
+    lines = [
+        "| page | cold requests | cold KiB | decoded KiB | compressed | warm requests | warm KiB | immutable |",
+        "|---|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    for r in results:
+        compressed = sum(1 for f in r.cold.fetches if f.encoding)
+        immutable = sum(1 for f in r.cold.fetches if "immutable" in f.cache_control)
+        lines.append(
+            f"| {r.url} | {r.cold.requests} | {_kib(r.cold.transferred)} | {_kib(r.cold.size)} | "
+            f"{compressed}/{len(r.cold.fetches)} | {r.warm.requests} | {_kib(r.warm.transferred)} | {immutable} |"
+        )
+    if len(results) > 1:
+        base = results[0]
+        for r in results[1:]:
+            lines.append("")
+            lines.append(
+                f"{r.url} vs {base.url}: cold {_change(base.cold.transferred, r.cold.transferred)} bytes, "
+                f"warm {_change(base.warm.requests, r.warm.requests)} requests, "
+                f"{_change(base.warm.transferred, r.warm.transferred)} bytes"
+            )
+    return "\n".join(lines)
+
+
+def _change(before: int, after: int) -> str:
+    if not before:
+        return f"{before} -> {after}"
+    return f"{(after - before) / before:+.0%}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("urls", nargs="+", help="Pages to load; the first is the baseline")
+    parser.add_argument("--insecure", action="store_true", help="Accept self-signed certificates")
+    parser.add_argument("--http2", action="store_true", help="Negotiate HTTP/2 (needs the h2 package)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--json", dest="json_path", help="Also write every fetch to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for url in args.urls:
+        if not urlsplit(url).scheme:
+            url = f"http://{url}"
+        try:
+            results.append(asyncio.run(measure(url, verify=not args.insecure, http2=args.http2, timeout=args.timeout)))
+        except (httpx.HTTPError, ImportError) as exc:
+            print(f"Could not load {url}: {exc}", file=sys.stderr)
+            return 1
+    print(render(results))
+    failed = [f for r in results for f in r.cold.failed]
+    for fetch in failed:
+        print(f"{fetch.status} {fetch.url}", file=sys.stderr)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump([r.to_dict() for r in results], f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+# DJ AI App - Latency Budgets for Pytest
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: pytest plugin that times repeated test runs and fails tests over their latency budget
+
+"""Latency budgets checked alongside correctness.
+
+Enable with ``pytest_plugins = ["dj_ai_app.bench.perf_budget"]`` and mark a test::
+
+    @pytest.mark.perf_budget(p95_ms=50, runs=30)
+    def test_health(api_client):
+        assert api_client.get("http://localhost:8000/health").status_code == 200
+
+The test body runs ``warmup`` untimed times and then ``runs`` timed times
+(fixtures are set up once); any failing run fails the test as usual. The
+test also fails when a measured percentile is over its budget. Every
+budgeted test ends up in a table at the end of the session and in
+``--perf-budget-json``.
+"""
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+
+from ..logs.aggregates import percentile
+
+BUDGETS = ("p50_ms", "p95_ms", "p99_ms", "max_ms")
+MODES = ("enforce", "report", "off")
+DEFAULT_RUNS = 20
+DEFAULT_JSON = "reports/perf_budget.json"
+
+
+@dataclass
+class BudgetResult:
+    """Timings of one budgeted test and how they compare with its budget."""
+
+    test: str
+    runs: int
+    budgets: Dict[str, float]
+    measured: Dict[str, float] = field(default_factory=dict)
+    violations: List[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.violations
+
+
+def measure(durations: List[float], budgets: Dict[str, float], scale: float = 1.0) -> Dict[str, object]:
+    """Percentiles in milliseconds and the budgets they exceed (budgets multiplied by ``scale``)."""
+    ordered = sorted(d * 1000 for d in durations)
+    measured = {
+        "p50_ms": percentile(ordered, 50), "p95_ms": percentile(ordered, 95),
+        "p99_ms": percentile(ordered, 99), "max_ms": ordered[-1] if ordered else None,
+    }
+    violations = [
+        f"{name} {measured[name]:.1f} > {limit * scale:.1f}"
+        for name, limit in budgets.items()
+        if measured[name] is not None and measured[name] > limit * scale
+    ]
+    return {"measured": {k: round(v, 3) for k, v in measured.items() if v is not None}, "violations": violations}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf_budget", "latency budgets")
+    group.addoption(
+        "--perf-budget", choices=MODES, default=os.environ.get("DJ_AI_PERF_BUDGET", "enforce"),
+        help="enforce: fail tests over budget; report: only tabulate; off: run budgeted tests once (default: $DJ_AI_PERF_BUDGET or enforce)",
+    )
+    group.addoption(
+        "--perf-runs", type=int, default=None,
+        help="Timed runs for every budgeted test, overriding the marker",
+    )
+    group.addoption(
+        "--perf-scale", type=float, default=float(os.environ.get("DJ_AI_PERF_SCALE", "1")),
+        help="Multiply every budget (e.g. 2 on slow CI runners; default: $DJ_AI_PERF_SCALE or 1)",
+    )
+    group.addoption(
+        "--perf-budget-json", default=DEFAULT_JSON, help=f"Where to write the results (default: {DEFAULT_JSON})",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "perf_budget(p50_ms=None, p95_ms=None, p99_ms=None, max_ms=None, runs=20, warmup=1): "
+        "run the test repeatedly and fail it when a latency percentile is over budget",
+    )
+    config._perf_budget_results = []
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    marker = pyfuncitem.get_closest_marker("perf_budget")
+    config = pyfuncitem.config
+    mode = config.getoption("--perf-budget")
+    if marker is None or mode == "off":
+        return None
+    unknown = set(marker.kwargs) - set(BUDGETS) - {"runs", "warmup"}
+    if marker.args or unknown:
+        raise pytest.UsageError(f"{pyfuncitem.nodeid}: perf_budget takes keyword arguments {', '.join(BUDGETS)}, runs, warmup")
+    budgets = {name: float(marker.kwargs[name]) for name in BUDGETS if marker.kwargs.get(name) is not None}
+    runs = config.getoption("--perf-runs") or int(marker.kwargs.get("runs", DEFAULT_RUNS))
+    warmup = int(marker.kwargs.get("warmup", 1))
+
+    test = pyfuncitem.obj
+    kwargs = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    for _ in range(warmup):
+        test(**kwargs)
+    durations = []
+    for _ in range(max(1, runs)):
+        started = time.perf_counter()
+        test(**kwargs)
+        durations.append(time.perf_counter() - started)
+
+    scale = config.getoption("--perf-scale")
+    outcome = measure(durations, budgets, scale)
+    result = BudgetResult(pyfuncitem.nodeid, len(durations), {k: v * scale for k, v in budgets.items()}, **outcome)
+    config._perf_budget_results.append(result)
+    if result.violations and mode == "enforce":
+        pytest.fail(f"Latency budget exceeded over {result.runs} runs: {'; '.join(result.violations)}", pytrace=False)
+    return True
+
+
+def _format_ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def render(results: List[BudgetResult]) -> List[str]:
+    header = f"{'test':<60} {'runs':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  budget"
+    lines = [header]
+    for r in results:
+        budget = ", ".join(f"{name[:-3]}<={limit:g}" for name, limit in r.budgets.items()) or "-"
+        status = "ok" if r.passed else "OVER"
+        lines.append(
+            f"{r.test[-60:]:<60} {r.runs:>5} {_format_ms(r.measured.get('p50_ms')):>8} "
+            f"{_format_ms(r.measured.get('p95_ms')):>8} {_format_ms(r.measured.get('p99_ms')):>8} "
+            f"{_format_ms(r.measured.get('max_ms')):>8}  {budget} {status}"
+        )
+    return lines
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = getattr(config, "_perf_budget_results", [])
+    if not results:
+        return
+    terminalreporter.write_sep("=", "latency budgets (ms)")
+    for line in render(results):
+        terminalreporter.write_line(line)
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    results = getattr(config, "_perf_budget_results", [])
+    if not results or hasattr(config, "workerinput"):
+        return
+    path = Path(config.getoption("--perf-budget-json"))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "mode": config.getoption("--perf-budget"),
+        "scale": config.getoption("--perf-scale"),
+        "results": [{**asdict(r), "passed": r.passed} for r in results],
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n")
@@ -0,0 +1,228 @@
+# DJ AI App - Sampling Profiler Capture
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Attach py-spy to the running backend for N seconds and write flamegraphs
+
+"""Capture where a running dj-ai-core spends its CPU.
+
+Usage::
+
+    python -m dj_ai_app.bench.profiler --seconds 30
+    python -m dj_ai_app.bench.profiler --mode exec --container dj-ai-core --seconds 10
+    python -m dj_ai_app.bench.profiler --from-folded data/profiles/<capture>/stacks.folded
+
+``sidecar`` mode (the default) runs py-spy in the ``dj-ai-profiler``
+service, which shares dj-ai-core's PID namespace, so the backend image needs
+no changes; ``exec`` mode runs a py-spy installed inside the container.
+Either way every worker process is sampled and the capture directory gets
+``stacks.folded``, ``flamegraph.svg``, ``profile.speedscope.json`` and
+``top.txt``.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .stacks import Stack, format_collapsed, parse_collapsed, render_flamegraph, render_top, to_speedscope
+
+MODES = ("sidecar", "exec")
+PROFILES_DIR = Path("data/profiles")
+
+Runner = Callable[..., subprocess.CompletedProcess]
+
+
+class ProfilerError(RuntimeError):
+    """py-spy could not attach or produced no samples."""
+
+
+@dataclass
+class ProfileResult:
+    """One capture and where its files were written."""
+
+    directory: Path
+    samples: int
+    stacks: Dict[Stack, int] = field(repr=False)
+    files: Dict[str, Path] = field(default_factory=dict)
+
+
+def py_spy_args(seconds: float, rate: int = 100, pid: int = 1, nonblocking: bool = False) -> List[str]:
+    """``py-spy record`` writing folded stacks to stdout, following worker subprocesses."""
+    args = [
+        "py-spy", "record", "--pid", str(pid), "--duration", str(max(1, round(seconds))), "--rate", str(rate),
+        "--subprocesses", "--format", "raw", "--output", "/dev/stdout",
+    ]
+    if nonblocking:
+        # Never pauses the backend, at the cost of occasionally torn stacks
+        args.append("--nonblocking")
+    return args
+
+
+class SamplingProfiler:
+    """Runs py-spy against the backend and turns its stacks into report files."""
+
+    def __init__(
+        self,
+        mode: str = "sidecar",
+        container: str = "dj-ai-core",
+        service: str = "dj-ai-profiler",
+        compose: str = "docker-compose",
+        files: Sequence[str] = (),
+        rate: int = 100,
+        pid: int = 1,
+        nonblocking: bool = False,
+        runner: Runner = subprocess.run,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiler mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.mode = mode
+        self.container = container
+        self.service = service
+        self.compose = compose.split()
+        self.files = list(files)
+        self.rate = rate
+        self.pid = pid
+        self.nonblocking = nonblocking
+        self._runner = runner
+
+    def command(self, seconds: float) -> List[str]:
+        args = py_spy_args(seconds, self.rate, self.pid, self.nonblocking)
+        if self.mode == "exec":
+            return ["docker", "exec", self.container, *args]
+        compose = list(self.compose)
+        for path in self.files:
+            compose += ["-f", path]
+        return [*compose, "--profile", "profiling", "run", "--rm", "-T", self.service, *args]
+
+    def capture(self, seconds: float) -> Dict[Stack, int]:
+        """Sample for ``seconds`` and return the folded stacks."""
+        try:
+            result = self._runner(self.command(seconds), capture_output=True, text=True, timeout=seconds + 120)
+        except (FileNotFoundError, subprocess.TimeoutExpired) as exc:
+            raise ProfilerError(f"Could not run py-spy: {exc}") from exc
+        stacks = parse_collapsed(result.stdout.splitlines())
+        if result.returncode != 0 or not stacks:
+            detail = (result.stderr or "").strip().splitlines()[-1:] or [f"exit status {result.returncode}"]
+            raise ProfilerError(f"py-spy produced no samples ({detail[0]})")
+        return stacks
+
+    def record(self, seconds: float, output_dir: Path = PROFILES_DIR, label: str = "", top: int = 25) -> ProfileResult:
+        """Capture and write the report files into a new timestamped directory."""
+        stacks = self.capture(seconds)
+        name = time.strftime("%Y%m%d-%H%M%S") + (f"-{label}" if label else "")
+        return write_profile(stacks, Path(output_dir) / name, title=f"{self.container} {name}", top=top)
+
+
+def write_profile(stacks: Dict[Stack, int], directory: Path, title: str = "profile", top: int = 25) -> ProfileResult:
+    """Folded stacks, flamegraph, speedscope profile and top-functions table in ``directory``."""
+    directory.mkdir(parents=True, exist_ok=True)
+    files = {
+        "folded": directory / "stacks.folded",
+        "flamegraph": directory / "flamegraph.svg",
+        "speedscope": directory / "profile.speedscope.json",
+        "top": directory / "top.txt",
+    }
+    files["folded"].write_text(format_collapsed(stacks))
+    files["flamegraph"].write_text(render_flamegraph(stacks, title=title))
+    files["speedscope"].write_text(json.dumps(to_speedscope(stacks, name=title)))
+    files["top"].write_text(render_top(stacks, top) + "\n")
+    return ProfileResult(directory, sum(stacks.values()), stacks, files)
+
+
+class ProfileTrigger:
+    """Starts a background capture when a measured p99 goes over budget.
+
+    Load tools call :meth:`check` with each window's p99; at most one
+    capture runs at a time and captures are ``cooldown`` seconds apart, so a
+    sustained regression yields a handful of profiles, not hundreds.
+    """
+
+    def __init__(
+        self,
+        profiler: SamplingProfiler,
+        p99_budget: float,
+        seconds: float = 15.0,
+        cooldown: float = 300.0,
+        output_dir: Path = PROFILES_DIR,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.profiler = profiler
+        self.p99_budget = p99_budget
+        self.seconds = seconds
+        self.cooldown = cooldown
+        self.output_dir = output_dir
+        self.results: List[ProfileResult] = []
+        self.errors: List[str] = []
+        self._clock = clock
+        self._last: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self, p99: Optional[float]) -> bool:
+        """Start a capture if ``p99`` is over budget and none ran recently; returns whether one started."""
+        if p99 is None or p99 <= self.p99_budget:
+            return False
+        if self._thread is not None and self._thread.is_alive():
+            return False
+        now = self._clock()
+        if self._last is not None and now - self._last < self.cooldown:
+            return False
+        self._last = now
+        label = f"p99-{p99 * 1000:.0f}ms"
+        self._thread = threading.Thread(target=self._capture, args=(label,), daemon=True)
+        self._thread.start()
+        return True
+
+    def _capture(self, label: str):
+        try:
+            self.results.append(self.profiler.record(self.seconds, self.output_dir, label))
+        except ProfilerError as exc:
+            self.errors.append(str(exc))
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until a running capture has been written."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=30.0, help="How long to sample")
+    parser.add_argument("--rate", type=int, default=100, help="Samples per second")
+    parser.add_argument("--mode", default="sidecar", choices=MODES)
+    parser.add_argument("--container", default="dj-ai-core", help="Container to profile in exec mode")
+    parser.add_argument("--pid", type=int, default=1, help="Process to attach to (its worker subprocesses are included)")
+    parser.add_argument("--nonblocking", action="store_true", help="Do not pause the backend while sampling")
+    parser.add_argument("--compose", default="docker-compose", help="Compose command (e.g. 'docker compose')")
+    parser.add_argument("--output", type=Path, default=PROFILES_DIR, help="Directory for capture directories")
+    parser.add_argument("--top", type=int, default=25, help="Functions in the summary")
+    parser.add_argument("--from-folded", type=Path, help="Re-render an existing stacks.folded instead of capturing")
+    args = parser.parse_args(argv)
+
+    if args.from_folded:
+        with open(args.from_folded) as f:
+            stacks = parse_collapsed(f)
+        result = write_profile(stacks, args.from_folded.parent, title=args.from_folded.parent.name, top=args.top)
+    else:
+        profiler = SamplingProfiler(
+            args.mode, container=args.container, compose=args.compose, rate=args.rate, pid=args.pid,
+            nonblocking=args.nonblocking,
+        )
+        try:
+            result = profiler.record(args.seconds, args.output, top=args.top)
+        except ProfilerError as exc:
+            print(exc, file=sys.stderr)
+            return 1
+
+    print(render_top(result.stacks, args.top))
+    print()
+    for kind, path in result.files.items():
+        print(f"{kind:>10}: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+# DJ AI App - Sampled Stacks
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Turn collapsed profiler stacks into flamegraphs, speedscope files and top-function tables
+
+import re
+import zlib
+from collections import Counter
+from html import escape
+from typing import Dict, Iterable, List, Optional, Tuple
+
+Stack = Tuple[str, ...]
+
+# py-spy frames look like "analyze (app/services/audio.py:42)"
+_FRAME_RE = re.compile(r"^(?P<name>.*?) \((?P<file>[^()]*?)(?::(?P<line>\d+))?\)$")
+
+
+def parse_collapsed(lines: Iterable[str]) -> Dict[Stack, int]:
+    """Folded stacks (``frame;frame;frame count``, root first) as sample counts.
+
+    py-spy's progress messages and anything else that is not a folded
+    stack are skipped, so the profiler's stdout can be parsed as is.
+    """
+    stacks: Counter = Counter()
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("py-spy>"):
+            continue
+        frames, _, count = line.rpartition(" ")
+        if not frames or not count.isdigit():
+            continue
+        stacks[tuple(frames.split(";"))] += int(count)
+    return dict(stacks)
+
+
+def format_collapsed(stacks: Dict[Stack, int]) -> str:
+    return "".join(f"{';'.join(stack)} {count}\n" for stack, count in sorted(stacks.items()))
+
+
+def split_frame(frame: str) -> Tuple[str, Optional[str], Optional[int]]:
+    """Function name, file and line of one frame."""
+    match = _FRAME_RE.match(frame)
+    if not match:
+        return frame, None, None
+    line = match.group("line")
+    return match.group("name"), match.group("file"), int(line) if line else None
+
+
+def top_functions(stacks: Dict[Stack, int], limit: int = 20) -> List[Tuple[str, int, int]]:
+    """``(frame, self samples, total samples)``, most self time first.
+
+    Self samples are those where the frame is on top of the stack; total
+    samples count every stack the frame appears in (once, even when recursive).
+    """
+    own: Counter = Counter()
+    total: Counter = Counter()
+    for stack, count in stacks.items():
+        if not stack:
+            continue
+        own[stack[-1]] += count
+        for frame in set(stack):
+            total[frame] += count
+    ranked = sorted(total, key=lambda frame: (-own[frame], -total[frame], frame))
+    return [(frame, own[frame], total[frame]) for frame in ranked[:limit]]
+
+
+def render_top(stacks: Dict[Stack, int], limit: int = 20) -> str:
+    """Text table of :func:`top_functions` with shares of all samples."""
+    samples = sum(stacks.values())
+    if not samples:
+        return "No samples collected"
+    lines = [f"{'self %':>7} {'total %':>8} {'self':>7} {'total':>7}  function"]
+    for frame, own, total in top_functions(stacks, limit):
+        lines.append(f"{own / samples:>7.1%} {total / samples:>8.1%} {own:>7} {total:>7}  {frame}")
+    lines.append(f"{samples} samples")
+    return "\n".join(lines)
+
+
+def to_speedscope(stacks: Dict[Stack, int], name: str = "profile") -> dict:
+    """A speedscope "sampled" profile (https://www.speedscope.app), one weighted sample per distinct stack."""
+    frames: List[dict] = []
+    index: Dict[str, int] = {}
+    samples, weights = [], []
+    for stack, count in sorted(stacks.items()):
+        sample = []
+        for frame in stack:
+            if frame not in index:
+                index[frame] = len(frames)
+                function, path, line = split_frame(frame)
+                entry = {"name": function}
+                if path:
+                    entry["file"] = path
+                if line is not None:
+                    entry["line"] = line
+                frames.append(entry)
+            sample.append(index[frame])
+        samples.append(sample)
+        weights.append(count)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "dj_ai_app.bench.profiler",
+        "activeProfileIndex": 0,
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled", "name": name, "unit": "none",
+            "startValue": 0, "endValue": sum(weights), "samples": samples, "weights": weights,
+        }],
+    }
+
+
+class _Node:
+    __slots__ = ("children", "count")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.count = 0
+
+
+def _color(frame: str) -> str:
+    # Stable warm colours, so one function keeps its colour across captures
+    h = zlib.crc32(frame.encode())
+    return f"rgb({205 + h % 50},{(h >> 8) % 180},{(h >> 16) % 55})"
+
+
+def render_flamegraph(stacks: Dict[Stack, int], title: str = "Flame Graph", width: int = 1200, row: int = 16) -> str:
+    """Self-contained SVG flamegraph: the root at the bottom, width proportional to samples."""
+    root = _Node()
+    depth = 0
+    for stack, count in stacks.items():
+        node = root
+        node.count += count
+        for frame in stack:
+            node = node.children.setdefault(frame, _Node())
+            node.count += count
+        depth = max(depth, len(stack))
+
+    top = 2 * row
+    height = top + (depth + 1) * row
+    scale = (width - 20) / max(root.count, 1)
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="Verdana,sans-serif" font-size="11">',
+        '<rect width="100%" height="100%" fill="#fdf6e3"/>',
+        f'<text x="{width / 2}" y="{row}" text-anchor="middle" font-size="15">{escape(title)}</text>',
+    ]
+
+    def draw(node: _Node, frame: str, x: float, level: int):
+        w = node.count * scale
+        if w < 0.5:
+            return
+        y = height - (level + 1) * row
+        label = f"{frame} ({node.count} samples, {node.count / max(root.count, 1):.1%})"
+        parts.append(
+            f'<g><title>{escape(label)}</title>'
+            f'<rect x="{x:.2f}" y="{y}" width="{w:.2f}" height="{row - 1}" fill="{_color(frame)}" rx="2"/>'
+        )
+        chars = int(w / 7)
+        if chars > 2:
+            text = frame if len(frame) <= chars else frame[:chars - 2] + ".."
+            parts.append(f'<text x="{x + 3:.2f}" y="{y + row - 4}">{escape(text)}</text>')
+        parts.append("</g>")
+        for name, child in sorted(node.children.items()):
+            draw(child, name, x, level + 1)
+            x += child.count * scale
+
+    draw(root, "all", 10.0, 0)
+    parts.append("</svg>")
+    return "\n".join(parts)
@@ -0,0 +1,199 @@
+# DJ AI App - Startup Profiler
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Bring the stack up and record a per-service startup timeline
+
+"""Bring a compose stack up and time every service's startup milestones.
+
+Usage::
+
+    python -m dj_ai_app.bench.startup --env dev --json startup.json
+
+For each service the timeline records, in seconds since ``up`` was issued:
+when its container was first seen running, when its port accepted TCP
+connections, its first healthy response and when it reported ready
+(dj-ai-core with its models loaded, the gateway via ``/gateway/ready``).
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, List, Optional, Set
+
+import httpx
+
+from ..gateway.app import backend_ready
+from .compose import COMPOSE_FILES, ComposeStack
+
+MILESTONES = ("started", "port_open", "healthy", "ready")
+
+
+@dataclass
+class ServiceProbe:
+    """Where to look for one service's milestones (ports as published on the host)."""
+
+    service: str
+    port: Optional[int] = None
+    health_path: Optional[str] = None
+    # None: ready as soon as healthy
+    ready_path: Optional[str] = None
+
+
+DEFAULT_PROBES = [
+    ServiceProbe("dj-ai-core", 8000, "/health", "/health"),
+    ServiceProbe("dj-ai-gateway", 8080, "/gateway/health", "/gateway/ready"),
+    ServiceProbe("dj-ai-worker"),
+    ServiceProbe("dj-ai-frontend", 3000, "/"),
+    ServiceProbe("nginx", 80, "/health"),
+]
+
+
+@dataclass
+class Timeline:
+    """Seconds from ``up`` to each milestone; None if it was never reached."""
+
+    service: str
+    started: Optional[float] = None
+    port_open: Optional[float] = None
+    healthy: Optional[float] = None
+    ready: Optional[float] = None
+
+
+async def tcp_port_open(host: str, port: int, timeout: float = 0.5) -> bool:
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    return True
+
+
+class StartupProfiler:
+    """Poll containers, ports and health endpoints while the stack comes up."""
+
+    def __init__(
+        self,
+        stack: ComposeStack,
+        probes: Optional[List[ServiceProbe]] = None,
+        host: str = "localhost",
+        interval: float = 0.25,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        port_open: Callable[[str, int], Awaitable[bool]] = tcp_port_open,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.stack = stack
+        self.probes = probes or DEFAULT_PROBES
+        self.host = host
+        self.interval = interval
+        self.transport = transport
+        self._port_open = port_open
+        self._clock = clock
+        self._running: Set[str] = set()
+
+    async def _http_ok(self, client: httpx.AsyncClient, probe: ServiceProbe, path: str, readiness: bool) -> bool:
+        try:
+            response = await client.get(f"http://{self.host}:{probe.port}{path}")
+        except httpx.RequestError:
+            return False
+        if response.status_code != 200:
+            return False
+        if not readiness:
+            return True
+        try:
+            return backend_ready(response.json())
+        except ValueError:
+            return True
+
+    async def _watch_containers(self, deadline: float):
+        while self._clock() < deadline:
+            self._running = set((await asyncio.to_thread(self.stack.containers)).values())
+            await asyncio.sleep(self.interval)
+
+    async def _watch(self, probe: ServiceProbe, timeline: Timeline, client: httpx.AsyncClient, started: float, deadline: float):
+        def mark(milestone: str):
+            if getattr(timeline, milestone) is None:
+                setattr(timeline, milestone, round(self._clock() - started, 2))
+
+        while self._clock() < deadline:
+            if probe.service in self._running:
+                mark("started")
+            if timeline.started is not None and probe.port is None:
+                # No port to probe (the worker): running is all we can observe
+                mark("ready")
+                return
+            if timeline.started is not None and timeline.port_open is None:
+                if await self._port_open(self.host, probe.port):
+                    mark("port_open")
+            if timeline.port_open is not None and timeline.healthy is None and probe.health_path:
+                if await self._http_ok(client, probe, probe.health_path, readiness=False):
+                    mark("healthy")
+            if timeline.healthy is not None:
+                if probe.ready_path is None or await self._http_ok(client, probe, probe.ready_path, readiness=True):
+                    mark("ready")
+                    return
+            await asyncio.sleep(self.interval)
+
+    async def run(self, timeout: float = 300.0) -> List[Timeline]:
+        """Issue ``up`` and record milestones until every service is ready or ``timeout``."""
+        services = set(await asyncio.to_thread(self.stack.services))
+        probes = [probe for probe in self.probes if probe.service in services]
+        timelines = [Timeline(probe.service) for probe in probes]
+        started = self._clock()
+        deadline = started + timeout
+        # "up -d" blocks on depends_on health conditions, so run it alongside the probes
+        up = asyncio.ensure_future(asyncio.to_thread(self.stack.up, False))
+        containers = asyncio.ensure_future(self._watch_containers(deadline))
+        try:
+            async with httpx.AsyncClient(timeout=2.0, transport=self.transport) as client:
+                await asyncio.gather(*(
+                    self._watch(probe, timeline, client, started, deadline)
+                    for probe, timeline in zip(probes, timelines)
+                ))
+            await up
+        finally:
+            containers.cancel()
+        return timelines
+
+
+def render(timelines: List[Timeline]) -> str:
+    """Markdown table of the startup timeline."""
+    lines = ["| Service | " + " | ".join(MILESTONES) + " |", "|" + "---|" * (1 + len(MILESTONES))]
+    for timeline in timelines:
+        cells = [
+            "-" if getattr(timeline, m) is None else f"{getattr(timeline, m):.2f}s"
+            for m in MILESTONES
+        ]
+        lines.append(f"| {timeline.service} | " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--env", default="dev", choices=sorted(COMPOSE_FILES))
+    parser.add_argument("--compose", default="docker-compose", help="Compose command (e.g. 'docker compose')")
+    parser.add_argument("--build", action="store_true", help="Build images first (not part of the timeline)")
+    parser.add_argument("--warm", action="store_true", help="Restart a running stack instead of starting from scratch")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--json", dest="json_path", help="Also write the timeline to this file")
+    args = parser.parse_args(argv)
+
+    stack = ComposeStack(args.env, args.compose)
+    if args.build:
+        stack.build()
+    if args.warm:
+        stack.stop()
+    else:
+        stack.down()
+    timelines = asyncio.run(StartupProfiler(stack).run(args.timeout))
+
+    print(render(timelines))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump([asdict(t) for t in timelines], f, indent=2)
+    return 0 if all(t.ready is not None for t in timelines) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
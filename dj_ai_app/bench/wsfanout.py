@@ -0,0 +1,339 @@
+# DJ AI App - WebSocket Fan-out Benchmark
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Hold thousands of idle and active broker connections and measure delivery under load
+
+"""Hold idle, active and slow WebSocket clients on the broker and measure fan-out.
+
+Usage::
+
+    python -m dj_ai_app.bench.wsfanout --serve --idle 5000 --active 1000 --slow 20
+    BROKER_PUBLISH_SECRET=... python -m dj_ai_app.bench.wsfanout --url ws://localhost/ws \
+        --publish-url http://localhost:8090/publish
+
+Idle clients subscribe to topics that never receive anything; active ones
+share ``--topics`` topics that are published to at ``--rate`` messages per
+second (keyed, so a client that falls behind gets the latest value instead
+of a backlog); slow ones subscribe to every active topic and never read.
+With ``--serve`` a broker is started on this machine pinned to one CPU
+core. The report shows how many connections were still open at the end,
+delivery latency, how many messages were coalesced or dropped, and the
+broker's CPU and memory from its ``/metrics``.
+"""
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import json
+import os
+import re
+import resource
+import secrets
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+
+from ..gateway.headers import BROKER_SECRET_HEADER
+from ..logs import percentile
+
+# Connections opened at once while ramping up
+CONNECT_CONCURRENCY = 200
+# Receive buffer of a slow client's socket, in bytes
+SLOW_RECEIVE_BUFFER = 4096
+# Publishes are batched into one /publish request per tick
+PUBLISH_TICK = 0.05
+
+_METRIC_RE = re.compile(r"^(dj_broker_[a-z_]+) ([0-9.e+-]+)$", re.MULTILINE)
+
+
+def raise_nofile_limit(wanted: int) -> int:
+    """Raise the soft open-files limit towards ``wanted`` (capped by the hard limit)."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+    if target > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+        return target
+    return soft
+
+
+def publish_url_for(ws_url: str) -> str:
+    """``ws://host:port/ws`` -> ``http://host:port/publish``."""
+    parts = urlsplit(ws_url)
+    return urlunsplit(("https" if parts.scheme == "wss" else "http", parts.netloc, "/publish", "", ""))
+
+
+def parse_metrics(text: str) -> Dict[str, float]:
+    """Unlabelled dj_broker_* samples of a /metrics page."""
+    return {name: float(value) for name, value in _METRIC_RE.findall(text)}
+
+
+@dataclass
+class FanoutResult:
+    """What one run held, delivered and cost the broker."""
+
+    idle: int
+    active: int
+    slow: int
+    opened: int = 0
+    failed: int = 0
+    # Still open when the run ended
+    held_idle: int = 0
+    held_active: int = 0
+    published: int = 0
+    received: int = 0
+    latency_p50: float = 0.0
+    latency_p99: float = 0.0
+    latency_max: float = 0.0
+    seconds: float = 0.0
+    broker: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def held(self) -> int:
+        return self.held_idle + self.held_active
+
+    def to_dict(self) -> Dict:
+        return {**asdict(self), "held": self.held}
+
+
+class _Client:
+    """One benchmark connection and what it saw."""
+
+    def __init__(self, kind: str, topics: List[str]):
+        self.kind = kind
+        self.topics = topics
+        self.connection = None
+        self.latencies: List[float] = []
+        self.closed = False
+
+    async def open(self, url: str, connect):
+        options = {}
+        if self.kind == "slow":
+            # Stops reading after one queued frame, with a small receive window like a stalled
+            # phone, so the broker's writes back up within seconds instead of after megabytes
+            parts = urlsplit(url)
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SLOW_RECEIVE_BUFFER)
+            sock.setblocking(False)
+            await asyncio.get_running_loop().sock_connect(sock, (parts.hostname, parts.port or 80))
+            options = {"sock": sock, "max_queue": 1}
+        self.connection = await connect(url, open_timeout=30, ping_interval=None, **options)
+        await self.connection.send(json.dumps({"subscribe": self.topics}))
+
+    async def read(self):
+        try:
+            async for text in self.connection:
+                sent = json.loads(text).get("sent")
+                if sent is not None:
+                    self.latencies.append(time.time() - sent)
+        except Exception:
+            pass
+        self.closed = True
+
+    async def close(self):
+        if self.kind == "slow":
+            # The broker's close frame is queued behind everything this client never read
+            self.connection.transport.abort()
+            return
+        await asyncio.wait_for(self.connection.close(), 5.0)
+
+
+async def _broker_metrics(client: httpx.AsyncClient, metrics_url: str) -> Dict[str, float]:
+    try:
+        response = await client.get(metrics_url)
+        return parse_metrics(response.text) if response.status_code == 200 else {}
+    except httpx.HTTPError:
+        return {}
+
+
+async def measure(
+    url: str, publish_url: Optional[str] = None, idle: int = 1000, active: int = 200, slow: int = 0,
+    topics: int = 20, rate: float = 50.0, duration: float = 10.0, size: int = 256, secret: str = "",
+) -> FanoutResult:
+    """Open all clients, publish for ``duration`` seconds, then close everything."""
+    from websockets.asyncio.client import connect
+
+    publish_url = publish_url or publish_url_for(url)
+    metrics_url = publish_url.rsplit("/", 1)[0] + "/metrics"
+    active_topics = [f"bench:{i}" for i in range(max(1, topics))]
+    clients = (
+        [_Client("idle", [f"idle:{i}"]) for i in range(idle)]
+        + [_Client("active", [active_topics[i % len(active_topics)]]) for i in range(active)]
+        + [_Client("slow", active_topics) for _ in range(slow)]
+    )
+    result = FanoutResult(idle, active, slow)
+    gate = asyncio.Semaphore(CONNECT_CONCURRENCY)
+
+    async def open_client(client: _Client) -> bool:
+        async with gate:
+            try:
+                await client.open(url, connect)
+                return True
+            except Exception:
+                return False
+
+    opened = await asyncio.gather(*(open_client(c) for c in clients))
+    live = [c for c, ok in zip(clients, opened) if ok]
+    result.opened, result.failed = len(live), len(clients) - len(live)
+    # Slow clients never read; the broker reports when it dropped them
+    watchers = [asyncio.ensure_future(c.read()) for c in live if c.kind != "slow"]
+
+    # Random, so permessage-deflate cannot shrink the payload to nothing
+    padding = base64.b64encode(os.urandom(max(0, size - 64))).decode()[:max(0, size - 64)]
+    async with httpx.AsyncClient(timeout=30, headers={BROKER_SECRET_HEADER: secret}) as http:
+        before = await _broker_metrics(http, metrics_url)
+        started = time.perf_counter()
+        sequence = 0
+        budget = 0.0
+        while time.perf_counter() - started < duration:
+            budget += rate * PUBLISH_TICK
+            batch = []
+            while budget >= 1:
+                budget -= 1
+                topic = active_topics[sequence % len(active_topics)]
+                batch.append({"topic": topic, "key": "progress",
+                              "message": {"type": "bench", "seq": sequence, "sent": time.time(), "pad": padding}})
+                sequence += 1
+            if batch:
+                with contextlib.suppress(httpx.HTTPError):
+                    await http.post(publish_url, json=batch)
+                    result.published += len(batch)
+            await asyncio.sleep(PUBLISH_TICK)
+        # Let the last messages arrive
+        await asyncio.sleep(min(1.0, duration))
+        result.seconds = time.perf_counter() - started
+        after = await _broker_metrics(http, metrics_url)
+
+    result.held_idle = sum(1 for c in live if c.kind == "idle" and not c.closed)
+    result.held_active = sum(1 for c in live if c.kind == "active" and not c.closed)
+    latencies = sorted(latency for c in live for latency in c.latencies)
+    result.received = len(latencies)
+    result.latency_p50 = percentile(latencies, 50) or 0.0
+    result.latency_p99 = percentile(latencies, 99) or 0.0
+    result.latency_max = max(latencies, default=0.0)
+    if after:
+        cpu = after.get("dj_broker_process_cpu_seconds_total", 0.0) - before.get("dj_broker_process_cpu_seconds_total", 0.0)
+        result.broker = {
+            "connections": after.get("dj_broker_connections", 0.0),
+            "cpu_seconds": round(cpu, 3),
+            "cpu_utilization": round(cpu / result.seconds, 3) if result.seconds else 0.0,
+            "rss_mib": round(after.get("dj_broker_process_resident_memory_bytes", 0.0) / 1024 ** 2, 1),
+            "coalesced": after.get("dj_broker_coalesced_total", 0.0) - before.get("dj_broker_coalesced_total", 0.0),
+            "dropped": after.get("dj_broker_dropped_total", 0.0) - before.get("dj_broker_dropped_total", 0.0),
+            "slow_disconnects": after.get("dj_broker_slow_disconnects_total", 0.0)
+            - before.get("dj_broker_slow_disconnects_total", 0.0),
+        }
+
+    await asyncio.gather(*(c.close() for c in live), return_exceptions=True)
+    for watcher in watchers:
+        watcher.cancel()
+    await asyncio.gather(*watchers, return_exceptions=True)
+    return result
+
+
+def _pin_to_one_core():
+    with contextlib.suppress(AttributeError, OSError):
+        os.sched_setaffinity(0, {min(os.sched_getaffinity(0))})
+
+
+@contextlib.contextmanager
+def serve(port: int, connections: int, secret: str, queue_size: Optional[int] = None,
+          send_timeout: Optional[float] = None):
+    """Run a broker subprocess on 127.0.0.1:``port``, pinned to one CPU core."""
+    env = dict(os.environ, BROKER_HOST="127.0.0.1", BROKER_PORT=str(port), BROKER_JOBS_DIR="",
+               BROKER_PUBLISH_SECRET=secret, LOG_LEVEL="warning")
+    if queue_size is not None:
+        env["BROKER_QUEUE_SIZE"] = str(queue_size)
+    if send_timeout is not None:
+        env["BROKER_SEND_TIMEOUT"] = str(send_timeout)
+
+    def prepare():
+        _pin_to_one_core()
+        raise_nofile_limit(connections + 1024)
+
+    process = subprocess.Popen([sys.executable, "-m", "dj_ai_app.broker"], env=env, preexec_fn=prepare)
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("The broker did not start")
+            time.sleep(0.2)
+        yield f"ws://127.0.0.1:{port}/ws"
+    finally:
+        process.terminate()
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}"
+
+
+def render(result: FanoutResult) -> str:
+    broker = result.broker
+    lines = [
+        "| connections | held | idle held | active held | slow dropped | published | received | p50 ms | p99 ms "
+        "| coalesced | dropped | broker CPU | broker RSS MiB |",
+        "|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|",
+        f"| {result.opened}/{result.idle + result.active + result.slow} | {result.held} | "
+        f"{result.held_idle}/{result.idle} | {result.held_active}/{result.active} | "
+        f"{broker.get('slow_disconnects', 0):.0f}/{result.slow} | {result.published} | {result.received} | "
+        f"{_ms(result.latency_p50)} | {_ms(result.latency_p99)} | {broker.get('coalesced', 0):.0f} | "
+        f"{broker.get('dropped', 0):.0f} | {broker.get('cpu_utilization', 0):.0%} | {broker.get('rss_mib', 0)} |",
+    ]
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="ws://localhost:8090/ws", help="Broker WebSocket URL")
+    parser.add_argument("--publish-url", help="Broker /publish URL (default: next to --url)")
+    parser.add_argument("--secret", default=os.environ.get("BROKER_PUBLISH_SECRET", ""),
+                        help="Broker publish secret (default: $BROKER_PUBLISH_SECRET; --serve makes one up)")
+    parser.add_argument("--serve", action="store_true", help="Start a local broker pinned to one CPU core")
+    parser.add_argument("--port", type=int, default=8091, help="Port of the --serve broker")
+    parser.add_argument("--idle", type=int, default=2000)
+    parser.add_argument("--active", type=int, default=500)
+    parser.add_argument("--slow", type=int, default=0)
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--rate", type=float, default=50.0, help="Messages published per second")
+    parser.add_argument("--size", type=int, default=256, help="Approximate bytes per message")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--json", dest="json_path", help="Also write the result to this file")
+    args = parser.parse_args(argv)
+
+    connections = args.idle + args.active + args.slow
+    raise_nofile_limit(connections + 1024)
+    options = dict(idle=args.idle, active=args.active, slow=args.slow, topics=args.topics, rate=args.rate,
+                   duration=args.duration, size=args.size)
+    try:
+        if args.serve:
+            options["secret"] = args.secret or secrets.token_hex(16)
+            with serve(args.port, connections, options["secret"]) as url:
+                result = asyncio.run(measure(url, **options))
+        else:
+            result = asyncio.run(measure(args.url, args.publish_url, secret=args.secret, **options))
+    except (ImportError, RuntimeError, OSError) as exc:
+        print(f"Benchmark failed: {exc}", file=sys.stderr)
+        return 1
+    print(render(result))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(result.to_dict(), f, indent=2)
+    return 0 if result.opened and result.held == result.idle + result.active else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
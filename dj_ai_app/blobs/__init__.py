@@ -0,0 +1,9 @@
+# DJ AI App - Upload Blob Store
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Deduplicated, size-capped upload storage for data/uploads
+
+"""Content-addressed upload storage with LRU eviction and a compaction sweeper."""
+
+from .store import BlobStore, SweepReport
+
+__all__ = ["BlobStore", "SweepReport"]
@@ -0,0 +1,51 @@
+# DJ AI App - Upload Sweeper Entrypoint
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Periodic compaction of the upload store (python -m dj_ai_app.blobs)
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+
+from ..env import env_float
+from .store import BlobStore
+
+logger = logging.getLogger("dj_ai_app.blobs")
+
+
+def main(argv=None) -> int:
+    """Sweep the upload store once, or every ``--interval`` seconds until stopped."""
+    parser = argparse.ArgumentParser(description="Compact the content-addressed upload store")
+    parser.add_argument("root", nargs="?", default=os.environ.get("BLOBS_DIR", "data/uploads"))
+    parser.add_argument("--max-mb", type=float, default=env_float(os.environ, "BLOBS_MAX_MB", 10240))
+    parser.add_argument("--interval", type=float, default=env_float(os.environ, "BLOBS_SWEEP_INTERVAL", 0),
+                        help="Seconds between sweeps; 0 sweeps once and exits")
+    parser.add_argument("--adopt-after", type=float, default=env_float(os.environ, "BLOBS_ADOPT_AFTER", 0),
+                        help="Fold loose files older than this many seconds into the store; 0 leaves them alone")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO"),
+        format="%(asctime)s [%(levelname)8s] %(name)s: %(message)s",
+    )
+    store = BlobStore(args.root, max_bytes=int(args.max_mb * 1024 * 1024))
+    stopping = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stopping.set())
+
+    while True:
+        report = store.sweep(adopt_after=args.adopt_after or None)
+        logger.info(
+            "Sweep: %d blobs, %.1f MiB; adopted %d, deduplicated %d, evicted %d (%.1f MiB freed), "
+            "dropped %d stale temp files and %d missing entries",
+            len(store), store.total_bytes / 1024 ** 2, report.adopted, report.duplicates,
+            len(report.evicted), report.freed_bytes / 1024 ** 2, report.stale_tmp, report.missing,
+        )
+        if not args.interval or stopping.wait(args.interval):
+            return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
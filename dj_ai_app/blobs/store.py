@@ -0,0 +1,249 @@
+# DJ AI App - Upload Blob Store
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Content-addressed, size-capped storage for uploaded audio
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Callable, List, Optional, Tuple, Union
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    pins INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS blobs_lru ON blobs (pins, last_access);
+"""
+
+# Entries in the root that belong to the store itself, not to loose uploads
+_OWN_ENTRIES = {"sha256", "tmp", "blobs.db", "blobs.db-wal", "blobs.db-shm", ".gitkeep"}
+
+
+@dataclass
+class SweepReport:
+    """What one compaction pass changed."""
+
+    stale_tmp: int = 0
+    missing: int = 0
+    reindexed: int = 0
+    adopted: int = 0
+    duplicates: int = 0
+    evicted: List[str] = field(default_factory=list)
+    freed_bytes: int = 0
+
+
+class BlobStore:
+    """Uploads stored once per SHA-256 at ``<root>/sha256/ab/cd/<hash>``.
+
+    Writes go to ``tmp/`` and are renamed into place, so a blob path never
+    shows a partial file. ``blobs.db`` tracks size, last access and pins;
+    once the store exceeds ``max_bytes`` the least recently used unpinned
+    blobs are deleted. Queued jobs pin their upload until they finish.
+    """
+
+    def __init__(self, root: Union[str, Path], max_bytes: int = 10 * 1024 ** 3, clock: Callable[[], float] = time.time):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self.tmp_dir = self.root / "tmp"
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        (self.root / "sha256").mkdir(exist_ok=True)
+        self.db_path = self.root / "blobs.db"
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def path(self, content_hash: str) -> Path:
+        return self.root / "sha256" / content_hash[:2] / content_hash[2:4] / content_hash
+
+    def contains(self, path: Union[str, Path]) -> bool:
+        """Whether ``path`` points into this store."""
+        try:
+            Path(path).resolve().relative_to((self.root / "sha256").resolve())
+        except ValueError:
+            return False
+        return True
+
+    @property
+    def total_bytes(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+
+    def _commit(self, temp: Path, content_hash: str, size: int, pin: bool) -> Tuple[Path, bool]:
+        """Move a fully written temp file into place unless the content is already stored."""
+        destination = self.path(content_hash)
+        now = self._clock()
+        pins = 1 if pin else 0
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                exists = conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (content_hash,)).fetchone()
+                if exists and destination.exists():
+                    temp.unlink()
+                    conn.execute(
+                        "UPDATE blobs SET last_access = ?, pins = pins + ? WHERE hash = ?", (now, pins, content_hash),
+                    )
+                    created = False
+                else:
+                    destination.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(temp, destination)
+                    # A row without its file (deleted by hand) keeps its pins
+                    conn.execute(
+                        "INSERT INTO blobs (hash, size, created_at, last_access, pins) VALUES (?, ?, ?, ?, ?)"
+                        " ON CONFLICT(hash) DO UPDATE SET size = excluded.size,"
+                        " last_access = excluded.last_access, pins = pins + excluded.pins",
+                        (content_hash, size, now, now, pins),
+                    )
+                    created = True
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        if created:
+            self.evict()
+        return destination, created
+
+    def put_stream(self, source: BinaryIO, pin: bool = False, chunk_size: int = 1024 * 1024) -> Tuple[str, Path, bool]:
+        """Store a stream; returns (sha256, blob path, whether it was new)."""
+        digest = hashlib.sha256()
+        size = 0
+        temp = self.tmp_dir / uuid.uuid4().hex
+        try:
+            with open(temp, "wb") as out:
+                for chunk in iter(lambda: source.read(chunk_size), b""):
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            temp.unlink(missing_ok=True)
+            raise
+        content_hash = digest.hexdigest()
+        path, created = self._commit(temp, content_hash, size, pin)
+        return content_hash, path, created
+
+    def put_bytes(self, data: bytes, pin: bool = False) -> Tuple[str, Path, bool]:
+        temp = self.tmp_dir / uuid.uuid4().hex
+        temp.write_bytes(data)
+        content_hash = hashlib.sha256(data).hexdigest()
+        path, created = self._commit(temp, content_hash, len(data), pin)
+        return content_hash, path, created
+
+    def touch(self, content_hash: str) -> Optional[Path]:
+        """Mark a blob as used and return its path, or None if it is not stored."""
+        with closing(self._connect()) as conn:
+            cursor = conn.execute("UPDATE blobs SET last_access = ? WHERE hash = ?", (self._clock(), content_hash))
+        path = self.path(content_hash)
+        return path if cursor.rowcount and path.exists() else None
+
+    def pin(self, content_hash: str):
+        with closing(self._connect()) as conn:
+            conn.execute("UPDATE blobs SET pins = pins + 1 WHERE hash = ?", (content_hash,))
+
+    def unpin(self, content_hash: str):
+        with closing(self._connect()) as conn:
+            conn.execute("UPDATE blobs SET pins = MAX(pins - 1, 0), last_access = ? WHERE hash = ?", (self._clock(), content_hash))
+
+    def _delete(self, conn: sqlite3.Connection, content_hash: str):
+        conn.execute("DELETE FROM blobs WHERE hash = ?", (content_hash,))
+        self.path(content_hash).unlink(missing_ok=True)
+
+    def evict(self, max_bytes: Optional[int] = None) -> List[str]:
+        """Delete least recently used unpinned blobs until the store fits the budget."""
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        evicted = []
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+                if total > budget:
+                    for row in conn.execute(
+                        "SELECT hash, size FROM blobs WHERE pins = 0 ORDER BY last_access"
+                    ).fetchall():
+                        if total <= budget:
+                            break
+                        self._delete(conn, row["hash"])
+                        total -= row["size"]
+                        evicted.append(row["hash"])
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return evicted
+
+    def _adopt(self, path: Path, report: SweepReport):
+        temp = self.tmp_dir / uuid.uuid4().hex
+        shutil.move(str(path), temp)
+        digest = hashlib.sha256()
+        with open(temp, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        _, created = self._commit(temp, digest.hexdigest(), temp.stat().st_size, pin=False)
+        if created:
+            report.adopted += 1
+        else:
+            report.duplicates += 1
+
+    def sweep(self, adopt_after: Optional[float] = None, tmp_after: float = 3600.0) -> SweepReport:
+        """Compact the store.
+
+        Removes abandoned temp files, forgets index rows whose file is gone,
+        indexes blob files the index lost (crash between rename and insert),
+        folds loose files older than ``adopt_after`` seconds in the root
+        (uploads written before the store existed) into the store, prunes
+        empty fan-out directories and finally enforces the byte budget.
+        """
+        report = SweepReport()
+        now = self._clock()
+        for temp in self.tmp_dir.iterdir():
+            if now - temp.stat().st_mtime > tmp_after:
+                temp.unlink(missing_ok=True)
+                report.stale_tmp += 1
+
+        with closing(self._connect()) as conn:
+            indexed = {row["hash"]: row["size"] for row in conn.execute("SELECT hash, size FROM blobs")}
+            for content_hash in indexed:
+                if not self.path(content_hash).exists():
+                    conn.execute("DELETE FROM blobs WHERE hash = ?", (content_hash,))
+                    report.missing += 1
+            for path in (self.root / "sha256").glob("*/*/*"):
+                if path.is_file() and path.name not in indexed:
+                    stat = path.stat()
+                    conn.execute(
+                        "INSERT OR IGNORE INTO blobs (hash, size, created_at, last_access) VALUES (?, ?, ?, ?)",
+                        (path.name, stat.st_size, stat.st_mtime, stat.st_mtime),
+                    )
+                    report.reindexed += 1
+
+        if adopt_after is not None:
+            for path in self.root.iterdir():
+                if path.name in _OWN_ENTRIES or not path.is_file():
+                    continue
+                if now - path.stat().st_mtime >= adopt_after:
+                    self._adopt(path, report)
+
+        for directory in sorted((self.root / "sha256").glob("*/*"), reverse=True) + sorted((self.root / "sha256").glob("*")):
+            if directory.is_dir() and not any(directory.iterdir()):
+                directory.rmdir()
+
+        before = self.total_bytes
+        report.evicted = self.evict()
+        report.freed_bytes = before - self.total_bytes
+        return report
@@ -0,0 +1,21 @@
+# DJ AI App - WebSocket Broker
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Fan-out service pushing job progress and recommendation updates over WebSockets
+
+"""WebSocket broker: topic subscriptions with bounded, coalescing per-connection queues."""
+
+from .app import create_app, topic_name
+from .config import BrokerSettings
+from .hub import Hub, HubStats, Subscriber
+from .watcher import JobWatcher, job_topic
+
+__all__ = [
+    "BrokerSettings",
+    "Hub",
+    "HubStats",
+    "JobWatcher",
+    "Subscriber",
+    "create_app",
+    "job_topic",
+    "topic_name",
+]
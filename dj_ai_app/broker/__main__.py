@@ -0,0 +1,29 @@
+# DJ AI App - WebSocket Broker Entrypoint
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Run the WebSocket broker with uvicorn (python -m dj_ai_app.broker)
+
+import os
+
+import uvicorn
+
+from .app import create_app
+from .config import BrokerSettings
+
+
+def main():
+    """Start the broker on BROKER_HOST:BROKER_PORT."""
+    settings = BrokerSettings.from_env()
+    # One process: subscriptions and outboxes live in memory
+    uvicorn.run(
+        create_app(settings),
+        host=os.environ.get("BROKER_HOST", "0.0.0.0"),
+        port=int(os.environ.get("BROKER_PORT", "8090")),
+        log_level=os.environ.get("LOG_LEVEL", "INFO").lower(),
+        ws_ping_interval=settings.ping_interval,
+        ws_ping_timeout=settings.ping_timeout,
+        ws_per_message_deflate=settings.per_message_deflate,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+# DJ AI App - WebSocket Broker Application
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: FastAPI app serving /ws subscriptions, the internal /publish endpoint and metrics
+
+import asyncio
+import contextlib
+import hmac
+import json
+import logging
+import resource
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response
+
+from ..gateway.headers import BROKER_SECRET_HEADER
+from ..gateway.metrics import CONTENT_TYPE, MetricsRegistry
+from ..jobs import JobStore
+from .config import BrokerSettings
+from .hub import SLOW_CONSUMER, Hub, Subscriber
+from .watcher import JOB_TOPIC, JobWatcher
+
+logger = logging.getLogger(__name__)
+
+# "Try again later": the client fell behind and may reconnect
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+def topic_name(name: Any) -> str:
+    """Subscription name as a topic; a bare job id (the original /ws protocol) means ``job:<id>``."""
+    name = str(name)
+    return name if ":" in name else f"{JOB_TOPIC}{name}"
+
+
+def _process_stats() -> Dict[str, float]:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    stats = {"cpu": usage.ru_utime + usage.ru_stime, "max_rss": usage.ru_maxrss * 1024.0}
+    with contextlib.suppress(OSError, ValueError, IndexError):
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        stats["rss"] = pages * resource.getpagesize()
+    stats.setdefault("rss", stats["max_rss"])
+    return stats
+
+
+def _register_metrics(app: FastAPI) -> MetricsRegistry:
+    """Hub counters and the process's own CPU and memory."""
+    registry = MetricsRegistry()
+    hub: Hub = app.state.hub
+    registry.gauge("dj_broker_connections", "Open WebSocket connections", lambda: len(hub.subscribers))
+    registry.gauge("dj_broker_topics", "Topics with at least one subscriber", lambda: len(hub.topics))
+    registry.gauge("dj_broker_subscriptions", "Subscriptions over all connections", hub.subscription_count)
+    registry.gauge("dj_broker_retained_messages", "Topics with a retained last message", lambda: len(hub.retained))
+    registry.gauge("dj_broker_queued_messages", "Messages waiting in connection outboxes",
+                   lambda: sum(len(s) for s in hub.subscribers))
+    registry.counter("dj_broker_connections_total", "WebSocket connections accepted", lambda: hub.stats.connections)
+    registry.counter("dj_broker_published_total", "Messages published to topics", lambda: hub.stats.published)
+    registry.counter("dj_broker_delivered_total", "Messages queued for a subscriber", lambda: hub.stats.delivered)
+    registry.counter("dj_broker_coalesced_total", "Queued messages replaced by a newer one with the same key",
+                     lambda: hub.stats.coalesced)
+    registry.counter("dj_broker_dropped_total", "Messages dropped with a slow consumer", lambda: hub.stats.dropped)
+    registry.counter("dj_broker_slow_disconnects_total", "Connections closed as slow consumers",
+                     lambda: hub.stats.slow_disconnects)
+    registry.counter("dj_broker_process_cpu_seconds_total", "User and system CPU time of the broker",
+                     lambda: _process_stats()["cpu"])
+    registry.gauge("dj_broker_process_resident_memory_bytes", "Resident memory of the broker",
+                   lambda: _process_stats()["rss"])
+    return registry
+
+
+def _events(body: Any) -> List[Dict[str, Any]]:
+    events = body if isinstance(body, list) else [body]
+    for event in events:
+        if not isinstance(event, dict) or not isinstance(event.get("topic"), str) \
+                or not isinstance(event.get("message"), dict):
+            raise HTTPException(status_code=400, detail='Expected {"topic": str, "message": object} or a list of them')
+        if not isinstance(event.get("key"), (str, type(None))):
+            raise HTTPException(status_code=400, detail='"key" must be a string or null')
+    return events
+
+
+def _topic_names(value: Any) -> Optional[List[str]]:
+    """A subscribe/unsubscribe field as a list of names; None if it is not a list of strings."""
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(name, str) for name in value):
+        return None
+    return value
+
+
+def create_app(settings: Optional[BrokerSettings] = None) -> FastAPI:
+    """Create the broker; the job watcher runs for as long as the app does."""
+    settings = settings or BrokerSettings.from_env()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        task = None
+        if settings.jobs_dir:
+            app.state.watcher = JobWatcher(app.state.hub, JobStore(settings.jobs_dir), settings.poll_interval)
+            task = asyncio.create_task(app.state.watcher.run())
+        try:
+            yield
+        finally:
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+
+    app = FastAPI(title="DJ AI Broker", lifespan=lifespan, docs_url=None, redoc_url=None, openapi_url=None)
+    app.state.settings = settings
+    app.state.hub = Hub(max_retained=settings.max_retained)
+    app.state.watcher = None
+    app.state.metrics = _register_metrics(app)
+
+    def handle(subscriber: Subscriber, message: Any):
+        hub: Hub = app.state.hub
+        if not isinstance(message, dict):
+            return
+        unsubscribe, subscribe = _topic_names(message.get("unsubscribe")), _topic_names(message.get("subscribe"))
+        if unsubscribe is None or subscribe is None:
+            subscriber.offer(json.dumps({"type": "error", "detail": "Expected lists of topic names"}))
+            return
+        for name in unsubscribe:
+            hub.unsubscribe(subscriber, topic_name(name))
+        for name in subscribe:
+            if len(subscriber.topics) >= settings.max_subscriptions:
+                subscriber.offer(json.dumps({"type": "error", "detail": "Too many subscriptions"}))
+                break
+            hub.subscribe(subscriber, topic_name(name))
+
+    @app.websocket("/ws")
+    async def updates(websocket: WebSocket):
+        """Push topic messages to clients that send {"subscribe": [topic, ...]}."""
+        await websocket.accept()
+        hub: Hub = app.state.hub
+        subscriber = hub.connect(settings.queue_size)
+
+        async def receive():
+            while True:
+                text = await websocket.receive_text()
+                try:
+                    handle(subscriber, json.loads(text))
+                except ValueError:
+                    continue
+
+        async def pump():
+            while not subscriber.closed:
+                await subscriber.wait()
+                for text in subscriber.drain():
+                    try:
+                        await asyncio.wait_for(websocket.send_text(text), settings.send_timeout)
+                    except asyncio.TimeoutError:
+                        hub.drop_slow(subscriber)
+                        break
+
+        receiver = asyncio.ensure_future(receive())
+        sender = asyncio.ensure_future(pump())
+        try:
+            await asyncio.wait({receiver, sender}, return_when=asyncio.FIRST_COMPLETED)
+            if subscriber.closed == SLOW_CONSUMER:
+                logger.info("Dropping slow WebSocket consumer %s", subscriber.id)
+                with contextlib.suppress(Exception):
+                    await asyncio.wait_for(
+                        websocket.close(code=SLOW_CONSUMER_CLOSE_CODE, reason=SLOW_CONSUMER), settings.send_timeout,
+                    )
+            for task in (receiver, sender):
+                if task.done() and not task.cancelled() and not isinstance(task.exception(), WebSocketDisconnect):
+                    task.result()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            receiver.cancel()
+            sender.cancel()
+            hub.remove(subscriber)
+
+    @app.post("/publish")
+    async def publish(request: Request):
+        """Internal: fan out {"topic", "message", "key"?, "retain"?} (or a list) to subscribers."""
+        if not settings.publish_secret:
+            raise HTTPException(status_code=404, detail="Publishing needs BROKER_PUBLISH_SECRET")
+        if not hmac.compare_digest(request.headers.get(BROKER_SECRET_HEADER, ""), settings.publish_secret):
+            raise HTTPException(status_code=403, detail="Invalid broker secret")
+        try:
+            body = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be JSON")
+        hub: Hub = app.state.hub
+        delivered = 0
+        for event in _events(body):
+            delivered += hub.publish(
+                event["topic"], event["message"], key=event.get("key"), retain=bool(event.get("retain")),
+            )
+        return {"delivered": delivered}
+
+    @app.get("/metrics")
+    async def metrics():
+        return Response(content=app.state.metrics.render(), media_type=CONTENT_TYPE)
+
+    @app.get("/health")
+    async def health():
+        hub: Hub = app.state.hub
+        return {"status": "healthy", "connections": len(hub.subscribers), "topics": len(hub.topics)}
+
+    return app
@@ -0,0 +1,49 @@
+# DJ AI App - WebSocket Broker Configuration
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Environment-driven limits for the WebSocket fan-out service
+
+import os
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+from ..env import env_bool, env_float, env_int
+
+
+@dataclass
+class BrokerSettings:
+    """Runtime settings for the dj-ai-broker service."""
+
+    # Job queue whose progress is pushed to "job:<id>" subscribers ("" disables it)
+    jobs_dir: str = "data/jobs"
+    poll_interval: float = 0.5
+    # Messages waiting for one connection; a client this far behind is disconnected
+    queue_size: int = 256
+    # A single send slower than this also marks the client as a slow consumer
+    send_timeout: float = 5.0
+    max_subscriptions: int = 1000
+    # Last message of each topic, sent to new subscribers
+    max_retained: int = 10000
+    # Server-level WebSocket options passed to uvicorn
+    ping_interval: float = 30.0
+    ping_timeout: float = 30.0
+    # Messages are small JSON; a zlib context per connection costs more memory and CPU than it saves
+    per_message_deflate: bool = False
+    # Shared secret publishers must send (X-Broker-Secret); "" disables POST /publish
+    publish_secret: str = ""
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "BrokerSettings":
+        """Build settings from BROKER_* environment variables."""
+        environ = os.environ if environ is None else environ
+        return cls(
+            jobs_dir=environ.get("BROKER_JOBS_DIR", cls.jobs_dir),
+            poll_interval=env_float(environ, "BROKER_POLL_INTERVAL", cls.poll_interval),
+            queue_size=env_int(environ, "BROKER_QUEUE_SIZE", cls.queue_size),
+            send_timeout=env_float(environ, "BROKER_SEND_TIMEOUT", cls.send_timeout),
+            max_subscriptions=env_int(environ, "BROKER_MAX_SUBSCRIPTIONS", cls.max_subscriptions),
+            max_retained=env_int(environ, "BROKER_MAX_RETAINED", cls.max_retained),
+            ping_interval=env_float(environ, "BROKER_PING_INTERVAL", cls.ping_interval),
+            ping_timeout=env_float(environ, "BROKER_PING_TIMEOUT", cls.ping_timeout),
+            per_message_deflate=env_bool(environ, "BROKER_PER_MESSAGE_DEFLATE", cls.per_message_deflate),
+            publish_secret=environ.get("BROKER_PUBLISH_SECRET", cls.publish_secret),
+        )
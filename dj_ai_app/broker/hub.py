@@ -0,0 +1,180 @@
+# DJ AI App - WebSocket Fan-out Hub
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Topic fan-out with bounded, coalescing per-connection queues and slow-consumer dropping
+
+import asyncio
+import itertools
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set
+
+SLOW_CONSUMER = "slow consumer"
+
+
+@dataclass
+class HubStats:
+    """Counters since start; messages are counted once per subscriber."""
+
+    connections: int = 0
+    published: int = 0
+    delivered: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    slow_disconnects: int = 0
+
+
+class Subscriber:
+    """One connection's outbox: at most ``limit`` messages waiting to be sent.
+
+    A message with a key replaces the one with the same key that is still
+    waiting (a newer progress value makes the older one useless), keeping
+    its place in the queue. A client that still lets the queue fill up is a
+    slow consumer: it is closed and its pending messages are dropped, so it
+    never holds memory or delays anyone else.
+    """
+
+    _ids = itertools.count()
+
+    def __init__(self, limit: int = 256):
+        self.id = next(self._ids)
+        self.limit = limit
+        self.topics: Set[str] = set()
+        self.closed: Optional[str] = None
+        self._outbox: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._serial = itertools.count()
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._outbox)
+
+    def offer(self, text: str, key: Optional[Hashable] = None) -> str:
+        """Queue ``text``: "queued", "coalesced", "overflow" or "closed"."""
+        if self.closed:
+            return "closed"
+        if key is not None and key in self._outbox:
+            self._outbox[key] = text
+            return "coalesced"
+        if len(self._outbox) >= self.limit:
+            self.close(SLOW_CONSUMER)
+            return "overflow"
+        self._outbox[next(self._serial) if key is None else key] = text
+        self._ready.set()
+        return "queued"
+
+    def drain(self) -> List[str]:
+        """Everything waiting, oldest first; the outbox is empty afterwards."""
+        messages = list(self._outbox.values())
+        self._outbox.clear()
+        self._ready.clear()
+        return messages
+
+    async def wait(self):
+        """Until there is something to send or the subscriber is closed."""
+        await self._ready.wait()
+
+    def close(self, reason: str):
+        if not self.closed:
+            self.closed = reason
+            self._outbox.clear()
+            self._ready.set()
+
+
+class Hub:
+    """Topics and their subscribers, plus the last retained message of each topic.
+
+    :meth:`publish` serializes a message once and only appends the text to
+    the subscribers' outboxes, so a publish never waits for a socket.
+    """
+
+    def __init__(self, max_retained: int = 10000):
+        self.topics: Dict[str, Set[Subscriber]] = {}
+        self.subscribers: Set[Subscriber] = set()
+        self.max_retained = max_retained
+        # topic -> (text, key)
+        self.retained: "OrderedDict[str, tuple]" = OrderedDict()
+        self.stats = HubStats()
+
+    def connect(self, limit: int = 256) -> Subscriber:
+        subscriber = Subscriber(limit)
+        self.subscribers.add(subscriber)
+        self.stats.connections += 1
+        return subscriber
+
+    def remove(self, subscriber: Subscriber):
+        """Forget a subscriber (disconnected or dropped) and all its subscriptions."""
+        for topic in list(subscriber.topics):
+            self.unsubscribe(subscriber, topic)
+        self.subscribers.discard(subscriber)
+
+    def subscribe(self, subscriber: Subscriber, topic: str):
+        """Add a subscription; a retained message is queued for it straight away."""
+        if topic in subscriber.topics:
+            return
+        subscriber.topics.add(topic)
+        self.topics.setdefault(topic, set()).add(subscriber)
+        retained = self.retained.get(topic)
+        if retained is not None:
+            self.retained.move_to_end(topic)
+            self._deliver([subscriber], *retained)
+
+    def unsubscribe(self, subscriber: Subscriber, topic: str):
+        subscriber.topics.discard(topic)
+        subscribers = self.topics.get(topic)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self.topics[topic]
+
+    def close_topic(self, topic: str):
+        """Drop every subscription to ``topic`` (e.g. an unknown job)."""
+        for subscriber in list(self.topics.get(topic, ())):
+            self.unsubscribe(subscriber, topic)
+        self.retained.pop(topic, None)
+
+    def publish(self, topic: str, message: Dict[str, Any], key: Optional[Hashable] = None, retain: bool = False) -> int:
+        """Queue ``message`` for every subscriber of ``topic``; returns how many got it.
+
+        Messages with the same ``key`` coalesce while waiting in an outbox.
+        With ``retain`` the message is also kept for later subscribers.
+        """
+        text = json.dumps({"topic": topic, **message}, separators=(",", ":"), default=str)
+        key = None if key is None else (topic, key)
+        self.stats.published += 1
+        if retain:
+            self.retained[topic] = (text, key)
+            self.retained.move_to_end(topic)
+            while len(self.retained) > self.max_retained:
+                self.retained.popitem(last=False)
+        return self._deliver(self.topics.get(topic, ()), text, key)
+
+    def _deliver(self, subscribers: Iterable[Subscriber], text: str, key: Optional[Hashable]) -> int:
+        delivered = 0
+        slow = []
+        for subscriber in subscribers:
+            pending = len(subscriber)
+            outcome = subscriber.offer(text, key)
+            if outcome == "queued":
+                delivered += 1
+            elif outcome == "coalesced":
+                delivered += 1
+                self.stats.coalesced += 1
+            elif outcome == "overflow":
+                self.stats.dropped += pending + 1
+                self.stats.slow_disconnects += 1
+                slow.append(subscriber)
+        self.stats.delivered += delivered
+        for subscriber in slow:
+            self.remove(subscriber)
+        return delivered
+
+    def drop_slow(self, subscriber: Subscriber):
+        """A send timed out: close the subscriber as a slow consumer."""
+        if not subscriber.closed:
+            self.stats.dropped += len(subscriber)
+            self.stats.slow_disconnects += 1
+            subscriber.close(SLOW_CONSUMER)
+        self.remove(subscriber)
+
+    def subscription_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self.topics.values())
@@ -0,0 +1,94 @@
+# DJ AI App - Job Progress Watcher
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Publish job progress and completion to "job:<id>" topics from one batched poll
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from ..jobs import Job, JobStore
+from .hub import Hub
+
+logger = logging.getLogger(__name__)
+
+JOB_TOPIC = "job:"
+# SQLite allows 999 bound parameters in older builds
+POLL_CHUNK = 500
+
+
+def job_topic(job_id: str) -> str:
+    return f"{JOB_TOPIC}{job_id}"
+
+
+class JobWatcher:
+    """Polls the job queue for every subscribed job at once, however many clients watch.
+
+    One query per interval covers all ``job:<id>`` topics; a change of
+    status, stage or progress is published (retained, and coalesced per job)
+    and a finished job is not polled again.
+    """
+
+    def __init__(self, hub: Hub, store: JobStore, interval: float = 0.5):
+        self.hub = hub
+        self.store = store
+        self.interval = interval
+        self.states: Dict[str, Tuple] = {}
+        # Finished jobs whose final event is retained by the hub
+        self.finished: "OrderedDict[str, None]" = OrderedDict()
+
+    def watched(self) -> List[str]:
+        ids = []
+        for topic in self.hub.topics:
+            if topic.startswith(JOB_TOPIC):
+                job_id = topic[len(JOB_TOPIC):]
+                if job_id not in self.finished or topic not in self.hub.retained:
+                    ids.append(job_id)
+        return ids
+
+    def fetch(self, ids: List[str]) -> List[Job]:
+        """The watched jobs that exist, in chunks of :data:`POLL_CHUNK` ids."""
+        jobs = []
+        for start in range(0, len(ids), POLL_CHUNK):
+            jobs.extend(self.store.get_many(ids[start:start + POLL_CHUNK]))
+        return jobs
+
+    def apply(self, ids: List[str], jobs: List[Job]) -> int:
+        """Publish what changed since the last poll; returns how many events were published."""
+        for job_id in self.states.keys() - set(ids):
+            del self.states[job_id]
+        published = 0
+        for job_id in set(ids) - {job.id for job in jobs}:
+            self.hub.publish(job_topic(job_id), {"type": "job", "job_id": job_id, "status": "unknown"})
+            self.hub.close_topic(job_topic(job_id))
+            self.states.pop(job_id, None)
+            published += 1
+        for job in jobs:
+            state = (job.status, job.stage, job.progress)
+            if state != self.states.get(job.id):
+                self.states[job.id] = state
+                self.hub.publish(job_topic(job.id), job.to_event(), key=("job", job.id), retain=True)
+                published += 1
+            if job.finished:
+                self.states.pop(job.id, None)
+                self.finished[job.id] = None
+                self.finished.move_to_end(job.id)
+                while len(self.finished) > self.hub.max_retained:
+                    self.finished.popitem(last=False)
+        return published
+
+    def poll(self) -> int:
+        """One synchronous poll (tests and tools)."""
+        ids = self.watched()
+        return self.apply(ids, self.fetch(ids))
+
+    async def run(self):
+        while True:
+            try:
+                ids = self.watched()
+                if ids:
+                    # The query runs in a thread; publishing stays on the event loop
+                    self.apply(ids, await asyncio.to_thread(self.fetch, ids))
+            except Exception as exc:
+                logger.warning("Job poll failed: %s", exc)
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,18 @@
+# DJ AI App - HTTP Cassettes
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Record real stack interactions once and replay them offline in tests
+
+"""Record/replay of HTTP interactions for the integration and e2e suites."""
+
+from .cassette import MODES, Cassette, CassetteMiss, Interaction, cassette_path, normalize_url
+from .patching import use_cassette
+
+__all__ = [
+    "Cassette",
+    "CassetteMiss",
+    "Interaction",
+    "MODES",
+    "cassette_path",
+    "normalize_url",
+    "use_cassette",
+]
@@ -0,0 +1,26 @@
+# DJ AI App - Cassette Inspector
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: List what a recorded cassette contains (python -m dj_ai_app.cassette)
+
+import argparse
+import sys
+
+from .cassette import Cassette
+
+
+def main(argv=None) -> int:
+    """Print one line per recorded interaction of each cassette."""
+    parser = argparse.ArgumentParser(description="Show the interactions recorded in cassette files")
+    parser.add_argument("cassettes", nargs="+", help="*.json.gz cassette files")
+    args = parser.parse_args(argv)
+
+    for path in args.cassettes:
+        cassette = Cassette(path, mode="replay")
+        print(f"{path} ({len(cassette.interactions)} interactions)")
+        for line in cassette.summary():
+            print(f"  {line}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+# DJ AI App - HTTP Cassettes
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Recorded HTTP interactions stored as compact gzip JSON, matched for replay
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+FORMAT_VERSION = 1
+MODES = ("record", "replay", "once")
+
+# Never written to cassette files
+REDACTED_HEADERS = ("authorization", "cookie", "proxy-authorization", "set-cookie")
+REDACTED = "<redacted>"
+
+
+class CassetteMiss(LookupError):
+    """A replayed request has no recorded interaction."""
+
+
+def normalize_url(url: str) -> str:
+    """URL with a lower-case host and sorted query, so equivalent requests match."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+def body_digest(body: Union[bytes, str, None]) -> Optional[str]:
+    if body is None:
+        return None
+    if isinstance(body, str):
+        body = body.encode()
+    return hashlib.sha256(body).hexdigest()
+
+
+def _redact(headers: Mapping[str, str]) -> Dict[str, str]:
+    return {k: (REDACTED if k.lower() in REDACTED_HEADERS else str(v)) for k, v in headers.items()}
+
+
+@dataclass
+class Interaction:
+    """One request and what came back: a response or a client-side error.
+
+    Request bodies are kept as a digest and size only (uploads can be
+    large); response bodies are kept whole, as text when they decode as
+    UTF-8 and base64 otherwise.
+    """
+
+    method: str
+    url: str
+    request_headers: Dict[str, str] = field(default_factory=dict)
+    request_body_sha256: Optional[str] = None
+    request_body_size: int = 0
+    status: int = 0
+    reason: str = ""
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: Optional[str] = None
+    body_b64: Optional[str] = None
+    elapsed: float = 0.0
+    # Exception class name (e.g. "ReadTimeout") when the request failed
+    error: Optional[str] = None
+
+    @classmethod
+    def from_exchange(
+        cls, method: str, url: str, request_headers: Mapping[str, str], request_body: Union[bytes, str, None],
+        status: int, reason: str, headers: Mapping[str, str], content: bytes, elapsed: float,
+    ) -> "Interaction":
+        interaction = cls(
+            method=method.upper(), url=url, request_headers=_redact(request_headers),
+            request_body_sha256=body_digest(request_body), request_body_size=len(request_body or b""),
+            status=status, reason=reason, headers=_redact(headers), elapsed=round(elapsed, 6),
+        )
+        try:
+            interaction.body = content.decode("utf-8")
+        except UnicodeDecodeError:
+            interaction.body_b64 = base64.b64encode(content).decode("ascii")
+        return interaction
+
+    @property
+    def content(self) -> bytes:
+        if self.body_b64 is not None:
+            return base64.b64decode(self.body_b64)
+        return (self.body or "").encode("utf-8")
+
+    def key(self, match_body: bool) -> Tuple[str, ...]:
+        key = (self.method, normalize_url(self.url))
+        return key + (self.request_body_sha256 or "",) if match_body else key
+
+    def to_dict(self) -> dict:
+        # Leave out empty fields to keep cassettes small and diffs readable
+        return {k: v for k, v in asdict(self).items() if v not in (None, "", {}, 0) or k == "status"}
+
+
+class Cassette:
+    """Interactions of one test, recorded or replayed.
+
+    Requests are matched on method and normalised URL (plus the body digest
+    with ``match_body``). Repeated identical requests replay in recorded
+    order; once a key's recordings are used up the last one repeats, so
+    polling loops replay without recording every poll.
+    """
+
+    def __init__(self, path: Union[str, Path], mode: str = "once", match_body: bool = False):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.path = Path(path)
+        if mode == "once":
+            mode = "replay" if self.path.exists() else "record"
+        self.mode = mode
+        self.match_body = match_body
+        self.interactions: List[Interaction] = []
+        self._queues: Dict[Tuple[str, ...], List[Interaction]] = {}
+        self._played: Dict[Tuple[str, ...], int] = {}
+        self._lock = threading.Lock()
+        if self.replaying and self.path.exists():
+            self.load()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{self.path} has cassette format {data.get('version')}, expected {FORMAT_VERSION}")
+        self.interactions = [Interaction(**entry) for entry in data["interactions"]]
+        self._queues = {}
+        for interaction in self.interactions:
+            self._queues.setdefault(interaction.key(self.match_body), []).append(interaction)
+        self._played = {}
+
+    def save(self):
+        """Write atomically; gzip without a timestamp so identical recordings give identical files."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(
+            {"version": FORMAT_VERSION, "interactions": [i.to_dict() for i in self.interactions]},
+            separators=(",", ":"), sort_keys=True,
+        ).encode("utf-8")
+        temp = self.path.with_name(self.path.name + ".tmp")
+        with open(temp, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+            f.write(payload)
+        os.replace(temp, self.path)
+
+    def record(self, interaction: Interaction):
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def play(self, method: str, url: str, body: Union[bytes, str, None] = None) -> Interaction:
+        """The recorded interaction for a request; raises :class:`CassetteMiss` if there is none.
+
+        A cassette that was never recorded replays as empty, so tests that
+        make no requests need no file.
+        """
+        key = (method.upper(), normalize_url(url))
+        if self.match_body:
+            key += (body_digest(body) or "",)
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                missing = "" if self.path.exists() else " (cassette not recorded yet)"
+                raise CassetteMiss(f"No recorded {method.upper()} {url} in {self.path}{missing}")
+            position = self._played.get(key, 0)
+            self._played[key] = position + 1
+            return queue[min(position, len(queue) - 1)]
+
+    def summary(self) -> List[str]:
+        lines = []
+        for i in self.interactions:
+            outcome = i.error or f"{i.status} {i.reason}".strip()
+            lines.append(f"{i.method:<7} {i.url}  ->  {outcome}  {i.elapsed * 1000:.1f} ms  {len(i.content)} B")
+        return lines
+
+
+def replay_delay(interaction: Interaction, speed: float) -> float:
+    """Seconds to wait before replaying, ``speed`` times faster than recorded (0 for no delay)."""
+    return interaction.elapsed / speed if speed > 0 else 0.0
+
+
+def sleep_for(interaction: Interaction, speed: float, sleep=time.sleep):
+    delay = replay_delay(interaction, speed)
+    if delay > 0:
+        sleep(delay)
+
+
+def cassette_path(root: Union[str, Path], parts: Sequence[str]) -> Path:
+    """``root/part/.../last.json.gz`` with characters unsafe in file names replaced."""
+    safe = ["".join(c if c.isalnum() or c in "-_." else "_" for c in part) for part in parts]
+    return Path(root).joinpath(*safe[:-1], safe[-1] + ".json.gz")
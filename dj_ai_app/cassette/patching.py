@@ -0,0 +1,108 @@
+# DJ AI App - Cassette Patching
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Record or replay every requests call through the active cassette
+
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .cassette import Cassette, Interaction, sleep_for
+
+# Client-side failures that are recorded and raised again on replay
+RECORDED_ERRORS = {
+    cls.__name__: cls
+    for cls in (
+        requests.exceptions.ConnectTimeout,
+        requests.exceptions.ReadTimeout,
+        requests.exceptions.Timeout,
+        requests.exceptions.SSLError,
+        requests.exceptions.ConnectionError,
+    )
+}
+
+_stack: List["_Active"] = []
+_stack_lock = threading.Lock()
+_original_send = HTTPAdapter.send
+
+
+class _Active:
+    def __init__(self, cassette: Cassette, speed: float):
+        self.cassette = cassette
+        self.speed = speed
+
+
+def _build_response(adapter: HTTPAdapter, request: requests.PreparedRequest, interaction: Interaction) -> requests.Response:
+    response = requests.Response()
+    response.status_code = interaction.status
+    response.reason = interaction.reason
+    response.headers = CaseInsensitiveDict(interaction.headers)
+    response._content = interaction.content
+    response._content_consumed = True
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = request.url
+    response.request = request
+    response.connection = adapter
+    response.elapsed = timedelta(seconds=interaction.elapsed)
+    return response
+
+
+def _send(adapter: HTTPAdapter, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+    active: Optional[_Active] = _stack[-1] if _stack else None
+    if active is None:
+        return _original_send(adapter, request, **kwargs)
+    cassette = active.cassette
+
+    if cassette.replaying:
+        interaction = cassette.play(request.method, request.url, request.body)
+        sleep_for(interaction, active.speed)
+        if interaction.error:
+            raise RECORDED_ERRORS.get(interaction.error, requests.exceptions.ConnectionError)(
+                f"{interaction.error} (replayed from {cassette.path.name})", request=request,
+            )
+        return _build_response(adapter, request, interaction)
+
+    started = time.monotonic()
+    try:
+        response = _original_send(adapter, request, **kwargs)
+        content = response.content
+    except requests.exceptions.RequestException as exc:
+        interaction = Interaction.from_exchange(
+            request.method, request.url, request.headers, request.body, 0, "", {}, b"", time.monotonic() - started,
+        )
+        interaction.error = next((name for name, cls in RECORDED_ERRORS.items() if type(exc) is cls), "ConnectionError")
+        cassette.record(interaction)
+        raise
+    cassette.record(Interaction.from_exchange(
+        request.method, request.url, request.headers, request.body,
+        response.status_code, response.reason or "", response.headers, content, time.monotonic() - started,
+    ))
+    return response
+
+
+@contextmanager
+def use_cassette(cassette: Cassette, speed: float = 0.0) -> Iterator[Cassette]:
+    """Route every ``requests`` call (module functions and sessions alike) through ``cassette``.
+
+    Replay returns instantly unless ``speed`` is set: ``1.0`` waits the
+    recorded latency, ``2.0`` half of it. Cassettes nest; the innermost
+    one is used. A recording cassette is saved on exit if anything was recorded.
+    """
+    with _stack_lock:
+        _stack.append(_Active(cassette, speed))
+        HTTPAdapter.send = _send
+    try:
+        yield cassette
+    finally:
+        with _stack_lock:
+            _stack.pop()
+            if not _stack:
+                HTTPAdapter.send = _original_send
+        if cassette.recording and cassette.interactions:
+            cassette.save()
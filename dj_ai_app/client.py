@@ -0,0 +1,128 @@
+# DJ AI App - Python Client
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Client tooling for scripts and bulk ingestion against the DJ AI API
+
+import hashlib
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import requests
+
+from .gateway.headers import CONTENT_HASH_HEADER, PRIORITY_HEADER, TENANT_HEADER
+
+DEFAULT_BASE_URL = "http://localhost/api"
+
+
+def file_sha256(path: Union[str, Path], chunk_size: int = 1024 * 1024) -> str:
+    """Hash a file in chunks without loading it into memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Statuses the gateway and nginx use to ask clients to back off
+RETRYABLE_STATUSES = (429, 503)
+
+
+def retry_after_seconds(response: requests.Response, default: float = 1.0) -> float:
+    """Read Retry-After (delta seconds) from a shed response."""
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", default)))
+    except ValueError:
+        return default
+
+
+class DJAIClient:
+    """Thin HTTP client for the DJ AI API, routed through the gateway.
+
+    Responses shed by admission control (503/429) are retried after the
+    server's Retry-After, up to ``max_retries`` times and never sleeping
+    longer than ``max_retry_wait`` in total.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        session: Optional[requests.Session] = None,
+        timeout: float = 600.0,
+        priority: Optional[str] = None,
+        tenant: Optional[str] = None,
+        max_retries: int = 3,
+        max_retry_wait: float = 120.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_retry_wait = max_retry_wait
+        # Bulk ingestion passes priority="bulk" so it never delays the DJ UI
+        if priority:
+            self.session.headers[PRIORITY_HEADER] = priority
+        if tenant:
+            self.session.headers[TENANT_HEADER] = tenant
+
+    def _url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _send(self, method: str, path: str, upload: Optional[Path] = None, **kwargs) -> requests.Response:
+        """Send a request, backing off while the server sheds load."""
+        waited = 0.0
+        for attempt in range(self.max_retries + 1):
+            if upload is None:
+                response = self.session.request(method, self._url(path), timeout=self.timeout, **kwargs)
+            else:
+                # Reopen the file on every attempt so retries resend it from the start
+                with open(upload, "rb") as f:
+                    response = self.session.request(
+                        method, self._url(path), files={"file": (upload.name, f)}, timeout=self.timeout, **kwargs
+                    )
+            if response.status_code not in RETRYABLE_STATUSES or attempt == self.max_retries:
+                break
+            delay = retry_after_seconds(response)
+            if waited + delay > self.max_retry_wait:
+                break
+            time.sleep(delay)
+            waited += delay
+        response.raise_for_status()
+        return response
+
+    def _get_json(self, path: str) -> dict:
+        return self._send("GET", path).json()
+
+    def health(self) -> dict:
+        """Return the backend health payload."""
+        return self._get_json("/health")
+
+    def supported_formats(self) -> dict:
+        """Return the audio formats accepted by /analyze-track."""
+        return self._get_json("/supported-formats")
+
+    def analyze_track(self, path: Union[str, Path]) -> dict:
+        """Upload a track for analysis, announcing its SHA-256 so repeats hit the cache."""
+        path = Path(path)
+        headers = {CONTENT_HASH_HEADER: file_sha256(path)}
+        return self._send("POST", "/analyze-track", upload=path, headers=headers).json()
+
+    def submit_analysis(self, path: Union[str, Path]) -> dict:
+        """Queue a track for asynchronous analysis and return the job handle."""
+        path = Path(path)
+        headers = {CONTENT_HASH_HEADER: file_sha256(path)}
+        return self._send("POST", "/jobs/analyze-track", upload=path, headers=headers).json()
+
+    def get_job(self, job_id: str) -> dict:
+        """Return the current status of an analysis job."""
+        return self._get_json(f"/jobs/{job_id}")
+
+    def wait_for_job(self, job_id: str, poll_interval: float = 1.0, timeout: Optional[float] = None) -> dict:
+        """Poll a job until it is done or failed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get_job(job_id)
+            if job["status"] in ("done", "failed"):
+                return job
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Job {job_id} did not finish within {timeout} seconds")
+            time.sleep(poll_interval)
@@ -0,0 +1,33 @@
+# DJ AI App - Environment Helpers
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Typed reads of service settings from environment variables
+
+from typing import Mapping
+
+
+def env_float(environ: Mapping[str, str], name: str, default: float) -> float:
+    """Read a float from the environment, falling back to a default."""
+    value = environ.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Environment variable {name} must be a number, got {value!r}")
+
+
+def env_int(environ: Mapping[str, str], name: str, default: int) -> int:
+    """Read an integer from the environment, falling back to a default."""
+    return int(env_float(environ, name, default))
+
+
+def env_bool(environ: Mapping[str, str], name: str, default: bool) -> bool:
+    """Read a true/false flag (1/0, yes/no, on/off) from the environment."""
+    value = environ.get(name, "").strip().lower()
+    if value == "":
+        return default
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"Environment variable {name} must be true or false, got {value!r}")
@@ -0,0 +1,21 @@
+# DJ AI App - Metrics Exporter
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Prometheus-format metrics for the whole compose stack, collected locally
+
+"""Stack-wide metrics exporter: nginx, container cgroups and the gateway."""
+
+from .app import create_app
+from .config import ExporterSettings
+from .containers import ContainerStats, collect_stats, parse_stats
+from .nginx import AccessLogTail, nginx_route, parse_stub_status
+
+__all__ = [
+    "AccessLogTail",
+    "ContainerStats",
+    "ExporterSettings",
+    "collect_stats",
+    "create_app",
+    "nginx_route",
+    "parse_stats",
+    "parse_stub_status",
+]
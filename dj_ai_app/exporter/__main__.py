@@ -0,0 +1,25 @@
+# DJ AI App - Metrics Exporter Entrypoint
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Run the metrics exporter with uvicorn (python -m dj_ai_app.exporter)
+
+import os
+
+import uvicorn
+
+from .app import create_app
+from .config import ExporterSettings
+
+
+def main():
+    """Start the exporter on EXPORTER_HOST:EXPORTER_PORT."""
+    # One process: histograms built from the access log live in memory
+    uvicorn.run(
+        create_app(ExporterSettings.from_env()),
+        host=os.environ.get("EXPORTER_HOST", "0.0.0.0"),
+        port=int(os.environ.get("EXPORTER_PORT", "9400")),
+        log_level=os.environ.get("LOG_LEVEL", "INFO").lower(),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# DJ AI App - Metrics Exporter Application
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: One Prometheus endpoint for nginx, container and gateway metrics
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+from ..gateway.metrics import CONTENT_TYPE, MetricsRegistry, RouteLabels
+from ..waterfall import parse_upstream_time
+from .config import ExporterSettings
+from .containers import collect_stats
+from .nginx import AccessLogTail, nginx_route, parse_stub_status
+
+NGINX_CONNECTION_STATES = ("active", "reading", "writing", "waiting")
+
+
+def _register_metrics(app: FastAPI) -> MetricsRegistry:
+    """Metrics backed by the snapshots each scrape stores on ``app.state``."""
+    registry = MetricsRegistry()
+    registry.gauge("dj_exporter_up", "Whether the last scrape of a source succeeded", lambda: app.state.up, label="source")
+    registry.gauge("dj_exporter_scrape_seconds", "Time the last scrape took", lambda: app.state.scrape_seconds)
+
+    def nginx(field: str):
+        return lambda: app.state.nginx.get(field, 0)
+
+    registry.gauge(
+        "dj_nginx_connections", "Client connections by state",
+        lambda: {state: app.state.nginx.get(state, 0) for state in NGINX_CONNECTION_STATES}, label="state",
+    )
+    registry.counter("dj_nginx_connections_accepted_total", "Accepted client connections", nginx("accepted"))
+    registry.counter("dj_nginx_connections_handled_total", "Handled client connections", nginx("handled"))
+    registry.counter("dj_nginx_http_requests_total", "Client requests (stub_status)", nginx("requests"))
+
+    registry.histogram("dj_nginx_request_duration_seconds", "Request time seen by nginx by route and method")
+    registry.histogram("dj_nginx_upstream_connect_seconds", "Time to connect to the upstream by route")
+    registry.histogram("dj_nginx_upstream_response_seconds", "Upstream response time by route")
+    registry.counter("dj_nginx_responses_total", "Responses by route, method and status class")
+
+    def per_container(attribute: str):
+        return lambda: {name: getattr(stats, attribute) for name, stats in app.state.containers.items()}
+
+    registry.counter("dj_container_cpu_seconds_total", "CPU time used", per_container("cpu_seconds"), label="container")
+    registry.gauge("dj_container_memory_bytes", "Memory in use, excluding reclaimable page cache", per_container("memory_bytes"), label="container")
+    registry.gauge("dj_container_memory_limit_bytes", "Memory limit", per_container("memory_limit_bytes"), label="container")
+    registry.counter("dj_container_network_receive_bytes_total", "Bytes received", per_container("rx_bytes"), label="container")
+    registry.counter("dj_container_network_transmit_bytes_total", "Bytes sent", per_container("tx_bytes"), label="container")
+    return registry
+
+
+def create_app(
+    settings: Optional[ExporterSettings] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+    docker_transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> FastAPI:
+    """Create the exporter application."""
+    settings = settings or ExporterSettings.from_env()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        app.state.http = httpx.AsyncClient(timeout=settings.scrape_timeout, transport=transport)
+        docker = docker_transport
+        if docker is None and settings.docker_socket and os.path.exists(settings.docker_socket):
+            docker = httpx.AsyncHTTPTransport(uds=settings.docker_socket)
+        app.state.docker = (
+            httpx.AsyncClient(base_url="http://docker", timeout=settings.scrape_timeout, transport=docker)
+            if docker is not None else None
+        )
+        try:
+            yield
+        finally:
+            await app.state.http.aclose()
+            if app.state.docker is not None:
+                await app.state.docker.aclose()
+            if app.state.access_log is not None:
+                app.state.access_log.close()
+
+    app = FastAPI(title="DJ AI Metrics Exporter", lifespan=lifespan, docs_url=None, redoc_url=None, openapi_url=None)
+    app.state.settings = settings
+    app.state.up = {}
+    app.state.scrape_seconds = 0.0
+    app.state.nginx = {}
+    app.state.containers = {}
+    app.state.access_log = AccessLogTail(settings.access_log) if settings.access_log else None
+    app.state.metrics = _register_metrics(app)
+    app.state.routes = RouteLabels()
+    # Serialises scrapes: the access log tail and histograms are not shared safely
+    scrape_lock = asyncio.Lock()
+
+    async def scrape_nginx():
+        if not settings.nginx_status_url:
+            return
+        try:
+            response = await app.state.http.get(settings.nginx_status_url)
+            app.state.nginx = parse_stub_status(response.text)
+            app.state.up["nginx"] = 1
+        except (httpx.HTTPError, ValueError):
+            app.state.up["nginx"] = 0
+
+    async def scrape_containers():
+        if app.state.docker is None:
+            return
+        try:
+            app.state.containers = await collect_stats(app.state.docker, settings.container_prefix)
+            app.state.up["docker"] = 1
+        except (httpx.HTTPError, ValueError):
+            app.state.up["docker"] = 0
+
+    async def scrape_gateway() -> str:
+        if not settings.gateway_metrics_url:
+            return ""
+        try:
+            response = await app.state.http.get(settings.gateway_metrics_url)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            app.state.up["gateway"] = 0
+            return ""
+        app.state.up["gateway"] = 1
+        return response.text
+
+    def consume_access_log():
+        tail: Optional[AccessLogTail] = app.state.access_log
+        if tail is None:
+            return
+        metrics: MetricsRegistry = app.state.metrics
+        for entry in tail.read():
+            route = nginx_route(entry["uri"], entry.get("status"), app.state.routes)
+            method = entry.get("method", "")
+            metrics.get("dj_nginx_request_duration_seconds").observe(float(entry["request_time"]), route=route, method=method)
+            metrics.get("dj_nginx_responses_total").inc(route=route, method=method, status=f"{str(entry.get('status', 0))[:1]}xx")
+            connect = parse_upstream_time(entry.get("upstream_connect_time", "-"))
+            if connect is not None:
+                metrics.get("dj_nginx_upstream_connect_seconds").observe(connect, route=route)
+            upstream = parse_upstream_time(entry.get("upstream_response_time", "-"))
+            if upstream is not None:
+                metrics.get("dj_nginx_upstream_response_seconds").observe(upstream, route=route)
+
+    @app.get("/metrics")
+    async def metrics():
+        """Scrape every source, then render all metrics in the Prometheus text format."""
+        async with scrape_lock:
+            started = time.monotonic()
+            _, _, gateway = await asyncio.gather(scrape_nginx(), scrape_containers(), scrape_gateway())
+            await asyncio.to_thread(consume_access_log)
+            app.state.scrape_seconds = time.monotonic() - started
+            return Response(content=app.state.metrics.render() + gateway, media_type=CONTENT_TYPE)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    return app
@@ -0,0 +1,40 @@
+# DJ AI App - Metrics Exporter Configuration
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Environment-driven settings for the stack metrics exporter
+
+import os
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+from ..env import env_float
+
+
+@dataclass
+class ExporterSettings:
+    """Where the exporter collects from; an empty value disables that source."""
+
+    # nginx stub_status page and the JSON timing log nginx writes for the exporter
+    nginx_status_url: str = "http://nginx:8081/nginx_status"
+    # Read only; nginx rotates it (config/nginx-logrotate.sh)
+    access_log: str = "/var/log/nginx/timing/timing.log"
+
+    # Docker Engine API socket for per-container cgroup stats
+    docker_socket: str = "/var/run/docker.sock"
+    container_prefix: str = "dj-ai-"
+
+    # Gateway metrics (backend request timings, queue depth) are re-exported as is
+    gateway_metrics_url: str = "http://dj-ai-gateway:8080/gateway/metrics"
+
+    scrape_timeout: float = 2.0
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "ExporterSettings":
+        environ = os.environ if environ is None else environ
+        return cls(
+            nginx_status_url=environ.get("EXPORTER_NGINX_STATUS_URL", cls.nginx_status_url),
+            access_log=environ.get("EXPORTER_ACCESS_LOG", cls.access_log),
+            docker_socket=environ.get("EXPORTER_DOCKER_SOCKET", cls.docker_socket),
+            container_prefix=environ.get("EXPORTER_CONTAINER_PREFIX", cls.container_prefix),
+            gateway_metrics_url=environ.get("EXPORTER_GATEWAY_METRICS_URL", cls.gateway_metrics_url),
+            scrape_timeout=env_float(environ, "EXPORTER_SCRAPE_TIMEOUT", cls.scrape_timeout),
+        )
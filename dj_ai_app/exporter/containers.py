@@ -0,0 +1,55 @@
+# DJ AI App - Container Resource Stats
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Per-container cgroup CPU, memory and network usage from the Docker Engine API
+
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import httpx
+
+
+@dataclass
+class ContainerStats:
+    """One container's cgroup counters at scrape time."""
+
+    cpu_seconds: float
+    memory_bytes: int
+    memory_limit_bytes: int
+    rx_bytes: int
+    tx_bytes: int
+
+
+def parse_stats(payload: dict) -> ContainerStats:
+    """Reduce a ``/containers/<id>/stats`` payload to the counters we export."""
+    cpu = payload.get("cpu_stats", {}).get("cpu_usage", {}).get("total_usage", 0)
+    memory = payload.get("memory_stats", {})
+    details = memory.get("stats", {})
+    # Page cache is reclaimable; subtract it like `docker stats` does (cgroup v2, then v1)
+    cache = details.get("inactive_file", details.get("total_inactive_file", 0))
+    networks = payload.get("networks", {}) or {}
+    return ContainerStats(
+        cpu_seconds=cpu / 1e9,
+        memory_bytes=max(0, memory.get("usage", 0) - cache),
+        memory_limit_bytes=memory.get("limit", 0),
+        rx_bytes=sum(n.get("rx_bytes", 0) for n in networks.values()),
+        tx_bytes=sum(n.get("tx_bytes", 0) for n in networks.values()),
+    )
+
+
+async def collect_stats(client: httpx.AsyncClient, prefix: str = "dj-ai-") -> Dict[str, ContainerStats]:
+    """Stats of every running container whose name starts with ``prefix``, keyed by name."""
+    response = await client.get("/containers/json")
+    response.raise_for_status()
+    names = {}
+    for container in response.json():
+        name = next((n.lstrip("/") for n in container.get("Names", []) if n.lstrip("/").startswith(prefix)), None)
+        if name:
+            names[container["Id"]] = name
+
+    async def one(container_id: str) -> Optional[ContainerStats]:
+        stats = await client.get(f"/containers/{container_id}/stats", params={"stream": "false", "one-shot": "true"})
+        return parse_stats(stats.json()) if stats.status_code == 200 else None
+
+    results = await asyncio.gather(*(one(container_id) for container_id in names))
+    return {name: stats for name, stats in zip(names.values(), results) if stats is not None}
@@ -0,0 +1,112 @@
+# DJ AI App - nginx Metrics Sources
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Parse nginx stub_status and tail the JSON timing access log
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from ..gateway.metrics import RouteLabels, route_label
+
+# Paths nginx proxies to the gateway or backend; everything else is the frontend
+API_PREFIXES = ("/api/", "/ws", "/health")
+
+_ACTIVE_RE = re.compile(r"Active connections:\s*(\d+)")
+_TOTALS_RE = re.compile(r"^\s*(\d+)\s+(\d+)\s+(\d+)\s*$", re.MULTILINE)
+_STATES_RE = re.compile(r"Reading:\s*(\d+)\s+Writing:\s*(\d+)\s+Waiting:\s*(\d+)")
+
+
+def parse_stub_status(text: str) -> Dict[str, int]:
+    """Counters and connection states from an nginx ``stub_status`` page."""
+    active, totals, states = _ACTIVE_RE.search(text), _TOTALS_RE.search(text), _STATES_RE.search(text)
+    if not (active and totals and states):
+        raise ValueError("Not an nginx stub_status page")
+    return {
+        "active": int(active.group(1)),
+        "accepted": int(totals.group(1)),
+        "handled": int(totals.group(2)),
+        "requests": int(totals.group(3)),
+        "reading": int(states.group(1)),
+        "writing": int(states.group(2)),
+        "waiting": int(states.group(3)),
+    }
+
+
+def nginx_route(uri: str, status: Optional[int] = None, routes: Optional[RouteLabels] = None) -> str:
+    """Route label for an nginx request: API routes by path, the frontend as one route."""
+    path = uri.split("?", 1)[0]
+    if not path.startswith(API_PREFIXES):
+        return "frontend"
+    return routes(path, status) if routes is not None else route_label(path)
+
+
+class AccessLogTail:
+    """Reads lines appended to the nginx timing log since the previous call.
+
+    Follows the file like ``tail -F`` and never writes to it: after a
+    rotation (config/nginx-logrotate.sh renames the log, then nginx reopens
+    it) the old file is read to its end, one call later than the switch,
+    since nginx keeps appending to it until the reopen. A log truncated in
+    place is read again from the start.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._file: Optional[BinaryIO] = None
+        self._partial = b""
+        self._rotated: Optional[Tuple[BinaryIO, bytes]] = None
+
+    @staticmethod
+    def _drain(f: BinaryIO, partial: bytes) -> Tuple[List[bytes], bytes]:
+        *lines, partial = (partial + f.read()).split(b"\n")
+        return lines, partial
+
+    def _replaced(self) -> bool:
+        try:
+            return os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    def read(self) -> List[dict]:
+        """Parsed entries written since the last read; malformed lines are skipped."""
+        lines: List[bytes] = []
+        if self._rotated is not None:
+            old, partial = self._rotated
+            with old:
+                lines += self._drain(old, partial)[0]
+            self._rotated = None
+        if self._file is not None:
+            if os.fstat(self._file.fileno()).st_size < self._file.tell():
+                self._file.seek(0)
+                self._partial = b""
+            more, self._partial = self._drain(self._file, self._partial)
+            lines += more
+            if self._replaced():
+                self._rotated, self._file, self._partial = (self._file, self._partial), None, b""
+        if self._file is None:
+            try:
+                self._file = open(self.path, "rb")
+            except FileNotFoundError:
+                pass
+            else:
+                more, self._partial = self._drain(self._file, b"")
+                lines += more
+        return list(self._parse(lines))
+
+    def close(self):
+        for f in (self._file, self._rotated[0] if self._rotated else None):
+            if f is not None:
+                f.close()
+        self._file = self._rotated = None
+
+    @staticmethod
+    def _parse(lines: List[bytes]) -> Iterator[dict]:
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and "uri" in entry and "request_time" in entry:
+                yield entry
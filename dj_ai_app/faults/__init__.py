@@ -0,0 +1,20 @@
+# DJ AI App - Network Faults
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Latency, bandwidth, reset and stall injection between clients and services
+
+"""Fault proxy: degrade real TCP traffic to measure resilience under venue networks."""
+
+from .profile import PRESETS, FaultProfile, TokenBucket, preset
+from .proxy import FaultProxy, ProxyStats, ProxyThread, faults, run_proxy
+
+__all__ = [
+    "PRESETS",
+    "FaultProfile",
+    "FaultProxy",
+    "ProxyStats",
+    "ProxyThread",
+    "TokenBucket",
+    "faults",
+    "preset",
+    "run_proxy",
+]
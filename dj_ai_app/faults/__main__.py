@@ -0,0 +1,101 @@
+# DJ AI App - Fault Proxy Entrypoint
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Run the fault proxy and its control API (python -m dj_ai_app.faults)
+
+"""Run a network fault proxy in front of a service.
+
+Usage:
+    python -m dj_ai_app.faults --upstream localhost:8000 --listen 127.0.0.1:8001 --preset venue-wifi
+    python -m dj_ai_app.faults --upstream localhost:8000 --latency-ms 200 --upload-kbps 64
+
+Change conditions while it runs:
+    curl -X PUT localhost:9420/profile -d '{"preset": "crowded-venue-wifi"}'
+    curl -X PUT localhost:9420/profile -d '{"reset_probability": 0.1}'
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from typing import List, Optional, Tuple
+
+from .profile import PRESETS, preset
+from .proxy import FaultProxy
+
+
+def parse_address(value: str, default_host: str = "127.0.0.1") -> Tuple[str, int]:
+    """``host:port`` or ``port``."""
+    host, sep, port = value.rpartition(":")
+    if not port.isdigit():
+        raise argparse.ArgumentTypeError(f"Expected host:port, got {value!r}")
+    return (host if sep and host else default_host), int(port)
+
+
+async def serve(proxy: FaultProxy, control: Optional[Tuple[str, int]]):
+    await proxy.start()
+    print(f"Forwarding {proxy.address} -> {proxy.upstream_host}:{proxy.upstream_port}", flush=True)
+    try:
+        if control is None:
+            await asyncio.Event().wait()
+        else:
+            # The control API needs fastapi and uvicorn; the proxy and its CLI parsing do not
+            import uvicorn
+
+            from .control import create_app
+
+            config = uvicorn.Config(
+                create_app(proxy), host=control[0], port=control[1],
+                log_level=os.environ.get("LOG_LEVEL", "INFO").lower(),
+            )
+            await uvicorn.Server(config).serve()
+    finally:
+        await proxy.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    environ = os.environ
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--upstream", type=parse_address, default=environ.get("FAULTS_UPSTREAM", "localhost:8000"))
+    parser.add_argument("--listen", type=parse_address, default=environ.get("FAULTS_LISTEN", "127.0.0.1:8001"))
+    parser.add_argument(
+        "--control", default=environ.get("FAULTS_CONTROL", "127.0.0.1:9420"),
+        help="Control API address, or 'off'",
+    )
+    parser.add_argument("--preset", default=environ.get("FAULTS_PRESET", "clean"), choices=sorted(PRESETS))
+    parser.add_argument("--latency-ms", type=float, help="One-way delay per chunk")
+    parser.add_argument("--jitter-ms", type=float, help="Uniform +/- variation of the delay")
+    parser.add_argument("--upload-kbps", type=float, help="Client-to-service cap in KiB/s")
+    parser.add_argument("--download-kbps", type=float, help="Service-to-client cap in KiB/s")
+    parser.add_argument("--reset-probability", type=float, help="Share of connections reset early")
+    parser.add_argument("--seed", type=int, help="Make jitter and resets repeatable")
+    args = parser.parse_args(argv)
+
+    changes = {}
+    if args.latency_ms is not None:
+        changes["latency"] = args.latency_ms / 1000
+    if args.jitter_ms is not None:
+        changes["jitter"] = args.jitter_ms / 1000
+    if args.upload_kbps is not None:
+        changes["upload_bps"] = args.upload_kbps * 1024
+    if args.download_kbps is not None:
+        changes["download_bps"] = args.download_kbps * 1024
+    if args.reset_probability is not None:
+        changes["reset_probability"] = args.reset_probability
+    try:
+        profile = preset(args.preset).update(changes)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+
+    (upstream_host, upstream_port), (host, port) = args.upstream, args.listen
+    proxy = FaultProxy(upstream_host, upstream_port, profile, host=host, port=port, seed=args.seed)
+    control = None if args.control == "off" else parse_address(args.control)
+    try:
+        asyncio.run(serve(proxy, control))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
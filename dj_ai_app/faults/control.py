@@ -0,0 +1,65 @@
+# DJ AI App - Fault Proxy Control API
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Change a running fault proxy's conditions over HTTP (load generator, CI scripts)
+
+from dataclasses import asdict
+from typing import Any, Dict
+
+from fastapi import Body, FastAPI, HTTPException
+from fastapi.responses import Response
+
+from ..gateway.metrics import CONTENT_TYPE, MetricsRegistry
+from .profile import PRESETS, preset
+from .proxy import FaultProxy
+
+
+def _register_metrics(proxy: FaultProxy) -> MetricsRegistry:
+    registry = MetricsRegistry()
+    registry.counter("dj_faults_connections_total", "Connections accepted by the proxy", lambda: proxy.stats.connections)
+    registry.gauge("dj_faults_connections_active", "Connections open through the proxy", lambda: proxy.stats.active)
+    registry.counter(
+        "dj_faults_bytes_total", "Bytes forwarded",
+        lambda: {"upload": proxy.stats.upload_bytes, "download": proxy.stats.download_bytes}, label="direction",
+    )
+    registry.counter("dj_faults_resets_total", "Connections reset on purpose", lambda: proxy.stats.resets)
+    registry.counter("dj_faults_stalls_total", "Uploads stalled on purpose", lambda: proxy.stats.stalls)
+    return registry
+
+
+def create_app(proxy: FaultProxy) -> FastAPI:
+    """Control API for ``proxy``; it does not start or stop the proxy itself."""
+    app = FastAPI(title="DJ AI Fault Proxy", docs_url=None, redoc_url=None, openapi_url=None)
+    app.state.proxy = proxy
+    app.state.metrics = _register_metrics(proxy)
+
+    @app.get("/profile")
+    async def get_profile():
+        return {"profile": proxy.profile.to_dict(), "presets": sorted(PRESETS)}
+
+    @app.put("/profile")
+    async def put_profile(changes: Dict[str, Any] = Body(...)):
+        """Partial update (``{"latency": 0.2}``), a preset (``{"preset": "venue-wifi"}``) or both."""
+        changes = dict(changes)
+        try:
+            base = preset(changes.pop("preset")) if "preset" in changes else proxy.profile
+            # null means "unlimited" for caps and "forever" for the stall length
+            if changes.get("stall_seconds", 0) is None:
+                changes["stall_seconds"] = float("inf")
+            proxy.profile = base.update(changes)
+        except (TypeError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        return {"profile": proxy.profile.to_dict()}
+
+    @app.get("/stats")
+    async def stats():
+        return asdict(proxy.stats)
+
+    @app.get("/metrics")
+    async def metrics():
+        return Response(content=app.state.metrics.render(), media_type=CONTENT_TYPE)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy", "upstream": f"{proxy.upstream_host}:{proxy.upstream_port}"}
+
+    return app
@@ -0,0 +1,100 @@
+# DJ AI App - Network Fault Profiles
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: What the fault proxy does to traffic: delay, jitter, bandwidth caps, resets and stalls
+
+import asyncio
+import math
+import time
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Any, Dict, Mapping, Optional
+
+
+# Settings where None means "off" or "unlimited"
+NULLABLE = ("upload_bps", "download_bps", "reset_after_bytes", "stall_after_bytes")
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    """Network conditions applied per connection and direction.
+
+    "Upload" is client to upstream, "download" upstream to client. Delay is
+    added per chunk without reordering, so throughput is limited by the
+    bandwidth caps and not by the delay, as on a real long link.
+    """
+
+    # One-way delay added to every chunk, plus a uniform +/- jitter (seconds)
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Bytes per second; None is unlimited
+    upload_bps: Optional[float] = None
+    download_bps: Optional[float] = None
+    # Share of connections reset (RST) at a random point within their first reset_window bytes
+    reset_probability: float = 0.0
+    reset_window: int = 64 * 1024
+    # Reset every connection once this many bytes have passed, in either direction
+    reset_after_bytes: Optional[int] = None
+    # Stop forwarding the upload for stall_seconds (inf: until the client gives up) after this many bytes
+    stall_after_bytes: Optional[int] = None
+    stall_seconds: float = 0.0
+    chunk_size: int = 16 * 1024
+
+    def update(self, changes: Mapping[str, Any]) -> "FaultProfile":
+        """A copy with ``changes`` applied; unknown names are an error."""
+        known = {f.name for f in fields(self)}
+        unknown = set(changes) - known
+        if unknown:
+            raise ValueError(f"Unknown fault settings: {', '.join(sorted(unknown))}")
+        for name, value in changes.items():
+            if value is None and name in NULLABLE:
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0 or (name == "chunk_size" and value < 1):
+                raise ValueError(f"Fault setting {name} must be a non-negative number, got {value!r}")
+        return replace(self, **changes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        # JSON has no infinity
+        return {k: (None if isinstance(v, float) and math.isinf(v) else v) for k, v in asdict(self).items()}
+
+
+# Measured-ish conditions DJs report from venues; bandwidth in bytes per second
+PRESETS: Dict[str, FaultProfile] = {
+    "clean": FaultProfile(),
+    "venue-wifi": FaultProfile(latency=0.04, jitter=0.03, upload_bps=256 * 1024, download_bps=1024 * 1024,
+                               reset_probability=0.02),
+    "crowded-venue-wifi": FaultProfile(latency=0.15, jitter=0.1, upload_bps=64 * 1024, download_bps=256 * 1024,
+                                       reset_probability=0.05, stall_after_bytes=512 * 1024, stall_seconds=3.0),
+    "mobile-3g": FaultProfile(latency=0.1, jitter=0.05, upload_bps=48 * 1024, download_bps=128 * 1024),
+}
+
+
+def preset(name: str) -> FaultProfile:
+    try:
+        return PRESETS[name]
+    except KeyError:
+        raise ValueError(f"Unknown fault preset {name!r}; expected one of {', '.join(PRESETS)}") from None
+
+
+class TokenBucket:
+    """Paces a byte stream to ``rate`` bytes per second with a one-chunk burst."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._allowance = 0.0
+        self._last: Optional[float] = None
+
+    async def consume(self, size: int, rate: Optional[float], burst: int):
+        if not rate:
+            self._last = None
+            return
+        now = self._clock()
+        if self._last is None:
+            self._allowance = float(burst)
+        else:
+            self._allowance = min(float(burst), self._allowance + (now - self._last) * rate)
+        self._last = now
+        self._allowance -= size
+        if self._allowance < 0:
+            wait = -self._allowance / rate
+            await asyncio.sleep(wait)
+            self._last = self._clock()
+            self._allowance = 0.0
@@ -0,0 +1,242 @@
+# DJ AI App - Network Fault Proxy
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: asyncio TCP proxy that degrades traffic between clients and a service
+
+import asyncio
+import math
+import random
+import socket
+import struct
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from .profile import FaultProfile, TokenBucket
+
+UPLOAD = "upload"
+DOWNLOAD = "download"
+
+
+@dataclass
+class ProxyStats:
+    connections: int = 0
+    active: int = 0
+    upload_bytes: int = 0
+    download_bytes: int = 0
+    resets: int = 0
+    stalls: int = 0
+    upstream_errors: int = 0
+
+
+class _Reset(Exception):
+    """The connection was picked for a reset."""
+
+
+def _abort_with_rst(writer: asyncio.StreamWriter):
+    sock = writer.get_extra_info("socket")
+    if sock is not None:
+        try:
+            # Zero linger turns close into a TCP RST, as a dropped Wi-Fi link looks to the peer
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        except OSError:
+            pass
+    writer.transport.abort()
+
+
+class FaultProxy:
+    """Forwards TCP connections to ``upstream_host:upstream_port`` under a :class:`FaultProfile`.
+
+    HTTP needs nothing special: the proxy works on bytes, so uploads,
+    keep-alive and WebSockets are all degraded the same way. Assigning
+    ``profile`` takes effect on the next chunk of every open connection;
+    resets and their trigger points are decided when a connection opens.
+    """
+
+    def __init__(
+        self,
+        upstream_host: str,
+        upstream_port: int,
+        profile: Optional[FaultProfile] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None,
+    ):
+        self.upstream_host = upstream_host
+        self.upstream_port = upstream_port
+        self.profile = profile or FaultProfile()
+        self.host = host
+        self.port = port
+        self.stats = ProxyStats()
+        self._random = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections = set()
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.address}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+
+    def _delay(self, profile: FaultProfile) -> float:
+        if not profile.latency and not profile.jitter:
+            return 0.0
+        return max(0.0, profile.latency + self._random.uniform(-profile.jitter, profile.jitter))
+
+    async def _handle(self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        self.stats.connections += 1
+        self.stats.active += 1
+        upstream_writer = None
+        try:
+            try:
+                upstream_reader, upstream_writer = await asyncio.open_connection(self.upstream_host, self.upstream_port)
+            except OSError:
+                self.stats.upstream_errors += 1
+                _abort_with_rst(client_writer)
+                return
+
+            profile = self.profile
+            reset_at = profile.reset_after_bytes
+            if profile.reset_probability and self._random.random() < profile.reset_probability:
+                reset_at = self._random.randrange(max(1, profile.reset_window))
+            state = {"bytes": 0, UPLOAD: 0, "reset_at": reset_at, "stalled": False}
+
+            pumps = [
+                asyncio.ensure_future(self._pump(client_reader, upstream_writer, UPLOAD, state)),
+                asyncio.ensure_future(self._pump(upstream_reader, client_writer, DOWNLOAD, state)),
+            ]
+            try:
+                done, _ = await asyncio.wait(pumps, return_when=asyncio.FIRST_EXCEPTION)
+                for pump in done:
+                    pump.result()
+            except _Reset:
+                self.stats.resets += 1
+                _abort_with_rst(client_writer)
+                _abort_with_rst(upstream_writer)
+            except (ConnectionError, OSError):
+                # One side went away; the finally below closes the other
+                pass
+            finally:
+                for pump in pumps:
+                    pump.cancel()
+                await asyncio.gather(*pumps, return_exceptions=True)
+        finally:
+            self.stats.active -= 1
+            self._connections.discard(task)
+            for writer in (client_writer, upstream_writer):
+                if writer is not None and not writer.transport.is_closing():
+                    writer.close()
+
+    async def _pump(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, direction: str, state: dict):
+        """Reader side: stamp each chunk with its due time; writer side: wait, pace, forward."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+        loop = asyncio.get_running_loop()
+
+        async def read():
+            due = 0.0
+            while True:
+                data = await reader.read(self.profile.chunk_size)
+                # Jitter varies the delay but never reorders a TCP stream
+                due = max(due, loop.time() + self._delay(self.profile))
+                await queue.put((due, data))
+                if not data:
+                    return
+
+        reading = asyncio.ensure_future(read())
+        bucket = TokenBucket(loop.time)
+        try:
+            while True:
+                due, data = await queue.get()
+                wait = due - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                if not data:
+                    if writer.can_write_eof():
+                        writer.write_eof()
+                    return
+                profile = self.profile
+                await bucket.consume(
+                    len(data), profile.upload_bps if direction == UPLOAD else profile.download_bps, profile.chunk_size,
+                )
+                await self._maybe_fault(direction, state, len(data), profile)
+                writer.write(data)
+                await writer.drain()
+                if direction == UPLOAD:
+                    self.stats.upload_bytes += len(data)
+                else:
+                    self.stats.download_bytes += len(data)
+        finally:
+            reading.cancel()
+            await asyncio.gather(reading, return_exceptions=True)
+
+    async def _maybe_fault(self, direction: str, state: dict, size: int, profile: FaultProfile):
+        state["bytes"] += size
+        if state["reset_at"] is not None and state["bytes"] > state["reset_at"]:
+            raise _Reset()
+        if direction != UPLOAD:
+            return
+        state[UPLOAD] += size
+        if profile.stall_after_bytes is not None and not state["stalled"] and state[UPLOAD] > profile.stall_after_bytes:
+            state["stalled"] = True
+            self.stats.stalls += 1
+            if math.isinf(profile.stall_seconds):
+                await asyncio.Event().wait()
+            await asyncio.sleep(profile.stall_seconds)
+
+
+class ProxyThread:
+    """A :class:`FaultProxy` on its own event loop thread, for synchronous callers (pytest, requests)."""
+
+    def __init__(self, proxy: FaultProxy):
+        self.proxy = proxy
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    def start(self) -> FaultProxy:
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.proxy.start(), self._loop).result(10)
+        return self.proxy
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.proxy.stop(), self._loop).result(10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(10)
+        self._loop.close()
+
+
+@contextmanager
+def run_proxy(upstream_host: str, upstream_port: int, profile: Optional[FaultProfile] = None, **kwargs) -> Iterator[FaultProxy]:
+    """Run a fault proxy in a background thread: ``with run_proxy("localhost", 8000) as proxy: proxy.url``."""
+    runner = ProxyThread(FaultProxy(upstream_host, upstream_port, profile, **kwargs))
+    proxy = runner.start()
+    try:
+        yield proxy
+    finally:
+        runner.stop()
+
+
+@contextmanager
+def faults(proxy: FaultProxy, **changes) -> Iterator[FaultProfile]:
+    """Apply ``changes`` to the proxy's profile for the duration of a block."""
+    previous = proxy.profile
+    proxy.profile = previous.update(changes)
+    try:
+        yield proxy.profile
+    finally:
+        proxy.profile = previous
@@ -0,0 +1,9 @@
+# DJ AI App - Feature Store
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Shared, append-only store of analysis results on the data volume
+
+"""Memory-mapped columnar store of track analyses shared across processes."""
+
+from .store import COLUMNS, KEYS, FeatureStore, key_code
+
+__all__ = ["COLUMNS", "KEYS", "FeatureStore", "key_code"]
@@ -0,0 +1,223 @@
+# DJ AI App - Columnar Feature Store
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Append-only, memory-mapped analysis results with lock-free readers
+
+import fcntl
+import hashlib
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+PITCHES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+KEYS = [f"{pitch} {mode}" for mode in ("major", "minor") for pitch in PITCHES]
+_FLATS = {"Db": "C#", "Eb": "D#", "Gb": "F#", "Ab": "G#", "Bb": "A#"}
+_KEY_RE = re.compile(r"^([A-G])([#b]?)\s*(major|minor|maj|min|m)?$", re.IGNORECASE)
+
+# Numeric features read from the analysis result or its "features" object
+NUMERIC_FEATURES = ("bpm", "duration", "energy", "spectral_centroid", "tempo_confidence")
+
+# Column name -> (struct format, width in bytes); every column has one entry per row
+COLUMNS: Dict[str, tuple] = {
+    **{name: ("d", 8) for name in NUMERIC_FEATURES},
+    "key": ("h", 2),
+    "content_hash": ("32s", 32),
+    "track_key": ("Q", 8),
+    "blob_offset": ("Q", 8),
+    "blob_length": ("Q", 8),
+}
+
+_COUNT = struct.Struct("<Q")
+
+
+def key_code(key: Optional[str]) -> int:
+    """Index of a musical key in KEYS ("A minor", "Am", "Bb major" ...), or -1."""
+    match = _KEY_RE.match((key or "").strip().replace("♯", "#").replace("♭", "b"))
+    if not match:
+        return -1
+    letter, accidental, mode = match.groups()
+    pitch = letter.upper() + accidental
+    pitch = _FLATS.get(pitch, pitch)
+    if pitch not in PITCHES:  # Cb, Fb, E#, B#
+        return -1
+    minor = (mode or "").lower() in ("minor", "min", "m")
+    return PITCHES.index(pitch) + (12 if minor else 0)
+
+
+def _track_key(track_id: str) -> int:
+    return int.from_bytes(hashlib.sha256(track_id.encode()).digest()[:8], "little")
+
+
+def _number(result: Dict[str, Any], name: str) -> float:
+    value = result.get(name)
+    if value is None and isinstance(result.get("features"), dict):
+        value = result["features"].get(name)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class FeatureStore:
+    """Analysis results in fixed-width column files plus a JSON Lines file.
+
+    Readers never lock: a row only becomes visible once the writer has
+    flushed every column and then bumped the row count in ``rows``, so
+    readers that map the files up to that count always see whole rows.
+    Appends from any number of processes are serialised by an exclusive
+    ``flock`` on ``write.lock``; a writer that crashed mid-row leaves
+    bytes past the committed count, which the next append truncates.
+    Each row's ``blob_offset``/``blob_length`` cover its JSON document in
+    ``results.jsonl``, without the newline that ends the line.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        (self.root / "columns").mkdir(parents=True, exist_ok=True)
+        self._count_path = self.root / "rows"
+        if not self._count_path.exists():
+            with open(self._count_path, "ab") as f:
+                if f.tell() == 0:
+                    f.write(_COUNT.pack(0))
+        self._count_fd = os.open(self._count_path, os.O_RDONLY)
+        self._maps: Dict[str, mmap.mmap] = {}
+        self._lock = threading.Lock()
+        self._indexed = 0
+        self._by_hash: Dict[bytes, int] = {}
+        self._by_track: Dict[int, List[int]] = {}
+
+    def _column_path(self, name: str) -> Path:
+        return self.root / "columns" / f"{name}.bin"
+
+    @property
+    def _blob_path(self) -> Path:
+        return self.root / "results.jsonl"
+
+    def __len__(self) -> int:
+        return _COUNT.unpack(os.pread(self._count_fd, _COUNT.size, 0))[0]
+
+    def close(self):
+        self._maps.clear()
+        os.close(self._count_fd)
+
+    # Readers
+
+    def _map(self, path: Path, needed: int) -> Optional[mmap.mmap]:
+        """Map ``path`` covering at least ``needed`` bytes, remapping after growth."""
+        if needed == 0:
+            return None
+        current = self._maps.get(path.name)
+        if current is None or len(current) < needed:
+            with open(path, "rb") as f:
+                # Old maps stay alive while callers hold views of them
+                current = self._maps[path.name] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return current
+
+    def column(self, name: str, rows: Optional[int] = None) -> memoryview:
+        """Zero-copy view of a column over the first ``rows`` committed rows."""
+        fmt, width = COLUMNS[name]
+        rows = len(self) if rows is None else rows
+        mapped = self._map(self._column_path(name), rows * width)
+        view = memoryview(mapped)[: rows * width] if mapped is not None else memoryview(b"")
+        return view if fmt.endswith("s") else view.cast(fmt)
+
+    def _refresh_index(self) -> int:
+        count = len(self)
+        with self._lock:
+            if count > self._indexed:
+                hashes = self.column("content_hash", count)
+                tracks = self.column("track_key", count)
+                for row in range(self._indexed, count):
+                    self._by_hash[bytes(hashes[row * 32:(row + 1) * 32])] = row
+                    self._by_track.setdefault(tracks[row], []).append(row)
+                self._indexed = count
+        return count
+
+    def raw(self, row: int) -> bytes:
+        """The stored analysis JSON of ``row``."""
+        count = len(self)
+        if not 0 <= row < count:
+            raise IndexError(row)
+        offset = self.column("blob_offset", count)[row]
+        length = self.column("blob_length", count)[row]
+        blob = self._map(self._blob_path, offset + length)
+        return blob[offset:offset + length]
+
+    def row_for_hash(self, content_hash: str) -> Optional[int]:
+        self._refresh_index()
+        return self._by_hash.get(bytes.fromhex(content_hash))
+
+    def raw_by_hash(self, content_hash: str) -> Optional[bytes]:
+        row = self.row_for_hash(content_hash)
+        return None if row is None else self.raw(row)
+
+    def get_by_hash(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        raw = self.raw_by_hash(content_hash)
+        return None if raw is None else json.loads(raw)
+
+    def get_by_track(self, track_id: str) -> Optional[Dict[str, Any]]:
+        """Most recent analysis stored for ``track_id``."""
+        self._refresh_index()
+        for row in reversed(self._by_track.get(_track_key(track_id), [])):
+            result = json.loads(self.raw(row))
+            if str(result.get("track_id")) == track_id:
+                return result
+        return None
+
+    # Writer
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        with open(self.root / "write.lock", "a") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def append(self, content_hash: str, result: Dict[str, Any]) -> int:
+        """Store one analysis and return its row; an already stored hash is not duplicated."""
+        digest = bytes.fromhex(content_hash)
+        if len(digest) != 32:
+            raise ValueError("content_hash must be a hex SHA-256 digest")
+        body = json.dumps(result, separators=(",", ":"), sort_keys=True).encode()
+        values = {name: _number(result, name) for name in NUMERIC_FEATURES}
+        values["key"] = key_code(result.get("key"))
+        values["content_hash"] = digest
+        values["track_key"] = _track_key(str(result.get("track_id", "")))
+
+        with self._write_lock():
+            count = self._refresh_index()
+            existing = self._by_hash.get(digest)
+            if existing is not None:
+                return existing
+            blob_end = 0
+            if count:
+                blob_end = self.column("blob_offset", count)[count - 1] + self.column("blob_length", count)[count - 1] + 1
+            values["blob_offset"] = blob_end
+            values["blob_length"] = len(body)
+
+            self._write_at(self._blob_path, blob_end, body + b"\n")
+            for name, (fmt, width) in COLUMNS.items():
+                self._write_at(self._column_path(name), count * width, struct.pack("<" + fmt, values[name]))
+            # Commit: readers only look at rows below the count
+            with open(self._count_path, "r+b") as f:
+                f.write(_COUNT.pack(count + 1))
+                f.flush()
+                os.fsync(f.fileno())
+        return count
+
+    @staticmethod
+    def _write_at(path: Path, offset: int, data: bytes):
+        """Write ``data`` at ``offset``, dropping anything a crashed writer left behind."""
+        with open(path, "a+b") as f:
+            f.truncate(offset)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,35 @@
+# DJ AI App - API Gateway
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Caching gateway between nginx and the dj-ai-core backend
+
+"""API gateway that sits between nginx and dj-ai-core."""
+
+from .admission import GradientLimiter, Overloaded
+from .cache import CachedResponse, LRUCache, make_etag
+from .config import GatewaySettings
+from .media import MediaSigner
+from .metrics import MetricsRegistry
+from .singleflight import SingleFlight
+
+__all__ = [
+    "CachedResponse",
+    "GatewaySettings",
+    "GradientLimiter",
+    "LRUCache",
+    "MediaSigner",
+    "MetricsRegistry",
+    "Overloaded",
+    "SingleFlight",
+    "create_app",
+    "make_etag",
+]
+
+
+def __getattr__(name):
+    # The app needs fastapi and httpx; metrics, scheduling and the other
+    # building blocks are imported by tools and tests that have neither
+    if name == "create_app":
+        from .app import create_app
+
+        return create_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
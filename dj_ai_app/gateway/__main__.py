@@ -0,0 +1,25 @@
+# DJ AI App - Gateway Entrypoint
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Run the API gateway with uvicorn (python -m dj_ai_app.gateway)
+
+import os
+
+import uvicorn
+
+from .app import create_app
+from .config import GatewaySettings
+
+
+def main():
+    """Start the gateway on GATEWAY_HOST:GATEWAY_PORT."""
+    # One process on purpose: the response caches live in memory
+    uvicorn.run(
+        create_app(GatewaySettings.from_env()),
+        host=os.environ.get("GATEWAY_HOST", "0.0.0.0"),
+        port=int(os.environ.get("GATEWAY_PORT", "8080")),
+        log_level=os.environ.get("LOG_LEVEL", "INFO").lower(),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# DJ AI App - Adaptive Admission Control
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Latency-driven concurrency limit that sheds load with fast 503s
+
+import math
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed; the gateway answers 503 with Retry-After."""
+
+    def __init__(self, retry_after: int, reason: str = "Gateway is at capacity"):
+        super().__init__(reason)
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class Ticket:
+    """Outcome of one admitted request, reported back to the limiter."""
+
+    def __init__(self):
+        self.ok = True
+        self.sampled = True
+
+    def skip(self):
+        """Answered without the backend (e.g. a cache hit): do not sample latency."""
+        self.sampled = False
+
+
+class GradientLimiter:
+    """Concurrency limit that follows observed latency (gradient algorithm).
+
+    A long-term latency average approximates the no-load round trip. When
+    recent latency rises above it, the gradient ``tolerance * long / short``
+    drops below 1 and shrinks the limit; when latency is flat the limit
+    grows by ``sqrt(limit)`` per sample, but only while the limit is
+    actually being used. Failed requests cut the limit multiplicatively.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        tolerance: float = 2.0,
+        smoothing: float = 0.2,
+        long_window: int = 600,
+        short_window: int = 10,
+        backoff_ratio: float = 0.9,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.backoff_ratio = backoff_ratio
+        self._long_alpha = 2.0 / (long_window + 1)
+        self._short_alpha = 2.0 / (short_window + 1)
+        self.long_rtt: Optional[float] = None
+        self.short_rtt: Optional[float] = None
+        self.in_flight = 0
+        self.accepted_total = 0
+        self.rejected_total = 0
+
+    @property
+    def current_limit(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    def try_acquire(self) -> bool:
+        """Admit a request if the concurrency limit allows it."""
+        if self.in_flight >= self.current_limit:
+            self.rejected_total += 1
+            return False
+        self.in_flight += 1
+        self.accepted_total += 1
+        return True
+
+    def release(self, latency: Optional[float], ok: bool = True):
+        """Record how an admitted request went and adapt the limit.
+
+        ``latency=None`` frees the slot without a sample (e.g. the client
+        went away), so disconnects neither grow nor shrink the limit.
+        """
+        in_flight = self.in_flight
+        self.in_flight -= 1
+        if latency is None:
+            return
+        if not ok:
+            self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+            return
+
+        if self.long_rtt is None:
+            self.long_rtt = self.short_rtt = latency
+            return
+        self.short_rtt += self._short_alpha * (latency - self.short_rtt)
+        self.long_rtt += self._long_alpha * (self.short_rtt - self.long_rtt)
+        # Let the baseline catch up quickly after latency has dropped for good
+        if self.long_rtt / self.short_rtt > 2:
+            self.long_rtt *= 0.95
+
+        # Do not grow a limit the traffic is not using
+        if in_flight < self.limit / 2:
+            return
+
+        gradient = max(0.5, min(1.0, self.tolerance * self.long_rtt / self.short_rtt))
+        target = self.limit * gradient + math.sqrt(self.limit)
+        self.limit = (1 - self.smoothing) * self.limit + self.smoothing * target
+        self.limit = max(self.min_limit, min(self.max_limit, self.limit))
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait: about one recent round trip."""
+        if self.short_rtt is None:
+            return 1
+        return max(1, min(60, math.ceil(self.short_rtt)))
+
+    @contextmanager
+    def admit(self) -> Iterator[Ticket]:
+        """Hold a slot for the body of the ``with`` block or raise Overloaded.
+
+        Set ``ticket.ok = False`` for upstream failures (5xx) that should
+        back the limit off; exceptions do so automatically.
+        """
+        if not self.try_acquire():
+            raise Overloaded(self.retry_after())
+        ticket = Ticket()
+        started = time.monotonic()
+        latency: Optional[float] = None
+        try:
+            yield ticket
+            latency = time.monotonic() - started
+        except Exception:
+            ticket.ok = False
+            latency = time.monotonic() - started
+            raise
+        finally:
+            self.release(latency if ticket.sampled else None, ticket.ok)
@@ -0,0 +1,697 @@
+# DJ AI App - Gateway Application
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: FastAPI app that proxies dj-ai-core and caches idempotent responses
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+from ..blobs import BlobStore
+from ..features import FeatureStore
+from ..jobs.store import Job, JobStore
+from ..prewarm.warmup import WARMUP_FILENAME, synthetic_wav
+from .admission import GradientLimiter, Overloaded, Ticket
+from .cache import CachedResponse, LRUCache
+from .config import GatewaySettings
+from .headers import BROKER_SECRET_HEADER, CONTENT_HASH_HEADER, PRIORITY_HEADER, TENANT_HEADER
+from .media import MediaSigner
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from .metrics import Histogram, MetricsRegistry, RouteLabels
+from .scheduler import BULK, INTERACTIVE, FairScheduler
+from .singleflight import SingleFlight
+from .tracing import REQUEST_ID_HEADER, current_request_id, log_span, new_request_id, record, span, start_trace
+from .warmup import Warmup
+
+# Backend endpoints whose responses only change on deploy
+METADATA_PATHS = ("/", "/supported-formats", "/openapi.json")
+
+PROXY_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD"]
+
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+}
+
+# Readiness probes must answer quickly even while the backend is starting
+READINESS_TIMEOUT = 2.0
+
+# Proxied calls whose results are also pushed to WebSocket subscribers through dj-ai-broker
+RECOMMENDATIONS_PATH = "recommend-transitions"
+BROKER_TIMEOUT = 2.0
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# How long nginx may reuse a media auth_request answer
+MEDIA_AUTH_CACHE_SECONDS = 60
+
+
+def backend_ready(payload) -> bool:
+    """A healthy backend is ready unless its /health says models are still loading."""
+    if not isinstance(payload, dict):
+        return True
+    return all(payload.get(flag) is not False for flag in ("models_loaded", "ready"))
+
+
+def _forward_headers(request: Request, drop_content_type: bool = False) -> Dict[str, str]:
+    """Copy request headers that are safe to send to the backend."""
+    skipped = HOP_BY_HOP_HEADERS | {"host", "content-length", REQUEST_ID_HEADER.lower()}
+    if drop_content_type:
+        skipped = skipped | {"content-type"}
+    headers = {k: v for k, v in request.headers.items() if k.lower() not in skipped}
+    request_id = current_request_id()
+    if request_id:
+        headers[REQUEST_ID_HEADER] = request_id
+    return headers
+
+
+def _response_headers(upstream: httpx.Response) -> Dict[str, str]:
+    """Copy backend response headers that are safe to replay from the cache."""
+    skipped = HOP_BY_HOP_HEADERS | {"content-length", "content-encoding", "content-type", "date", "server"}
+    return {
+        k: v
+        for k, v in upstream.headers.items()
+        if k.lower() not in skipped and not k.lower().startswith("access-control-")
+    }
+
+
+def _to_cached(upstream: httpx.Response) -> CachedResponse:
+    return CachedResponse(
+        status_code=upstream.status_code,
+        body=upstream.content,
+        media_type=upstream.headers.get("content-type", "application/json"),
+        headers=_response_headers(upstream),
+    )
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    candidates = request.headers.get("if-none-match")
+    if not candidates:
+        return False
+    tags = [tag.strip() for tag in candidates.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def _reply(request: Request, entry: CachedResponse, cache_status: str, max_age: Optional[float] = None) -> Response:
+    """Turn a cache entry into a response, honouring If-None-Match."""
+    headers = dict(entry.headers)
+    headers["ETag"] = entry.etag
+    headers["X-Cache"] = cache_status
+    if max_age is not None:
+        headers["Cache-Control"] = f"public, max-age={int(max_age)}"
+    if entry.status_code == 200 and _etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, status_code=entry.status_code, media_type=entry.media_type, headers=headers)
+
+
+async def _read_form(request: Request) -> Tuple[List[tuple], Dict[str, List[str]], List[str]]:
+    """Split a multipart upload into httpx files/data and per-file SHA-256 digests."""
+    form = await request.form()
+    files, data, digests = [], {}, []
+    try:
+        for name, value in form.multi_items():
+            if isinstance(value, str):
+                data.setdefault(name, []).append(value)
+                continue
+            content = await value.read()
+            digests.append(hashlib.sha256(content).hexdigest())
+            files.append((name, (value.filename, content, value.content_type)))
+    finally:
+        await form.close()
+    return files, data, digests
+
+
+def _request_class(request: Request) -> Tuple[str, str]:
+    """Priority class and tenant used to schedule a request's analysis."""
+    priority = request.headers.get(PRIORITY_HEADER, INTERACTIVE).strip().lower()
+    tenant = (
+        request.headers.get(TENANT_HEADER)
+        or request.headers.get("x-real-ip")
+        or (request.client.host if request.client else "anonymous")
+    )
+    return priority, tenant
+
+
+def _save_upload(source: BinaryIO, destination: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Copy an upload to disk and return its SHA-256."""
+    digest = hashlib.sha256()
+    with open(destination, "wb") as out:
+        for chunk in iter(lambda: source.read(chunk_size), b""):
+            digest.update(chunk)
+            out.write(chunk)
+    return digest.hexdigest()
+
+
+class _TimedTransport(httpx.AsyncBaseTransport):
+    """Records how long dj-ai-core takes to answer (up to response headers) per route."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, histogram: Histogram, routes: RouteLabels):
+        self._transport = transport
+        self._histogram = histogram
+        self._routes = routes
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        response = None
+        try:
+            response = await self._transport.handle_async_request(request)
+            return response
+        finally:
+            status = response.status_code if response is not None else None
+            self._histogram.observe(time.monotonic() - started, route=self._routes(request.url.path, status))
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def _register_metrics(app: FastAPI) -> MetricsRegistry:
+    """Expose cache and coalescing counters from the objects that own them."""
+    registry = MetricsRegistry()
+    registry.histogram("dj_gateway_request_duration_seconds", "Gateway request latency by route and method")
+    registry.counter("dj_gateway_requests_total", "Gateway responses by route, method and status")
+    registry.gauge("dj_gateway_requests_in_flight", "Gateway requests being handled")
+    registry.histogram("dj_gateway_upstream_duration_seconds", "dj-ai-core time to response headers by route")
+    for name in ("metadata", "analysis"):
+        cache: LRUCache = getattr(app.state, f"{name}_cache")
+        registry.counter(f"dj_gateway_{name}_cache_hits_total", f"{name} cache hits", lambda c=cache: c.hits)
+        registry.counter(f"dj_gateway_{name}_cache_misses_total", f"{name} cache misses", lambda c=cache: c.misses)
+        registry.counter(f"dj_gateway_{name}_cache_evictions_total", f"{name} cache LRU evictions", lambda c=cache: c.evictions)
+        registry.gauge(f"dj_gateway_{name}_cache_bytes", f"{name} cache size in bytes", lambda c=cache: c.current_bytes)
+
+    flights: SingleFlight = app.state.analysis_flights
+    registry.gauge("dj_gateway_singleflight_in_flight", "Distinct analyses currently running upstream", lambda: flights.in_flight)
+    registry.gauge("dj_gateway_singleflight_waiters", "Requests waiting on an identical in-flight analysis", lambda: flights.waiters)
+    registry.counter("dj_gateway_singleflight_leaders_total", "Analyses sent upstream by a leader", lambda: flights.leaders_total)
+    registry.counter("dj_gateway_singleflight_coalesced_total", "Requests answered by another request's analysis", lambda: flights.coalesced_total)
+    registry.counter(
+        "dj_gateway_singleflight_cpu_seconds_saved_total",
+        "Backend analysis seconds not spent thanks to coalescing (leader time x followers)",
+        lambda: flights.seconds_saved_total,
+    )
+
+    limiters = {"api": app.state.api_limiter, "analysis": app.state.analysis_limiter}
+
+    def per_limiter(attribute: str):
+        return lambda: {name: getattr(limiter, attribute) for name, limiter in limiters.items()}
+
+    registry.gauge("dj_gateway_admission_limit", "Adaptive concurrency limit", per_limiter("current_limit"), label="limiter")
+    registry.gauge("dj_gateway_admission_in_flight", "Admitted requests in progress", per_limiter("in_flight"), label="limiter")
+    registry.counter("dj_gateway_admission_accepted_total", "Requests admitted", per_limiter("accepted_total"), label="limiter")
+    registry.counter("dj_gateway_admission_rejected_total", "Requests shed with 503", per_limiter("rejected_total"), label="limiter")
+
+    if app.state.features is not None:
+        registry.gauge("dj_gateway_feature_store_rows", "Analyses in the shared feature store", lambda: len(app.state.features))
+
+    registry.gauge(
+        "dj_gateway_warmup_seconds",
+        "Duration of the successful warm-up analysis (0 until it has run)",
+        lambda: app.state.warmup.seconds or 0.0,
+    )
+
+    scheduler: FairScheduler = app.state.scheduler
+    registry.gauge("dj_gateway_scheduler_queued", "Analyses waiting for a backend slot", scheduler.queued_by_class, label="class")
+    registry.gauge("dj_gateway_scheduler_active", "Analyses holding a backend slot", lambda: dict(scheduler.active_by_class), label="class")
+    registry.counter("dj_gateway_scheduler_dispatched_total", "Analyses granted a backend slot", lambda: dict(scheduler.dispatched_total), label="class")
+    registry.counter(
+        "dj_gateway_scheduler_wait_seconds_total",
+        "Time analyses spent queued for a backend slot",
+        lambda: dict(scheduler.wait_seconds_total),
+        label="class",
+    )
+    return registry
+
+
+def create_app(settings: Optional[GatewaySettings] = None, transport: Optional[httpx.AsyncBaseTransport] = None) -> FastAPI:
+    """Create the gateway application."""
+    settings = settings or GatewaySettings.from_env()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        app.state.backend = httpx.AsyncClient(
+            base_url=settings.backend_url,
+            timeout=settings.upstream_timeout,
+            transport=_TimedTransport(
+                transport or httpx.AsyncHTTPTransport(), app.state.metrics.get("dj_gateway_upstream_duration_seconds"),
+                app.state.routes,
+            ),
+        )
+        if settings.broker_url:
+            app.state.broker = httpx.AsyncClient(
+                base_url=settings.broker_url, timeout=BROKER_TIMEOUT, transport=transport,
+                headers={BROKER_SECRET_HEADER: settings.broker_secret},
+            )
+        try:
+            yield
+        finally:
+            app.state.warmup.cancel()
+            await app.state.backend.aclose()
+            if app.state.broker is not None:
+                await app.state.broker.aclose()
+
+    # The gateway serves the backend's /openapi.json, so its own docs stay off
+    app = FastAPI(title="DJ AI Gateway", lifespan=lifespan, docs_url=None, redoc_url=None, openapi_url=None)
+    app.state.settings = settings
+    app.state.metadata_cache = LRUCache(max_bytes=4 * 1024 * 1024, ttl=settings.metadata_ttl)
+    app.state.analysis_cache = LRUCache(max_bytes=settings.analysis_cache_bytes)
+    app.state.analysis_flights = SingleFlight()
+    app.state.media = MediaSigner(settings.media_secret, settings.media_url_ttl) if settings.media_secret else None
+    app.state.broker = None
+    app.state.broker_tasks = set()
+    app.state.features = (
+        FeatureStore(Path(settings.features_dir) / settings.analysis_cache_version) if settings.features_dir else None
+    )
+    app.state.scheduler = FairScheduler(
+        capacity=settings.scheduler_capacity,
+        weights={INTERACTIVE: settings.interactive_weight, BULK: settings.bulk_weight},
+        tenant_limit=settings.scheduler_tenant_limit,
+        class_limits={BULK: settings.bulk_limit},
+    )
+    app.state.api_limiter = GradientLimiter(
+        initial_limit=min(20, settings.admission_api_max), max_limit=settings.admission_api_max,
+        tolerance=settings.admission_tolerance,
+    )
+    app.state.analysis_limiter = GradientLimiter(
+        initial_limit=min(settings.scheduler_capacity * 4, settings.admission_analysis_max),
+        max_limit=settings.admission_analysis_max, tolerance=settings.admission_tolerance,
+    )
+
+    async def warmup_analysis():
+        response = await app.state.backend.post(
+            "/analyze-track",
+            files={"file": (WARMUP_FILENAME, synthetic_wav(), "audio/wav")},
+            timeout=settings.warmup_timeout,
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"backend returned {response.status_code}")
+
+    app.state.warmup = Warmup(warmup_analysis)
+    app.state.metrics = _register_metrics(app)
+    app.state.routes = RouteLabels()
+    app.state.span_sink = log_span if settings.trace_spans else None
+
+    @app.middleware("http")
+    async def record_latency(request: Request, call_next):
+        metrics: MetricsRegistry = app.state.metrics
+        in_flight = metrics.get("dj_gateway_requests_in_flight")
+        in_flight.inc()
+        started = time.monotonic()
+        status = 500
+        # nginx sets the id; direct calls to the gateway get a fresh one
+        request_id = request.headers.get(REQUEST_ID_HEADER) or new_request_id()
+        with start_trace(request_id, app.state.span_sink) as trace:
+            try:
+                response = await call_next(request)
+                status = response.status_code
+                response.headers[REQUEST_ID_HEADER] = request_id
+                return response
+            finally:
+                in_flight.dec()
+                # Matched route template, except for the catch-all proxy
+                route = request.scope.get("route")
+                path = getattr(route, "path", "/{path:path}")
+                label = app.state.routes(request.url.path, status) if path == "/{path:path}" else path
+                metrics.get("dj_gateway_request_duration_seconds").observe(
+                    time.monotonic() - started, route=label, method=request.method,
+                )
+                metrics.get("dj_gateway_requests_total").inc(route=label, method=request.method, status=status)
+                trace.record("gateway.total", started, route=label, method=request.method, status=status)
+
+    @app.exception_handler(httpx.RequestError)
+    async def backend_unavailable(request: Request, exc: httpx.RequestError):
+        return JSONResponse(status_code=502, content={"detail": f"Backend unavailable: {exc.__class__.__name__}"})
+
+    @app.exception_handler(Overloaded)
+    async def overloaded(request: Request, exc: Overloaded):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": f"{exc.reason}, retry after {exc.retry_after} s"},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+    @app.get("/gateway/health")
+    async def gateway_health():
+        """Liveness of the gateway itself (the backend's /health is proxied)."""
+        return {"status": "healthy"}
+
+    @app.get("/gateway/ready")
+    async def gateway_ready():
+        """Readiness: the backend answers /health and has finished loading its models."""
+        try:
+            upstream = await app.state.backend.get("/health", timeout=READINESS_TIMEOUT)
+        except httpx.RequestError as exc:
+            return JSONResponse(
+                status_code=503,
+                content={"status": "waiting", "detail": f"Backend unavailable: {exc.__class__.__name__}"},
+            )
+        try:
+            payload = upstream.json()
+        except ValueError:
+            payload = None
+        if upstream.status_code != 200 or not backend_ready(payload):
+            return JSONResponse(status_code=503, content={"status": "waiting", "backend": payload})
+        warmup: Warmup = app.state.warmup
+        if settings.warmup and not warmup.poll():
+            return JSONResponse(
+                status_code=503,
+                content={"status": "warming", "attempts": warmup.attempts, "last_error": warmup.last_error},
+            )
+        return {"status": "ready", "backend": payload, "warmup_seconds": warmup.seconds}
+
+    @app.get("/gateway/features/{track_id}")
+    async def stored_features(track_id: str):
+        """Latest analysis of a track from the shared feature store."""
+        features: Optional[FeatureStore] = app.state.features
+        result = features.get_by_track(track_id) if features is not None else None
+        if result is None:
+            return JSONResponse(status_code=404, content={"detail": f"No stored analysis for track {track_id}"})
+        return result
+
+    @app.get("/gateway/media/{content_hash}")
+    async def media_url(request: Request, content_hash: str, filename: str = ""):
+        """Signed URL nginx streams a stored upload from (byte ranges, no Python in the data path).
+
+        Only issued to the tenant that submitted a job for the upload; others
+        get the same 404 as for an unknown hash. nginx drops X-Tenant-ID from
+        client requests, so through nginx the tenant is the client address.
+        """
+        signer: Optional[MediaSigner] = app.state.media
+        if signer is None or not settings.uploads_dir:
+            return JSONResponse(
+                status_code=404, content={"detail": "Media streaming needs GATEWAY_MEDIA_SECRET and GATEWAY_UPLOADS_DIR"},
+            )
+        if not _SHA256_RE.match(content_hash):
+            return JSONResponse(status_code=400, content={"detail": "Expected a lowercase hex SHA-256"})
+        store = job_store()
+        _, tenant = _request_class(request)
+        if not await asyncio.to_thread(store.uploaded_by, content_hash, tenant) \
+                or await asyncio.to_thread(store.blobs.touch, content_hash) is None:
+            return JSONResponse(status_code=404, content={"detail": "Upload not stored"})
+        url, expires = signer.sign(content_hash, filename)
+        return {"url": url, "expires": expires}
+
+    @app.get("/gateway/media-auth", include_in_schema=False)
+    async def media_auth(request: Request):
+        """nginx auth_request target: 204 for a valid signed /media/ URL in X-Original-URI, else 403."""
+        signer: Optional[MediaSigner] = app.state.media
+        verified = signer.verify(request.headers.get("X-Original-URI", "")) if signer is not None else None
+        if verified is None:
+            return Response(status_code=403, headers={"Cache-Control": "max-age=10"})
+        # nginx caches the answer; never past the URL's expiry
+        ttl = max(0, min(MEDIA_AUTH_CACHE_SECONDS, int(verified[1] - time.time())))
+        return Response(status_code=204, headers={"Cache-Control": f"max-age={ttl}"})
+
+    @app.get("/gateway/metrics")
+    async def gateway_metrics():
+        """Prometheus metrics for caching and request coalescing."""
+        return Response(content=app.state.metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+    async def metadata(request: Request) -> Response:
+        key = request.url.path + ("?" + request.url.query if request.url.query else "")
+        cache: LRUCache = app.state.metadata_cache
+        entry = cache.get(key)
+        if entry is not None:
+            return _reply(request, entry, "HIT", max_age=settings.metadata_ttl)
+
+        with app.state.api_limiter.admit() as ticket:
+            upstream = await app.state.backend.get(
+                request.url.path,
+                params=request.query_params,
+                headers=_forward_headers(request),
+            )
+            ticket.ok = upstream.status_code < 500
+        entry = _to_cached(upstream)
+        if upstream.status_code == 200:
+            cache.put(key, entry)
+        return _reply(request, entry, "MISS", max_age=settings.metadata_ttl)
+
+    for path in METADATA_PATHS:
+        app.add_api_route(path, metadata, methods=["GET"], include_in_schema=False)
+
+    def invalid_priority() -> JSONResponse:
+        choices = ", ".join(app.state.scheduler.priorities)
+        return JSONResponse(status_code=400, content={"detail": f"{PRIORITY_HEADER} must be one of {choices}"})
+
+    def analysis_key(content_hash: str, query: str) -> str:
+        return f"{settings.analysis_cache_version}:{content_hash}?{query}"
+
+    def cached_analysis(content_hash: str, query: str) -> Optional[CachedResponse]:
+        """Look in this gateway's LRU, then in the feature store shared by every replica."""
+        key = analysis_key(content_hash, query)
+        entry = app.state.analysis_cache.get(key)
+        features: Optional[FeatureStore] = app.state.features
+        if entry is None and features is not None and not query:
+            body = features.raw_by_hash(content_hash)
+            if body is not None:
+                entry = CachedResponse(200, body)
+                app.state.analysis_cache.put(key, entry)
+        return entry
+
+    async def store_analysis(content_hash: str, query: str, entry: CachedResponse):
+        app.state.analysis_cache.put(analysis_key(content_hash, query), entry)
+        features: Optional[FeatureStore] = app.state.features
+        if features is not None and not query:
+            try:
+                result = json.loads(entry.body)
+            except ValueError:
+                return
+            if isinstance(result, dict):
+                await asyncio.to_thread(features.append, content_hash, result)
+
+    @app.post("/analyze-track")
+    async def analyze_track(request: Request):
+        """Serve repeated analyses from the content-hash cache and coalesce concurrent ones."""
+        flights: SingleFlight = app.state.analysis_flights
+        priority, tenant = _request_class(request)
+        if priority not in app.state.scheduler.priorities:
+            return invalid_priority()
+        query = request.url.query
+        claimed = request.headers.get(CONTENT_HASH_HEADER, "").strip().lower()
+        if claimed:
+            if not _SHA256_RE.match(claimed):
+                return JSONResponse(status_code=400, content={"detail": f"{CONTENT_HASH_HEADER} must be a hex SHA-256 digest"})
+            key = analysis_key(claimed, query)
+            entry = cached_analysis(claimed, query)
+            if entry is not None:
+                return _reply(request, entry, "HIT")
+            # Attach before reading the upload when an identical analysis is running
+            if flights.is_running(key):
+                return _reply(request, await flights.join(key), "COALESCED")
+
+        # Shed load before the upload is read when the backend is saturated
+        with app.state.analysis_limiter.admit() as ticket:
+            return await forward_analysis(request, ticket, priority, tenant, claimed)
+
+    async def forward_analysis(request: Request, ticket: Ticket, priority: str, tenant: str, claimed: str) -> Response:
+        flights: SingleFlight = app.state.analysis_flights
+        scheduler: FairScheduler = app.state.scheduler
+        query = request.url.query
+
+        if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+            with span("gateway.upload"):
+                body = await request.body()
+            queued = time.monotonic()
+            async with scheduler.slot(priority, tenant):
+                record("gateway.queue", queued, priority=priority)
+                with span("gateway.backend"):
+                    upstream = await app.state.backend.post(
+                        "/analyze-track",
+                        params=request.query_params,
+                        content=body,
+                        headers=_forward_headers(request),
+                    )
+            ticket.ok = upstream.status_code < 500
+            return _reply(request, _to_cached(upstream), "BYPASS")
+
+        # Upload transfer from nginx plus hashing; slow here means a slow client or disk
+        with span("gateway.upload"):
+            files, data, digests = await _read_form(request)
+        if claimed and claimed not in digests:
+            ticket.skip()
+            return JSONResponse(status_code=400, content={"detail": f"{CONTENT_HASH_HEADER} does not match the uploaded file"})
+
+        async def analyze() -> CachedResponse:
+            queued = time.monotonic()
+            async with scheduler.slot(priority, tenant):
+                record("gateway.queue", queued, priority=priority)
+                with span("gateway.backend"):
+                    upstream = await app.state.backend.post(
+                        "/analyze-track",
+                        params=request.query_params,
+                        files=files or None,
+                        data=data or None,
+                        headers=_forward_headers(request, drop_content_type=True),
+                    )
+            entry = _to_cached(upstream)
+            if key is not None and upstream.status_code == 200:
+                await store_analysis(digests[0], query, entry)
+            return entry
+
+        key = analysis_key(digests[0], query) if len(digests) == 1 else None
+        if key is None:
+            entry = await analyze()
+            ticket.ok = entry.status_code < 500
+            return _reply(request, entry, "MISS")
+        if not claimed:
+            entry = cached_analysis(digests[0], query)
+            if entry is not None:
+                ticket.skip()
+                return _reply(request, entry, "HIT")
+        entry, shared = await flights.do(key, analyze)
+        ticket.ok = entry.status_code < 500
+        return _reply(request, entry, "COALESCED" if shared else "MISS")
+
+    def job_store() -> JobStore:
+        # Opened on first use so the gateway starts without a jobs volume
+        if getattr(app.state, "jobs", None) is None:
+            blobs = BlobStore(settings.uploads_dir, settings.uploads_max_bytes) if settings.uploads_dir else None
+            app.state.jobs = JobStore(settings.jobs_dir, blobs=blobs)
+        return app.state.jobs
+
+    def queued_jobs() -> int:
+        # Opening the store would create jobs_dir, so report 0 until the queue exists
+        if getattr(app.state, "jobs", None) is None and not (Path(settings.jobs_dir) / "jobs.db").exists():
+            return 0
+        return job_store().queue_depth()
+
+    app.state.metrics.gauge("dj_gateway_jobs_queued", "Analysis jobs waiting for a worker", queued_jobs)
+
+    def remember(job: Job):
+        """Feed finished worker results back into the analysis cache."""
+        if job.status == "done" and job.content_hash and job.result is not None:
+            key = analysis_key(job.content_hash, job.query)
+            if key not in app.state.analysis_cache:
+                app.state.analysis_cache.put(key, CachedResponse(200, json.dumps(job.result).encode()))
+
+    @app.post("/jobs/analyze-track", status_code=202)
+    async def submit_analysis_job(request: Request):
+        """Queue an analysis and return its job id without waiting for the result."""
+        store = job_store()
+        priority, tenant = _request_class(request)
+        if priority not in app.state.scheduler.priorities:
+            return invalid_priority()
+        depth = await asyncio.to_thread(store.queue_depth)
+        if depth >= settings.max_queued_jobs:
+            per_job = app.state.analysis_limiter.retry_after()
+            raise Overloaded(min(60, per_job * max(1, depth // settings.scheduler_capacity)), "Analysis queue is full")
+        job_id = store.new_id()
+        form = await request.form()
+        try:
+            upload = next((value for _, value in form.multi_items() if not isinstance(value, str)), None)
+            if upload is None:
+                return JSONResponse(status_code=422, content={"detail": "Upload the audio file in a multipart form field"})
+            with span("gateway.upload"):
+                if store.blobs is not None:
+                    # Pinned until the job finishes; a duplicate upload reuses the stored blob
+                    content_hash, payload, _ = await asyncio.to_thread(store.blobs.put_stream, upload.file, True)
+                else:
+                    payload = store.payload_path(job_id)
+                    content_hash = await asyncio.to_thread(_save_upload, upload.file, payload)
+
+            def discard_payload():
+                if store.blobs is not None:
+                    store.blobs.unpin(content_hash)
+                else:
+                    payload.unlink()
+
+            claimed = request.headers.get(CONTENT_HASH_HEADER, "").strip().lower()
+            if claimed and claimed != content_hash:
+                discard_payload()
+                return JSONResponse(status_code=400, content={"detail": f"{CONTENT_HASH_HEADER} does not match the uploaded file"})
+
+            query = request.url.query
+            cached = cached_analysis(content_hash, query)
+            if cached is not None and cached.media_type.startswith("application/json"):
+                discard_payload()
+                job = await asyncio.to_thread(
+                    store.submit_done, job_id, content_hash, json.loads(cached.body), tenant=tenant,
+                )
+            else:
+                try:
+                    job = await asyncio.to_thread(
+                        store.submit, job_id, upload.filename, upload.content_type, content_hash, query,
+                        priority=priority, tenant=tenant, payload_path=payload,
+                    )
+                except Exception:
+                    # No job row, so nothing would ever release the pinned upload
+                    await asyncio.to_thread(discard_payload)
+                    raise
+        finally:
+            await form.close()
+
+        status_url = f"{request.headers.get('x-forwarded-prefix', '')}/jobs/{job.id}"
+        return JSONResponse(
+            status_code=202,
+            content={"job_id": job.id, "status": job.status, "status_url": status_url},
+            headers={"Location": status_url},
+        )
+
+    @app.get("/jobs/{job_id}")
+    async def get_job(job_id: str):
+        """Poll the status (and, once done, the result) of an analysis job."""
+        store = job_store()
+        job = await asyncio.to_thread(store.get, job_id)
+        if job is None:
+            return JSONResponse(status_code=404, content={"detail": "Job not found"})
+        remember(job)
+        public = job.to_public()
+        signer: Optional[MediaSigner] = app.state.media
+        # Uploads in the blob store outlive their job, so the deck can stream them
+        if signer is not None and store.blobs is not None and job.status == "done" and job.content_hash:
+            public["media_url"], _ = signer.sign(job.content_hash, job.filename)
+        return public
+
+    async def publish_recommendations(request_body: bytes, response_body: bytes):
+        """Push new recommendations to clients subscribed to ``track:<current_track_id>``."""
+        try:
+            track_id = json.loads(request_body)["current_track_id"]
+            recommendations = json.loads(response_body)
+        except (ValueError, KeyError, TypeError):
+            return
+        event = {"type": "recommendations", "track_id": track_id, "recommendations": recommendations}
+        try:
+            await app.state.broker.post("/publish", json={
+                "topic": f"track:{track_id}", "message": event, "key": "recommendations", "retain": True,
+            })
+        except httpx.HTTPError:
+            pass
+
+    @app.api_route("/{path:path}", methods=PROXY_METHODS, include_in_schema=False)
+    async def proxy(request: Request, path: str):
+        """Forward everything else to the backend untouched."""
+        with app.state.api_limiter.admit() as ticket:
+            upstream = await app.state.backend.request(
+                request.method,
+                "/" + path,
+                params=request.query_params,
+                content=await request.body(),
+                headers=_forward_headers(request),
+            )
+            ticket.ok = upstream.status_code < 500
+        if app.state.broker is not None and request.method == "POST" and path == RECOMMENDATIONS_PATH \
+                and upstream.status_code == 200:
+            # Fire and forget: a broker outage must not slow down or fail the request
+            task = asyncio.ensure_future(publish_recommendations(await request.body(), upstream.content))
+            app.state.broker_tasks.add(task)
+            task.add_done_callback(app.state.broker_tasks.discard)
+        headers = {
+            k: v
+            for k, v in upstream.headers.items()
+            if k.lower() not in HOP_BY_HOP_HEADERS | {"content-length", "content-encoding"}
+        }
+        return Response(content=upstream.content, status_code=upstream.status_code, headers=headers)
+
+    return app
@@ -0,0 +1,103 @@
+# DJ AI App - Gateway Response Cache
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Size-capped LRU store for API metadata and analysis results
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+
+def make_etag(body: bytes) -> str:
+    """Build a strong ETag from a response body."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+@dataclass
+class CachedResponse:
+    """A backend response kept by the gateway."""
+
+    status_code: int
+    body: bytes
+    media_type: str = "application/json"
+    headers: Dict[str, str] = field(default_factory=dict)
+    etag: str = ""
+    stored_at: float = 0.0
+
+    def __post_init__(self):
+        if not self.etag:
+            self.etag = make_etag(self.body)
+
+    @property
+    def size(self) -> int:
+        """Approximate memory footprint used for the byte budget."""
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers.items())
+
+
+class LRUCache:
+    """Byte-capped LRU cache with an optional time-to-live per entry."""
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self._lookup(key) is not None
+
+    def _lookup(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self.ttl is not None and self._clock() - entry.stored_at > self.ttl:
+            self._remove(key)
+            return None
+        return entry
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self.current_bytes -= entry.size
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return a fresh entry and mark it most recently used."""
+        entry = self._lookup(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: CachedResponse) -> bool:
+        """Store an entry, evicting least recently used ones to fit the budget."""
+        if entry.size > self.max_bytes:
+            return False
+        if key in self._entries:
+            self._remove(key)
+        entry.stored_at = self._clock()
+        self._entries[key] = entry
+        self.current_bytes += entry.size
+        while self.current_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+        return True
+
+    def clear(self):
+        """Drop every entry."""
+        self._entries.clear()
+        self.current_bytes = 0
@@ -0,0 +1,107 @@
+# DJ AI App - Gateway Configuration
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Environment-driven settings for the API gateway
+
+import os
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+from ..env import env_bool, env_float, env_int
+
+
+@dataclass
+class GatewaySettings:
+    """Runtime settings for the API gateway."""
+
+    backend_url: str = "http://dj-ai-core:8000"
+    upstream_timeout: float = 600.0
+
+    # Short-TTL cache for API metadata (/, /supported-formats, /openapi.json)
+    metadata_ttl: float = 30.0
+
+    # Content-addressed cache for /analyze-track results
+    analysis_cache_bytes: int = 64 * 1024 * 1024
+    analysis_cache_version: str = "v1"
+
+    # Shared memory-mapped feature store ("" disables it); one store per cache version
+    features_dir: str = ""
+
+    # Content-addressed upload store for job payloads ("" keeps them in jobs_dir)
+    uploads_dir: str = ""
+    uploads_max_bytes: int = 10 * 1024 ** 3
+
+    # Key for the signed /media/ URLs nginx streams uploads from ("" disables them)
+    media_secret: str = ""
+    media_url_ttl: float = 3600.0
+
+    # dj-ai-broker base URL for pushing recommendation updates ("" disables it)
+    broker_url: str = ""
+    # Must match the broker's BROKER_PUBLISH_SECRET
+    broker_secret: str = ""
+
+    # Log timed spans (JSON lines keyed by X-Request-ID) for per-hop latency waterfalls
+    trace_spans: bool = False
+
+    # Asynchronous job mode (queue shared with the dj-ai-worker service)
+    jobs_dir: str = "data/jobs"
+
+    # Analysis scheduling; capacity should match dj-ai-core's API_WORKERS
+    scheduler_capacity: int = 1
+    scheduler_tenant_limit: int = 2
+    scheduler_bulk_limit: int = 0  # 0 keeps one slot free for interactive work
+    interactive_weight: float = 8.0
+    bulk_weight: float = 1.0
+
+    # Adaptive admission control (gradient concurrency limits)
+    admission_api_max: int = 200
+    admission_analysis_max: int = 32
+    admission_tolerance: float = 2.0
+    max_queued_jobs: int = 500
+
+    # Run one analysis before reporting ready, so the first user upload is warm
+    warmup: bool = False
+    warmup_timeout: float = 300.0
+
+    @property
+    def bulk_limit(self) -> int:
+        """Concurrent bulk analyses allowed (always at least one)."""
+        if self.scheduler_bulk_limit > 0:
+            return min(self.scheduler_bulk_limit, self.scheduler_capacity)
+        return max(1, self.scheduler_capacity - 1)
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "GatewaySettings":
+        """Build settings from GATEWAY_* environment variables."""
+        environ = os.environ if environ is None else environ
+        return cls(
+            backend_url=environ.get("GATEWAY_BACKEND_URL", cls.backend_url).rstrip("/"),
+            upstream_timeout=env_float(environ, "GATEWAY_UPSTREAM_TIMEOUT", cls.upstream_timeout),
+            metadata_ttl=env_float(environ, "GATEWAY_METADATA_TTL", cls.metadata_ttl),
+            analysis_cache_bytes=int(
+                env_float(environ, "GATEWAY_ANALYSIS_CACHE_MB", cls.analysis_cache_bytes / (1024 * 1024))
+                * 1024 * 1024
+            ),
+            analysis_cache_version=environ.get("GATEWAY_ANALYSIS_CACHE_VERSION", cls.analysis_cache_version),
+            features_dir=environ.get("GATEWAY_FEATURES_DIR", cls.features_dir),
+            uploads_dir=environ.get("GATEWAY_UPLOADS_DIR", cls.uploads_dir),
+            uploads_max_bytes=int(
+                env_float(environ, "GATEWAY_UPLOADS_MAX_MB", cls.uploads_max_bytes / (1024 * 1024)) * 1024 * 1024
+            ),
+            media_secret=environ.get("GATEWAY_MEDIA_SECRET", cls.media_secret),
+            media_url_ttl=env_float(environ, "GATEWAY_MEDIA_URL_TTL", cls.media_url_ttl),
+            broker_url=environ.get("GATEWAY_BROKER_URL", cls.broker_url).rstrip("/"),
+            broker_secret=environ.get("GATEWAY_BROKER_SECRET", cls.broker_secret),
+            trace_spans=env_bool(environ, "GATEWAY_TRACE_SPANS", cls.trace_spans),
+            jobs_dir=environ.get("GATEWAY_JOBS_DIR", cls.jobs_dir),
+            scheduler_capacity=env_int(environ, "GATEWAY_SCHEDULER_CAPACITY", cls.scheduler_capacity),
+            scheduler_tenant_limit=env_int(environ, "GATEWAY_SCHEDULER_TENANT_LIMIT", cls.scheduler_tenant_limit),
+            scheduler_bulk_limit=env_int(environ, "GATEWAY_SCHEDULER_BULK_LIMIT", cls.scheduler_bulk_limit),
+            interactive_weight=env_float(environ, "GATEWAY_INTERACTIVE_WEIGHT", cls.interactive_weight),
+            bulk_weight=env_float(environ, "GATEWAY_BULK_WEIGHT", cls.bulk_weight),
+            admission_api_max=env_int(environ, "GATEWAY_ADMISSION_API_MAX", cls.admission_api_max),
+            admission_analysis_max=env_int(environ, "GATEWAY_ADMISSION_ANALYSIS_MAX", cls.admission_analysis_max),
+            admission_tolerance=env_float(environ, "GATEWAY_ADMISSION_TOLERANCE", cls.admission_tolerance),
+            max_queued_jobs=env_int(environ, "GATEWAY_MAX_QUEUED_JOBS", cls.max_queued_jobs),
+            warmup=env_bool(environ, "GATEWAY_WARMUP", cls.warmup),
+            warmup_timeout=env_float(environ, "GATEWAY_WARMUP_TIMEOUT", cls.warmup_timeout),
+        )
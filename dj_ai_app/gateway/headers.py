@@ -0,0 +1,13 @@
+# DJ AI App - Gateway Headers
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Request header names shared by the gateway, the broker and the Python client
+
+# Header the client tooling uses to announce the SHA-256 of the uploaded file
+CONTENT_HASH_HEADER = "X-Content-SHA256"
+
+# Scheduling class ("interactive" or "bulk") and tenant of an analysis
+PRIORITY_HEADER = "X-Priority"
+TENANT_HEADER = "X-Tenant-ID"
+
+# Shared secret services send with dj-ai-broker's POST /publish
+BROKER_SECRET_HEADER = "X-Broker-Secret"
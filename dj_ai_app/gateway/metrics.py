@@ -0,0 +1,196 @@
+# DJ AI App - Gateway Metrics
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Minimal Prometheus text-format metrics for the gateway
+
+import bisect
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Seconds; analyses run for minutes, metadata calls for milliseconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+# Shared label of proxied paths the backend does not know, and of routes past the cap
+OTHER_ROUTE = "other"
+
+_ID_SEGMENT = re.compile(r"^(?:\d+|[0-9a-f]{16,}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$", re.IGNORECASE)
+
+
+def route_label(path: str, max_segments: int = 3) -> str:
+    """Low-cardinality route for a request path: ids become ``:id``, deep paths are cut."""
+    segments = [":id" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/") if segment]
+    return "/" + "/".join(segments[:max_segments])
+
+
+class RouteLabels:
+    """``route_label`` for arbitrary proxied paths with a fixed number of label values.
+
+    A 404 is labelled ``"other"`` (a scanner's random paths never name a
+    real route), and so is every route after the first ``limit`` seen.
+    """
+
+    def __init__(self, limit: int = 100):
+        self.limit = limit
+        self._seen: Set[str] = set()
+
+    def __call__(self, path: str, status: Optional[int] = None) -> str:
+        if status == 404:
+            return OTHER_ROUTE
+        label = route_label(path)
+        if label not in self._seen:
+            if len(self._seen) >= self.limit:
+                return OTHER_ROUTE
+            self._seen.add(label)
+        return label
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    pairs = ",".join('{}="{}"'.format(name, value.replace("\\", "\\\\").replace('"', '\\"')) for name, value in key)
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """A named time series family, optionally read from a callback.
+
+    With ``label`` set, the callback returns ``{label_value: value}``.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, func: Optional[Callable[[], Any]] = None, label: Optional[str] = None):
+        self.name = name
+        self.help_text = help_text
+        self.func = func
+        self.label = label
+        self._values: Dict[LabelKey, float] = {}
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def value(self, **labels) -> float:
+        """Current value of one series."""
+        if self.func is not None:
+            value = self.func()
+            return float(value[labels[self.label]] if self.label else value)
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        if self.func is not None:
+            value = self.func()
+            if self.label is None:
+                return [(self.name, (), float(value))]
+            return [(self.name, ((self.label, str(k)),), float(v)) for k, v in sorted(value.items())]
+        return [(self.name, key, value) for key, value in sorted(self._values.items())]
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for name, key, value in self.samples():
+            lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Observations counted into cumulative ``le`` buckets, plus their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts (last is +Inf), sum, count]
+        self._series: Dict[LabelKey, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def value(self, **labels) -> float:
+        """Number of observations in one series."""
+        series = self._series.get(self._key(labels))
+        return float(series[2]) if series else 0.0
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        samples = []
+        for key, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                samples.append((f"{self.name}_bucket", key + (("le", le),), cumulative))
+            samples.append((f"{self.name}_sum", key, total))
+            samples.append((f"{self.name}_count", key, count))
+        return samples
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on /gateway/metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, func: Optional[Callable[[], Any]] = None, label: Optional[str] = None) -> Counter:
+        return self._register(Counter(name, help_text, func, label))
+
+    def gauge(self, name: str, help_text: str, func: Optional[Callable[[], Any]] = None, label: Optional[str] = None) -> Gauge:
+        return self._register(Gauge(name, help_text, func, label))
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, buckets))
+
+    def get(self, name: str) -> Metric:
+        return self._metrics[name]
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
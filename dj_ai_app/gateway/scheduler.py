@@ -0,0 +1,139 @@
+# DJ AI App - Analysis Scheduler
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Weighted fair queuing of analyses between interactive and bulk traffic
+
+import asyncio
+import bisect
+import itertools
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+DEFAULT_WEIGHTS = {INTERACTIVE: 8.0, BULK: 1.0}
+
+
+@dataclass(order=True)
+class _Waiter:
+    tag: float
+    seq: int
+    priority: str = field(compare=False)
+    tenant: str = field(compare=False)
+    future: "asyncio.Future" = field(compare=False)
+    queued_at: float = field(compare=False)
+
+
+class FairScheduler:
+    """Hand out ``capacity`` backend slots by weighted fair queuing.
+
+    Every request gets a virtual finish tag of ``start + 1 / weight`` for its
+    priority class, and free slots go to the lowest tag whose tenant and
+    class are under their concurrency caps. Capping the bulk class below
+    ``capacity`` keeps a slot free for interactive uploads, while an idle
+    interactive class lets bulk work use everything it is allowed.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1,
+        weights: Optional[Dict[str, float]] = None,
+        tenant_limit: int = 2,
+        class_limits: Optional[Dict[str, int]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if capacity < 1:
+            raise ValueError("Scheduler capacity must be at least 1")
+        self.capacity = capacity
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self.tenant_limit = tenant_limit
+        self.class_limits = dict(class_limits or {})
+        self._clock = clock
+        self._seq = itertools.count()
+        self._vtime = 0.0
+        self._last_finish: Dict[str, float] = defaultdict(float)
+        self._waiters: List[_Waiter] = []
+        self.active = 0
+        self.active_by_class: Dict[str, int] = defaultdict(int)
+        self.active_by_tenant: Dict[str, int] = defaultdict(int)
+        self.dispatched_total: Dict[str, int] = defaultdict(int)
+        self.wait_seconds_total: Dict[str, float] = defaultdict(float)
+
+    @property
+    def priorities(self) -> List[str]:
+        return list(self.weights)
+
+    def queued_by_class(self) -> Dict[str, int]:
+        counts = {priority: 0 for priority in self.weights}
+        for waiter in self._waiters:
+            counts[waiter.priority] += 1
+        return counts
+
+    def _tag(self, priority: str) -> float:
+        start = max(self._vtime, self._last_finish[priority])
+        finish = start + 1.0 / self.weights[priority]
+        self._last_finish[priority] = finish
+        return finish
+
+    def _eligible(self, priority: str, tenant: str) -> bool:
+        return (
+            self.active < self.capacity
+            and self.active_by_class[priority] < self.class_limits.get(priority, self.capacity)
+            and self.active_by_tenant[tenant] < self.tenant_limit
+        )
+
+    def _grant(self, waiter: _Waiter):
+        self._vtime = max(self._vtime, waiter.tag - 1.0 / self.weights[waiter.priority])
+        self.active += 1
+        self.active_by_class[waiter.priority] += 1
+        self.active_by_tenant[waiter.tenant] += 1
+        self.dispatched_total[waiter.priority] += 1
+        self.wait_seconds_total[waiter.priority] += self._clock() - waiter.queued_at
+
+    def _dispatch(self):
+        index = 0
+        while index < len(self._waiters) and self.active < self.capacity:
+            waiter = self._waiters[index]
+            if waiter.future.done() or not self._eligible(waiter.priority, waiter.tenant):
+                index += 1
+                continue
+            self._waiters.pop(index)
+            self._grant(waiter)
+            waiter.future.set_result(None)
+
+    async def acquire(self, priority: str, tenant: str):
+        """Wait for a backend slot for ``tenant`` in class ``priority``."""
+        if priority not in self.weights:
+            raise ValueError(f"Unknown priority {priority!r}; expected one of {', '.join(self.weights)}")
+        waiter = _Waiter(
+            self._tag(priority), next(self._seq), priority, tenant,
+            asyncio.get_running_loop().create_future(), self._clock(),
+        )
+        bisect.insort(self._waiters, waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just before the caller went away: hand the slot on
+                self.release(priority, tenant)
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, priority: str, tenant: str):
+        """Return a slot and wake the next eligible waiter."""
+        self.active -= 1
+        self.active_by_class[priority] -= 1
+        self.active_by_tenant[tenant] -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: str, tenant: str) -> AsyncIterator[None]:
+        await self.acquire(priority, tenant)
+        try:
+            yield
+        finally:
+            self.release(priority, tenant)
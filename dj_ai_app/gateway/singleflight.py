@@ -0,0 +1,76 @@
+# DJ AI App - Request Coalescing
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Share one in-flight analysis between concurrent identical uploads
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class _Call:
+    """One in-progress upstream call and the followers attached to it."""
+
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.waiting = 0
+        self.followers = 0
+
+
+class SingleFlight:
+    """Run at most one call per key; concurrent callers share its result."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._calls: Dict[str, _Call] = {}
+        self.leaders_total = 0
+        self.coalesced_total = 0
+        self.seconds_saved_total = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct keys currently being computed."""
+        return len(self._calls)
+
+    @property
+    def waiters(self) -> int:
+        """Followers currently waiting on a leader."""
+        return sum(call.waiting for call in self._calls.values())
+
+    def is_running(self, key: str) -> bool:
+        return key in self._calls
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        started = self._clock()
+        try:
+            return await fn()
+        finally:
+            call = self._calls.pop(key)
+            # Every follower would have paid the leader's upstream time again
+            self.seconds_saved_total += (self._clock() - started) * call.followers
+
+    async def join(self, key: str) -> Any:
+        """Wait for the call already running under ``key`` and share its result."""
+        call = self._calls[key]
+        call.followers += 1
+        call.waiting += 1
+        self.coalesced_total += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiting -= 1
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Return ``(result, shared)``; ``shared`` is True for followers.
+
+        The upstream call runs in its own task, so a leader whose client
+        disconnects does not cancel the work its followers are waiting for.
+        """
+        if key in self._calls:
+            return await self.join(key), True
+
+        task = asyncio.ensure_future(self._run(key, fn))
+        # Consume failures nobody awaits so asyncio does not log them
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        call = self._calls[key] = _Call(task)
+        self.leaders_total += 1
+        return await asyncio.shield(call.task), False
@@ -0,0 +1,108 @@
+# DJ AI App - Request Tracing
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Request ids and timed spans written as JSON log lines
+
+import json
+import logging
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional
+
+# Set by nginx (or generated here), forwarded to dj-ai-core and echoed to clients
+REQUEST_ID_HEADER = "X-Request-ID"
+
+SpanSink = Callable[[dict], None]
+
+_current: ContextVar[Optional["Trace"]] = ContextVar("dj_ai_trace", default=None)
+
+span_logger = logging.getLogger("dj_ai_app.spans")
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex
+
+
+def log_span(span: dict):
+    """Write one span as a bare JSON line on stdout, next to dj-ai-core's LOG_FORMAT=json logs."""
+    if not span_logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        span_logger.addHandler(handler)
+        span_logger.setLevel(logging.INFO)
+        span_logger.propagate = False
+    span_logger.info(json.dumps(span, separators=(",", ":")))
+
+
+class Trace:
+    """Spans of one request; each is emitted as soon as it ends.
+
+    Span lines look like ``{"event": "span", "service": "gateway",
+    "request_id": ..., "span": "gateway.backend", "start": <epoch s>,
+    "duration": <s>}``; dj-ai-core is expected to log its stages the same way.
+    """
+
+    def __init__(self, request_id: str, sink: Optional[SpanSink] = None, service: str = "gateway"):
+        self.request_id = request_id
+        self.service = service
+        self._sink = sink
+        self.spans: List[dict] = []
+
+    def record(self, name: str, started: float, **fields):
+        """Emit a span that began at ``started`` (``time.monotonic()``) and ends now."""
+        if self._sink is None:
+            return
+        duration = time.monotonic() - started
+        span = {
+            "event": "span", "service": self.service, "request_id": self.request_id, "span": name,
+            "start": round(time.time() - duration, 6), "duration": round(duration, 6), **fields,
+        }
+        self.spans.append(span)
+        self._sink(span)
+
+    @contextmanager
+    def span(self, name: str, **fields) -> Iterator[None]:
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(name, started, **fields)
+
+
+@contextmanager
+def start_trace(request_id: str, sink: Optional[SpanSink]) -> Iterator[Trace]:
+    """Make a trace current for one request; without a sink only the request id is kept."""
+    trace = Trace(request_id, sink)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+def current_request_id() -> Optional[str]:
+    trace = _current.get()
+    return trace.request_id if trace is not None else None
+
+
+@contextmanager
+def span(name: str, **fields) -> Iterator[None]:
+    """Time a block as a span of the current request, if it is traced."""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    with trace.span(name, **fields):
+        yield
+
+
+def record(name: str, started: float, **fields):
+    trace = _current.get()
+    if trace is not None:
+        trace.record(name, started, **fields)
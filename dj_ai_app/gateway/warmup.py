@@ -0,0 +1,58 @@
+# DJ AI App - Gateway Warm-up
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Gate readiness on one successful warm-up analysis
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """Run a warm-up coroutine in the background, retrying until it succeeds once.
+
+    Readiness probes call poll(); the first call starts the warm-up, later
+    calls report whether it has finished. A failed attempt is logged and
+    restarted by the next probe, so a backend that is still loading models
+    simply keeps the gateway not-ready.
+    """
+
+    def __init__(self, run: Callable[[], Awaitable[None]], clock: Callable[[], float] = time.monotonic):
+        self._run = run
+        self._clock = clock
+        self._task: Optional[asyncio.Task] = None
+        self.done = False
+        self.attempts = 0
+        self.seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    async def _timed(self):
+        started = self._clock()
+        await self._run()
+        self.seconds = self._clock() - started
+
+    def poll(self) -> bool:
+        """Start or check the warm-up; True once it has succeeded."""
+        if self.done:
+            return True
+        if self._task is None:
+            self.attempts += 1
+            self._task = asyncio.ensure_future(self._timed())
+            return False
+        if not self._task.done():
+            return False
+        error = None if self._task.cancelled() else self._task.exception()
+        self._task = None
+        if error is None:
+            self.done = True
+            logger.info("Warm-up analysis finished in %.2fs", self.seconds or 0.0)
+            return True
+        self.last_error = f"{error.__class__.__name__}: {error}"
+        logger.warning("Warm-up attempt %d failed: %s", self.attempts, self.last_error)
+        return False
+
+    def cancel(self):
+        if self._task is not None:
+            self._task.cancel()
@@ -0,0 +1,18 @@
+# DJ AI App - Analysis Jobs
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Local job queue and worker pool for asynchronous track analysis
+
+"""Asynchronous analysis jobs backed by a local SQLite queue."""
+
+from .store import Job, JobStore
+
+__all__ = ["Job", "JobStore", "JobWorker", "WorkerSettings"]
+
+
+def __getattr__(name):
+    # The worker needs httpx; the queue itself (gateway, broker, upload store) does not
+    if name in ("JobWorker", "WorkerSettings"):
+        from . import worker
+
+        return getattr(worker, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,34 @@
+# DJ AI App - Worker Entrypoint
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Run the analysis worker pool (python -m dj_ai_app.jobs)
+
+import asyncio
+import logging
+import os
+import signal
+
+from ..blobs import BlobStore
+from .store import JobStore
+from .worker import JobWorker, WorkerSettings
+
+
+async def _serve(worker: JobWorker):
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+    await worker.run_forever()
+
+
+def main():
+    """Start the worker pool on the shared job queue."""
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO"),
+        format="%(asctime)s [%(levelname)8s] %(name)s: %(message)s",
+    )
+    settings = WorkerSettings.from_env()
+    blobs = BlobStore(settings.uploads_dir, settings.uploads_max_bytes) if settings.uploads_dir else None
+    asyncio.run(_serve(JobWorker(JobStore(settings.jobs_dir, blobs=blobs), settings)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+# DJ AI App - Job Store
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: SQLite-backed job queue shared by the gateway and the worker pool
+
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from ..blobs import BlobStore
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+FINISHED_STATES = (DONE, FAILED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    payload_path TEXT,
+    filename TEXT,
+    content_type TEXT,
+    content_hash TEXT,
+    query TEXT NOT NULL DEFAULT '',
+    priority TEXT NOT NULL DEFAULT 'interactive',
+    tenant TEXT,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_content_hash ON jobs (content_hash);
+"""
+
+# Columns added after the first release, applied to existing queues on open
+_MIGRATIONS = {
+    "priority": "ALTER TABLE jobs ADD COLUMN priority TEXT NOT NULL DEFAULT 'interactive'",
+    "tenant": "ALTER TABLE jobs ADD COLUMN tenant TEXT",
+}
+
+
+@dataclass
+class Job:
+    """One queued analysis."""
+
+    id: str
+    kind: str
+    status: str
+    stage: str
+    progress: float
+    payload_path: Optional[str]
+    filename: Optional[str]
+    content_type: Optional[str]
+    content_hash: Optional[str]
+    query: str
+    priority: str
+    tenant: Optional[str]
+    result: Optional[Any]
+    error: Optional[str]
+    attempts: int
+    worker: Optional[str]
+    created_at: float
+    updated_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        data = dict(row)
+        if data["result"] is not None:
+            data["result"] = json.loads(data["result"])
+        return cls(**data)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def to_public(self) -> Dict[str, Any]:
+        """Fields returned to API clients (no filesystem paths)."""
+        data = asdict(self)
+        for private in ("payload_path", "worker", "attempts"):
+            data.pop(private)
+        return data
+
+    def to_event(self) -> Dict[str, Any]:
+        """Progress message pushed to WebSocket subscribers (result and error once finished)."""
+        event = {"type": "job", "job_id": self.id, "status": self.status, "stage": self.stage, "progress": self.progress}
+        if self.finished:
+            event["result"] = self.result
+            event["error"] = self.error
+        return event
+
+
+class JobStore:
+    """Durable job queue in ``<root>/jobs.db`` with upload payloads next to it.
+
+    Every call opens its own connection, so one store can be shared by
+    threads in the gateway and by separate worker processes. With a
+    ``blobs`` store, payloads live there instead: jobs pin their upload
+    while queued and unpin it when they finish, so re-analysis of the same
+    file finds it until the LRU budget evicts it.
+    """
+
+    def __init__(self, root: Union[str, Path], blobs: Optional[BlobStore] = None):
+        self.root = Path(root)
+        self.blobs = blobs
+        self.payload_dir = self.root / "payloads"
+        self.payload_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root / "jobs.db"
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, statement in _MIGRATIONS.items():
+                if column not in columns:
+                    conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def payload_path(self, job_id: str) -> Path:
+        return self.payload_dir / job_id
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    def submit(
+        self,
+        job_id: str,
+        filename: Optional[str],
+        content_type: Optional[str],
+        content_hash: Optional[str],
+        query: str = "",
+        kind: str = "analyze-track",
+        priority: str = "interactive",
+        tenant: Optional[str] = None,
+        payload_path: Optional[Union[str, Path]] = None,
+    ) -> Job:
+        """Queue a job whose upload was already written to ``payload_path`` (default ``payload_path(job_id)``)."""
+        now = time.time()
+        payload_path = payload_path or self.payload_path(job_id)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, stage, payload_path, filename, content_type,"
+                " content_hash, query, priority, tenant, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, QUEUED, str(payload_path), filename, content_type,
+                 content_hash, query, priority, tenant, now, now),
+            )
+        return self.get(job_id)
+
+    def submit_done(
+        self, job_id: str, content_hash: Optional[str], result: Any, kind: str = "analyze-track",
+        tenant: Optional[str] = None,
+    ) -> Job:
+        """Record a job that was answered without running (e.g. a cache hit)."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, stage, progress, content_hash, tenant, result,"
+                " created_at, updated_at, finished_at) VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, DONE, DONE, content_hash, tenant, json.dumps(result), now, now, now),
+            )
+        return self.get(job_id)
+
+    def uploaded_by(self, content_hash: str, tenant: str) -> bool:
+        """Whether ``tenant`` submitted a job for this upload."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT 1 FROM jobs WHERE content_hash = ? AND tenant = ? LIMIT 1", (content_hash, tenant),
+            ).fetchone()
+        return row is not None
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.from_row(row) if row else None
+
+    def get_many(self, job_ids: Iterable[str]) -> List[Job]:
+        ids = list(job_ids)
+        if not ids:
+            return []
+        placeholders = ",".join("?" for _ in ids)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(f"SELECT * FROM jobs WHERE id IN ({placeholders})", ids).fetchall()
+        return [Job.from_row(row) for row in rows]
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """Atomically move the next queued job to running.
+
+        Interactive jobs are claimed before bulk ones; the gateway's fair
+        scheduler then arbitrates between the analyses workers send it.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ?"
+                " ORDER BY CASE priority WHEN 'interactive' THEN 0 ELSE 1 END, created_at LIMIT 1",
+                (QUEUED,),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, stage = ?, worker = ?, attempts = attempts + 1,"
+                " started_at = ?, updated_at = ? WHERE id = ?",
+                (RUNNING, "starting", worker, now, now, row["id"]),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return self.get(row["id"])
+
+    def update_progress(self, job_id: str, stage: str, progress: float):
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET stage = ?, progress = ?, updated_at = ? WHERE id = ?",
+                (stage, progress, time.time(), job_id),
+            )
+
+    def heartbeat(self, job_id: str):
+        """Show that a running job's worker is still alive."""
+        with closing(self._connect()) as conn:
+            conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (time.time(), job_id))
+
+    def release(self, job_id: str, count_attempt: bool = True):
+        """Put a running job back in the queue after a transient failure.
+
+        ``count_attempt=False`` refunds the claim, for backpressure (503)
+        that says nothing about whether the job itself can succeed.
+        """
+        refund = 0 if count_attempt else 1
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, stage = ?, progress = 0, worker = NULL, attempts = attempts - ?,"
+                " updated_at = ? WHERE id = ?",
+                (QUEUED, QUEUED, refund, time.time(), job_id),
+            )
+
+    def _finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None):
+        now = time.time()
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT payload_path, content_hash FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            conn.execute(
+                "UPDATE jobs SET status = ?, stage = ?, progress = 1, result = ?, error = ?,"
+                " finished_at = ?, updated_at = ? WHERE id = ?",
+                (status, status, None if result is None else json.dumps(result), error, now, now, job_id),
+            )
+        self._release_payload(job_id, row["payload_path"] if row else None, row["content_hash"] if row else None)
+
+    def _release_payload(self, job_id: str, payload: Optional[str], content_hash: Optional[str]):
+        """A finished job's upload: unpin a shared blob, delete a private payload."""
+        if payload and self.blobs is not None and content_hash and self.blobs.contains(payload):
+            # Shared, deduplicated upload: keep it for re-analysis, let the LRU decide
+            self.blobs.unpin(content_hash)
+            return
+        try:
+            os.remove(payload or self.payload_path(job_id))
+        except FileNotFoundError:
+            pass
+
+    def complete(self, job_id: str, result: Any):
+        self._finish(job_id, DONE, result=result)
+
+    def fail(self, job_id: str, error: str):
+        self._finish(job_id, FAILED, error=error)
+
+    def requeue_stale(self, older_than: float, max_attempts: int = 3) -> int:
+        """Return running jobs abandoned by a dead worker to the queue."""
+        cutoff = time.time() - older_than
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # Out of attempts: fail them, and release their uploads like fail() does
+            exhausted = conn.execute(
+                "SELECT id, payload_path, content_hash FROM jobs WHERE status = ? AND updated_at < ? AND attempts >= ?",
+                (RUNNING, cutoff, max_attempts),
+            ).fetchall()
+            now = time.time()
+            conn.executemany(
+                "UPDATE jobs SET status = ?, stage = ?, progress = 1, error = 'worker lost', finished_at = ?,"
+                " updated_at = ? WHERE id = ?",
+                [(FAILED, FAILED, now, now, row["id"]) for row in exhausted],
+            )
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, stage = ?, worker = NULL, updated_at = ?"
+                " WHERE status = ? AND updated_at < ?",
+                (QUEUED, QUEUED, now, RUNNING, cutoff),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        for row in exhausted:
+            self._release_payload(row["id"], row["payload_path"], row["content_hash"])
+        return cursor.rowcount
+
+    def queue_depth(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
@@ -0,0 +1,222 @@
+# DJ AI App - Analysis Worker Pool
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Drain the local job queue by running analyses through the gateway
+
+import asyncio
+import logging
+import os
+import socket
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Tuple
+
+import httpx
+
+from ..env import env_float, env_int
+from ..gateway.headers import CONTENT_HASH_HEADER, PRIORITY_HEADER, TENANT_HEADER
+from ..pcm import PCMCache
+from ..peaks import DEFAULT_LEVELS, PeaksStore, parse_levels
+from .store import Job, JobStore
+
+logger = logging.getLogger(__name__)
+
+# Admission control shed the request; retry after the server's Retry-After
+SHED_STATUSES = (429, 503)
+
+
+def _job_headers(job: Job) -> Dict[str, str]:
+    """Carry the job's scheduling class through the gateway."""
+    headers = {PRIORITY_HEADER: job.priority}
+    if job.tenant:
+        headers[TENANT_HEADER] = job.tenant
+    if job.content_hash:
+        headers[CONTENT_HASH_HEADER] = job.content_hash
+    return headers
+
+
+def _retry_after(response: httpx.Response, ceiling: float) -> float:
+    try:
+        delay = float(response.headers.get("Retry-After", 1))
+    except ValueError:
+        delay = 1.0
+    return max(0.0, min(ceiling, delay))
+
+
+@dataclass
+class WorkerSettings:
+    """Runtime settings for the dj-ai-worker service."""
+
+    jobs_dir: str = "data/jobs"
+    # Same upload store as the gateway ("" when payloads live in jobs_dir)
+    uploads_dir: str = ""
+    uploads_max_bytes: int = 10 * 1024 ** 3
+    # Point at dj-ai-gateway so jobs share its cache and fair scheduler
+    backend_url: str = "http://dj-ai-gateway:8080"
+    concurrency: int = 2
+    poll_interval: float = 0.5
+    heartbeat_interval: float = 10.0
+    stale_after: float = 120.0
+    max_attempts: int = 3
+    upstream_timeout: float = 600.0
+    max_backoff: float = 60.0
+    # Waveform peaks written before analysis ("" to skip); nginx serves them under /peaks/
+    peaks_dir: str = ""
+    peaks_levels: Tuple[int, ...] = DEFAULT_LEVELS
+    # Decoded samples behind the peaks, so regenerating them skips ffmpeg;
+    # dj-ai-core decodes uploads itself and never reads this cache
+    pcm_cache_dir: str = ""
+    pcm_cache_max_bytes: int = 4 * 1024 ** 3
+    sample_rate: int = 22050
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "WorkerSettings":
+        """Build settings from WORKER_* environment variables."""
+        environ = os.environ if environ is None else environ
+        return cls(
+            jobs_dir=environ.get("WORKER_JOBS_DIR", cls.jobs_dir),
+            uploads_dir=environ.get("WORKER_UPLOADS_DIR", cls.uploads_dir),
+            uploads_max_bytes=int(
+                env_float(environ, "WORKER_UPLOADS_MAX_MB", cls.uploads_max_bytes / (1024 * 1024)) * 1024 * 1024
+            ),
+            backend_url=environ.get("WORKER_BACKEND_URL", cls.backend_url).rstrip("/"),
+            concurrency=env_int(environ, "WORKER_CONCURRENCY", cls.concurrency),
+            poll_interval=env_float(environ, "WORKER_POLL_INTERVAL", cls.poll_interval),
+            heartbeat_interval=env_float(environ, "WORKER_HEARTBEAT_INTERVAL", cls.heartbeat_interval),
+            stale_after=env_float(environ, "WORKER_STALE_AFTER", cls.stale_after),
+            max_attempts=env_int(environ, "WORKER_MAX_ATTEMPTS", cls.max_attempts),
+            upstream_timeout=env_float(environ, "WORKER_UPSTREAM_TIMEOUT", cls.upstream_timeout),
+            max_backoff=env_float(environ, "WORKER_MAX_BACKOFF", cls.max_backoff),
+            peaks_dir=environ.get("WORKER_PEAKS_DIR", cls.peaks_dir),
+            peaks_levels=parse_levels(environ.get("WORKER_PEAKS_LEVELS", "")) or cls.peaks_levels,
+            pcm_cache_dir=environ.get("WORKER_PCM_CACHE_DIR", cls.pcm_cache_dir),
+            pcm_cache_max_bytes=int(
+                env_float(environ, "WORKER_PCM_CACHE_MAX_MB", cls.pcm_cache_max_bytes / (1024 * 1024)) * 1024 * 1024
+            ),
+            sample_rate=env_int(environ, "SAMPLE_RATE", cls.sample_rate),
+        )
+
+
+class JobWorker:
+    """Pool of ``concurrency`` loops that claim queued jobs and analyse them."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        settings: Optional[WorkerSettings] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        name: Optional[str] = None,
+    ):
+        self.store = store
+        self.settings = settings or WorkerSettings()
+        self.transport = transport
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.peaks = PeaksStore(self.settings.peaks_dir, self.settings.peaks_levels) if self.settings.peaks_dir else None
+        self.pcm_cache = (
+            PCMCache(self.settings.pcm_cache_dir, self.settings.pcm_cache_max_bytes)
+            if self.settings.pcm_cache_dir else None
+        )
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """Finish the jobs in progress, then return from run_forever()."""
+        self._stopping.set()
+
+    async def run_forever(self):
+        async with httpx.AsyncClient(
+            base_url=self.settings.backend_url,
+            timeout=self.settings.upstream_timeout,
+            transport=self.transport,
+        ) as client:
+            loops = [self._loop(client, slot) for slot in range(self.settings.concurrency)]
+            await asyncio.gather(self._reaper(), *loops)
+
+    async def _sleep(self, seconds: float):
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _reaper(self):
+        while not self._stopping.is_set():
+            requeued = await asyncio.to_thread(self.store.requeue_stale, self.settings.stale_after, self.settings.max_attempts)
+            if requeued:
+                logger.warning("Requeued %d jobs abandoned by a lost worker", requeued)
+            await self._sleep(self.settings.stale_after / 2)
+
+    async def _loop(self, client: httpx.AsyncClient, slot: int):
+        worker = f"{self.name}/{slot}"
+        while not self._stopping.is_set():
+            job = await asyncio.to_thread(self.store.claim, worker)
+            if job is None:
+                await self._sleep(self.settings.poll_interval)
+                continue
+            try:
+                await self.process(client, job)
+            except Exception as exc:
+                # One broken job must not take the pool (and the reaper) down with it
+                logger.exception("Job %s failed unexpectedly", job.id)
+                try:
+                    await asyncio.to_thread(self.store.fail, job.id, f"Worker error: {exc.__class__.__name__}: {exc}")
+                except Exception:
+                    logger.exception("Could not mark job %s failed; the reaper will requeue it", job.id)
+
+    async def _heartbeat(self, job_id: str):
+        while True:
+            await asyncio.sleep(self.settings.heartbeat_interval)
+            await asyncio.to_thread(self.store.heartbeat, job_id)
+
+    async def _waveform(self, job: Job):
+        """Write the track's peaks; the waveform is drawable before its analysis is done."""
+        if self.peaks is None or not job.content_hash or self.peaks.exists(job.content_hash):
+            return
+        try:
+            await asyncio.to_thread(
+                self.peaks.generate, job.content_hash, job.payload_path, self.settings.sample_rate, self.pcm_cache,
+            )
+        except Exception as exc:
+            # The analysis does not depend on the waveform
+            logger.warning("No waveform peaks for job %s: %s", job.id, exc)
+
+    async def process(self, client: httpx.AsyncClient, job: Job):
+        """Run one claimed job to completion, failure or requeue."""
+        logger.info("Analysing job %s (%s)", job.id, job.filename)
+        heartbeat = asyncio.ensure_future(self._heartbeat(job.id))
+        try:
+            # Before the upload is posted: finishing the job releases its payload
+            await self._waveform(job)
+            await asyncio.to_thread(self.store.update_progress, job.id, "analyzing", 0.1)
+            with open(job.payload_path, "rb") as payload:
+                response = await client.post(
+                    "/analyze-track",
+                    params=job.query or None,
+                    headers=_job_headers(job),
+                    files={"file": (job.filename or job.id, payload, job.content_type or "application/octet-stream")},
+                )
+        except httpx.RequestError as exc:
+            if job.attempts < self.settings.max_attempts:
+                logger.warning("Job %s hit %s, requeueing", job.id, exc.__class__.__name__)
+                await asyncio.to_thread(self.store.release, job.id)
+            else:
+                await asyncio.to_thread(self.store.fail, job.id, f"Backend unavailable: {exc.__class__.__name__}")
+            return
+        except FileNotFoundError:
+            await asyncio.to_thread(self.store.fail, job.id, "Upload payload is missing")
+            return
+        finally:
+            heartbeat.cancel()
+
+        if response.status_code == 200:
+            try:
+                result = response.json()
+            except ValueError:
+                await asyncio.to_thread(self.store.fail, job.id, f"Backend returned invalid JSON: {response.text[:500]}")
+                return
+            await asyncio.to_thread(self.store.complete, job.id, result)
+        elif response.status_code in SHED_STATUSES:
+            delay = _retry_after(response, self.settings.max_backoff)
+            logger.info("Gateway shed job %s, backing off %.0fs", job.id, delay)
+            await self._sleep(delay)
+            await asyncio.to_thread(self.store.release, job.id, False)
+        else:
+            await asyncio.to_thread(
+                self.store.fail, job.id, f"Backend returned {response.status_code}: {response.text[:500]}"
+            )
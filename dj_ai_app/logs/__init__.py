@@ -0,0 +1,20 @@
+# DJ AI App - Log Analytics
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Streaming service log follower with rolling latency and error-rate aggregates
+
+"""Follow service logs incrementally and query rolling per-endpoint aggregates."""
+
+from .aggregates import LogAggregator, percentile, render_stats
+from .events import LogEvent, parse_line
+from .follower import LogFollower, compose_logs_command, read_lines
+
+__all__ = [
+    "LogAggregator",
+    "LogEvent",
+    "LogFollower",
+    "compose_logs_command",
+    "parse_line",
+    "percentile",
+    "read_lines",
+    "render_stats",
+]
@@ -0,0 +1,53 @@
+# DJ AI App - Log Analytics Entrypoint
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Rolling per-endpoint latency and error rates from logs (python -m dj_ai_app.logs)
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from .aggregates import LogAggregator, render_stats
+from .follower import LogFollower
+
+
+def main(argv=None) -> int:
+    """Summarise log files or stdin; with --follow, reprint the table as files grow."""
+    parser = argparse.ArgumentParser(
+        description="Per-endpoint request counts, 5xx rates and latency percentiles from service logs",
+        epilog="Example: docker compose logs --no-color --no-log-prefix nginx | python -m dj_ai_app.logs",
+    )
+    parser.add_argument("logs", nargs="*", help="Log files, named after their service by file stem (default: stdin)")
+    parser.add_argument("--window", type=float, default=300.0, help="Rolling window in seconds (0 for the whole log)")
+    parser.add_argument("--follow", action="store_true", help="Keep following the files and reprint every --interval")
+    parser.add_argument("--interval", type=float, default=10.0, help="Seconds between tables with --follow")
+    parser.add_argument("--max-error-rate", type=float, help="Exit 1 when the overall 5xx rate reaches this fraction")
+    args = parser.parse_args(argv)
+
+    follower = LogFollower(LogAggregator(window=args.window or None))
+    if not args.logs:
+        follower.process_stream(sys.stdin.buffer, "stdin")
+    elif args.follow:
+        for path in args.logs:
+            follower.follow_file(path, Path(path).stem)
+        try:
+            while True:
+                time.sleep(args.interval)
+                print(render_stats(follower.aggregator), end="\n\n", flush=True)
+        except KeyboardInterrupt:
+            follower.stop()
+    else:
+        for path in args.logs:
+            follower.process_file(path, Path(path).stem)
+
+    print(render_stats(follower.aggregator))
+    if args.max_error_rate is not None:
+        stats = follower.aggregator.stats()
+        if stats["count"] and stats["error_rate"] >= args.max_error_rate:
+            print(f"5xx rate {stats['error_rate']:.2%} reached --max-error-rate {args.max_error_rate:.2%}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
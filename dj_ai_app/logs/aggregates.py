@@ -0,0 +1,177 @@
+# DJ AI App - Rolling Log Aggregates
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Bounded per-endpoint latency and error-rate windows built from log events
+
+import math
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .events import LogEvent
+
+# Endpoints beyond the cap are folded into this one so memory stays bounded
+OTHER_ENDPOINT = "other"
+
+
+def percentile(sorted_values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+class EndpointWindow:
+    """The last ``max_samples`` requests of one endpoint plus lifetime totals."""
+
+    def __init__(self, max_samples: int):
+        # (event time, duration or None, is_error)
+        self.samples: Deque[Tuple[float, Optional[float], bool]] = deque(maxlen=max_samples)
+        self.total = 0
+        self.errors_total = 0
+
+    def add(self, when: float, duration: Optional[float], error: bool):
+        self.samples.append((when, duration, error))
+        self.total += 1
+        self.errors_total += error
+
+    def summary(self, since: Optional[float] = None) -> Dict[str, Optional[float]]:
+        samples = [s for s in self.samples if since is None or s[0] >= since]
+        durations = sorted(d for _, d, _ in samples if d is not None)
+        errors = sum(1 for _, _, error in samples if error)
+        return {
+            "count": len(samples),
+            "errors": errors,
+            "error_rate": errors / len(samples) if samples else 0.0,
+            "p50": percentile(durations, 50),
+            "p95": percentile(durations, 95),
+            "p99": percentile(durations, 99),
+            "max": durations[-1] if durations else None,
+            "total": self.total,
+            "errors_total": self.errors_total,
+        }
+
+
+class LogAggregator:
+    """Rolling per-endpoint latency and error rates, level counts and recent lines.
+
+    Memory is fixed by ``max_samples`` per endpoint, ``max_endpoints`` and
+    ``recent_lines`` per service, however many lines are fed. The rolling
+    window is measured in event time (the newest event seen), so replaying
+    an old log gives the same answers as following it live.
+    """
+
+    def __init__(
+        self,
+        window: Optional[float] = 300.0,
+        max_samples: int = 4096,
+        max_endpoints: int = 256,
+        recent_lines: int = 500,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.window = window
+        self.max_samples = max_samples
+        self.max_endpoints = max_endpoints
+        self.recent_lines = recent_lines
+        self._clock = clock
+        self._endpoints: Dict[str, EndpointWindow] = {}
+        self._recent: Dict[str, Deque[str]] = {}
+        self.levels: Counter = Counter()
+        self.lines_total = 0
+        self.latest: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def add(self, event: LogEvent):
+        with self._lock:
+            self.lines_total += 1
+            self.levels[(event.service, event.level)] += 1
+            recent = self._recent.get(event.service)
+            if recent is None:
+                recent = self._recent[event.service] = deque(maxlen=self.recent_lines)
+            recent.append(event.message)
+            when = event.timestamp if event.timestamp is not None else self._clock()
+            self.latest = when if self.latest is None else max(self.latest, when)
+            if event.endpoint is None:
+                return
+            key = event.endpoint
+            if key not in self._endpoints and len(self._endpoints) >= self.max_endpoints:
+                key = OTHER_ENDPOINT
+            window = self._endpoints.get(key)
+            if window is None:
+                window = self._endpoints[key] = EndpointWindow(self.max_samples)
+            window.add(when, event.duration, event.is_error)
+
+    def _since(self) -> Optional[float]:
+        if self.window is None or self.latest is None:
+            return None
+        return self.latest - self.window
+
+    def endpoints(self) -> List[str]:
+        with self._lock:
+            return sorted(self._endpoints)
+
+    def stats(self, endpoint: Optional[str] = None) -> Dict[str, Optional[float]]:
+        """Rolling summary of one endpoint, or of all endpoints together."""
+        with self._lock:
+            since = self._since()
+            if endpoint is not None:
+                window = self._endpoints.get(endpoint)
+                return (window or EndpointWindow(1)).summary(since)
+            merged = EndpointWindow(self.max_samples * max(1, len(self._endpoints)))
+            for window in self._endpoints.values():
+                for sample in window.samples:
+                    merged.samples.append(sample)
+                merged.total += window.total
+                merged.errors_total += window.errors_total
+            return merged.summary(since)
+
+    def recent(self, service: str, lines: Optional[int] = None) -> List[str]:
+        """Latest messages of one service, oldest first."""
+        with self._lock:
+            messages = list(self._recent.get(service, ()))
+        return messages if lines is None else messages[-lines:]
+
+    def count(self, service: Optional[str] = None, level: Optional[str] = None) -> int:
+        with self._lock:
+            return sum(
+                n for (s, lvl), n in self.levels.items()
+                if (service is None or s == service) and (level is None or lvl == level)
+            )
+
+    def assert_error_rate_below(self, max_rate: float, endpoint: Optional[str] = None, min_requests: int = 1):
+        """Test assertion on the rolling 5xx rate."""
+        stats = self.stats(endpoint)
+        assert stats["count"] >= min_requests, (
+            f"Expected at least {min_requests} requests to {endpoint or 'any endpoint'}, saw {stats['count']}"
+        )
+        assert stats["error_rate"] < max_rate, (
+            f"Error rate of {endpoint or 'all endpoints'} is {stats['error_rate']:.1%} "
+            f"({stats['errors']} of {stats['count']}), expected below {max_rate:.1%}"
+        )
+
+    def assert_latency_below(self, seconds: float, endpoint: Optional[str] = None, quantile: int = 95):
+        """Test assertion on a rolling latency percentile (50, 95 or 99)."""
+        stats = self.stats(endpoint)
+        value = stats[f"p{quantile}"]
+        assert value is not None, f"No latency samples for {endpoint or 'any endpoint'}"
+        assert value < seconds, f"p{quantile} of {endpoint or 'all endpoints'} is {value:.3f} s, expected below {seconds} s"
+
+
+def render_stats(aggregator: LogAggregator) -> str:
+    """Text table of the rolling window, one row per endpoint."""
+    endpoints = aggregator.endpoints()
+    if not endpoints:
+        return "No request log lines in the input"
+
+    def ms(value):
+        return f"{value * 1000:>10.1f}" if value is not None else f"{'-':>10}"
+
+    header = f"{'endpoint':<40}{'count':>8}{'5xx %':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    rows = []
+    for endpoint in endpoints:
+        stats = aggregator.stats(endpoint)
+        rows.append(
+            f"{endpoint:<40}{stats['count']:>8}{stats['error_rate'] * 100:>8.2f}"
+            f"{ms(stats['p50'])}{ms(stats['p95'])}{ms(stats['p99'])}"
+        )
+    return "\n".join([header] + rows)
@@ -0,0 +1,134 @@
+# DJ AI App - Log Events
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Parse service log lines (JSON or plain text) into structured events
+
+import json
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from ..gateway.metrics import route_label
+
+# `docker compose logs` prefix ("dj-ai-core  | ") when --no-log-prefix is not used
+_PREFIX_RE = re.compile(r"^(?P<service>[\w.-]+)\s+\|\s?")
+_LEVEL_RE = re.compile(r"\b(CRITICAL|ERROR|WARNING|WARN|INFO|DEBUG)\b")
+# uvicorn access lines: '... "GET /health HTTP/1.1" 200 ...'
+_ACCESS_RE = re.compile(r'"(?P<method>[A-Z]+) (?P<path>\S+) HTTP/[\d.]+" (?P<status>\d{3})')
+
+
+@dataclass
+class LogEvent:
+    """One log line reduced to the fields the aggregates need.
+
+    ``endpoint`` is set for request log lines (nginx access, gateway
+    ``gateway.total`` spans, backend access logs) and ``duration`` when the
+    line carries a latency.
+    """
+
+    service: str
+    message: str
+    level: str = "INFO"
+    timestamp: Optional[float] = None
+    endpoint: Optional[str] = None
+    status: Optional[int] = None
+    duration: Optional[float] = None
+    request_id: Optional[str] = None
+
+    @property
+    def is_error(self) -> bool:
+        if self.status is not None:
+            return self.status >= 500
+        return self.level in ("ERROR", "CRITICAL")
+
+
+def _first(entry: dict, *names):
+    for name in names:
+        value = entry.get(name)
+        if value not in (None, "", "-"):
+            return value
+    return None
+
+
+def _timestamp(value) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _duration(entry: dict) -> Optional[float]:
+    try:
+        seconds = _first(entry, "request_time", "duration", "process_time", "elapsed")
+        if seconds is not None:
+            return float(seconds)
+        milliseconds = _first(entry, "duration_ms", "latency_ms")
+        return float(milliseconds) / 1000 if milliseconds is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _endpoint(method, path) -> Optional[str]:
+    if not path:
+        return None
+    path = str(path).split("?", 1)[0]
+    return f"{method} {route_label(path)}" if method else route_label(path)
+
+
+def parse_line(service: str, line: str) -> Optional[LogEvent]:
+    """Structured event for one line; None for blank lines."""
+    line = line.rstrip("\r\n")
+    prefix = _PREFIX_RE.match(line)
+    if prefix and not line.startswith("{"):
+        service, line = prefix.group("service"), line[prefix.end():]
+    if not line.strip():
+        return None
+
+    start = line.find("{")
+    entry = None
+    if start >= 0:
+        try:
+            entry = json.loads(line[start:])
+        except ValueError:
+            entry = None
+    if not isinstance(entry, dict):
+        level = _LEVEL_RE.search(line)
+        access = _ACCESS_RE.search(line)
+        return LogEvent(
+            service=service,
+            message=line,
+            level="WARNING" if level and level.group(1) == "WARN" else (level.group(1) if level else "INFO"),
+            endpoint=_endpoint(access.group("method"), access.group("path")) if access else None,
+            status=int(access.group("status")) if access else None,
+        )
+
+    level = str(_first(entry, "level", "levelname", "severity") or "INFO").upper()
+    event = LogEvent(
+        service=str(entry.get("service") or service),
+        message=str(_first(entry, "message", "msg") or line),
+        level="WARNING" if level == "WARN" else level,
+        timestamp=_timestamp(_first(entry, "msec", "timestamp", "time", "start")),
+        request_id=_first(entry, "request_id"),
+    )
+    if entry.get("event") == "span":
+        # Only the span covering the whole request describes the endpoint
+        if entry.get("span") != "gateway.total":
+            event.duration = _duration(entry)
+            return event
+        event.endpoint = _endpoint(entry.get("method"), entry.get("route"))
+    else:
+        event.endpoint = _endpoint(_first(entry, "method", "request_method"), _first(entry, "uri", "path", "route", "url"))
+    status = _first(entry, "status", "status_code")
+    if status is not None:
+        try:
+            event.status = int(status)
+        except (TypeError, ValueError):
+            pass
+    event.duration = _duration(entry)
+    return event
@@ -0,0 +1,183 @@
+# DJ AI App - Streaming Log Follower
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Tail service logs incrementally into rolling aggregates with bounded memory
+
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, List, Optional, Sequence, Union
+
+from .aggregates import LogAggregator
+from .events import LogEvent, parse_line
+
+# Longer lines are cut; the rest of the line is skipped, never buffered
+MAX_LINE_BYTES = 64 * 1024
+
+
+def read_lines(stream: BinaryIO, max_line_bytes: int = MAX_LINE_BYTES) -> Iterator[str]:
+    """Decoded lines of a binary stream, holding at most one (capped) line in memory."""
+    while True:
+        line = stream.readline(max_line_bytes)
+        if not line:
+            return
+        if not line.endswith(b"\n") and len(line) >= max_line_bytes:
+            # Drain the oversized remainder without keeping it
+            rest = line
+            while rest and not rest.endswith(b"\n"):
+                rest = stream.readline(max_line_bytes)
+        yield line.decode("utf-8", errors="replace")
+
+
+def compose_logs_command(
+    service: str, follow: bool = True, tail: str = "all", compose: str = "docker-compose", files: Sequence[str] = (),
+) -> List[str]:
+    """``docker-compose logs`` for one service, without the prefix so lines parse as-is."""
+    command = compose.split()
+    for path in files:
+        command += ["-f", path]
+    command += ["logs", "--no-color", "--no-log-prefix", "--tail", str(tail)]
+    if follow:
+        command.append("--follow")
+    return command + [service]
+
+
+class LogFollower:
+    """Feeds log sources into a :class:`LogAggregator`.
+
+    Sources are a file (followed across truncation and replacement, like
+    ``tail -F``) or a command's stdout (``docker-compose logs --follow``).
+    Each runs in a daemon thread and never buffers more than one line, so
+    multi-GB logs from soak runs cost no more memory than short ones.
+    """
+
+    def __init__(self, aggregator: Optional[LogAggregator] = None, poll_interval: float = 0.2):
+        self.aggregator = aggregator or LogAggregator()
+        self.poll_interval = poll_interval
+        self._threads: List[threading.Thread] = []
+        self._processes: List[subprocess.Popen] = []
+        self._stopping = threading.Event()
+        self._changed = threading.Condition()
+        self._listeners: List[Callable[[LogEvent], None]] = []
+
+    def _feed(self, service: str, line: str):
+        event = parse_line(service, line)
+        if event is None:
+            return
+        self.aggregator.add(event)
+        for listener in list(self._listeners):
+            listener(event)
+        with self._changed:
+            self._changed.notify_all()
+
+    def process_stream(self, stream: BinaryIO, service: str) -> int:
+        """Read a binary stream to its end synchronously; returns lines read."""
+        lines = 0
+        for line in read_lines(stream):
+            self._feed(service, line)
+            lines += 1
+        return lines
+
+    def process_file(self, path: Union[str, Path], service: str) -> int:
+        """Read a whole log file (offline analysis of a soak run)."""
+        with open(path, "rb") as f:
+            return self.process_stream(f, service)
+
+    def process_command(self, command: Sequence[str], service: str) -> int:
+        """Stream a finite command's stdout (e.g. ``logs --tail N``) without buffering it."""
+        with subprocess.Popen(list(command), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as process:
+            return self.process_stream(process.stdout, service)
+
+    def _follow_file(self, path: Path, service: str, from_start: bool):
+        inode, offset, skipping = None, None, False
+        while not self._stopping.is_set():
+            try:
+                f = open(path, "rb")
+            except FileNotFoundError:
+                self._stopping.wait(self.poll_interval)
+                continue
+            with f:
+                stat = os.fstat(f.fileno())
+                if stat.st_ino != inode or offset is None or stat.st_size < offset:
+                    # First open, rotation or truncation: start over (or at the end)
+                    offset = 0 if from_start or inode is not None else stat.st_size
+                    inode = stat.st_ino
+                f.seek(offset)
+                while not self._stopping.is_set():
+                    line = f.readline(MAX_LINE_BYTES)
+                    complete = line.endswith(b"\n")
+                    if not complete and len(line) < MAX_LINE_BYTES:
+                        # Partial line: wait for the writer to finish it
+                        f.seek(offset)
+                        break
+                    offset = f.tell()
+                    if not skipping:
+                        self._feed(service, line.decode("utf-8", errors="replace"))
+                    # An oversized line is fed cut; its remainder is skipped
+                    skipping = not complete
+            self._stopping.wait(self.poll_interval)
+
+    def _follow_command(self, command: Sequence[str], service: str):
+        process = subprocess.Popen(list(command), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self._processes.append(process)
+        try:
+            for line in read_lines(process.stdout):
+                if self._stopping.is_set():
+                    break
+                self._feed(service, line)
+        finally:
+            process.stdout.close()
+
+    def _start(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        return thread
+
+    def follow_file(self, path: Union[str, Path], service: str, from_start: bool = True) -> "LogFollower":
+        self._start(self._follow_file, Path(path), service, from_start)
+        return self
+
+    def follow_command(self, command: Sequence[str], service: str) -> "LogFollower":
+        self._start(self._follow_command, command, service)
+        return self
+
+    def follow_compose(self, services: Sequence[str], tail: str = "all", **kwargs) -> "LogFollower":
+        """Follow ``docker-compose logs`` of each service (one process per service)."""
+        for service in services:
+            self.follow_command(compose_logs_command(service, tail=tail, **kwargs), service)
+        return self
+
+    def add_listener(self, listener: Callable[[LogEvent], None]):
+        self._listeners.append(listener)
+
+    def wait_for(self, predicate: Callable[[LogAggregator], bool], timeout: float = 30.0) -> bool:
+        """Block until ``predicate(aggregator)`` holds or the timeout passes."""
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while not predicate(self.aggregator):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._changed.wait(min(remaining, self.poll_interval))
+        return True
+
+    def stop(self, timeout: float = 5.0):
+        self._stopping.set()
+        for process in self._processes:
+            if process.poll() is None:
+                process.terminate()
+        for thread in self._threads:
+            thread.join(timeout)
+        for process in self._processes:
+            try:
+                process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def __enter__(self) -> "LogFollower":
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,20 @@
+# DJ AI App - Health Monitor
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Long-running endpoint prober with rolling availability and latency SLOs
+
+"""Health monitor: concurrent probes, per-endpoint history and SLOs over HTTP."""
+
+from .app import create_app
+from .config import DEFAULT_TARGETS, MonitorSettings, parse_targets
+from .history import Probe, ProbeHistory
+from .monitor import HealthMonitor
+
+__all__ = [
+    "DEFAULT_TARGETS",
+    "HealthMonitor",
+    "MonitorSettings",
+    "Probe",
+    "ProbeHistory",
+    "create_app",
+    "parse_targets",
+]
@@ -0,0 +1,25 @@
+# DJ AI App - Health Monitor Entrypoint
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Run the health monitor with uvicorn (python -m dj_ai_app.monitor)
+
+import os
+
+import uvicorn
+
+from .app import create_app
+from .config import MonitorSettings
+
+
+def main():
+    """Start the monitor on MONITOR_HOST:MONITOR_PORT (local only by default)."""
+    # One process: probe history lives in memory
+    uvicorn.run(
+        create_app(MonitorSettings.from_env()),
+        host=os.environ.get("MONITOR_HOST", "127.0.0.1"),
+        port=int(os.environ.get("MONITOR_PORT", "9410")),
+        log_level=os.environ.get("LOG_LEVEL", "INFO").lower(),
+    )
+
+
+if __name__ == "__main__":
+    main()
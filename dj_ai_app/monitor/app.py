@@ -0,0 +1,103 @@
+# DJ AI App - Health Monitor Application
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Serve rolling availability and latency SLOs of every service endpoint
+
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import httpx
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import Response
+
+from ..gateway.metrics import CONTENT_TYPE, MetricsRegistry
+from .config import MonitorSettings
+from .monitor import HealthMonitor
+
+
+def _register_metrics(app: FastAPI) -> MetricsRegistry:
+    """Per-target gauges computed from the probe history at scrape time."""
+    registry = MetricsRegistry()
+
+    def per_target(field: str):
+        def collect():
+            monitor: Optional[HealthMonitor] = app.state.monitor
+            if monitor is None:
+                return {}
+            values = {name: monitor.summary(name)[field] for name in monitor.settings.targets}
+            return {name: float(value) for name, value in values.items() if value is not None}
+        return collect
+
+    registry.gauge("dj_monitor_up", "Whether the last probe succeeded", per_target("up"), label="target")
+    registry.gauge("dj_monitor_availability_ratio", "Successful probes in the SLO window", per_target("availability"), label="target")
+    registry.gauge("dj_monitor_error_budget_remaining", "Unused share of the availability error budget", per_target("error_budget_remaining"), label="target")
+    registry.gauge("dj_monitor_latency_p50_seconds", "Median probe latency in the SLO window", per_target("p50"), label="target")
+    registry.gauge("dj_monitor_latency_p95_seconds", "95th percentile probe latency in the SLO window", per_target("p95"), label="target")
+    return registry
+
+
+def create_app(
+    settings: Optional[MonitorSettings] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> FastAPI:
+    """Create the monitor application; probing runs for as long as the app does."""
+    settings = settings or MonitorSettings.from_env()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        async with httpx.AsyncClient(timeout=settings.timeout, transport=transport) as client:
+            app.state.monitor = HealthMonitor(settings, client)
+            task = asyncio.create_task(app.state.monitor.run())
+            try:
+                yield
+            finally:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+
+    app = FastAPI(title="DJ AI Health Monitor", lifespan=lifespan, docs_url=None, redoc_url=None, openapi_url=None)
+    app.state.settings = settings
+    app.state.monitor = None
+    app.state.metrics = _register_metrics(app)
+
+    def monitor() -> HealthMonitor:
+        if app.state.monitor is None:
+            raise HTTPException(status_code=503, detail="Monitor is not running")
+        return app.state.monitor
+
+    @app.get("/slo")
+    async def slo():
+        """Rolling SLO summary of every target."""
+        return monitor().status()
+
+    @app.get("/slo/{target}")
+    async def slo_target(
+        target: str,
+        buckets: int = Query(12, ge=1, le=360),
+        window: Optional[float] = Query(None, gt=0),
+        samples: int = Query(20, ge=0, le=10_000),
+    ):
+        """One target: SLO summary, latency/availability trend and the latest probes."""
+        current = monitor()
+        if target not in current.histories:
+            raise HTTPException(status_code=404, detail=f"Unknown target: {target}")
+        probes = list(current.histories[target].probes)[-samples:] if samples else []
+        return {
+            "target": target,
+            **current.summary(target),
+            "trend": current.trend(target, buckets, window),
+            "samples": [
+                {"time": p.time, "latency": p.latency, "ok": p.ok, "status": p.status, "error": p.error} for p in probes
+            ],
+        }
+
+    @app.get("/metrics")
+    async def metrics():
+        return Response(content=app.state.metrics.render(), media_type=CONTENT_TYPE)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    return app
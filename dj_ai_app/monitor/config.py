@@ -0,0 +1,62 @@
+# DJ AI App - Health Monitor Configuration
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Environment-driven probe targets, cadence and SLO objectives
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional
+
+from ..env import env_float, env_int
+
+# The endpoints scripts/health-check.ps1 checks, as seen from inside the compose network
+DEFAULT_TARGETS = {
+    "backend": "http://dj-ai-core:8000/health",
+    "docs": "http://dj-ai-core:8000/docs",
+    "frontend": "http://dj-ai-frontend:3000/",
+    "nginx": "http://nginx/health",
+}
+
+
+def parse_targets(value: str) -> Dict[str, str]:
+    """``name=url,name=url`` into an ordered mapping."""
+    targets = {}
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, sep, url = entry.partition("=")
+        if not sep or not name.strip() or not url.strip():
+            raise ValueError(f"Monitor target must look like name=url, got {entry!r}")
+        targets[name.strip()] = url.strip()
+    return targets
+
+
+@dataclass
+class MonitorSettings:
+    """What to probe, how often, and the objectives probes are judged against."""
+
+    targets: Dict[str, str] = field(default_factory=lambda: dict(DEFAULT_TARGETS))
+    interval: float = 5.0
+    timeout: float = 2.0
+    # Probes kept per target (one hour at the default interval)
+    history: int = 720
+    # Rolling SLO window in seconds
+    window: float = 300.0
+    availability_objective: float = 0.999
+    latency_objective: float = 0.5
+    latency_quantile: int = 95
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "MonitorSettings":
+        environ = os.environ if environ is None else environ
+        targets = environ.get("MONITOR_TARGETS", "")
+        return cls(
+            targets=parse_targets(targets) if targets.strip() else dict(DEFAULT_TARGETS),
+            interval=env_float(environ, "MONITOR_INTERVAL", cls.interval),
+            timeout=env_float(environ, "MONITOR_TIMEOUT", cls.timeout),
+            history=env_int(environ, "MONITOR_HISTORY", cls.history),
+            window=env_float(environ, "MONITOR_WINDOW", cls.window),
+            availability_objective=env_float(environ, "MONITOR_AVAILABILITY_SLO", cls.availability_objective),
+            latency_objective=env_float(environ, "MONITOR_LATENCY_SLO_MS", cls.latency_objective * 1000) / 1000,
+            latency_quantile=env_int(environ, "MONITOR_LATENCY_QUANTILE", cls.latency_quantile),
+        )
@@ -0,0 +1,93 @@
+# DJ AI App - Probe History
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Fixed-size ring buffer of probe results with rolling SLO and trend summaries
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional
+
+from ..logs import percentile
+
+
+@dataclass(frozen=True)
+class Probe:
+    """One probe of one endpoint."""
+
+    time: float
+    latency: float
+    ok: bool
+    status: Optional[int] = None
+    error: Optional[str] = None
+
+
+class ProbeHistory:
+    """The last ``size`` probes of one endpoint; older probes fall off the ring."""
+
+    def __init__(self, size: int):
+        self.probes: Deque[Probe] = deque(maxlen=size)
+        self.consecutive_failures = 0
+
+    def add(self, probe: Probe):
+        self.probes.append(probe)
+        self.consecutive_failures = 0 if probe.ok else self.consecutive_failures + 1
+
+    def since(self, start: Optional[float]) -> List[Probe]:
+        return [p for p in self.probes if start is None or p.time >= start]
+
+    def summary(
+        self,
+        since: Optional[float] = None,
+        availability_objective: float = 0.999,
+        latency_objective: float = 0.5,
+        latency_quantile: int = 95,
+    ) -> Dict[str, object]:
+        """Availability and latency SLIs over the probes since ``since``, judged against the objectives.
+
+        ``error_budget_remaining`` is the share of the allowed failures not
+        yet used (1.0 untouched, negative once the objective is missed).
+        Latency percentiles only count successful probes.
+        """
+        probes = self.since(since)
+        failures = sum(1 for p in probes if not p.ok)
+        latencies = sorted(p.latency for p in probes if p.ok)
+        availability = 1 - failures / len(probes) if probes else None
+        latency = percentile(latencies, latency_quantile)
+        budget = 1 - availability_objective
+        last = self.probes[-1] if self.probes else None
+        return {
+            "probes": len(probes),
+            "failures": failures,
+            "availability": availability,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "error_budget_remaining": (
+                1 - (failures / len(probes)) / budget if probes and budget > 0 else None
+            ),
+            "availability_met": availability is not None and availability >= availability_objective,
+            "latency_met": latency is not None and latency <= latency_objective,
+            "up": last.ok if last else None,
+            "last_status": last.status if last else None,
+            "last_error": last.error if last else None,
+            "last_latency": last.latency if last else None,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+    def trend(self, start: float, end: float, buckets: int) -> List[Dict[str, object]]:
+        """Availability and latency per equal slice of ``[start, end]``, oldest first."""
+        width = (end - start) / buckets
+        slices: List[List[Probe]] = [[] for _ in range(buckets)]
+        for probe in self.probes:
+            if start <= probe.time <= end:
+                slices[min(buckets - 1, int((probe.time - start) / width))].append(probe)
+        trend = []
+        for i, probes in enumerate(slices):
+            latencies = sorted(p.latency for p in probes if p.ok)
+            trend.append({
+                "start": start + i * width,
+                "probes": len(probes),
+                "availability": sum(p.ok for p in probes) / len(probes) if probes else None,
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+            })
+        return trend
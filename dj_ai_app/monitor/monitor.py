@@ -0,0 +1,95 @@
+# DJ AI App - Health Monitor
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Probe every service endpoint concurrently on a fixed cadence
+
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from .config import MonitorSettings
+from .history import Probe, ProbeHistory
+
+
+class HealthMonitor:
+    """Probes all targets at once every ``interval`` seconds and keeps their history.
+
+    Ticks are scheduled at a fixed rate rather than "sleep after probing",
+    so slow probes do not stretch the cadence; a tick that falls behind by
+    more than one interval is skipped instead of fired in a burst.
+    """
+
+    def __init__(self, settings: MonitorSettings, client: httpx.AsyncClient, clock: Callable[[], float] = time.time):
+        self.settings = settings
+        self.client = client
+        self._clock = clock
+        self.histories: Dict[str, ProbeHistory] = {name: ProbeHistory(settings.history) for name in settings.targets}
+        self.ticks = 0
+
+    async def probe(self, name: str) -> Probe:
+        url = self.settings.targets[name]
+        when = self._clock()
+        started = time.monotonic()
+        try:
+            response = await self.client.get(url, timeout=self.settings.timeout)
+        except httpx.HTTPError as exc:
+            probe = Probe(when, time.monotonic() - started, False, error=type(exc).__name__)
+        else:
+            ok = 200 <= response.status_code < 400
+            probe = Probe(when, time.monotonic() - started, ok, status=response.status_code,
+                          error=None if ok else f"HTTP {response.status_code}")
+        self.histories[name].add(probe)
+        return probe
+
+    async def probe_all(self) -> List[Probe]:
+        probes = await asyncio.gather(*(self.probe(name) for name in self.settings.targets))
+        self.ticks += 1
+        return list(probes)
+
+    async def run(self):
+        """Probe until cancelled."""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            await self.probe_all()
+            next_tick += self.settings.interval
+            now = loop.time()
+            if next_tick < now:
+                next_tick = now
+            await asyncio.sleep(next_tick - now)
+
+    def _since(self) -> Optional[float]:
+        return self._clock() - self.settings.window if self.settings.window else None
+
+    def summary(self, name: str) -> Dict[str, object]:
+        settings = self.settings
+        return {
+            "url": settings.targets[name],
+            **self.histories[name].summary(
+                self._since(), settings.availability_objective, settings.latency_objective, settings.latency_quantile,
+            ),
+        }
+
+    def status(self) -> Dict[str, object]:
+        """Every target's rolling SLO summary."""
+        settings = self.settings
+        targets = {name: self.summary(name) for name in settings.targets}
+        return {
+            "time": self._clock(),
+            "window_seconds": settings.window,
+            "objectives": {
+                "availability": settings.availability_objective,
+                "latency_seconds": settings.latency_objective,
+                "latency_quantile": settings.latency_quantile,
+            },
+            # Targets not probed yet do not count against health
+            "healthy": all(t["probes"] == 0 or (t["up"] and t["availability_met"]) for t in targets.values()),
+            "targets": targets,
+        }
+
+    def trend(self, name: str, buckets: int = 12, window: Optional[float] = None) -> List[Dict[str, object]]:
+        """Per-slice availability and latency of one target over ``window`` (the whole history by default)."""
+        end = self._clock()
+        window = window or self.settings.history * self.settings.interval
+        return self.histories[name].trend(end - window, end, buckets)
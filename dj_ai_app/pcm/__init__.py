@@ -0,0 +1,9 @@
+# DJ AI App - Decoded PCM Cache
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Decode each upload once and share the samples through memory maps
+
+"""Memory-mapped cache of decoded, resampled mono PCM."""
+
+from .cache import DecodeError, PCMCache, ffmpeg_decode, npy_header, parse_npy_header
+
+__all__ = ["DecodeError", "PCMCache", "ffmpeg_decode", "npy_header", "parse_npy_header"]
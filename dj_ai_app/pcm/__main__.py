@@ -0,0 +1,50 @@
+# DJ AI App - PCM Cache Entrypoint
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Pre-decode stored uploads into the worker's PCM cache (python -m dj_ai_app.pcm)
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+from ..env import env_float, env_int
+from .cache import DecodeError, PCMCache
+
+logger = logging.getLogger("dj_ai_app.pcm")
+
+
+def main(argv=None) -> int:
+    """Decode every blob in the upload store that is not cached yet."""
+    parser = argparse.ArgumentParser(description="Fill the decoded-PCM cache from the upload store")
+    parser.add_argument("uploads", nargs="?", default=os.environ.get("BLOBS_DIR", "data/uploads"))
+    parser.add_argument("--cache", default=os.environ.get("PCM_CACHE_DIR", "data/pcm"))
+    parser.add_argument("--sample-rate", type=int, default=env_int(os.environ, "SAMPLE_RATE", 22050))
+    parser.add_argument("--max-mb", type=float, default=env_float(os.environ, "PCM_CACHE_MAX_MB", 4096))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO"),
+        format="%(asctime)s [%(levelname)8s] %(name)s: %(message)s",
+    )
+    cache = PCMCache(args.cache, max_bytes=int(args.max_mb * 1024 * 1024))
+    decoded = cached = failed = 0
+    for blob in sorted(Path(args.uploads).glob("sha256/*/*/*")):
+        if cache.path(blob.name, args.sample_rate).exists():
+            cached += 1
+            continue
+        try:
+            cache.get_or_decode(blob.name, args.sample_rate, blob)
+            decoded += 1
+        except DecodeError as exc:
+            logger.warning("%s", exc)
+            failed += 1
+    logger.info(
+        "PCM cache at %d Hz: decoded %d, already cached %d, failed %d; %.1f MiB in use",
+        args.sample_rate, decoded, cached, failed, cache.total_bytes / 1024 ** 2,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+# DJ AI App - Decoded PCM Cache
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Memory-mapped mono float32 samples keyed by content hash and sample rate
+
+import ast
+import mmap
+import os
+import struct
+import subprocess
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Callable, ContextManager, Iterator, List, Optional, Tuple, Union
+
+NPY_MAGIC = b"\x93NUMPY"
+# Fixed header size so the sample count can be written after streaming the data
+HEADER_BYTES = 128
+# End of ffmpeg's stderr quoted in a DecodeError
+STDERR_TAIL_BYTES = 4096
+
+Decoder = Callable[[Path, int], ContextManager[BinaryIO]]
+
+
+class DecodeError(Exception):
+    """Raised when an audio file cannot be decoded to PCM."""
+
+
+def npy_header(samples: int) -> bytes:
+    """A version 1.0 ``.npy`` header for a 1-D little-endian float32 array."""
+    text = "{'descr': '<f4', 'fortran_order': False, 'shape': (%d,), }" % samples
+    body = HEADER_BYTES - len(NPY_MAGIC) - 4
+    return NPY_MAGIC + b"\x01\x00" + struct.pack("<H", body) + (text.ljust(body - 1) + "\n").encode("latin1")
+
+
+def parse_npy_header(data: bytes) -> Tuple[int, int]:
+    """Return (data offset, sample count) of a 1-D float32 ``.npy`` file."""
+    if data[:6] != NPY_MAGIC:
+        raise ValueError("Not an .npy file")
+    if data[6] == 1:
+        length, offset = struct.unpack_from("<H", data, 8)[0], 10
+    else:
+        length, offset = struct.unpack_from("<I", data, 8)[0], 12
+    header = ast.literal_eval(data[offset:offset + length].decode("latin1"))
+    if header.get("descr") != "<f4" or header.get("fortran_order") or len(header.get("shape", ())) != 1:
+        raise ValueError(f"Expected a 1-D little-endian float32 array, got {header}")
+    return offset + length, header["shape"][0]
+
+
+def ffmpeg_command(path: Union[str, Path], sample_rate: int) -> List[str]:
+    return [
+        "ffmpeg", "-v", "error", "-nostdin", "-i", str(path),
+        "-f", "f32le", "-acodec", "pcm_f32le", "-ac", "1", "-ar", str(sample_rate), "-",
+    ]
+
+
+@contextmanager
+def ffmpeg_decode(path: Path, sample_rate: int) -> Iterator[BinaryIO]:
+    """Stream ``path`` decoded and resampled to mono float32 (raw, little-endian)."""
+    # stderr goes to a file: a second pipe nobody reads while stdout is
+    # streamed would stall ffmpeg once it fills up with warnings
+    with tempfile.TemporaryFile() as errors:
+        process = subprocess.Popen(ffmpeg_command(path, sample_rate), stdout=subprocess.PIPE, stderr=errors)
+        try:
+            yield process.stdout
+            if process.wait() != 0:
+                errors.seek(max(0, errors.seek(0, os.SEEK_END) - STDERR_TAIL_BYTES))
+                stderr = errors.read().decode(errors="replace").strip()
+                raise DecodeError(f"ffmpeg could not decode {path}: {stderr}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+
+
+class PCMCache:
+    """Decoded samples stored once per track and sample rate as ``.npy`` files.
+
+    Files live at ``<root>/<rate>/ab/<hash>.npy`` so numpy users can
+    ``np.load(path, mmap_mode="r")`` them; ``get`` maps them without numpy.
+    Reads bump the file's mtime, and once the cache exceeds ``max_bytes``
+    the least recently read files are deleted.
+    """
+
+    def __init__(self, root: Union[str, Path], max_bytes: int = 4 * 1024 ** 3, clock: Callable[[], float] = time.time):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self.tmp_dir = self.root / "tmp"
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    def path(self, content_hash: str, sample_rate: int) -> Path:
+        return self.root / str(sample_rate) / content_hash[:2] / f"{content_hash}.npy"
+
+    def _entries(self) -> List[Path]:
+        return [path for path in self.root.glob("*/*/*.npy") if path.parent.parent.name.isdigit()]
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(path.stat().st_size for path in self._entries())
+
+    def _touch(self, path: Path):
+        now = self._clock()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass  # read-only mount: serve the samples, skip the LRU bump
+
+    def get(self, content_hash: str, sample_rate: int) -> Optional[memoryview]:
+        """Zero-copy float32 view of the cached samples, or None on a miss."""
+        path = self.path(content_hash, sample_rate)
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size <= HEADER_BYTES:
+                    mapped = None
+                else:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        self._touch(path)
+        if mapped is None:
+            return memoryview(b"").cast("f")
+        offset, samples = parse_npy_header(mapped[:HEADER_BYTES * 4])
+        return memoryview(mapped)[offset:offset + samples * 4].cast("f")
+
+    def _write_temp(self, source: BinaryIO, chunk_size: int) -> Path:
+        temp = self.tmp_dir / uuid.uuid4().hex
+        size = 0
+        try:
+            with open(temp, "wb") as out:
+                out.write(npy_header(0))
+                carry = b""
+                for chunk in iter(lambda: source.read(chunk_size), b""):
+                    chunk = carry + chunk
+                    usable = len(chunk) - len(chunk) % 4
+                    out.write(chunk[:usable])
+                    carry = chunk[usable:]
+                    size += usable
+                out.seek(0)
+                out.write(npy_header(size // 4))
+        except BaseException:
+            temp.unlink(missing_ok=True)
+            raise
+        return temp
+
+    def _commit(self, temp: Path, content_hash: str, sample_rate: int) -> memoryview:
+        destination = self.path(content_hash, sample_rate)
+        try:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp, destination)
+        except BaseException:
+            temp.unlink(missing_ok=True)
+            raise
+        self._touch(destination)
+        self.evict(keep=destination)
+        return self.get(content_hash, sample_rate)
+
+    def put_stream(self, content_hash: str, sample_rate: int, source: BinaryIO, chunk_size: int = 1024 * 1024) -> memoryview:
+        """Store raw little-endian float32 samples read from ``source``."""
+        return self._commit(self._write_temp(source, chunk_size), content_hash, sample_rate)
+
+    def put(self, content_hash: str, sample_rate: int, samples) -> memoryview:
+        """Store a float32 buffer (``array('f')``, a numpy array, raw bytes)."""
+        data = memoryview(samples).cast("B")
+        return self.put_stream(content_hash, sample_rate, _BufferReader(data))
+
+    def get_or_decode(
+        self, content_hash: str, sample_rate: int, audio_path: Union[str, Path], decoder: Decoder = ffmpeg_decode,
+    ) -> memoryview:
+        """Cached samples, decoding ``audio_path`` once on a miss."""
+        cached = self.get(content_hash, sample_rate)
+        if cached is not None:
+            return cached
+        temp = None
+        try:
+            # The decoder reports failures on exit, so only commit after it closes cleanly
+            with decoder(Path(audio_path), sample_rate) as stream:
+                temp = self._write_temp(stream, 1024 * 1024)
+        except BaseException:
+            if temp is not None:
+                temp.unlink(missing_ok=True)
+            raise
+        return self._commit(temp, content_hash, sample_rate)
+
+    def evict(self, max_bytes: Optional[int] = None, keep: Optional[Path] = None) -> List[Path]:
+        """Delete least recently read files until the cache fits its budget."""
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        evicted = []
+        for _, size, path in sorted(entries):
+            if total <= budget:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted.append(path)
+        return evicted
+
+
+class _BufferReader:
+    """File-like reads over a memoryview without copying it first."""
+
+    def __init__(self, data: memoryview):
+        self._data = data
+        self._position = 0
+
+    def read(self, size: int) -> bytes:
+        chunk = self._data[self._position:self._position + size]
+        self._position += len(chunk)
+        return bytes(chunk)
@@ -0,0 +1,21 @@
+# DJ AI App - Waveform Peaks
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Precomputed waveform overviews so the frontend never decodes a track to draw it
+
+"""Multi-resolution min/max waveform peaks in audiowaveform's ``.dat`` format."""
+
+from .waveform import (
+    DEFAULT_LEVELS, PeaksStore, WaveformData, coarsen, decode_dat, encode_dat, min_max, parse_levels, stream_min_max,
+)
+
+__all__ = [
+    "DEFAULT_LEVELS",
+    "PeaksStore",
+    "WaveformData",
+    "coarsen",
+    "decode_dat",
+    "encode_dat",
+    "min_max",
+    "parse_levels",
+    "stream_min_max",
+]
@@ -0,0 +1,56 @@
+# DJ AI App - Waveform Peaks Entrypoint
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Generate peaks for stored uploads that have none yet (python -m dj_ai_app.peaks)
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+from ..env import env_float, env_int
+from ..pcm import DecodeError, PCMCache
+from .waveform import DEFAULT_LEVELS, PeaksStore, parse_levels
+
+
+logger = logging.getLogger("dj_ai_app.peaks")
+
+
+def main(argv=None) -> int:
+    """Write peaks for every blob in the upload store that has none."""
+    parser = argparse.ArgumentParser(description="Backfill waveform peaks from the upload store")
+    parser.add_argument("uploads", nargs="?", default=os.environ.get("BLOBS_DIR", "data/uploads"))
+    parser.add_argument("--out", default=os.environ.get("PEAKS_DIR", "data/peaks"))
+    parser.add_argument("--levels", type=parse_levels,
+                        default=parse_levels(os.environ.get("PEAKS_LEVELS", ",".join(map(str, DEFAULT_LEVELS)))),
+                        help="Samples per pixel of each zoom level, comma separated (default: 256,1024,4096)")
+    parser.add_argument("--bits", type=int, choices=(8, 16), default=env_int(os.environ, "PEAKS_BITS", 8))
+    parser.add_argument("--sample-rate", type=int, default=env_int(os.environ, "SAMPLE_RATE", 22050))
+    parser.add_argument("--pcm-cache", default=os.environ.get("PCM_CACHE_DIR", ""),
+                        help="Decode through the shared PCM cache (default: $PCM_CACHE_DIR, off when empty)")
+    parser.add_argument("--pcm-max-mb", type=float, default=env_float(os.environ, "PCM_CACHE_MAX_MB", 4096))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO"),
+        format="%(asctime)s [%(levelname)8s] %(name)s: %(message)s",
+    )
+    store = PeaksStore(args.out, args.levels, args.bits)
+    cache = PCMCache(args.pcm_cache, max_bytes=int(args.pcm_max_mb * 1024 * 1024)) if args.pcm_cache else None
+    generated = existing = failed = 0
+    for blob in sorted(Path(args.uploads).glob("sha256/*/*/*")):
+        if store.exists(blob.name):
+            existing += 1
+            continue
+        try:
+            store.generate(blob.name, blob, args.sample_rate, cache)
+            generated += 1
+        except DecodeError as exc:
+            logger.warning("%s", exc)
+            failed += 1
+    logger.info("Waveform peaks: generated %d, already present %d, failed %d", generated, existing, failed)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+# DJ AI App - Waveform Peaks
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Multi-resolution min/max peaks in audiowaveform's .dat format, stored per content hash
+
+import json
+import os
+import struct
+import sys
+import uuid
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Sequence, Tuple, Union
+
+from ..pcm import PCMCache, ffmpeg_decode
+from ..pcm.cache import Decoder
+
+# Zoom levels in samples per pixel; each must be a multiple of the first
+DEFAULT_LEVELS = (256, 1024, 4096)
+DAT_VERSION = 2
+# version, flags, sample rate, samples per pixel, length, channels
+DAT_HEADER = struct.Struct("<iIiiIi")
+DAT_HEADER_V1 = struct.Struct("<iIiiI")
+FLAG_8_BIT = 0x1
+
+Peaks = Tuple[array, array]
+
+
+def parse_levels(value: str) -> Tuple[int, ...]:
+    """``"256,1024,4096"`` as a tuple of samples-per-pixel levels."""
+    return tuple(int(level) for level in value.split(",") if level.strip())
+
+
+def min_max(samples: memoryview, samples_per_pixel: int) -> Peaks:
+    """Per-pixel minimum and maximum of float32 ``samples`` (the last pixel may be partial)."""
+    mins, maxs = array("f"), array("f")
+    for start in range(0, len(samples), samples_per_pixel):
+        window = samples[start:start + samples_per_pixel]
+        mins.append(min(window))
+        maxs.append(max(window))
+    return mins, maxs
+
+
+def coarsen(peaks: Peaks, factor: int) -> Peaks:
+    """Merge every ``factor`` pixels into one; exact, since min of mins is the min."""
+    mins, maxs = peaks
+    return (
+        array("f", (min(mins[i:i + factor]) for i in range(0, len(mins), factor))),
+        array("f", (max(maxs[i:i + factor]) for i in range(0, len(maxs), factor))),
+    )
+
+
+def stream_min_max(source: BinaryIO, samples_per_pixel: int, pixels_per_read: int = 4096) -> Tuple[Peaks, int]:
+    """:func:`min_max` over raw little-endian float32 from ``source``, and the sample count.
+
+    Reads whole pixels at a time, so the track is never held in memory.
+    """
+    mins, maxs = array("f"), array("f")
+    count = 0
+    block = samples_per_pixel * 4 * pixels_per_read
+    while True:
+        data = _read_full(source, block)
+        usable = len(data) - len(data) % 4
+        if not usable:
+            return (mins, maxs), count
+        samples = array("f")
+        samples.frombytes(data[:usable])
+        if sys.byteorder == "big":
+            samples.byteswap()
+        block_mins, block_maxs = min_max(memoryview(samples), samples_per_pixel)
+        mins.extend(block_mins)
+        maxs.extend(block_maxs)
+        count += len(samples)
+        if len(data) < block:
+            return (mins, maxs), count
+
+
+def _read_full(source: BinaryIO, size: int) -> bytes:
+    """Pipes return short reads; keep reading until ``size`` bytes or end of stream."""
+    parts, remaining = [], size
+    while remaining:
+        chunk = source.read(remaining)
+        if not chunk:
+            break
+        parts.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(parts)
+
+
+def encode_dat(peaks: Peaks, sample_rate: int, samples_per_pixel: int, bits: int = 8) -> bytes:
+    """Peaks as an audiowaveform version 2 ``.dat`` file (one channel, interleaved min/max)."""
+    if bits not in (8, 16):
+        raise ValueError(f"bits must be 8 or 16, got {bits}")
+    mins, maxs = peaks
+    scale, low, high = (127, -128, 127) if bits == 8 else (32767, -32768, 32767)
+    data = array("b" if bits == 8 else "h")
+    for lo, hi in zip(mins, maxs):
+        data.append(max(low, min(high, round(lo * scale))))
+        data.append(max(low, min(high, round(hi * scale))))
+    if sys.byteorder == "big":
+        data.byteswap()
+    header = DAT_HEADER.pack(DAT_VERSION, FLAG_8_BIT if bits == 8 else 0, sample_rate, samples_per_pixel, len(mins), 1)
+    return header + data.tobytes()
+
+
+@dataclass
+class WaveformData:
+    """A decoded ``.dat`` file; ``mins``/``maxs`` are the stored integers of the first channel."""
+
+    version: int
+    sample_rate: int
+    samples_per_pixel: int
+    bits: int
+    channels: int
+    mins: List[int]
+    maxs: List[int]
+
+    @property
+    def duration(self) -> float:
+        return len(self.mins) * self.samples_per_pixel / self.sample_rate
+
+
+def decode_dat(data: bytes) -> WaveformData:
+    """Parse an audiowaveform ``.dat`` file (version 1 or 2)."""
+    version = struct.unpack_from("<i", data)[0]
+    if version == 1:
+        _, flags, sample_rate, samples_per_pixel, length = DAT_HEADER_V1.unpack_from(data)
+        channels, offset = 1, DAT_HEADER_V1.size
+    elif version == 2:
+        _, flags, sample_rate, samples_per_pixel, length, channels = DAT_HEADER.unpack_from(data)
+        offset = DAT_HEADER.size
+    else:
+        raise ValueError(f"Unsupported .dat version {version}")
+    bits = 8 if flags & FLAG_8_BIT else 16
+    values = array("b" if bits == 8 else "h")
+    values.frombytes(data[offset:offset + length * channels * 2 * values.itemsize])
+    if sys.byteorder == "big":
+        values.byteswap()
+    stride = channels * 2
+    return WaveformData(
+        version, sample_rate, samples_per_pixel, bits, channels,
+        values[0::stride].tolist(), values[1::stride].tolist(),
+    )
+
+
+class PeaksStore:
+    """Peak files for every zoom level of a track, under ``<root>/ab/<hash>/``.
+
+    Each level is ``<samples_per_pixel>.dat`` (readable by peaks.js and
+    wavesurfer.js) and ``index.json`` lists the levels. Paths contain the
+    content hash, so files never change once written and can be cached
+    forever; ``index.json`` is written last and marks a complete set.
+    """
+
+    def __init__(
+        self, root: Union[str, Path], levels: Sequence[int] = DEFAULT_LEVELS, bits: int = 8,
+        decoder: Optional[Decoder] = None,
+    ):
+        levels = sorted(set(levels))
+        if not levels or levels[0] < 1 or any(level % levels[0] for level in levels):
+            raise ValueError(f"Levels must be positive multiples of the finest level, got {levels}")
+        self.root = Path(root)
+        self.levels = levels
+        self.bits = bits
+        self.decoder = decoder or ffmpeg_decode
+        self.tmp_dir = self.root / "tmp"
+
+    def directory(self, content_hash: str) -> Path:
+        return self.root / content_hash[:2] / content_hash
+
+    def path(self, content_hash: str, samples_per_pixel: int) -> Path:
+        return self.directory(content_hash) / f"{samples_per_pixel}.dat"
+
+    def index_path(self, content_hash: str) -> Path:
+        return self.directory(content_hash) / "index.json"
+
+    def exists(self, content_hash: str) -> bool:
+        return self.index_path(content_hash).exists()
+
+    def index(self, content_hash: str) -> Optional[dict]:
+        try:
+            return json.loads(self.index_path(content_hash).read_text())
+        except FileNotFoundError:
+            return None
+
+    def _write(self, destination: Path, data: bytes):
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        temp = self.tmp_dir / uuid.uuid4().hex
+        try:
+            temp.write_bytes(data)
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp, destination)
+        except BaseException:
+            temp.unlink(missing_ok=True)
+            raise
+
+    def put(self, content_hash: str, peaks: Peaks, sample_rate: int, samples: int) -> dict:
+        """Write every level from peaks at the finest level, then the index."""
+        finest = self.levels[0]
+        entries = []
+        for level in self.levels:
+            level_peaks = peaks if level == finest else coarsen(peaks, level // finest)
+            self._write(self.path(content_hash, level), encode_dat(level_peaks, sample_rate, level, self.bits))
+            entries.append({"samples_per_pixel": level, "length": len(level_peaks[0]), "file": f"{level}.dat"})
+        index = {
+            "content_hash": content_hash,
+            "sample_rate": sample_rate,
+            "duration": round(samples / sample_rate, 3),
+            "bits": self.bits,
+            "levels": entries,
+        }
+        self._write(self.index_path(content_hash), json.dumps(index, indent=2).encode())
+        return index
+
+    def generate(
+        self,
+        content_hash: str,
+        audio_path: Union[str, Path],
+        sample_rate: int = 22050,
+        pcm_cache: Optional[PCMCache] = None,
+    ) -> dict:
+        """Decode ``audio_path`` (through ``pcm_cache`` when given) and write its peaks.
+
+        Returns the index; a track that already has peaks is not decoded again.
+        """
+        existing = self.index(content_hash)
+        if existing is not None:
+            return existing
+        finest = self.levels[0]
+        if pcm_cache is not None:
+            samples = pcm_cache.get_or_decode(content_hash, sample_rate, audio_path, self.decoder)
+            return self.put(content_hash, min_max(samples, finest), sample_rate, len(samples))
+        with self.decoder(Path(audio_path), sample_rate) as stream:
+            peaks, samples = stream_min_max(stream, finest)
+        return self.put(content_hash, peaks, sample_rate, samples)
@@ -0,0 +1,17 @@
+# DJ AI App - Model Pre-warm
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Validate model artifacts and warm them up before dj-ai-core serves traffic
+
+"""Model artifact validation, page-cache priming and warm-up inference."""
+
+from .artifacts import MANIFEST_NAME, ArtifactReport, prime_page_cache, validate_artifacts, write_manifest
+from .warmup import synthetic_wav
+
+__all__ = [
+    "MANIFEST_NAME",
+    "ArtifactReport",
+    "prime_page_cache",
+    "synthetic_wav",
+    "validate_artifacts",
+    "write_manifest",
+]
@@ -0,0 +1,53 @@
+# DJ AI App - Model Init Entrypoint
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: One-shot init stage (python -m dj_ai_app.prewarm <models dir>)
+
+import argparse
+import logging
+import os
+import sys
+
+from .artifacts import prime_page_cache, validate_artifacts, write_manifest
+
+logger = logging.getLogger("dj_ai_app.prewarm")
+
+
+def main(argv=None) -> int:
+    """Validate and prime the models volume; a non-zero exit keeps dj-ai-core from starting."""
+    parser = argparse.ArgumentParser(description="Validate and page-cache the shared models volume")
+    parser.add_argument("models_dir", nargs="?", default=os.environ.get("MODEL_DIR", "data/models"))
+    parser.add_argument("--no-checksums", action="store_true", help="Only check sizes against the manifest")
+    parser.add_argument("--no-prime", action="store_true", help="Validate without reading artifacts into memory")
+    parser.add_argument("--write-manifest", action="store_true", help="Record sizes and checksums, then exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO"),
+        format="%(asctime)s [%(levelname)8s] %(name)s: %(message)s",
+    )
+
+    if args.write_manifest:
+        files = write_manifest(args.models_dir)
+        logger.info("Wrote manifest for %d artifacts", len(files))
+        return 0
+
+    report = validate_artifacts(args.models_dir, verify_checksums=not args.no_checksums)
+    for error in report.errors:
+        logger.error(error)
+    if not report.ok:
+        return 1
+    if report.files == 0:
+        logger.warning("No model artifacts in %s; nothing to prime", args.models_dir)
+        return 0
+
+    if not args.no_prime:
+        prime_page_cache(args.models_dir, report)
+    logger.info(
+        "Validated %d artifacts (%.1f MiB); primed %.1f MiB in %.2fs",
+        report.files, report.bytes / 1024 ** 2, report.primed_bytes / 1024 ** 2, report.prime_seconds,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
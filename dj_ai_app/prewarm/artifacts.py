@@ -0,0 +1,114 @@
+# DJ AI App - Model Artifacts
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Check the shared models volume and pull it into the page cache
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Union
+
+# Optional manifest next to the models: {"files": {"<relative path>": {"size": n, "sha256": "..."}}}
+MANIFEST_NAME = "manifest.json"
+
+_IGNORED = {MANIFEST_NAME, ".gitkeep"}
+_CHUNK = 4 * 1024 * 1024
+
+
+def _artifacts(root: Path) -> List[Path]:
+    return sorted(
+        path for path in root.rglob("*")
+        if path.is_file() and path.name not in _IGNORED and not path.name.startswith(".")
+    )
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class ArtifactReport:
+    """Outcome of validating (and optionally priming) a models directory."""
+
+    files: int = 0
+    bytes: int = 0
+    errors: List[str] = field(default_factory=list)
+    primed_bytes: int = 0
+    prime_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def write_manifest(root: Union[str, Path]) -> Dict[str, Dict[str, object]]:
+    """Record size and SHA-256 of every artifact so later deploys can verify them."""
+    root = Path(root)
+    files = {
+        path.relative_to(root).as_posix(): {"size": path.stat().st_size, "sha256": _sha256(path)}
+        for path in _artifacts(root)
+    }
+    (root / MANIFEST_NAME).write_text(json.dumps({"files": files}, indent=2, sort_keys=True))
+    return files
+
+
+def validate_artifacts(root: Union[str, Path], verify_checksums: bool = True) -> ArtifactReport:
+    """Check every artifact is present, non-empty and matches the manifest if there is one."""
+    root = Path(root)
+    report = ArtifactReport()
+    if not root.is_dir():
+        report.errors.append(f"{root} is not a directory")
+        return report
+
+    present = {path.relative_to(root).as_posix(): path for path in _artifacts(root)}
+    for name, path in present.items():
+        size = path.stat().st_size
+        report.files += 1
+        report.bytes += size
+        if size == 0:
+            report.errors.append(f"{name} is empty")
+
+    manifest_path = root / MANIFEST_NAME
+    if manifest_path.exists():
+        try:
+            expected = json.loads(manifest_path.read_text())["files"]
+        except (ValueError, KeyError) as exc:
+            report.errors.append(f"{MANIFEST_NAME} is unreadable: {exc}")
+            return report
+        for name, spec in sorted(expected.items()):
+            path = present.get(name)
+            if path is None:
+                report.errors.append(f"{name} is listed in {MANIFEST_NAME} but missing")
+            elif path.stat().st_size != spec.get("size", path.stat().st_size):
+                report.errors.append(f"{name} has size {path.stat().st_size}, expected {spec['size']}")
+            elif verify_checksums and spec.get("sha256") and _sha256(path) != spec["sha256"]:
+                report.errors.append(f"{name} does not match its SHA-256 in {MANIFEST_NAME}")
+    return report
+
+
+def prime_page_cache(root: Union[str, Path], report: ArtifactReport) -> ArtifactReport:
+    """Read every artifact once so dj-ai-core's first model load hits memory, not disk.
+
+    The page cache belongs to the host kernel, so pages pulled in here are
+    shared with every container that mounts the same volume.
+    """
+    started = time.monotonic()
+    buffer = bytearray(_CHUNK)
+    view = memoryview(buffer)
+    for path in _artifacts(Path(root)):
+        with open(path, "rb", buffering=0) as f:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            while True:
+                read = f.readinto(view)
+                if not read:
+                    break
+                report.primed_bytes += read
+    report.prime_seconds = time.monotonic() - started
+    return report
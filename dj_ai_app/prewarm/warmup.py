@@ -0,0 +1,34 @@
+# DJ AI App - Warm-up Inference
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Synthetic audio that exercises the full analysis path once
+
+import io
+import math
+import struct
+import wave
+
+WARMUP_FILENAME = "warmup.wav"
+
+
+def synthetic_wav(seconds: float = 5.0, sample_rate: int = 22050, bpm: float = 120.0) -> bytes:
+    """Mono 16-bit WAV of a 440 Hz tone with a click on every beat.
+
+    Long enough for tempo and key detection to run their real code paths,
+    small enough (about 200 KiB) to send on every gateway start.
+    """
+    frames = int(seconds * sample_rate)
+    beat = int(sample_rate * 60.0 / bpm)
+    samples = []
+    for n in range(frames):
+        value = 0.3 * math.sin(2 * math.pi * 440.0 * n / sample_rate)
+        if n % beat < sample_rate // 100:
+            value += 0.5
+        samples.append(int(max(-1.0, min(1.0, value)) * 32767))
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(struct.pack(f"<{frames}h", *samples))
+    return buffer.getvalue()
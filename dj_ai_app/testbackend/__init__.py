@@ -0,0 +1,9 @@
+# DJ AI App - Test Backend
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Reusable dj-ai-core process for tests that run without Docker
+
+"""Test backend daemon: one uvicorn per source hash, shared across test sessions."""
+
+from .daemon import BackendInfo, TestBackend, TestBackendError, free_port, source_hash
+
+__all__ = ["BackendInfo", "TestBackend", "TestBackendError", "free_port", "source_hash"]
@@ -0,0 +1,57 @@
+# DJ AI App - Test Backend Entrypoint
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Start, inspect or stop the shared test backend (python -m dj_ai_app.testbackend)
+
+"""Manage the shared dj-ai-core test backend.
+
+Usage::
+
+    python -m dj_ai_app.testbackend start     # start, or reuse the running one if the source is unchanged
+    python -m dj_ai_app.testbackend status
+    python -m dj_ai_app.testbackend stop
+    python -m dj_ai_app.testbackend start --source ../dj-ai-core --app app.main:app
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from .daemon import TestBackend, TestBackendError
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("action", choices=["start", "status", "stop"])
+    parser.add_argument("--source", help="dj-ai-core checkout (default: $DJ_AI_CORE_DIR or ../dj-ai-core)")
+    parser.add_argument("--app", help="ASGI app to serve (default: $DJ_AI_CORE_APP or app.main:app)")
+    args = parser.parse_args(argv)
+
+    backend = TestBackend.from_env()
+    if args.source:
+        backend.source_dir = Path(args.source)
+    if args.app:
+        backend.app = args.app
+
+    if args.action == "start":
+        try:
+            info = backend.ensure()
+        except TestBackendError as exc:
+            print(exc, file=sys.stderr)
+            return 1
+        print(f"{'Reusing' if info.reused else 'Started'} {info.url} (pid {info.pid}, log {info.log_path})")
+    elif args.action == "status":
+        info = backend.status()
+        if info is None:
+            print("Not running")
+            return 1
+        print(f"Running {info.url} (pid {info.pid}, source {info.source_hash[:12]})")
+        if info.source_hash != backend.fingerprint():
+            print("Source changed since start: the next 'start' or test session restarts it")
+    else:
+        print("Stopped" if backend.stop() else "Not running")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
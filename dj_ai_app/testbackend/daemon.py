@@ -0,0 +1,287 @@
+# DJ AI App - Test Backend Daemon
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: One dj-ai-core uvicorn process shared by test runs until its source changes
+
+import fcntl
+import hashlib
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterator, List, Mapping, Optional, Sequence, Union
+
+import requests
+
+from ..env import env_float
+
+# Files whose change means the running backend is stale
+SOURCE_SUFFIXES = (".py", ".txt", ".toml", ".cfg", ".ini", ".env")
+# Never part of the backend's code: caches, environments, data and its own tests
+SKIPPED_DIRS = {".git", "__pycache__", ".pytest_cache", ".mypy_cache", ".venv", "venv", "env", "node_modules",
+                "tests", "data", "uploads", "models", "htmlcov"}
+
+DEFAULT_STATE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "test-backend"
+
+
+class TestBackendError(RuntimeError):
+    """The backend could not be started."""
+
+    __test__ = False
+
+
+def source_hash(root: Union[str, Path], extra: Sequence[str] = ()) -> str:
+    """SHA-256 over the relative paths and contents of the backend's source files.
+
+    ``extra`` (the interpreter and command line) is mixed in, so switching
+    virtual environment or app target also counts as a change.
+    """
+    root = Path(root)
+    digest = hashlib.sha256()
+    for part in extra:
+        digest.update(part.encode() + b"\0")
+    files = []
+    for directory, dirs, names in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIPPED_DIRS and not d.endswith(".egg-info"))
+        files.extend(Path(directory) / name for name in names if name.endswith(SOURCE_SUFFIXES))
+    for path in sorted(files):
+        digest.update(path.relative_to(root).as_posix().encode() + b"\0")
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def free_port(host: str = "127.0.0.1") -> int:
+    """A port nothing listens on right now (the OS picks it)."""
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def process_args(pid: int) -> List[str]:
+    """Command line of a running process ([] if it is gone)."""
+    proc = Path(f"/proc/{pid}/cmdline")
+    if proc.exists():
+        try:
+            return [arg for arg in proc.read_bytes().decode(errors="replace").split("\0") if arg]
+        except OSError:
+            return []
+    result = subprocess.run(["ps", "-o", "args=", "-p", str(pid)], capture_output=True, text=True)
+    return result.stdout.split()
+
+
+@dataclass
+class BackendInfo:
+    """A running test backend, as recorded in the state file."""
+
+    pid: int
+    host: str
+    port: int
+    source_hash: str
+    started_at: float
+    log_path: str
+    # Not stored: whether this call found the backend already running
+    reused: bool = False
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def to_state(self) -> dict:
+        state = asdict(self)
+        state.pop("reused")
+        return state
+
+
+class TestBackend:
+    """dj-ai-core under uvicorn, shared by every test session on this machine.
+
+    :meth:`ensure` returns the running backend when its source hash still
+    matches and it answers its health check; otherwise it stops the old
+    process and starts a new one on a free port. The process runs in its
+    own session, so it outlives the pytest run that started it: the next
+    run skips the cold start. A file lock makes concurrent runs share one
+    backend instead of racing to start two.
+    """
+
+    __test__ = False  # not a pytest test class
+
+    def __init__(
+        self,
+        source_dir: Union[str, Path],
+        app: str = "app.main:app",
+        state_dir: Union[str, Path] = DEFAULT_STATE_DIR,
+        host: str = "127.0.0.1",
+        python: str = sys.executable,
+        health_path: str = "/health",
+        startup_timeout: float = 60.0,
+        environ: Optional[Mapping[str, str]] = None,
+    ):
+        self.source_dir = Path(source_dir)
+        self.app = app
+        self.state_dir = Path(state_dir)
+        self.host = host
+        self.python = python
+        self.health_path = health_path
+        self.startup_timeout = startup_timeout
+        self.environ = dict(os.environ if environ is None else environ)
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "TestBackend":
+        """``DJ_AI_CORE_DIR`` (default: the sibling dj-ai-core checkout), ``DJ_AI_CORE_APP`` and friends."""
+        environ = os.environ if environ is None else environ
+        repo_root = Path(__file__).resolve().parents[2]
+        return cls(
+            source_dir=environ.get("DJ_AI_CORE_DIR") or repo_root.parent / "dj-ai-core",
+            app=environ.get("DJ_AI_CORE_APP", "app.main:app"),
+            state_dir=environ.get("DJ_AI_TEST_BACKEND_DIR") or DEFAULT_STATE_DIR,
+            startup_timeout=env_float(environ, "DJ_AI_TEST_BACKEND_TIMEOUT", 60.0),
+        )
+
+    @property
+    def state_path(self) -> Path:
+        return self.state_dir / "backend.json"
+
+    def command(self, port: int) -> List[str]:
+        return [self.python, "-m", "uvicorn", self.app, "--host", self.host, "--port", str(port)]
+
+    def fingerprint(self) -> str:
+        return source_hash(self.source_dir, [self.python, self.app, self.host])
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.state_dir / "backend.lock", "a") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _read_state(self) -> Optional[BackendInfo]:
+        try:
+            return BackendInfo(**json.loads(self.state_path.read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _write_state(self, info: BackendInfo):
+        temp = self.state_path.with_suffix(".tmp")
+        temp.write_text(json.dumps(info.to_state(), indent=2))
+        os.replace(temp, self.state_path)
+
+    def healthy(self, info: BackendInfo, timeout: float = 2.0) -> bool:
+        if not self.owns(info):
+            return False
+        try:
+            return requests.get(f"{info.url}{self.health_path}", timeout=timeout).status_code == 200
+        except requests.RequestException:
+            return False
+
+    def owns(self, info: BackendInfo) -> bool:
+        """Whether ``info.pid`` is still our uvicorn; after a reboot the pid may belong to anything."""
+        args = process_args(info.pid)
+        return "uvicorn" in " ".join(args) and str(info.port) in args
+
+    def status(self) -> Optional[BackendInfo]:
+        """The recorded backend if it is still up, else None."""
+        info = self._read_state()
+        return info if info is not None and self.healthy(info) else None
+
+    def ensure(self) -> BackendInfo:
+        """A healthy backend running the current source, started only if needed."""
+        if not self.source_dir.is_dir():
+            raise TestBackendError(f"Backend source not found at {self.source_dir} (set DJ_AI_CORE_DIR)")
+        with self._lock():
+            current = self.fingerprint()
+            info = self._read_state()
+            if info is not None and info.source_hash == current and self.healthy(info):
+                info.reused = True
+                return info
+            if info is not None and self.owns(info):
+                self._terminate(info.pid)
+            info = self._start(current)
+            self._write_state(info)
+            return info
+
+    def stop(self) -> bool:
+        """Stop the recorded backend; returns whether one was running."""
+        with self._lock():
+            info = self._read_state()
+            if info is None:
+                return False
+            running = self.owns(info)
+            if running:
+                self._terminate(info.pid)
+            self.state_path.unlink(missing_ok=True)
+            return running
+
+    def _start(self, fingerprint: str, attempts: int = 3) -> BackendInfo:
+        log_path = self.state_dir / "backend.log"
+        last_error = ""
+        for _ in range(attempts):
+            port = free_port(self.host)
+            with open(log_path, "wb") as log:
+                process = subprocess.Popen(
+                    self.command(port), cwd=self.source_dir, env=self.environ, stdin=subprocess.DEVNULL,
+                    stdout=log, stderr=subprocess.STDOUT, start_new_session=True,
+                )
+            info = BackendInfo(process.pid, self.host, port, fingerprint, time.time(), str(log_path))
+            if self._wait_healthy(info, process):
+                return info
+            self._terminate(process.pid)
+            process.wait()
+            last_error = _tail(log_path)
+            # Another process may have taken the port between picking and binding it
+            if "address already in use" not in last_error.lower():
+                break
+        raise TestBackendError(f"Backend did not become healthy; last log lines:\n{last_error}")
+
+    def _wait_healthy(self, info: BackendInfo, process: subprocess.Popen,
+                      sleep: Callable[[float], None] = time.sleep) -> bool:
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                return False
+            if self.healthy(info, timeout=1.0):
+                return True
+            sleep(0.1)
+        return False
+
+    def _terminate(self, pid: int, timeout: float = 10.0):
+        """SIGTERM the backend's process group (uvicorn and any reloader or workers), then SIGKILL."""
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.killpg(pid, sig)
+            except (ProcessLookupError, PermissionError):
+                return
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                try:
+                    # Reap it if it is our child; otherwise just watch for it to go away
+                    if os.waitpid(pid, os.WNOHANG)[0] == pid:
+                        return
+                except ChildProcessError:
+                    if not pid_alive(pid):
+                        return
+                time.sleep(0.05)
+
+
+def _tail(path: Path, lines: int = 20) -> str:
+    try:
+        return "\n".join(path.read_text(errors="replace").splitlines()[-lines:])
+    except OSError:
+        return ""
@@ -0,0 +1,23 @@
+# DJ AI App - Request Waterfalls
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Per-request latency breakdown from nginx through the gateway to dj-ai-core
+
+"""Join request-id-tagged logs into per-request waterfalls and stage percentiles."""
+
+from .collector import (
+    Span,
+    Waterfall,
+    WaterfallCollector,
+    parse_upstream_time,
+    render_percentiles,
+    render_waterfall,
+)
+
+__all__ = [
+    "Span",
+    "Waterfall",
+    "WaterfallCollector",
+    "parse_upstream_time",
+    "render_percentiles",
+    "render_waterfall",
+]
@@ -0,0 +1,50 @@
+# DJ AI App - Waterfall Collector Entrypoint
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Per-request waterfalls and stage percentiles from logs (python -m dj_ai_app.waterfall)
+
+import argparse
+import sys
+
+from .collector import WaterfallCollector, render_percentiles, render_waterfall
+
+
+def main(argv=None) -> int:
+    """Read nginx and service logs from files or stdin and report where request time went."""
+    parser = argparse.ArgumentParser(
+        description="Join nginx timing logs and JSON span logs by X-Request-ID",
+        epilog="Example: docker compose logs --no-color nginx dj-ai-gateway dj-ai-core | python -m dj_ai_app.waterfall",
+    )
+    parser.add_argument("logs", nargs="*", help="Log files (default: stdin)")
+    parser.add_argument("--request-id", help="Show the waterfall of one request")
+    parser.add_argument("--slowest", type=int, default=5, help="Show waterfalls of the N slowest requests")
+    parser.add_argument("--uri-prefix", default="/api/", help="Only aggregate requests under this path")
+    args = parser.parse_args(argv)
+
+    collector = WaterfallCollector()
+    if args.logs:
+        for path in args.logs:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                collector.feed_lines(f)
+    else:
+        collector.feed_lines(sys.stdin)
+
+    if args.request_id:
+        waterfall = collector.get(args.request_id)
+        if waterfall is None:
+            print(f"No log lines for request {args.request_id}", file=sys.stderr)
+            return 1
+        print(render_waterfall(waterfall))
+        return 0
+
+    print(render_percentiles(collector.stage_percentiles(uri_prefix=args.uri_prefix)))
+    slowest = sorted(
+        (w for w in collector.waterfalls() if w.uri.startswith(args.uri_prefix)), key=lambda w: w.total, reverse=True,
+    )[:args.slowest]
+    for waterfall in slowest:
+        print()
+        print(render_waterfall(waterfall))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
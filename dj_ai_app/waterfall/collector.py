@@ -0,0 +1,182 @@
+# DJ AI App - Request Waterfall Collector
+# Author: Sergie Code - Software Engineer & YouTube Programming Educator
+# Purpose: Join nginx timing logs and JSON span logs into per-request waterfalls
+
+import json
+import math
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+PERCENTILES = (50, 90, 99)
+
+
+@dataclass
+class Span:
+    """One timed stage of a request, as logged by a service."""
+
+    service: str
+    name: str
+    start: float
+    duration: float
+
+
+@dataclass
+class Waterfall:
+    """Everything logged about one request id."""
+
+    request_id: str
+    method: str = ""
+    uri: str = ""
+    status: int = 0
+    start: Optional[float] = None
+    total: Optional[float] = None
+    upstream_connect: Optional[float] = None
+    upstream_response: Optional[float] = None
+    spans: List[Span] = field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        """Whether nginx has logged the request (it logs once the response is sent)."""
+        return self.total is not None
+
+    def stages(self) -> Dict[str, float]:
+        """Seconds per hop: nginx's own share, then every logged span."""
+        stages: Dict[str, float] = {}
+        if self.total is not None:
+            stages["nginx.total"] = self.total
+            if self.upstream_response is not None:
+                # Client upload/download and request buffering in nginx
+                stages["nginx.client"] = max(0.0, self.total - self.upstream_response)
+                stages["nginx.upstream"] = self.upstream_response
+            if self.upstream_connect is not None:
+                stages["nginx.upstream_connect"] = self.upstream_connect
+        for span in self.spans:
+            stages[span.name] = stages.get(span.name, 0.0) + span.duration
+        return stages
+
+
+def _json_object(line: str) -> Optional[dict]:
+    # `docker compose logs` prefixes lines with "service  | "
+    start = line.find("{")
+    if start < 0:
+        return None
+    try:
+        value = json.loads(line[start:])
+    except ValueError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def parse_upstream_time(value) -> Optional[float]:
+    """nginx times: ``-`` without an upstream, comma/colon-separated after retries."""
+    total, seen = 0.0, False
+    for part in str(value).replace(":", ",").split(","):
+        part = part.strip()
+        if part and part != "-":
+            total += float(part)
+            seen = True
+    return total if seen else None
+
+
+class WaterfallCollector:
+    """Builds waterfalls from any mix of nginx and service log lines.
+
+    Keeps at most ``max_requests`` requests in memory (oldest dropped
+    first), so it can follow long-running logs.
+    """
+
+    def __init__(self, max_requests: int = 100_000):
+        self.max_requests = max_requests
+        self._requests: "OrderedDict[str, Waterfall]" = OrderedDict()
+
+    def _get(self, request_id: str) -> Waterfall:
+        waterfall = self._requests.get(request_id)
+        if waterfall is None:
+            waterfall = self._requests[request_id] = Waterfall(request_id)
+            while len(self._requests) > self.max_requests:
+                self._requests.popitem(last=False)
+        return waterfall
+
+    def feed(self, line: str) -> bool:
+        """Consume one log line; returns whether it belonged to a request."""
+        entry = _json_object(line)
+        if not entry or not entry.get("request_id"):
+            return False
+        request_id = str(entry["request_id"])
+        if entry.get("event") == "span":
+            duration = entry.get("duration")
+            if duration is None and "duration_ms" in entry:
+                duration = float(entry["duration_ms"]) / 1000
+            if duration is None:
+                return False
+            self._get(request_id).spans.append(Span(
+                service=str(entry.get("service", "")),
+                name=str(entry.get("span") or entry.get("name", "")),
+                start=float(entry.get("start", 0.0)),
+                duration=float(duration),
+            ))
+            return True
+        if "request_time" in entry:
+            waterfall = self._get(request_id)
+            waterfall.method = entry.get("method", "")
+            waterfall.uri = entry.get("uri", "")
+            waterfall.status = int(entry.get("status", 0))
+            waterfall.total = float(entry["request_time"])
+            if "msec" in entry:
+                waterfall.start = float(entry["msec"]) - waterfall.total
+            waterfall.upstream_connect = parse_upstream_time(entry.get("upstream_connect_time", "-"))
+            waterfall.upstream_response = parse_upstream_time(entry.get("upstream_response_time", "-"))
+            return True
+        return False
+
+    def feed_lines(self, lines: Iterable[str]) -> int:
+        return sum(1 for line in lines if self.feed(line))
+
+    def get(self, request_id: str) -> Optional[Waterfall]:
+        return self._requests.get(request_id)
+
+    def waterfalls(self, complete_only: bool = True) -> List[Waterfall]:
+        return [w for w in self._requests.values() if w.complete or not complete_only]
+
+    def stage_percentiles(self, percentiles: Sequence[int] = PERCENTILES, uri_prefix: str = "") -> Dict[str, Dict[int, float]]:
+        """Nearest-rank percentiles of every stage over complete requests."""
+        samples: Dict[str, List[float]] = {}
+        for waterfall in self.waterfalls():
+            if not waterfall.uri.startswith(uri_prefix):
+                continue
+            for stage, seconds in waterfall.stages().items():
+                samples.setdefault(stage, []).append(seconds)
+        result = {}
+        for stage, values in sorted(samples.items()):
+            values.sort()
+            result[stage] = {p: values[max(0, math.ceil(p / 100 * len(values)) - 1)] for p in percentiles}
+        return result
+
+
+def render_waterfall(waterfall: Waterfall, width: int = 50) -> str:
+    """Text waterfall: one bar per span, positioned on the request's timeline."""
+    spans = sorted(waterfall.spans, key=lambda s: s.start)
+    origin = waterfall.start if waterfall.start is not None else (spans[0].start if spans else 0.0)
+    end = max([origin + (waterfall.total or 0.0)] + [s.start + s.duration for s in spans])
+    scale = width / max(end - origin, 1e-9)
+    lines = [f"{waterfall.method} {waterfall.uri} -> {waterfall.status}  request_id={waterfall.request_id}"]
+    rows = [("nginx", "nginx.total", origin, waterfall.total or 0.0)] if waterfall.total is not None else []
+    rows += [(s.service, s.name, s.start, s.duration) for s in spans]
+    for service, name, start, duration in rows:
+        offset = int(max(0.0, start - origin) * scale)
+        bar = "#" * max(1, int(duration * scale))
+        lines.append(f"  {name:<26} {duration * 1000:>9.1f} ms |{' ' * offset}{bar}")
+    return "\n".join(lines)
+
+
+def render_percentiles(percentiles: Dict[str, Dict[int, float]]) -> str:
+    if not percentiles:
+        return "No complete requests with a request id in the input"
+    columns = sorted(next(iter(percentiles.values())))
+    header = f"{'stage':<28}" + "".join(f"{'p' + str(p) + ' (ms)':>14}" for p in columns)
+    rows = [
+        f"{stage:<28}" + "".join(f"{values[p] * 1000:>14.1f}" for p in columns)
+        for stage, values in percentiles.items()
+    ]
+    return "\n".join([header] + rows)
@@ -11,6 +11,8 @@ import time
 import requests
 from typing import Dict, List, Tuple
 
+from dj_ai_app.testbackend import TestBackend, TestBackendError
+
 class DJAIIntegrationTester:
     """Comprehensive integration tester for DJ AI App ecosystem."""
     
@@ -282,22 +284,17 @@ class DJAIIntegrationTester:
         self.log("Testing backend startup...")
         
         try:
-            # Change to backend directory
-            original_cwd = os.getcwd()
-            os.chdir(self.core_path)
-            
-            # Start backend server in background
-            process = subprocess.Popen([
-                sys.executable, "-m", "uvicorn", 
-                "app.main:app", "--host", "127.0.0.1", "--port", "8001"
-            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            
-            # Wait a moment for startup
-            time.sleep(5)
+            # Shared test backend on a free port: reused while the backend source is unchanged
+            try:
+                backend = TestBackend(self.core_path).ensure()
+            except TestBackendError as e:
+                self.issues.append(f"Backend failed to start: {str(e)}")
+                return False
+            self.log(f"{'Reusing' if backend.reused else 'Started'} test backend at {backend.url}")
             
             # Test if server is responding
             try:
-                response = requests.get("http://127.0.0.1:8001/health", timeout=5)
+                response = requests.get(f"{backend.url}/health", timeout=5)
                 if response.status_code == 200:
                     self.log("✅ Backend starts and responds successfully")
                     success = True
@@ -308,11 +305,7 @@ class DJAIIntegrationTester:
                 self.issues.append(f"Backend health check failed: {str(e)}")
                 success = False
             
-            # Cleanup
-            process.terminate()
-            process.wait(timeout=10)
-            os.chdir(original_cwd)
-            
+            # Left running for the next run; `python -m dj_ai_app.testbackend stop` ends it
             return success
             
         except Exception as e:
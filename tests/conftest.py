@@ -6,8 +6,14 @@ import pytest
 import os
 import time
 import requests
+from contextlib import nullcontext
 from pathlib import Path
 
+from dj_ai_app.cassette import Cassette, cassette_path, use_cassette
+from dj_ai_app.faults import run_proxy
+from dj_ai_app.logs import LogAggregator, LogFollower, compose_logs_command
+from dj_ai_app.testbackend import TestBackend, TestBackendError
+
 # Test Configuration
 TEST_TIMEOUT = 60  # seconds
 API_TIMEOUT = 30   # seconds
@@ -21,12 +27,61 @@ NGINX_URL = "http://localhost:80"
 # Test Data Paths
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 SAMPLE_AUDIO_DIR = FIXTURES_DIR / "audio"
+CASSETTES_DIR = FIXTURES_DIR / "cassettes"
+
+# Latency budgets: @pytest.mark.perf_budget(p95_ms=..., runs=...)
+pytest_plugins = ["dj_ai_app.bench.perf_budget"]
+
+# Services whose logs are followed for the whole session
+LOGGED_SERVICES = ["nginx", "dj-ai-gateway", "dj-ai-core", "dj-ai-frontend"]
+
+def pytest_addoption(parser):
+    """Cassette options: record the stack once, then replay without Docker."""
+    parser.addoption(
+        "--cassettes", choices=["off", "record", "replay", "once"], default=os.environ.get("DJ_AI_CASSETTES", "off"),
+        help="Record or replay the HTTP calls of integration and e2e tests (default: $DJ_AI_CASSETTES or off)",
+    )
+    parser.addoption(
+        "--cassette-speed", type=float, default=float(os.environ.get("DJ_AI_CASSETTE_SPEED", "0")),
+        help="Replay at the recorded latency divided by this; 0 replays instantly",
+    )
+
+def replaying(config):
+    """Whether HTTP calls are served from cassettes instead of a running stack."""
+    return config.getoption("--cassettes") == "replay"
 
 @pytest.fixture(scope="session")
-def docker_services():
+def recorded(pytestconfig):
+    """Open a cassette under tests/fixtures/cassettes (a no-op when cassettes are off)."""
+    mode = pytestconfig.getoption("--cassettes")
+    speed = pytestconfig.getoption("--cassette-speed")
+
+    def open_cassette(*parts):
+        if mode == "off":
+            return nullcontext()
+        return use_cassette(Cassette(cassette_path(CASSETTES_DIR, parts), mode), speed)
+
+    return open_cassette
+
+@pytest.fixture(autouse=True)
+def cassette(request, recorded):
+    """Record or replay each integration and e2e test's HTTP calls in its own cassette."""
+    path = Path(str(request.fspath))
+    parts = path.relative_to(Path(__file__).parent).with_suffix("").parts
+    if parts[0] not in ("integration", "e2e") or request.node.get_closest_marker("live"):
+        yield None
+        return
+    with recorded(*parts, request.node.name) as active:
+        yield active
+
+@pytest.fixture(scope="session")
+def docker_services(pytestconfig):
     """Ensure Docker services are running before tests."""
     import subprocess
     
+    if replaying(pytestconfig):
+        return True
+    
     # Check if Docker is running
     try:
         subprocess.run(["docker", "version"], check=True, capture_output=True)
@@ -42,8 +97,11 @@ def docker_services():
     return True
 
 @pytest.fixture(scope="session")
-def wait_for_services(docker_services):
+def wait_for_services(docker_services, pytestconfig):
     """Wait for all services to be healthy."""
+    if replaying(pytestconfig):
+        return True
+    
     services = {
         "backend": BACKEND_URL,
         "frontend": FRONTEND_URL
@@ -71,6 +129,30 @@ def wait_for_services(docker_services):
     
     return True
 
+@pytest.fixture(scope="session")
+def service_logs(docker_services):
+    """Follow service logs for the session into rolling per-endpoint aggregates."""
+    follower = LogFollower().follow_compose(LOGGED_SERVICES, tail="100")
+    yield follower
+    follower.stop()
+
+@pytest.fixture(scope="session")
+def test_backend():
+    """dj-ai-core without Docker on a free port, reused across sessions while its source is unchanged."""
+    backend = TestBackend.from_env()
+    if not backend.source_dir.is_dir():
+        pytest.skip(f"dj-ai-core checkout not found at {backend.source_dir} (set DJ_AI_CORE_DIR)")
+    try:
+        return backend.ensure()
+    except TestBackendError as exc:
+        pytest.fail(str(exc))
+
+@pytest.fixture
+def backend_proxy(wait_for_services):
+    """A fault proxy in front of the backend; degrade it with ``dj_ai_app.faults.faults(proxy, ...)``."""
+    with run_proxy("localhost", 8000) as proxy:
+        yield proxy
+
 @pytest.fixture
 def sample_audio_file():
     """Provide a sample audio file for testing."""
@@ -83,6 +165,20 @@ def api_client():
     """HTTP client for API testing."""
     return requests.Session()
 
+class FakeClock:
+    """Manually advanced clock: tests set or advance ``now``."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    """A FakeClock at 0 to pass as the ``clock`` of TTL, expiry and eviction code."""
+    return FakeClock()
+
 class TestHelpers:
     """Helper functions for tests."""
     
@@ -111,19 +207,14 @@ class TestHelpers:
             return False
     
     @staticmethod
-    def get_service_logs(service_name):
-        """Get logs for a specific service."""
-        import subprocess
+    def get_service_logs(service_name, tail=200):
+        """Get the latest log lines of a service, streamed rather than buffered whole."""
+        follower = LogFollower(LogAggregator(recent_lines=tail))
         try:
-            result = subprocess.run(
-                ["docker-compose", "logs", service_name],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return result.stdout
-        except subprocess.CalledProcessError:
+            follower.process_command(compose_logs_command(service_name, follow=False, tail=tail), service_name)
+        except FileNotFoundError:
             return ""
+        return "\n".join(follower.aggregator.recent(service_name))
 
 # Pytest configuration
 def pytest_configure(config):
@@ -140,6 +231,12 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "slow: marks tests as slow running"
     )
+    config.addinivalue_line(
+        "markers", "live: needs the running stack itself (Docker, logs, sockets); skipped when replaying cassettes"
+    )
+    # Instant replays say nothing about latency: tabulate budgets, do not enforce them
+    if replaying(config) and not config.getoption("--cassette-speed") and config.getoption("--perf-budget") == "enforce":
+        config.option.perf_budget = "report"
 
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers automatically."""
@@ -155,3 +252,7 @@ def pytest_collection_modifyitems(config, items):
         # Add e2e marker to e2e tests
         if "e2e" in str(item.fspath):
             item.add_marker(pytest.mark.e2e)
+        
+        # Tests that talk to Docker rather than HTTP cannot be replayed
+        if replaying(config) and item.get_closest_marker("live"):
+            item.add_marker(pytest.mark.skip(reason="needs the running stack; cannot be replayed from cassettes"))
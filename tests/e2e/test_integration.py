@@ -9,21 +9,22 @@ import os
 
 
 @pytest.fixture(scope="session")
-def services_running():
+def services_running(recorded):
     """Fixture to check if services are running."""
-    try:
-        # Check if backend is responding
-        backend_response = requests.get("http://localhost:8000/health", timeout=5)
-        backend_ok = backend_response.status_code == 200
-    except:
-        backend_ok = False
-    
-    try:
-        # Check if frontend is responding
-        frontend_response = requests.get("http://localhost:3000", timeout=5)
-        frontend_ok = frontend_response.status_code == 200
-    except:
-        frontend_ok = False
+    with recorded("e2e", "test_integration", "services_running"):
+        try:
+            # Check if backend is responding
+            backend_response = requests.get("http://localhost:8000/health", timeout=5)
+            backend_ok = backend_response.status_code == 200
+        except:
+            backend_ok = False
+        
+        try:
+            # Check if frontend is responding
+            frontend_response = requests.get("http://localhost:3000", timeout=5)
+            frontend_ok = frontend_response.status_code == 200
+        except:
+            frontend_ok = False
     
     return {
         "backend": backend_ok,
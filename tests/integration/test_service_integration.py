@@ -8,6 +8,8 @@ import time
 import json
 from pathlib import Path
 
+from dj_ai_app.prewarm.warmup import synthetic_wav
+
 class TestServiceIntegration:
     """Test integration between DJ AI services."""
     
@@ -81,6 +83,7 @@ class TestServiceIntegration:
         assert "Access-Control-Allow-Origin" in cors_headers
     
     @pytest.mark.slow
+    @pytest.mark.live
     def test_service_startup_order(self, docker_services):
         """Test that services start in the correct order."""
         import subprocess
@@ -182,9 +185,53 @@ class TestAPIIntegration:
         assert response.status_code == 422
 
 
+class TestLocalBackend:
+    """Test dj-ai-core outside Docker through the shared test backend."""
+
+    @pytest.mark.live
+    def test_backend_without_docker(self, test_backend):
+        """Test that the test backend answers on its allocated port."""
+        response = requests.get(f"{test_backend.url}/health", timeout=5)
+        assert response.status_code == 200
+        assert response.json()["status"] in ["healthy", "ok"]
+
+
+class TestLatencyBudgets:
+    """Test latency SLOs of the backend next to its correctness."""
+
+    @pytest.fixture(scope="class")
+    def small_track(self):
+        """A 2 s synthetic WAV: real analysis code paths, little audio."""
+        return synthetic_wav(seconds=2.0, bpm=124.0)
+
+    @pytest.mark.perf_budget(p95_ms=50, runs=30)
+    def test_health_latency(self, wait_for_services, api_client):
+        """Test that /health answers within budget."""
+        response = api_client.get("http://localhost:8000/health")
+        assert response.status_code == 200
+
+    @pytest.mark.perf_budget(p95_ms=100, runs=30)
+    def test_supported_formats_latency(self, wait_for_services, api_client):
+        """Test that /supported-formats answers within budget."""
+        response = api_client.get("http://localhost:8000/supported-formats")
+        assert response.status_code == 200
+        assert "formats" in response.json()
+
+    @pytest.mark.slow
+    @pytest.mark.perf_budget(p95_ms=3000, max_ms=5000, runs=5, warmup=1)
+    def test_small_analysis_latency(self, wait_for_services, api_client, small_track):
+        """Test that analysing a short track stays within budget once the models are loaded."""
+        response = api_client.post(
+            "http://localhost:8000/analyze-track", files={"file": ("budget.wav", small_track, "audio/wav")}
+        )
+        assert response.status_code == 200
+        assert "bpm" in response.json()
+
+
 class TestDockerIntegration:
     """Test Docker integration and orchestration."""
     
+    @pytest.mark.live
     def test_docker_compose_services_running(self, docker_services):
         """Test that all Docker Compose services are running."""
         import subprocess
@@ -208,6 +255,7 @@ class TestDockerIntegration:
         for expected in expected_services:
             assert any(expected in name for name in service_names), f"Service {expected} not found"
     
+    @pytest.mark.live
     def test_docker_networks(self, docker_services):
         """Test Docker network configuration."""
         import subprocess
@@ -222,6 +270,7 @@ class TestDockerIntegration:
         networks = result.stdout.strip().split('\n')
         assert "dj-ai-network" in networks
     
+    @pytest.mark.live
     def test_docker_volumes(self, docker_services):
         """Test Docker volume configuration."""
         import subprocess
@@ -255,6 +304,7 @@ class TestEnvironmentConfiguration:
         # Check CORS headers are present
         assert "Access-Control-Allow-Origin" in response.headers
     
+    @pytest.mark.live
     def test_service_ports(self, wait_for_services):
         """Test that services are running on expected ports."""
         import socket
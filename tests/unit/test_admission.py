@@ -0,0 +1,176 @@
+# DJ AI App - Admission Control Tests
+# Author: Sergie Code
+# Purpose: Unit tests for adaptive load shedding in the gateway and client backoff
+
+import asyncio
+import hashlib
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+requests = pytest.importorskip("requests")
+
+from fastapi.testclient import TestClient
+
+from dj_ai_app import client as client_module
+from dj_ai_app.client import DJAIClient
+from dj_ai_app.gateway import GatewaySettings, GradientLimiter, Overloaded, create_app
+from dj_ai_app.jobs import JobStore, JobWorker, WorkerSettings
+
+
+def _drive(limiter, latency, rounds=200):
+    """Keep the limiter fully used while every request takes ``latency``."""
+    for _ in range(rounds):
+        held = 0
+        while limiter.try_acquire():
+            held += 1
+        for _ in range(held):
+            limiter.release(latency)
+
+
+class FakeSession:
+    """requests.Session stand-in returning canned responses in order."""
+
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+        self.headers = {}
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0)
+        response.url = url
+        response.headers["Retry-After"] = "2"
+        response._content = b'{"status": "healthy"}'
+        return response
+
+
+class TestGradientLimiter:
+    """Test that the concurrency limit follows observed latency."""
+
+    def test_limit_grows_while_latency_is_flat(self):
+        limiter = GradientLimiter(initial_limit=4, max_limit=100)
+        _drive(limiter, 0.05)
+        assert limiter.current_limit > 20
+
+    def test_limit_shrinks_when_latency_rises(self):
+        limiter = GradientLimiter(initial_limit=4, max_limit=100)
+        _drive(limiter, 0.05)
+        healthy = limiter.current_limit
+        _drive(limiter, 1.0, rounds=1)
+        assert limiter.current_limit < healthy / 2
+
+    def test_idle_capacity_does_not_inflate_the_limit(self):
+        limiter = GradientLimiter(initial_limit=10, max_limit=100)
+        for _ in range(100):
+            assert limiter.try_acquire()
+            limiter.release(0.05)
+        assert limiter.current_limit == 10
+
+    def test_failures_back_off(self):
+        limiter = GradientLimiter(initial_limit=10)
+        limiter.try_acquire()
+        limiter.release(0.05, ok=False)
+        assert limiter.limit == pytest.approx(9.0)
+
+    def test_full_limiter_raises_overloaded_with_retry_after(self):
+        limiter = GradientLimiter(initial_limit=1)
+        limiter.try_acquire()
+        limiter.release(3.2)
+        with limiter.admit():
+            with pytest.raises(Overloaded) as excinfo:
+                with limiter.admit():
+                    pass
+        assert excinfo.value.retry_after == 4
+        assert limiter.rejected_total == 1
+        assert limiter.in_flight == 0
+
+    def test_skipped_ticket_records_no_latency(self):
+        limiter = GradientLimiter()
+        with limiter.admit() as ticket:
+            ticket.skip()
+        assert limiter.short_rtt is None
+        assert limiter.in_flight == 0
+
+
+class TestGatewayLoadShedding:
+    """Test fast 503s from the gateway when the backend is saturated."""
+
+    @pytest.fixture
+    def gateway(self, tmp_path):
+        settings = GatewaySettings(backend_url="http://backend", jobs_dir=str(tmp_path), max_queued_jobs=1)
+        backend = httpx.MockTransport(lambda request: httpx.Response(200, json={"bpm": 128.0}))
+        with TestClient(create_app(settings, transport=backend)) as client:
+            yield client
+
+    def test_saturated_analysis_limiter_returns_503(self, gateway):
+        limiter = gateway.app.state.analysis_limiter
+        while limiter.try_acquire():
+            pass
+
+        response = gateway.post("/analyze-track", files={"file": ("track.mp3", b"audio", "audio/mpeg")})
+
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) >= 1
+
+    def test_cache_hits_are_served_while_saturated(self, gateway):
+        audio = b"cached audio"
+        gateway.post("/analyze-track", files={"file": ("track.mp3", audio, "audio/mpeg")})
+        limiter = gateway.app.state.analysis_limiter
+        while limiter.try_acquire():
+            pass
+
+        response = gateway.post(
+            "/analyze-track",
+            files={"file": ("track.mp3", audio, "audio/mpeg")},
+            headers={"X-Content-SHA256": hashlib.sha256(audio).hexdigest()},
+        )
+        assert response.status_code == 200
+        assert response.headers["X-Cache"] == "HIT"
+
+    def test_full_job_queue_returns_503(self, gateway):
+        upload = {"file": ("track.mp3", b"first", "audio/mpeg")}
+        assert gateway.post("/jobs/analyze-track", files=upload).status_code == 202
+
+        response = gateway.post("/jobs/analyze-track", files={"file": ("track.mp3", b"second", "audio/mpeg")})
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+
+
+class TestBackpressureClients:
+    """Test that the SDK and worker pool honour Retry-After."""
+
+    def test_client_retries_after_503(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr(client_module.time, "sleep", sleeps.append)
+        session = FakeSession(503, 503, 200)
+
+        assert DJAIClient(session=session).health() == {"status": "healthy"}
+        assert session.calls == 3
+        assert sleeps == [2.0, 2.0]
+
+    def test_client_gives_up_after_max_retries(self, monkeypatch):
+        monkeypatch.setattr(client_module.time, "sleep", lambda seconds: None)
+        session = FakeSession(503, 503)
+
+        with pytest.raises(requests.HTTPError):
+            DJAIClient(session=session, max_retries=1).health()
+
+    def test_worker_requeues_shed_job_without_spending_an_attempt(self, tmp_path):
+        store = JobStore(tmp_path)
+        job_id = store.new_id()
+        store.payload_path(job_id).write_bytes(b"audio")
+        store.submit(job_id, "track.mp3", "audio/mpeg", hashlib.sha256(b"audio").hexdigest())
+        transport = httpx.MockTransport(lambda request: httpx.Response(503, headers={"Retry-After": "0"}))
+        worker = JobWorker(store, WorkerSettings(backend_url="http://gateway"), transport=transport)
+
+        async def scenario():
+            async with httpx.AsyncClient(base_url="http://gateway", transport=transport) as client:
+                await worker.process(client, store.claim("w1"))
+
+        asyncio.run(scenario())
+        job = store.get(job_id)
+        assert job.status == "queued"
+        assert job.attempts == 0
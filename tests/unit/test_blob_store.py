@@ -0,0 +1,199 @@
+# DJ AI App - Upload Store Tests
+# Author: Sergie Code
+# Purpose: Unit tests for the content-addressed upload store and its sweeper
+
+import hashlib
+import io
+import os
+import sqlite3
+
+import pytest
+
+from dj_ai_app.blobs import BlobStore
+from dj_ai_app.jobs import JobStore
+
+
+def _hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class TestBlobStore:
+    """Test deduplication, layout and LRU eviction."""
+
+    def test_blob_path_fans_out_by_hash(self, tmp_path):
+        store = BlobStore(tmp_path)
+        content_hash, path, created = store.put_bytes(b"track")
+
+        assert created
+        assert content_hash == _hash(b"track")
+        assert path == tmp_path / "sha256" / content_hash[:2] / content_hash[2:4] / content_hash
+        assert path.read_bytes() == b"track"
+        assert store.contains(path)
+        assert not store.contains(tmp_path / "elsewhere.mp3")
+
+    def test_same_content_is_stored_once(self, tmp_path):
+        store = BlobStore(tmp_path)
+        first = store.put_stream(io.BytesIO(b"same audio"), chunk_size=3)
+        second = store.put_bytes(b"same audio")
+
+        assert first[:2] == second[:2]
+        assert second[2] is False
+        assert len(store) == 1
+        assert store.total_bytes == len(b"same audio")
+        assert list(store.tmp_dir.iterdir()) == []
+
+    def test_least_recently_used_blob_is_evicted(self, tmp_path, clock):
+        store = BlobStore(tmp_path, max_bytes=20, clock=clock)
+        old, old_path, _ = store.put_bytes(b"a" * 8)
+        clock.now += 1
+        store.put_bytes(b"b" * 8)
+        clock.now += 1
+        store.touch(old)
+        clock.now += 1
+        store.put_bytes(b"c" * 8)
+
+        assert old_path.exists()
+        assert store.touch(_hash(b"b" * 8)) is None
+        assert store.total_bytes == 16
+
+    def test_pinned_blobs_are_never_evicted(self, tmp_path, clock):
+        store = BlobStore(tmp_path, max_bytes=10, clock=clock)
+        pinned, pinned_path, _ = store.put_bytes(b"a" * 8, pin=True)
+        clock.now += 1
+        store.put_bytes(b"b" * 8)
+
+        assert pinned_path.exists()
+        assert len(store) == 1
+
+        store.unpin(pinned)
+        clock.now += 1
+        store.put_bytes(b"c" * 8)
+        assert not pinned_path.exists()
+
+
+class TestSweep:
+    """Test compaction of the store directory."""
+
+    def test_stale_temp_files_are_removed(self, tmp_path, clock):
+        clock.now = 10_000.0
+        store = BlobStore(tmp_path, clock=clock)
+        stale = store.tmp_dir / "partial"
+        stale.write_bytes(b"half an upload")
+        os.utime(stale, (0, 0))
+        fresh = store.tmp_dir / "in-progress"
+        fresh.write_bytes(b"still writing")
+        os.utime(fresh, (clock.now, clock.now))
+
+        report = store.sweep()
+
+        assert report.stale_tmp == 1
+        assert not stale.exists()
+        assert fresh.exists()
+
+    def test_index_is_reconciled_with_the_filesystem(self, tmp_path):
+        store = BlobStore(tmp_path)
+        gone, gone_path, _ = store.put_bytes(b"deleted by hand")
+        gone_path.unlink()
+        orphan = store.path(_hash(b"renamed before crash"))
+        orphan.parent.mkdir(parents=True)
+        orphan.write_bytes(b"renamed before crash")
+
+        report = store.sweep()
+
+        assert report.missing == 1
+        assert report.reindexed == 1
+        assert store.touch(gone) is None
+        assert store.touch(orphan.name) == orphan
+        assert not gone_path.parent.exists()
+
+    def test_loose_files_are_adopted_and_deduplicated(self, tmp_path, clock):
+        clock.now = 10_000.0
+        store = BlobStore(tmp_path, clock=clock)
+        store.put_bytes(b"known track")
+        for name, data in (("legacy.mp3", b"legacy track"), ("copy.mp3", b"known track")):
+            (tmp_path / name).write_bytes(data)
+            os.utime(tmp_path / name, (0, 0))
+        (tmp_path / "recent.mp3").write_bytes(b"being read by the backend")
+
+        report = store.sweep(adopt_after=3600)
+
+        assert (report.adopted, report.duplicates) == (1, 1)
+        assert store.path(_hash(b"legacy track")).read_bytes() == b"legacy track"
+        assert (tmp_path / "recent.mp3").exists()
+        assert not (tmp_path / "legacy.mp3").exists()
+        assert not (tmp_path / "copy.mp3").exists()
+        assert len(store) == 2
+
+
+class TestJobStoreIntegration:
+    """Test that queued jobs pin their upload until they finish."""
+
+    def test_finished_job_unpins_its_payload(self, tmp_path):
+        blobs = BlobStore(tmp_path / "uploads", max_bytes=0)
+        store = JobStore(tmp_path / "jobs", blobs=blobs)
+        content_hash, path, _ = blobs.put_bytes(b"queued audio", pin=True)
+        job = store.submit(store.new_id(), "track.mp3", "audio/mpeg", content_hash, payload_path=path)
+
+        assert blobs.evict() == []
+        store.claim("w1")
+        store.complete(job.id, {"bpm": 128})
+
+        assert blobs.evict() == [content_hash]
+        assert not path.exists()
+
+    def test_job_failed_by_the_reaper_unpins_its_payload(self, tmp_path):
+        blobs = BlobStore(tmp_path / "uploads", max_bytes=0)
+        store = JobStore(tmp_path / "jobs", blobs=blobs)
+        content_hash, path, _ = blobs.put_bytes(b"abandoned audio", pin=True)
+        job = store.submit(store.new_id(), "track.mp3", "audio/mpeg", content_hash, payload_path=path)
+        store.claim("w1")
+
+        assert store.requeue_stale(older_than=-1, max_attempts=1) == 0
+        assert (store.get(job.id).status, store.get(job.id).error) == ("failed", "worker lost")
+        assert blobs.evict() == [content_hash]
+
+
+class TestGatewayUploads:
+    """Test that the gateway stores job payloads in the upload store."""
+
+    def test_duplicate_uploads_share_one_blob(self, tmp_path):
+        httpx = pytest.importorskip("httpx")
+        pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+
+        from dj_ai_app.gateway import GatewaySettings, create_app
+
+        settings = GatewaySettings(
+            backend_url="http://backend", jobs_dir=str(tmp_path / "jobs"), uploads_dir=str(tmp_path / "uploads"),
+        )
+        app = create_app(settings, transport=httpx.MockTransport(lambda r: httpx.Response(404)))
+        with TestClient(app) as client:
+            for _ in range(2):
+                response = client.post("/jobs/analyze-track", files={"file": ("track.mp3", b"audio", "audio/mpeg")})
+                assert response.status_code == 202
+
+        blobs = BlobStore(tmp_path / "uploads")
+        assert len(blobs) == 1
+        assert blobs.path(_hash(b"audio")).read_bytes() == b"audio"
+        assert list(JobStore(tmp_path / "jobs").payload_dir.iterdir()) == []
+
+    def test_failed_submit_unpins_the_upload(self, tmp_path, monkeypatch):
+        httpx = pytest.importorskip("httpx")
+        pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+
+        from dj_ai_app.gateway import GatewaySettings, create_app
+
+        def locked(*args, **kwargs):
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(JobStore, "submit", locked)
+        settings = GatewaySettings(
+            backend_url="http://backend", jobs_dir=str(tmp_path / "jobs"), uploads_dir=str(tmp_path / "uploads"),
+        )
+        app = create_app(settings, transport=httpx.MockTransport(lambda r: httpx.Response(404)))
+        with TestClient(app, raise_server_exceptions=False) as client:
+            response = client.post("/jobs/analyze-track", files={"file": ("track.mp3", b"audio", "audio/mpeg")})
+            assert response.status_code == 500
+
+        assert BlobStore(tmp_path / "uploads").evict(max_bytes=0) == [_hash(b"audio")]
@@ -0,0 +1,164 @@
+# DJ AI App - Cassette Tests
+# Author: Sergie Code
+# Purpose: Unit tests for recording HTTP interactions and replaying them offline
+
+import gzip
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from dj_ai_app.cassette import Cassette, CassetteMiss, cassette_path, normalize_url, use_cassette
+from dj_ai_app.cassette.__main__ import main
+
+
+class _Handler(BaseHTTPRequestHandler):
+    calls = 0
+
+    def do_GET(self):
+        type(self).calls += 1
+        if self.path.startswith("/slow"):
+            time.sleep(0.1)
+        if self.path.startswith("/bytes"):
+            body, content_type = bytes(range(256)), "application/octet-stream"
+        else:
+            body, content_type = json.dumps({"path": self.path, "call": type(self).calls}).encode(), "application/json"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Set-Cookie", "session=secret")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        body = self.rfile.read(length)
+        self.send_response(201)
+        self.send_header("Content-Type", "text/plain")
+        self.end_headers()
+        self.wfile.write(b"got " + body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.calls = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _closed_port() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+
+class TestCassette:
+    """Test recording and replaying requests calls."""
+
+    def test_record_then_replay_without_the_server(self, server, tmp_path):
+        path = tmp_path / "health.json.gz"
+        with use_cassette(Cassette(path, "record")):
+            first = requests.get(f"{server}/health?b=2&a=1", headers={"Authorization": "Bearer x"})
+            second = requests.Session().get(f"{server}/health?b=2&a=1")
+            binary = requests.get(f"{server}/bytes")
+            posted = requests.post(f"{server}/analyze", data=b"track")
+        assert _Handler.calls == 3
+
+        with use_cassette(Cassette(path, "replay")):
+            assert requests.get(f"{server}/health?a=1&b=2").json() == first.json()
+            assert requests.get(f"{server}/health?a=1&b=2").json() == second.json()
+            # Recordings of a key used up: the last one repeats
+            assert requests.get(f"{server}/health?a=1&b=2").json()["call"] == 2
+            assert requests.get(f"{server}/bytes").content == binary.content
+            replayed = requests.post(f"{server}/analyze", data=b"other")
+            assert (replayed.status_code, replayed.text) == (201, posted.text)
+            assert replayed.headers["Content-Type"] == "text/plain"
+        assert _Handler.calls == 3
+
+        stored = gzip.decompress(path.read_bytes()).decode()
+        assert "Bearer x" not in stored and "secret" not in stored
+
+    def test_unrecorded_request_is_a_miss(self, server, tmp_path):
+        with use_cassette(Cassette(tmp_path / "never.json.gz", "replay")):
+            with pytest.raises(CassetteMiss, match="not recorded yet"):
+                requests.get(f"{server}/health")
+        assert _Handler.calls == 0
+
+    def test_match_body(self, server, tmp_path):
+        path = tmp_path / "post.json.gz"
+        with use_cassette(Cassette(path, "record")):
+            requests.post(f"{server}/a", data=b"one")
+
+        with use_cassette(Cassette(path, "replay", match_body=True)):
+            assert requests.post(f"{server}/a", data=b"one").text == "got one"
+            with pytest.raises(CassetteMiss):
+                requests.post(f"{server}/a", data=b"two")
+
+    def test_connection_errors_replay(self, tmp_path):
+        url = _closed_port()
+        path = tmp_path / "down.json.gz"
+        with use_cassette(Cassette(path, "record")):
+            with pytest.raises(requests.ConnectionError):
+                requests.get(f"{url}/health", timeout=1)
+
+        with use_cassette(Cassette(path, "replay")):
+            with pytest.raises(requests.ConnectionError, match="replayed"):
+                requests.get(f"{url}/health")
+
+    def test_replay_at_recorded_latency(self, server, tmp_path):
+        path = tmp_path / "slow.json.gz"
+        with use_cassette(Cassette(path, "record")):
+            requests.get(f"{server}/slow")
+
+        with use_cassette(Cassette(path, "replay")):
+            started = time.monotonic()
+            requests.get(f"{server}/slow")
+            assert time.monotonic() - started < 0.05
+        with use_cassette(Cassette(path, "replay"), speed=1.0):
+            started = time.monotonic()
+            response = requests.get(f"{server}/slow")
+            assert time.monotonic() - started >= 0.1
+            assert response.elapsed.total_seconds() >= 0.1
+
+    def test_once_mode_and_deterministic_files(self, server, tmp_path):
+        path = tmp_path / "once.json.gz"
+        for _ in range(2):
+            with use_cassette(Cassette(path, "once")) as cassette:
+                requests.get(f"{server}/bytes")
+        assert _Handler.calls == 1
+        assert cassette.replaying
+
+        data = path.read_bytes()
+        cassette.save()
+        assert path.read_bytes() == data
+
+    def test_nothing_is_patched_outside_a_cassette(self, server, tmp_path):
+        with use_cassette(Cassette(tmp_path / "outer.json.gz", "replay")):
+            with use_cassette(Cassette(tmp_path / "inner.json.gz", "record")):
+                requests.get(f"{server}/inner")
+            with pytest.raises(CassetteMiss):
+                requests.get(f"{server}/inner")
+        assert requests.get(f"{server}/live").json()["call"] == 2
+        assert (tmp_path / "inner.json.gz").exists()
+        assert not (tmp_path / "outer.json.gz").exists()
+
+    def test_helpers_and_inspector(self, server, tmp_path, capsys):
+        assert normalize_url("HTTP://Core:8000/health?b=1&a=2#x") == "http://core:8000/health?a=2&b=1"
+        path = cassette_path(tmp_path, ["e2e", "test_workflow", "test_x[param 1]"])
+        assert path == tmp_path / "e2e" / "test_workflow" / "test_x_param_1_.json.gz"
+
+        with use_cassette(Cassette(path, "record")):
+            requests.get(f"{server}/health")
+        assert main([str(path)]) == 0
+        assert "GET     " in capsys.readouterr().out
@@ -75,6 +75,25 @@ class TestDockerComposeConfiguration:
         assert "version" in prod_data
         assert "services" in prod_data
 
+    def test_production_overlay_limits_every_service(self):
+        """Every production service declares CPU and memory limits and reservations."""
+        with open("docker-compose.yml", 'r') as f:
+            base_services = yaml.safe_load(f)["services"]
+        with open("docker-compose.prod.yml", 'r') as f:
+            prod_services = yaml.safe_load(f)["services"]
+
+        for name in base_services:
+            resources = prod_services[name]["deploy"]["resources"]
+            for kind in ("limits", "reservations"):
+                assert {"cpus", "memory"} <= set(resources[kind]), f"{name} is missing {kind}"
+
+    def test_polling_watchers_only_in_development(self):
+        """File-watcher polling is a dev-only setting."""
+        for compose_file in ("docker-compose.yml", "docker-compose.prod.yml"):
+            content = Path(compose_file).read_text()
+            assert "USEPOLLING" not in content and "WATCHPACK_POLLING" not in content, compose_file
+        assert "CHOKIDAR_USEPOLLING=true" in Path("docker-compose.dev.yml").read_text()
+
 
 class TestEnvironmentConfiguration:
     """Test environment configuration files."""
@@ -0,0 +1,227 @@
+# DJ AI App - Metrics Exporter Tests
+# Author: Sergie Code
+# Purpose: Unit tests for latency histograms, nginx parsing and the stack metrics exporter
+
+import json
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient
+
+from dj_ai_app.exporter import (
+    AccessLogTail,
+    ExporterSettings,
+    create_app,
+    nginx_route,
+    parse_stats,
+    parse_stub_status,
+)
+from dj_ai_app.gateway import GatewaySettings
+from dj_ai_app.gateway import create_app as create_gateway
+from dj_ai_app.gateway.metrics import MetricsRegistry, RouteLabels, route_label
+from dj_ai_app.waterfall import parse_upstream_time
+
+STUB_STATUS = """Active connections: 3
+server accepts handled requests
+ 120 118 900
+Reading: 0 Writing: 2 Waiting: 1
+"""
+
+CONTAINER_STATS = {
+    "cpu_stats": {"cpu_usage": {"total_usage": 2_500_000_000}},
+    "memory_stats": {"usage": 300, "limit": 1000, "stats": {"inactive_file": 100}},
+    "networks": {"eth0": {"rx_bytes": 10, "tx_bytes": 20}, "eth1": {"rx_bytes": 1, "tx_bytes": 2}},
+}
+
+
+def _log_line(uri="/api/analyze-track", status=200, request_time=1.5, connect="0.001", upstream="1.499"):
+    return json.dumps({
+        "method": "POST", "uri": uri, "status": status, "request_time": request_time,
+        "upstream_connect_time": connect, "upstream_response_time": upstream,
+    })
+
+
+class TestHistogram:
+    """Test the Prometheus histogram and route labels."""
+
+    def test_buckets_are_cumulative(self):
+        histogram = MetricsRegistry().histogram("latency_seconds", "test", buckets=(0.1, 1))
+        for value in (0.05, 0.5, 0.5, 5):
+            histogram.observe(value, route="/a")
+
+        lines = histogram.render()
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{route="/a",le="1"} 3' in lines
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+        assert 'latency_seconds_count{route="/a"} 4' in lines
+        assert histogram.value(route="/a") == 4
+
+    @pytest.mark.parametrize("path, label", [
+        ("/jobs/0123456789abcdef0123456789abcdef", "/jobs/:id"),
+        ("/tracks/42/analysis", "/tracks/:id/analysis"),
+        ("/a/b/c/d/e", "/a/b/c"),
+        ("/", "/"),
+    ])
+    def test_route_label(self, path, label):
+        assert route_label(path) == label
+
+    def test_route_labels_are_bounded(self):
+        routes = RouteLabels(limit=2)
+        assert routes("/tracks/42", 200) == "/tracks/:id"
+        assert routes("/foo123abc/x", 404) == "other"
+        assert routes("/supported-formats") == "/supported-formats"
+        assert routes("/scan1") == "other"
+        assert routes("/tracks/7") == "/tracks/:id"
+
+
+class TestNginxSources:
+    """Test stub_status parsing and the timing log tail."""
+
+    def test_parse_stub_status(self):
+        status = parse_stub_status(STUB_STATUS)
+
+        assert status["active"] == 3
+        assert (status["accepted"], status["handled"], status["requests"]) == (120, 118, 900)
+        assert (status["reading"], status["writing"], status["waiting"]) == (0, 2, 1)
+
+    def test_invalid_stub_status(self):
+        with pytest.raises(ValueError):
+            parse_stub_status("<html>502 Bad Gateway</html>")
+
+    @pytest.mark.parametrize("value, seconds", [("-", None), ("0.5", 0.5), ("0.5, 0.25", 0.75), ("0.1 : 0.2", pytest.approx(0.3))])
+    def test_parse_upstream_time(self, value, seconds):
+        assert parse_upstream_time(value) == seconds
+
+    def test_frontend_paths_share_one_route(self):
+        assert nginx_route("/static/js/main.3f2a.js") == "frontend"
+        assert nginx_route("/api/jobs/0123456789abcdef0123456789abcdef?wait=1") == "/api/jobs/:id"
+        assert nginx_route("/?utm_source=/api/") == "frontend"
+
+    def test_tail_reads_only_new_complete_lines(self, tmp_path):
+        log = tmp_path / "timing.log"
+        tail = AccessLogTail(log)
+        assert tail.read() == []
+
+        log.write_text(_log_line() + "\n" + _log_line(uri="/api/jobs/x")[:20])
+        assert [entry["uri"] for entry in tail.read()] == ["/api/analyze-track"]
+
+        with open(log, "a") as f:
+            f.write(_log_line(uri="/api/jobs/x")[20:] + "\nnot json\n")
+        assert [entry["uri"] for entry in tail.read()] == ["/api/jobs/x"]
+        assert tail.read() == []
+
+    def test_tail_follows_rotated_logs_without_writing(self, tmp_path):
+        log = tmp_path / "timing.log"
+        tail = AccessLogTail(log)
+        log.write_text(_log_line() + "\n")
+        assert len(tail.read()) == 1
+        assert log.stat().st_size > 0
+
+        # Rotation: nginx keeps writing to the renamed file until it reopens
+        log.rename(tmp_path / "timing.log.1")
+        with open(tmp_path / "timing.log.1", "a") as f:
+            f.write(_log_line(uri="/api/jobs/x") + "\n")
+        log.write_text(_log_line(uri="/health") + "\n")
+        assert sorted(entry["uri"] for entry in tail.read()) == ["/api/jobs/x", "/health"]
+        assert tail.read() == []
+
+        log.write_text("")
+        assert tail.read() == []
+        log.write_text(_log_line(uri="/peaks/x") + "\n")
+        assert [entry["uri"] for entry in tail.read()] == ["/peaks/x"]
+        tail.close()
+
+
+class TestContainerStats:
+    """Test reduction of Docker Engine stats payloads."""
+
+    def test_parse_stats(self):
+        stats = parse_stats(CONTAINER_STATS)
+
+        assert stats.cpu_seconds == 2.5
+        assert stats.memory_bytes == 200
+        assert stats.memory_limit_bytes == 1000
+        assert (stats.rx_bytes, stats.tx_bytes) == (11, 22)
+
+
+class TestExporterApp:
+    """Test the combined /metrics endpoint."""
+
+    def _exporter(self, tmp_path, nginx_up=True):
+        def http(request):
+            if request.url.path == "/nginx_status":
+                return httpx.Response(200, text=STUB_STATUS) if nginx_up else httpx.Response(502)
+            return httpx.Response(200, text="# TYPE dj_gateway_jobs_queued gauge\ndj_gateway_jobs_queued 7\n")
+
+        def docker(request):
+            if request.url.path == "/containers/json":
+                return httpx.Response(200, json=[
+                    {"Id": "c1", "Names": ["/dj-ai-core"]},
+                    {"Id": "c2", "Names": ["/unrelated"]},
+                ])
+            assert request.url.path == "/containers/c1/stats"
+            return httpx.Response(200, json=CONTAINER_STATS)
+
+        settings = ExporterSettings(
+            nginx_status_url="http://nginx:8081/nginx_status",
+            access_log=str(tmp_path / "timing.log"),
+            gateway_metrics_url="http://dj-ai-gateway:8080/gateway/metrics",
+        )
+        return create_app(settings, transport=httpx.MockTransport(http), docker_transport=httpx.MockTransport(docker))
+
+    def test_metrics_combine_every_source(self, tmp_path):
+        (tmp_path / "timing.log").write_text("\n".join([
+            _log_line(), _log_line(connect="-", upstream="-", status=304), _log_line(uri="/api/wp-login.php", status=404),
+        ]) + "\n")
+        with TestClient(self._exporter(tmp_path)) as client:
+            text = client.get("/metrics").text
+
+        assert 'dj_exporter_up{source="nginx"} 1' in text
+        assert 'dj_nginx_connections{state="writing"} 2' in text
+        assert "dj_nginx_http_requests_total 900" in text
+        assert 'dj_nginx_request_duration_seconds_count{method="POST",route="/api/analyze-track"} 2' in text
+        assert 'dj_nginx_upstream_connect_seconds_count{route="/api/analyze-track"} 1' in text
+        assert 'dj_nginx_responses_total{method="POST",route="/api/analyze-track",status="3xx"} 1' in text
+        assert 'dj_nginx_responses_total{method="POST",route="other",status="4xx"} 1' in text
+        assert 'dj_container_cpu_seconds_total{container="dj-ai-core"} 2.5' in text
+        assert "unrelated" not in text
+        assert "dj_gateway_jobs_queued 7" in text
+
+    def test_unreachable_source_is_reported_down(self, tmp_path):
+        with TestClient(self._exporter(tmp_path, nginx_up=False)) as client:
+            text = client.get("/metrics").text
+
+        assert 'dj_exporter_up{source="nginx"} 0' in text
+        assert 'dj_exporter_up{source="gateway"} 1' in text
+
+
+class TestGatewayLatencyMetrics:
+    """Test per-route latency histograms in the gateway."""
+
+    def test_requests_are_timed_by_route_template(self, tmp_path):
+        settings = GatewaySettings(backend_url="http://backend", jobs_dir=str(tmp_path))
+        app = create_gateway(settings, transport=httpx.MockTransport(lambda r: httpx.Response(200, json={})))
+        with TestClient(app) as client:
+            client.get("/gateway/features/some-track")
+            client.get("/tracks/42")
+            text = client.get("/gateway/metrics").text
+
+        assert 'dj_gateway_requests_total{method="GET",route="/gateway/features/{track_id}",status="404"} 1' in text
+        assert 'dj_gateway_request_duration_seconds_count{method="GET",route="/tracks/:id"} 1' in text
+        assert 'dj_gateway_upstream_duration_seconds_count{route="/tracks/:id"} 1' in text
+        assert "dj_gateway_requests_in_flight 1" in text
+
+    def test_unknown_paths_share_one_route(self, tmp_path):
+        settings = GatewaySettings(backend_url="http://backend", jobs_dir=str(tmp_path))
+        app = create_gateway(settings, transport=httpx.MockTransport(lambda r: httpx.Response(404, json={})))
+        with TestClient(app) as client:
+            for i in range(5):
+                client.get(f"/scan{i}abc/x")
+            text = client.get("/gateway/metrics").text
+
+        assert 'dj_gateway_request_duration_seconds_count{method="GET",route="other"} 5' in text
+        assert 'dj_gateway_upstream_duration_seconds_count{route="other"} 5' in text
+        assert "scan" not in text
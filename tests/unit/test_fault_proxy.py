@@ -0,0 +1,212 @@
+# DJ AI App - Fault Proxy Tests
+# Author: Sergie Code
+# Purpose: Unit tests for latency, bandwidth, reset and stall injection
+
+import asyncio
+import json
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from dj_ai_app.faults import FaultProfile, TokenBucket, faults, preset, run_proxy
+from dj_ai_app.faults.__main__ import parse_address
+
+
+class _Echo(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            data = self.request.recv(65536)
+            if not data:
+                return
+            self.request.sendall(data)
+
+
+class _Health(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"status": "healthy"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(server):
+    threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def echo():
+    server = _serve(socketserver.ThreadingTCPServer(("127.0.0.1", 0), _Echo))
+    server.daemon_threads = True
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def http_server():
+    server = _serve(ThreadingHTTPServer(("127.0.0.1", 0), _Health))
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def _round_trip(proxy, payload: bytes, timeout: float = 5.0) -> bytes:
+    with socket.create_connection(("127.0.0.1", proxy.port), timeout=timeout) as sock:
+        sock.sendall(payload)
+        sock.shutdown(socket.SHUT_WR)
+        received = b""
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return received
+            received += chunk
+
+
+class TestFaultProxy:
+    """Test traffic degradation through the proxy."""
+
+    def test_clean_profile_forwards_unchanged(self, echo):
+        with run_proxy("127.0.0.1", echo) as proxy:
+            payload = bytes(range(256)) * 1000
+            assert _round_trip(proxy, payload) == payload
+        assert proxy.stats.connections == 1
+        assert proxy.stats.upload_bytes == proxy.stats.download_bytes == len(payload)
+        assert proxy.stats.active == 0
+
+    def test_latency_applies_in_both_directions(self, echo):
+        with run_proxy("127.0.0.1", echo, FaultProfile(latency=0.1)) as proxy:
+            started = time.monotonic()
+            assert _round_trip(proxy, b"ping") == b"ping"
+            assert time.monotonic() - started >= 0.2
+
+    def test_bandwidth_cap_limits_throughput(self, echo):
+        # One 16 KiB chunk goes out as a burst, the other 48 KiB at 256 KiB/s
+        profile = FaultProfile(upload_bps=256 * 1024)
+        with run_proxy("127.0.0.1", echo, profile) as proxy:
+            started = time.monotonic()
+            assert len(_round_trip(proxy, b"x" * 64 * 1024)) == 64 * 1024
+            assert 0.15 <= time.monotonic() - started < 2
+
+    def test_reset_after_bytes_sends_rst(self, echo):
+        with run_proxy("127.0.0.1", echo, FaultProfile(reset_after_bytes=1000)) as proxy:
+            with pytest.raises(ConnectionResetError):
+                _round_trip(proxy, b"x" * 4000)
+            assert proxy.stats.resets == 1
+
+    def test_reset_probability_is_seeded(self, echo):
+        profile = FaultProfile(reset_probability=1.0, reset_window=10)
+        with run_proxy("127.0.0.1", echo, profile, seed=7) as proxy:
+            for _ in range(3):
+                with pytest.raises(ConnectionResetError):
+                    _round_trip(proxy, b"x" * 100)
+            assert proxy.stats.resets == 3
+
+    def test_upload_stall(self, echo):
+        profile = FaultProfile(stall_after_bytes=10, stall_seconds=0.3, chunk_size=16)
+        with run_proxy("127.0.0.1", echo, profile) as proxy:
+            started = time.monotonic()
+            assert _round_trip(proxy, b"x" * 64) == b"x" * 64
+            assert time.monotonic() - started >= 0.3
+            assert proxy.stats.stalls == 1
+
+    def test_endless_stall_times_the_client_out(self, echo):
+        profile = FaultProfile(stall_after_bytes=0, stall_seconds=float("inf"))
+        with run_proxy("127.0.0.1", echo, profile) as proxy:
+            with pytest.raises(socket.timeout):
+                _round_trip(proxy, b"upload", timeout=0.3)
+
+    def test_faults_context_and_live_update(self, http_server):
+        with run_proxy("127.0.0.1", http_server) as proxy:
+            session = requests.Session()
+            assert session.get(f"{proxy.url}/health", timeout=2).status_code == 200
+            # Applies to the kept-alive connection as well as new ones
+            with faults(proxy, latency=0.5):
+                with pytest.raises(requests.exceptions.Timeout):
+                    session.get(f"{proxy.url}/health", timeout=0.3)
+            assert proxy.profile == FaultProfile()
+            assert requests.get(f"{proxy.url}/health", timeout=2).json() == {"status": "healthy"}
+
+    def test_unreachable_upstream_resets_the_client(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        with run_proxy("127.0.0.1", port) as proxy:
+            with pytest.raises(requests.exceptions.ConnectionError):
+                requests.get(f"{proxy.url}/health", timeout=2)
+            assert proxy.stats.upstream_errors == 1
+
+
+class TestFaultProfile:
+    """Test profiles, presets and pacing."""
+
+    def test_update_validates(self):
+        profile = preset("venue-wifi").update({"latency": 0.2, "upload_bps": None})
+        assert profile.latency == 0.2 and profile.upload_bps is None
+        for bad in ({"latency": -1}, {"latency": "slow"}, {"latency": None}, {"chunk_size": 0}, {"bogus": 1}):
+            with pytest.raises(ValueError):
+                profile.update(bad)
+        with pytest.raises(ValueError, match="Unknown fault preset"):
+            preset("dial-up")
+
+    def test_to_dict_is_json_safe(self):
+        data = FaultProfile(stall_seconds=float("inf")).to_dict()
+        assert data["stall_seconds"] is None
+        json.dumps(data)
+
+    def test_token_bucket_paces(self):
+        async def run():
+            bucket = TokenBucket()
+            started = time.monotonic()
+            for _ in range(5):
+                await bucket.consume(1000, 20_000, 1000)
+            return time.monotonic() - started
+
+        # First chunk is the burst, four more at 20 kB/s
+        assert 0.18 <= asyncio.run(run()) < 1
+
+    def test_parse_address(self):
+        assert parse_address("dj-ai-core:8000") == ("dj-ai-core", 8000)
+        assert parse_address("8001") == ("127.0.0.1", 8001)
+
+
+class TestControlAPI:
+    """Test changing a running proxy over HTTP."""
+
+    def test_profile_stats_and_metrics(self, echo):
+        pytest.importorskip("httpx")
+        from fastapi.testclient import TestClient
+
+        from dj_ai_app.faults.control import create_app
+
+        with run_proxy("127.0.0.1", echo) as proxy:
+            client = TestClient(create_app(proxy))
+            assert "venue-wifi" in client.get("/profile").json()["presets"]
+
+            response = client.put("/profile", json={"preset": "mobile-3g", "latency": 0.01})
+            assert response.status_code == 200
+            assert proxy.profile == preset("mobile-3g").update({"latency": 0.01})
+
+            assert client.put("/profile", json={"stall_after_bytes": 0, "stall_seconds": None}).status_code == 200
+            assert proxy.profile.stall_seconds == float("inf")
+            assert client.get("/profile").json()["profile"]["stall_seconds"] is None
+
+            assert client.put("/profile", json={"latency": "slow"}).status_code == 400
+            assert client.put("/profile", json={"preset": "dial-up"}).status_code == 400
+
+            client.put("/profile", json={"preset": "clean"})
+            _round_trip(proxy, b"abc")
+            assert client.get("/stats").json()["upload_bytes"] == 3
+            metrics = client.get("/metrics").text
+            assert "dj_faults_connections_total 1" in metrics
+            assert 'dj_faults_bytes_total{direction="download"} 3' in metrics
@@ -0,0 +1,157 @@
+# DJ AI App - Feature Store Tests
+# Author: Sergie Code
+# Purpose: Unit tests for the shared memory-mapped feature store
+
+import hashlib
+import json
+import math
+import multiprocessing
+
+import pytest
+
+from dj_ai_app.features import KEYS, FeatureStore, key_code
+
+
+def _hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _analysis(track_id, bpm=128.0, key="A minor", energy=0.8):
+    return {"track_id": track_id, "bpm": bpm, "key": key, "duration": 240.0, "features": {"energy": energy}}
+
+
+def _append_many(root, worker, count):
+    store = FeatureStore(root)
+    for i in range(count):
+        store.append(_hash(f"{worker}-{i}".encode()), _analysis(f"{worker}-{i}", bpm=float(i)))
+
+
+class TestKeyCodes:
+    """Test musical key normalisation."""
+
+    @pytest.mark.parametrize("key, name", [
+        ("C major", "C major"),
+        ("Am", "A minor"),
+        ("Bb major", "A# major"),
+        ("f# min", "F# minor"),
+        ("D♭", "C# major"),
+    ])
+    def test_known_keys(self, key, name):
+        assert KEYS[key_code(key)] == name
+
+    @pytest.mark.parametrize("key", [None, "", "H major", "Cb major"])
+    def test_unknown_keys(self, key):
+        assert key_code(key) == -1
+
+
+class TestFeatureStore:
+    """Test appends, lookups and zero-copy column access."""
+
+    def test_append_and_lookup(self, tmp_path):
+        store = FeatureStore(tmp_path)
+        row = store.append(_hash(b"a"), _analysis("t1"))
+
+        assert row == 0
+        assert store.get_by_hash(_hash(b"a"))["track_id"] == "t1"
+        assert store.get_by_track("t1")["features"]["energy"] == 0.8
+        assert store.get_by_hash(_hash(b"missing")) is None
+        assert store.get_by_track("missing") is None
+
+    def test_same_content_is_stored_once(self, tmp_path):
+        store = FeatureStore(tmp_path)
+        store.append(_hash(b"a"), _analysis("t1"))
+
+        assert store.append(_hash(b"a"), _analysis("t1", bpm=90.0)) == 0
+        assert len(store) == 1
+
+    def test_columns_are_typed_views(self, tmp_path):
+        store = FeatureStore(tmp_path)
+        store.append(_hash(b"a"), _analysis("t1", bpm=126.0, key="Am"))
+        store.append(_hash(b"b"), {"track_id": "t2"})
+
+        assert list(store.column("bpm")) == [126.0, pytest.approx(math.nan, nan_ok=True)]
+        assert list(store.column("key")) == [21, -1]
+        assert store.column("energy")[0] == 0.8
+
+    def test_latest_analysis_of_a_track_wins(self, tmp_path):
+        store = FeatureStore(tmp_path)
+        store.append(_hash(b"v1"), _analysis("t1", bpm=120.0))
+        store.append(_hash(b"v2"), _analysis("t1", bpm=121.0))
+
+        assert store.get_by_track("t1")["bpm"] == 121.0
+
+    def test_readers_see_appends_from_other_instances(self, tmp_path):
+        reader = FeatureStore(tmp_path)
+        assert reader.get_by_hash(_hash(b"a")) is None
+
+        FeatureStore(tmp_path).append(_hash(b"a"), _analysis("t1"))
+        assert reader.get_by_hash(_hash(b"a"))["track_id"] == "t1"
+        assert len(reader.column("bpm")) == 1
+
+    def test_torn_write_is_discarded(self, tmp_path):
+        store = FeatureStore(tmp_path)
+        store.append(_hash(b"a"), _analysis("t1"))
+        # A writer died after writing part of a row but before committing it
+        with open(tmp_path / "columns" / "bpm.bin", "ab") as f:
+            f.write(b"\xff" * 5)
+        with open(tmp_path / "results.jsonl", "ab") as f:
+            f.write(b'{"track_id": "gar')
+
+        store.append(_hash(b"b"), _analysis("t2", bpm=99.0))
+        assert list(store.column("bpm")) == [128.0, 99.0]
+        assert store.get_by_track("t2")["bpm"] == 99.0
+
+    def test_results_file_is_json_lines(self, tmp_path):
+        store = FeatureStore(tmp_path)
+        store.append(_hash(b"a"), _analysis("t1"))
+        store.append(_hash(b"b"), _analysis("t2\nwith a newline"))
+
+        lines = (tmp_path / "results.jsonl").read_bytes().splitlines()
+        assert [json.loads(line)["track_id"] for line in lines] == ["t1", "t2\nwith a newline"]
+        assert store.raw(1) == lines[1]
+
+    def test_concurrent_writer_processes(self, tmp_path):
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=_append_many, args=(tmp_path, w, 25)) for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        store = FeatureStore(tmp_path)
+        assert len(store) == 100
+        assert all(store.get_by_track(f"{w}-24") is not None for w in range(4))
+
+    def test_rejects_invalid_hash(self, tmp_path):
+        with pytest.raises(ValueError):
+            FeatureStore(tmp_path).append("abcd", _analysis("t1"))
+
+
+class TestGatewayFeatureStore:
+    """Test that gateway replicas share analyses through the store."""
+
+    def test_second_replica_reuses_first_replicas_analysis(self, tmp_path):
+        httpx = pytest.importorskip("httpx")
+        pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+
+        from dj_ai_app.gateway import GatewaySettings, create_app
+
+        calls = []
+
+        def backend(request):
+            calls.append(request.url.path)
+            return httpx.Response(200, json=_analysis("t1"))
+
+        settings = GatewaySettings(backend_url="http://backend", features_dir=str(tmp_path))
+        upload = {"file": ("track.mp3", b"same audio", "audio/mpeg")}
+        with TestClient(create_app(settings, transport=httpx.MockTransport(backend))) as first:
+            assert first.post("/analyze-track", files=upload).headers["X-Cache"] == "MISS"
+        with TestClient(create_app(settings, transport=httpx.MockTransport(backend))) as second:
+            response = second.post("/analyze-track", files=upload)
+            by_track = second.get("/gateway/features/t1")
+
+        assert response.headers["X-Cache"] == "HIT"
+        assert response.json()["bpm"] == 128.0
+        assert by_track.json()["track_id"] == "t1"
+        assert calls == ["/analyze-track"]
@@ -0,0 +1,150 @@
+# DJ AI App - Gateway Cache Tests
+# Author: Sergie Code
+# Purpose: Unit tests for the gateway response cache and its HTTP behaviour
+
+import hashlib
+import json
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient
+
+from dj_ai_app.gateway import CachedResponse, GatewaySettings, LRUCache, create_app
+from dj_ai_app.gateway.app import CONTENT_HASH_HEADER
+
+
+class FakeBackend:
+    """httpx transport standing in for dj-ai-core."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, request):
+        self.calls.append(request.url.path)
+        if request.url.path == "/supported-formats":
+            return httpx.Response(200, json={"formats": ["mp3", "wav", "flac", "m4a"]})
+        if request.url.path == "/analyze-track":
+            return httpx.Response(200, json={"track_id": f"t{len(self.calls)}", "bpm": 128.0})
+        return httpx.Response(404, json={"detail": "Not Found"})
+
+
+@pytest.fixture
+def backend():
+    return FakeBackend()
+
+
+@pytest.fixture
+def gateway(backend):
+    app = create_app(GatewaySettings(backend_url="http://backend"), transport=httpx.MockTransport(backend))
+    with TestClient(app) as client:
+        yield client
+
+
+class TestLRUCache:
+    """Test the byte-capped LRU store."""
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_bytes=30)
+        cache.put("a", CachedResponse(200, b"x" * 10))
+        cache.put("b", CachedResponse(200, b"y" * 10))
+        cache.get("a")
+        cache.put("c", CachedResponse(200, b"z" * 10))
+        cache.put("d", CachedResponse(200, b"w" * 10))
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.current_bytes <= 30
+        assert cache.evictions == 1
+
+    def test_rejects_entries_larger_than_budget(self):
+        cache = LRUCache(max_bytes=5)
+        assert cache.put("big", CachedResponse(200, b"x" * 10)) is False
+        assert len(cache) == 0
+
+    def test_ttl_expiry(self, clock):
+        cache = LRUCache(max_bytes=1024, ttl=30, clock=clock)
+        cache.put("meta", CachedResponse(200, b"{}"))
+
+        clock.now = 29
+        assert cache.get("meta") is not None
+        clock.now = 31
+        assert cache.get("meta") is None
+        assert cache.current_bytes == 0
+
+
+class TestMetadataCaching:
+    """Test ETag-validated caching of API metadata."""
+
+    def test_second_request_is_served_from_cache(self, gateway, backend):
+        first = gateway.get("/supported-formats")
+        second = gateway.get("/supported-formats")
+
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.json() == first.json()
+        assert backend.calls.count("/supported-formats") == 1
+        assert "max-age=30" in second.headers["Cache-Control"]
+
+    def test_if_none_match_returns_304(self, gateway):
+        etag = gateway.get("/supported-formats").headers["ETag"]
+        response = gateway.get("/supported-formats", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_errors_are_not_cached(self, gateway, backend):
+        gateway.get("/openapi.json")
+        gateway.get("/openapi.json")
+        assert backend.calls.count("/openapi.json") == 2
+
+
+class TestAnalysisCaching:
+    """Test content-hashed caching of /analyze-track."""
+
+    AUDIO = b"RIFF....WAVEfmt fake audio"
+
+    def _upload(self, gateway, content_hash=None, audio=AUDIO):
+        headers = {CONTENT_HASH_HEADER: content_hash} if content_hash else {}
+        return gateway.post("/analyze-track", files={"file": ("track.wav", audio, "audio/wav")}, headers=headers)
+
+    def test_repeated_upload_skips_backend(self, gateway, backend):
+        digest = hashlib.sha256(self.AUDIO).hexdigest()
+        first = self._upload(gateway, digest)
+        second = self._upload(gateway, digest)
+
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.json() == first.json()
+        assert backend.calls.count("/analyze-track") == 1
+
+    def test_upload_without_header_still_uses_content_hash(self, gateway, backend):
+        self._upload(gateway)
+        response = self._upload(gateway)
+
+        assert response.headers["X-Cache"] == "HIT"
+        assert backend.calls.count("/analyze-track") == 1
+
+    def test_mismatched_hash_is_rejected(self, gateway, backend):
+        response = self._upload(gateway, "0" * 64)
+
+        assert response.status_code == 400
+        assert "does not match" in response.json()["detail"]
+        assert "/analyze-track" not in backend.calls
+
+    def test_malformed_hash_is_rejected(self, gateway):
+        response = self._upload(gateway, "not-a-digest")
+        assert response.status_code == 400
+
+
+class TestProxy:
+    """Test pass-through of uncached routes."""
+
+    def test_unknown_routes_are_forwarded(self, gateway, backend):
+        response = gateway.get("/non-existent-endpoint")
+
+        assert response.status_code == 404
+        assert backend.calls == ["/non-existent-endpoint"]
+        assert json.loads(response.content)["detail"] == "Not Found"
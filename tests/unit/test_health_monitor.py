@@ -0,0 +1,171 @@
+# DJ AI App - Health Monitor Tests
+# Author: Sergie Code
+# Purpose: Unit tests for probe history, SLO summaries and the health monitor service
+
+import asyncio
+import time
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient
+
+from dj_ai_app.monitor import (
+    DEFAULT_TARGETS,
+    HealthMonitor,
+    MonitorSettings,
+    Probe,
+    ProbeHistory,
+    create_app,
+    parse_targets,
+)
+
+
+def _settings(**overrides):
+    values = dict(
+        targets={"backend": "http://core/health", "frontend": "http://frontend/"},
+        interval=1.0, history=10, window=60.0, availability_objective=0.9, latency_objective=0.5,
+    )
+    values.update(overrides)
+    return MonitorSettings(**values)
+
+
+class TestMonitorSettings:
+    """Test monitor configuration from the environment."""
+
+    def test_defaults_and_env(self):
+        assert MonitorSettings.from_env({}).targets == DEFAULT_TARGETS
+
+        settings = MonitorSettings.from_env({
+            "MONITOR_TARGETS": "api=http://core/health, web=http://frontend/",
+            "MONITOR_INTERVAL": "2", "MONITOR_LATENCY_SLO_MS": "250", "MONITOR_HISTORY": "100",
+        })
+        assert settings.targets == {"api": "http://core/health", "web": "http://frontend/"}
+        assert settings.interval == 2.0
+        assert settings.latency_objective == 0.25
+        assert settings.history == 100
+
+    def test_bad_target(self):
+        with pytest.raises(ValueError, match="name=url"):
+            parse_targets("http://core/health")
+
+
+class TestProbeHistory:
+    """Test the ring buffer and its SLO summaries."""
+
+    def test_ring_buffer_keeps_the_latest_probes(self):
+        history = ProbeHistory(3)
+        for i in range(5):
+            history.add(Probe(time=float(i), latency=0.1, ok=i != 4))
+
+        assert [p.time for p in history.probes] == [2.0, 3.0, 4.0]
+        assert history.consecutive_failures == 1
+
+    def test_summary_against_objectives(self):
+        history = ProbeHistory(100)
+        for i in range(20):
+            history.add(Probe(time=float(i), latency=(i + 1) / 100, ok=i != 0, status=200 if i else 503))
+
+        summary = history.summary(availability_objective=0.9, latency_objective=0.2)
+        assert summary["probes"] == 20
+        assert summary["availability"] == 0.95
+        assert summary["availability_met"]
+        assert summary["error_budget_remaining"] == pytest.approx(0.5)
+        assert summary["p95"] == 0.2
+        assert summary["latency_met"]
+        assert summary["up"] and summary["last_status"] == 200
+
+        recent = history.summary(since=15.0, latency_objective=0.1)
+        assert recent["probes"] == 5
+        assert recent["failures"] == 0
+        assert not recent["latency_met"]
+
+    def test_trend_shows_degradation(self):
+        history = ProbeHistory(100)
+        for i in range(40):
+            history.add(Probe(time=float(i), latency=0.05 if i < 20 else 0.5, ok=i < 30))
+
+        first, second = history.trend(0.0, 40.0, 2)
+        assert first["probes"] == 20 and first["availability"] == 1.0 and first["p95"] == 0.05
+        assert second["availability"] == 0.5 and second["p50"] == 0.5
+
+
+class TestHealthMonitor:
+    """Test concurrent probing and the HTTP endpoints."""
+
+    def test_probes_run_concurrently(self, clock):
+        async def handler(request):
+            await asyncio.sleep(0.2)
+            if request.url.host == "frontend":
+                return httpx.Response(502)
+            return httpx.Response(200, json={"status": "healthy"})
+
+        async def scenario():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                monitor = HealthMonitor(_settings(), client, clock=clock)
+                started = time.monotonic()
+                await monitor.probe_all()
+                elapsed = time.monotonic() - started
+                return monitor, elapsed
+
+        monitor, elapsed = asyncio.run(scenario())
+        assert elapsed < 0.35
+        status = monitor.status()
+        assert status["targets"]["backend"]["up"]
+        assert status["targets"]["frontend"]["last_error"] == "HTTP 502"
+        assert not status["healthy"]
+
+    def test_connection_errors_are_failures(self, clock):
+        def handler(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        async def scenario():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                monitor = HealthMonitor(_settings(), client, clock=clock)
+                await monitor.probe_all()
+                await monitor.probe_all()
+                return monitor.summary("backend")
+
+        summary = asyncio.run(scenario())
+        assert summary["availability"] == 0.0
+        assert summary["consecutive_failures"] == 2
+        assert summary["last_error"] == "ConnectError"
+
+    def test_run_keeps_a_fixed_cadence(self):
+        async def handler(request):
+            return httpx.Response(200)
+
+        async def scenario():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                monitor = HealthMonitor(_settings(interval=0.05), client)
+                task = asyncio.create_task(monitor.run())
+                await asyncio.sleep(0.22)
+                task.cancel()
+                return monitor.ticks
+
+        assert 3 <= asyncio.run(scenario()) <= 6
+
+    def test_http_endpoints(self):
+        def handler(request):
+            return httpx.Response(200)
+
+        app = create_app(_settings(interval=3600), transport=httpx.MockTransport(handler))
+        with TestClient(app) as client:
+            deadline = time.monotonic() + 5
+            while app.state.monitor.ticks == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            slo = client.get("/slo").json()
+            assert slo["healthy"]
+            assert slo["targets"]["backend"]["availability"] == 1.0
+
+            detail = client.get("/slo/backend", params={"buckets": 4}).json()
+            assert len(detail["trend"]) == 4
+            assert detail["samples"][-1]["status"] == 200
+            assert client.get("/slo/nope").status_code == 404
+
+            metrics = client.get("/metrics").text
+            assert 'dj_monitor_up{target="backend"} 1' in metrics
+            assert 'dj_monitor_availability_ratio{target="frontend"} 1' in metrics
@@ -0,0 +1,70 @@
+# DJ AI App - Idle Usage Benchmark Tests
+# Author: Sergie Code
+# Purpose: Unit tests for the dev vs. production idle resource comparison
+
+import json
+
+import pytest
+
+from dj_ai_app.bench import ComposeStack
+from dj_ai_app.bench.idle import IdleUsage, parse_size, parse_stats, render
+
+
+def _row(name, cpu, memory):
+    return json.dumps({"Name": name, "CPUPerc": cpu, "MemUsage": f"{memory} / 7.6GiB"})
+
+
+class TestDockerStatsParsing:
+    """Test reading docker stats output."""
+
+    @pytest.mark.parametrize("text, expected", [
+        ("0B", 0),
+        ("512KiB", 512 * 1024),
+        ("12.5MiB", int(12.5 * 1024 ** 2)),
+        ("1.2GB", 1_200_000_000),
+    ])
+    def test_parse_size(self, text, expected):
+        assert parse_size(text) == expected
+
+    def test_parse_size_rejects_garbage(self):
+        with pytest.raises(ValueError):
+            parse_size("lots")
+
+    def test_snapshot_is_keyed_by_service(self):
+        output = "\n".join([_row("dj-ai-core", "1.50%", "300MiB"), _row("dj-ai-nginx", "0.00%", "4MiB")])
+        snapshot = parse_stats(output, {"dj-ai-core": "dj-ai-core", "dj-ai-nginx": "nginx"})
+
+        assert snapshot["nginx"] == {"cpu_percent": 0.0, "memory_bytes": 4 * 1024 ** 2}
+        assert snapshot["dj-ai-core"]["cpu_percent"] == 1.5
+
+
+class TestIdleReport:
+    """Test summarising samples into the comparison table."""
+
+    def test_render_compares_environments(self):
+        dev, prod = IdleUsage("dev"), IdleUsage("prod")
+        dev.add({"dj-ai-frontend": {"cpu_percent": 12.0, "memory_bytes": 600 * 1024 ** 2}})
+        dev.add({"dj-ai-frontend": {"cpu_percent": 8.0, "memory_bytes": 600 * 1024 ** 2}})
+        prod.add({"dj-ai-frontend": {"cpu_percent": 0.1, "memory_bytes": 40 * 1024 ** 2}})
+        prod.add({"nginx": {"cpu_percent": 0.0, "memory_bytes": 8 * 1024 ** 2}})
+
+        table = render([dev, prod])
+
+        assert "| dj-ai-frontend | 10.00 | 600.0 | 0.10 | 40.0 |" in table
+        assert "| nginx | - | - | 0.00 | 8.0 |" in table
+        assert table.splitlines()[-1] == "| **total** | **10.00** | **600.0** | **0.10** | **48.0** |"
+
+
+class TestComposeStack:
+    """Test the compose command lines used by the measurements."""
+
+    def test_prod_command_uses_overlay_and_project(self):
+        command = ComposeStack("prod", compose="docker compose").command("up", "-d")
+        assert command == [
+            "docker", "compose", "-f", "docker-compose.yml", "-f", "docker-compose.prod.yml",
+            "-p", "dj-ai-app-prod", "up", "-d",
+        ]
+
+    def test_unknown_environment(self):
+        with pytest.raises(ValueError):
+            ComposeStack("staging")
@@ -0,0 +1,66 @@
+# DJ AI App - Import Tests
+# Author: Sergie Code
+# Purpose: Check that modules used by the test harness and client tooling import with only requirements-test.txt
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Service dependencies that requirements-test.txt does not install
+SERVICE_PACKAGES = ("fastapi", "starlette", "httpx", "uvicorn", "multipart", "numpy", "websockets")
+
+# Imported by tests/conftest.py, so every test needs them
+CONFTEST_MODULES = (
+    "dj_ai_app.cassette",
+    "dj_ai_app.faults",
+    "dj_ai_app.logs",
+    "dj_ai_app.testbackend",
+)
+
+# Gateway building blocks that need only the standard library; test_scheduler imports them unguarded
+GATEWAY_MODULES = (
+    "dj_ai_app.gateway.scheduler",
+    "dj_ai_app.gateway.admission",
+    "dj_ai_app.gateway.singleflight",
+    "dj_ai_app.gateway.metrics",
+)
+
+# Upload store and job queue, used by test_blob_store without httpx
+STORAGE_MODULES = ("dj_ai_app.blobs", "dj_ai_app.jobs")
+
+# Plain HTTP client tooling (requests only)
+CLIENT_MODULES = ("dj_ai_app.client",)
+
+
+def _import_without_service_packages(module: str) -> subprocess.CompletedProcess:
+    blocked = "".join(f"sys.modules[{name!r}] = None\n" for name in SERVICE_PACKAGES)
+    code = f"import importlib, sys\n{blocked}importlib.import_module({module!r})\n"
+    return subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, timeout=60)
+
+
+class TestLightImports:
+    """Test that the harness does not need the services' dependencies."""
+
+    @pytest.mark.parametrize("module", CONFTEST_MODULES)
+    def test_conftest_modules(self, module):
+        result = _import_without_service_packages(module)
+        assert result.returncode == 0, result.stderr
+
+    @pytest.mark.parametrize("module", GATEWAY_MODULES)
+    def test_gateway_building_blocks(self, module):
+        result = _import_without_service_packages(module)
+        assert result.returncode == 0, result.stderr
+
+    @pytest.mark.parametrize("module", STORAGE_MODULES)
+    def test_storage_modules(self, module):
+        result = _import_without_service_packages(module)
+        assert result.returncode == 0, result.stderr
+
+    @pytest.mark.parametrize("module", CLIENT_MODULES)
+    def test_client_modules(self, module):
+        result = _import_without_service_packages(module)
+        assert result.returncode == 0, result.stderr
@@ -0,0 +1,178 @@
+# DJ AI App - Analysis Job Tests
+# Author: Sergie Code
+# Purpose: Unit tests for the job queue, worker pool and gateway job endpoints
+
+import asyncio
+import hashlib
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient
+
+from dj_ai_app.gateway import GatewaySettings, create_app
+from dj_ai_app.jobs import JobStore, JobWorker, WorkerSettings
+
+AUDIO = b"ID3 fake mp3 bytes"
+
+
+def _queue(store, payload=AUDIO, priority="interactive"):
+    job_id = store.new_id()
+    store.payload_path(job_id).write_bytes(payload)
+    return store.submit(job_id, "track.mp3", "audio/mpeg", hashlib.sha256(payload).hexdigest(), priority=priority)
+
+
+class TestJobStore:
+    """Test the SQLite job queue."""
+
+    def test_submit_and_claim_in_fifo_order(self, tmp_path):
+        store = JobStore(tmp_path)
+        first = _queue(store)
+        second = _queue(store)
+
+        assert store.queue_depth() == 2
+        assert store.claim("w1").id == first.id
+        assert store.claim("w2").id == second.id
+        assert store.claim("w3") is None
+
+    def test_interactive_jobs_are_claimed_before_bulk(self, tmp_path):
+        store = JobStore(tmp_path)
+        _queue(store, priority="bulk")
+        interactive = _queue(store, priority="interactive")
+
+        assert store.claim("w1").id == interactive.id
+
+    def test_complete_stores_result_and_removes_payload(self, tmp_path):
+        store = JobStore(tmp_path)
+        job = _queue(store)
+        store.claim("w1")
+        store.complete(job.id, {"bpm": 128})
+
+        done = store.get(job.id)
+        assert done.status == "done"
+        assert done.result == {"bpm": 128}
+        assert not store.payload_path(job.id).exists()
+        assert "payload_path" not in done.to_public()
+
+    def test_stale_running_jobs_are_requeued(self, tmp_path):
+        store = JobStore(tmp_path)
+        job = _queue(store)
+        store.claim("w1")
+
+        assert store.requeue_stale(older_than=-1) == 1
+        assert store.get(job.id).status == "queued"
+
+
+class TestJobWorker:
+    """Test that the worker pool drains the queue against the backend."""
+
+    def _run(self, store, backend):
+        worker = JobWorker(store, WorkerSettings(backend_url="http://backend"), transport=httpx.MockTransport(backend))
+
+        async def scenario():
+            async with httpx.AsyncClient(base_url="http://backend", transport=worker.transport) as client:
+                while True:
+                    job = store.claim("test")
+                    if job is None:
+                        return
+                    await worker.process(client, job)
+
+        asyncio.run(scenario())
+
+    def test_successful_analysis(self, tmp_path):
+        store = JobStore(tmp_path)
+        job = _queue(store)
+        uploads = []
+
+        def backend(request):
+            uploads.append(request.content)
+            return httpx.Response(200, json={"track_id": "t1", "bpm": 126.0})
+
+        self._run(store, backend)
+
+        assert store.get(job.id).result == {"track_id": "t1", "bpm": 126.0}
+        assert AUDIO in uploads[0]
+
+    def test_backend_error_fails_job(self, tmp_path):
+        store = JobStore(tmp_path)
+        job = _queue(store)
+
+        self._run(store, lambda request: httpx.Response(500, text="boom"))
+
+        failed = store.get(job.id)
+        assert failed.status == "failed"
+        assert "500" in failed.error
+
+    def test_broken_jobs_do_not_stop_the_pool(self, tmp_path):
+        store = JobStore(tmp_path)
+        not_json, crashing, good = _queue(store, b"a"), _queue(store, b"b"), _queue(store, b"c")
+
+        def backend(request):
+            if b"\r\n\r\nb" in request.content:
+                raise RuntimeError("unexpected")
+            if b"\r\n\r\na" in request.content:
+                return httpx.Response(200, text="<html>proxy error</html>")
+            return httpx.Response(200, json={"bpm": 120.0})
+
+        settings = WorkerSettings(backend_url="http://backend", concurrency=1, poll_interval=0.01)
+        worker = JobWorker(store, settings, transport=httpx.MockTransport(backend))
+
+        async def scenario():
+            pool = asyncio.ensure_future(worker.run_forever())
+            while not all(store.get(job.id).finished for job in (not_json, crashing, good)):
+                assert not pool.done(), pool.exception()
+                await asyncio.sleep(0.01)
+            worker.stop()
+            await asyncio.wait_for(pool, 5)
+
+        asyncio.run(scenario())
+
+        assert "invalid JSON" in store.get(not_json.id).error
+        assert store.get(crashing.id).error == "Worker error: RuntimeError: unexpected"
+        assert store.get(good.id).result == {"bpm": 120.0}
+
+
+class TestGatewayJobEndpoints:
+    """Test submission and polling through the gateway."""
+
+    @pytest.fixture
+    def gateway(self, tmp_path):
+        settings = GatewaySettings(backend_url="http://backend", jobs_dir=str(tmp_path))
+        app = create_app(settings, transport=httpx.MockTransport(lambda r: httpx.Response(404)))
+        with TestClient(app) as client:
+            yield client, JobStore(tmp_path)
+
+    def test_submit_returns_job_id_immediately(self, gateway):
+        client, store = gateway
+        response = client.post("/jobs/analyze-track", files={"file": ("track.mp3", AUDIO, "audio/mpeg")})
+
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert response.headers["Location"] == f"/jobs/{job_id}"
+        assert client.get(f"/jobs/{job_id}").json()["status"] == "queued"
+        assert store.payload_path(job_id).read_bytes() == AUDIO
+
+    def test_invalid_priority_is_rejected(self, gateway):
+        client, _ = gateway
+        response = client.post(
+            "/jobs/analyze-track",
+            files={"file": ("track.mp3", AUDIO, "audio/mpeg")},
+            headers={"X-Priority": "urgent"},
+        )
+        assert response.status_code == 400
+
+    def test_unknown_job_is_404(self, gateway):
+        client, _ = gateway
+        assert client.get("/jobs/does-not-exist").status_code == 404
+
+    def test_finished_job_result_feeds_the_analysis_cache(self, gateway):
+        client, store = gateway
+        job_id = client.post("/jobs/analyze-track", files={"file": ("track.mp3", AUDIO, "audio/mpeg")}).json()["job_id"]
+        store.claim("w1")
+        store.complete(job_id, {"bpm": 120})
+        client.get(f"/jobs/{job_id}")
+
+        again = client.post("/jobs/analyze-track", files={"file": ("track.mp3", AUDIO, "audio/mpeg")})
+        assert again.json()["status"] == "done"
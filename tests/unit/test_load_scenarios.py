@@ -0,0 +1,209 @@
+# DJ AI App - Load Scenario Tests
+# Author: Sergie Code
+# Purpose: Unit tests for OpenAPI-generated load scenarios and the load harness
+
+import asyncio
+import json
+from typing import List, Optional
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+
+import httpx
+from fastapi import FastAPI, File, HTTPException, Query, UploadFile
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, Field
+
+from dj_ai_app.bench.load import LoadReport, LoadRunner, Sample, main, parse_weights
+from dj_ai_app.bench.openapi import RequestFactory, id_source, is_id_name, operations, resolve, scenarios
+
+
+class Analysis(BaseModel):
+    track_id: str
+    bpm: float
+
+
+class TransitionRequest(BaseModel):
+    current_track_id: str
+    candidate_track_ids: List[str] = []
+    limit: int = Field(5, ge=1, le=20)
+    energy: Optional[float] = Field(None, gt=0, lt=1)
+
+
+def _core() -> FastAPI:
+    """The dj-ai-core routes the load generator cares about."""
+    app = FastAPI()
+    app.state.tracks = {}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.post("/analyze-track", response_model=Analysis)
+    async def analyze_track(file: UploadFile = File(...)):
+        data = await file.read()
+        if data[:4] != b"RIFF":
+            raise HTTPException(status_code=415, detail="not audio")
+        track_id = f"t{len(app.state.tracks) + 1}"
+        app.state.tracks[track_id] = file.filename
+        return {"track_id": track_id, "bpm": 128.0}
+
+    @app.post("/recommend-transitions")
+    async def recommend(request: TransitionRequest):
+        if request.current_track_id not in app.state.tracks:
+            raise HTTPException(status_code=404, detail="unknown track")
+        return {"recommendations": []}
+
+    @app.get("/tracks/{track_id}")
+    async def track(track_id: str, detail: bool = Query(False)):
+        if track_id not in app.state.tracks:
+            raise HTTPException(status_code=404, detail="unknown track")
+        return {"track_id": track_id}
+
+    @app.delete("/tracks/{track_id}")
+    async def delete_track(track_id: str):
+        app.state.tracks.pop(track_id, None)
+        return {}
+
+    return app
+
+
+class TestScenarioGeneration:
+    """Test reading operations and building requests from a spec."""
+
+    def test_operations_weights_and_chains(self):
+        spec = _core().openapi()
+        ops = {op.name: op for op in operations(spec)}
+        # Deletes are off by default
+        assert set(ops) == {"GET /health", "POST /analyze-track", "POST /recommend-transitions", "GET /tracks/{track_id}"}
+        assert ops["GET /health"].weight == 3.0
+        assert ops["POST /analyze-track"].uploads and ops["POST /analyze-track"].produces == ("track_id",)
+        assert ops["POST /recommend-transitions"].consumes == ("current_track_id",)
+
+        chains = {s.name: s for s in scenarios(list(ops.values()))}
+        assert "POST /analyze-track -> POST /recommend-transitions" in chains
+        assert "POST /analyze-track -> GET /tracks/{track_id}" in chains
+        assert chains["GET /health"].steps == [ops["GET /health"]]
+
+        custom = {op.name: op.weight for op in operations(spec, parse_weights(["GET /health=0", "delete_track_tracks__track_id__delete=2"]))}
+        assert "GET /health" not in custom and custom["DELETE /tracks/{track_id}"] == 2
+        assert [op.name for op in operations(spec, include="^/tracks")] == ["GET /tracks/{track_id}"]
+
+    def test_generated_requests_are_valid(self):
+        app = _core()
+        spec = app.openapi()
+        client = TestClient(app)
+        factory = RequestFactory(spec, seed=1, audio_variants=2, audio_seconds=0.2)
+        ops = {op.name: op for op in operations(spec)}
+        context = {}
+
+        upload = factory.build(ops["POST /analyze-track"], context)
+        name, audio, content_type = upload.files["file"]
+        assert audio[:4] == b"RIFF" and content_type == "audio/wav"
+        response = client.post(upload.path, files=upload.files)
+        assert response.status_code == 200
+        factory.remember(response.json(), context)
+        assert context == {"track_id": ["t1"]}
+
+        recommend = factory.build(ops["POST /recommend-transitions"], context)
+        assert recommend.json["current_track_id"] == "t1"
+        assert client.post(recommend.path, json=recommend.json).status_code == 200
+
+        lookup = factory.build(ops["GET /tracks/{track_id}"], context)
+        assert lookup.path == "/tracks/t1"
+
+    def test_values_follow_the_schema(self):
+        spec = {"components": {"schemas": {
+            "Mix": {"type": "object", "required": ["name", "bpm", "count", "kind", "track_ids"], "properties": {
+                "name": {"type": "string", "minLength": 12, "maxLength": 20},
+                "bpm": {"type": "number", "exclusiveMinimum": 60, "maximum": 200},
+                "count": {"type": "integer", "minimum": 2, "maximum": 4},
+                "kind": {"enum": ["club", "radio"]},
+                "track_ids": {"type": "array", "items": {"type": "string"}, "minItems": 2},
+                "note": {"type": "string"},
+            }},
+            "Wrapped": {"allOf": [{"$ref": "#/components/schemas/Mix"}], "properties": {"extra": {"type": "string"}}},
+        }}}
+        factory = RequestFactory(spec, seed=3)
+        value = factory.value({"$ref": "#/components/schemas/Mix"}, "", {"track_id": ["a", "b", "c"]})
+        assert 12 <= len(value["name"]) <= 20
+        assert 60 < value["bpm"] <= 200 and 2 <= value["count"] <= 4
+        assert value["kind"] in ("club", "radio") and value["track_ids"] == ["c", "b"]
+        assert "note" not in value
+        assert "extra" in resolve(spec, {"$ref": "#/components/schemas/Wrapped"})["properties"]
+
+    def test_id_names(self):
+        assert is_id_name("track_id") and is_id_name("ids") and not is_id_name("paid")
+        assert id_source("current_track_id", ["id", "track_id"]) == "track_id"
+        assert id_source("track_ids", ["track_id"]) == "track_id"
+        assert id_source("playlist_id", ["track_id"]) is None
+
+
+class TestLoadRunner:
+    """Test running generated scenarios against an app."""
+
+    def test_run_chains_ids_per_user(self):
+        app = _core()
+        spec = app.openapi()
+        plan = scenarios(operations(spec))
+        runner = LoadRunner(
+            "http://core", plan, RequestFactory(spec, seed=2, audio_seconds=0.2), users=3, duration=30,
+            iterations=8, seed=2, transport=httpx.ASGITransport(app=app),
+        )
+        report = asyncio.run(runner.run())
+        assert len(report.samples) >= 24
+        assert report.error_rate == 0, [s for s in report.samples if not s.ok]
+        names = {row.operation for row in report.stats()}
+        assert "POST /recommend-transitions" in names or "GET /tracks/{track_id}" in names
+        assert "| POST /analyze-track |" in report.render()
+
+    def test_failed_step_skips_the_rest_of_the_scenario(self):
+        def handler(request):
+            return httpx.Response(500 if request.url.path == "/analyze-track" else 200, json={})
+
+        spec = _core().openapi()
+        plan = [s for s in scenarios(operations(spec)) if len(s.steps) == 2]
+        runner = LoadRunner(
+            "http://core", plan, RequestFactory(spec, audio_seconds=0.2), users=1, iterations=3,
+            transport=httpx.MockTransport(handler),
+        )
+        report = asyncio.run(runner.run())
+        assert [s.operation for s in report.samples] == ["POST /analyze-track"] * 3
+        assert report.error_rate == 1.0
+
+    def test_slow_window_triggers_a_profile(self):
+        class Trigger:
+            checked: List[Optional[float]] = []
+
+            def check(self, p99):
+                self.checked.append(p99)
+
+        async def slow(request):
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"status": "healthy"})
+
+        spec = _core().openapi()
+        plan = scenarios(operations(spec, include="^/health$"))
+        trigger = Trigger()
+        runner = LoadRunner(
+            "http://core", plan, RequestFactory(spec), users=2, duration=1.3, trigger=trigger,
+            transport=httpx.MockTransport(slow),
+        )
+        asyncio.run(runner.run())
+        assert trigger.checked and trigger.checked[0] >= 0.05
+
+    def test_report_and_cli(self, tmp_path, capsys):
+        report = LoadReport([Sample("GET /health", 0, 0.1, 200), Sample("GET /health", 0, 0.3, 0, "ConnectTimeout")], 2.0)
+        row = report.stats()[0]
+        assert (row.count, row.errors, row.rps, row.p99) == (2, 1, 1.0, 0.3)
+        assert json.loads(json.dumps(report.to_dict()))["error_rate"] == 0.5
+
+        spec_path = tmp_path / "openapi.json"
+        spec_path.write_text(json.dumps(_core().openapi()))
+        assert main(["--spec", str(spec_path), "--list"]) == 0
+        assert "POST /analyze-track -> POST /recommend-transitions" in capsys.readouterr().out
+        assert main(["--spec", str(spec_path), "--exclude", ".", "--list"]) == 1
+        with pytest.raises(ValueError):
+            parse_weights(["no-weight"])
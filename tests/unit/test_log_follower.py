@@ -0,0 +1,182 @@
+# DJ AI App - Log Follower Tests
+# Author: Sergie Code
+# Purpose: Unit tests for log parsing, rolling endpoint aggregates and the streaming follower
+
+import io
+import json
+import sys
+
+import pytest
+
+from dj_ai_app.logs import LogAggregator, LogFollower, compose_logs_command, parse_line, read_lines, render_stats
+from dj_ai_app.logs.__main__ import main
+
+
+def _nginx(uri="/api/analyze-track", status=200, request_time=0.5, msec=1000.0, method="POST"):
+    return json.dumps({
+        "msec": msec, "request_id": "r1", "method": method, "uri": uri, "status": status,
+        "request_time": request_time, "upstream_response_time": "0.4",
+    })
+
+
+class TestParseLine:
+    """Test turning log lines into events."""
+
+    def test_nginx_timing_line(self):
+        event = parse_line("nginx", _nginx(uri="/api/jobs/4f1c2a9e8b7d6c5f4e3d2c1b0a998877?wait=1", status=502))
+
+        assert event.endpoint == "POST /api/jobs/:id"
+        assert event.status == 502
+        assert event.duration == 0.5
+        assert event.timestamp == 1000.0
+        assert event.is_error
+
+    def test_only_the_gateway_total_span_is_a_request(self):
+        total = parse_line("dj-ai-gateway", json.dumps({
+            "event": "span", "service": "gateway", "request_id": "r1", "span": "gateway.total",
+            "start": 10.0, "duration": 0.25, "route": "/analyze-track", "method": "POST", "status": 200,
+        }))
+        stage = parse_line("dj-ai-gateway", json.dumps({
+            "event": "span", "service": "gateway", "request_id": "r1", "span": "gateway.backend",
+            "start": 10.0, "duration": 0.2,
+        }))
+
+        assert total.endpoint == "POST /analyze-track"
+        assert total.duration == 0.25
+        assert stage.endpoint is None
+        assert stage.duration == 0.2
+
+    def test_plain_text_lines(self):
+        access = parse_line("x", 'dj-ai-core  | INFO:     172.18.0.5:40312 - "GET /health HTTP/1.1" 200 OK')
+        error = parse_line("dj-ai-core", "ERROR:    Exception in ASGI application")
+
+        assert access.service == "dj-ai-core"
+        assert access.endpoint == "GET /health"
+        assert access.status == 200
+        assert not access.is_error
+        assert error.level == "ERROR"
+        assert error.endpoint is None
+        assert error.is_error
+        assert parse_line("dj-ai-core", "   \n") is None
+
+    def test_json_application_logs(self):
+        event = parse_line("dj-ai-core", json.dumps({
+            "levelname": "warn", "msg": "slow decode", "timestamp": "2025-01-01T00:00:00Z", "duration_ms": 1500,
+        }))
+
+        assert event.level == "WARNING"
+        assert event.message == "slow decode"
+        assert event.timestamp == 1735689600.0
+        assert event.duration == 1.5
+
+
+class TestLogAggregator:
+    """Test the rolling per-endpoint windows."""
+
+    def test_percentiles_and_error_rate(self):
+        aggregator = LogAggregator(window=None)
+        for i in range(1, 101):
+            aggregator.add(parse_line("nginx", _nginx(request_time=i / 100, status=500 if i % 20 == 0 else 200)))
+
+        stats = aggregator.stats("POST /api/analyze-track")
+        assert stats["count"] == 100
+        assert stats["p50"] == 0.5
+        assert stats["p95"] == 0.95
+        assert stats["max"] == 1.0
+        assert stats["error_rate"] == 0.05
+        assert aggregator.stats("GET /nothing")["count"] == 0
+
+    def test_window_follows_event_time(self):
+        aggregator = LogAggregator(window=60)
+        aggregator.add(parse_line("nginx", _nginx(status=500, msec=1000.0)))
+        aggregator.add(parse_line("nginx", _nginx(status=200, msec=1100.0)))
+
+        stats = aggregator.stats()
+        assert stats["count"] == 1
+        assert stats["errors"] == 0
+        assert stats["total"] == 2
+        assert stats["errors_total"] == 1
+
+    def test_memory_is_bounded(self):
+        aggregator = LogAggregator(window=None, max_samples=10, max_endpoints=2, recent_lines=3)
+        for i in range(50):
+            aggregator.add(parse_line("nginx", _nginx(uri=f"/route{i}", msec=1000.0 + i)))
+
+        assert aggregator.endpoints() == ["POST /route0", "POST /route1", "other"]
+        assert aggregator.stats("other")["count"] == 10
+        assert aggregator.stats("other")["total"] == 48
+        assert len(aggregator.recent("nginx")) == 3
+        assert aggregator.count("nginx") == 50
+
+    def test_assertion_helpers(self):
+        aggregator = LogAggregator(window=None)
+        for status in (200, 200, 200, 503):
+            aggregator.add(parse_line("nginx", _nginx(status=status, request_time=0.1)))
+
+        aggregator.assert_error_rate_below(0.5, min_requests=4)
+        aggregator.assert_latency_below(0.2, "POST /api/analyze-track", quantile=99)
+        with pytest.raises(AssertionError, match="25.0%"):
+            aggregator.assert_error_rate_below(0.1)
+        with pytest.raises(AssertionError, match="at least 10"):
+            aggregator.assert_error_rate_below(0.5, min_requests=10)
+        assert "POST /api/analyze-track" in render_stats(aggregator)
+
+
+class TestLogFollower:
+    """Test streaming log sources into the aggregator."""
+
+    def test_read_lines_caps_oversized_lines(self):
+        stream = io.BytesIO(b"a" * 100 + b"\nshort\n" + b"b" * 10)
+
+        assert list(read_lines(stream, max_line_bytes=16)) == ["a" * 16, "short\n", "b" * 10]
+
+    def test_process_file_keeps_fixed_memory(self, tmp_path):
+        log = tmp_path / "nginx.log"
+        with open(log, "w") as f:
+            for i in range(20000):
+                f.write(_nginx(msec=1000.0 + i / 100, status=500 if i % 100 == 0 else 200) + "\n")
+
+        follower = LogFollower(LogAggregator(window=None, max_samples=1000))
+        assert follower.process_file(log, "nginx") == 20000
+        stats = follower.aggregator.stats()
+        assert stats["count"] == 1000
+        assert stats["total"] == 20000
+        assert stats["errors_total"] == 200
+
+    def test_follow_file_picks_up_appended_lines(self, tmp_path):
+        log = tmp_path / "nginx.log"
+        log.write_text(_nginx() + "\n")
+
+        with LogFollower(poll_interval=0.01).follow_file(log, "nginx") as follower:
+            assert follower.wait_for(lambda logs: logs.stats()["total"] == 1, timeout=5)
+            with open(log, "a") as f:
+                f.write(_nginx(status=500))
+                f.flush()
+                assert not follower.wait_for(lambda logs: logs.stats()["total"] == 2, timeout=0.1)
+                f.write("\n")
+            assert follower.wait_for(lambda logs: logs.stats()["errors_total"] == 1, timeout=5)
+
+            # Truncation (logrotate copytruncate) starts over from the top
+            log.write_text(_nginx(status=200) + "\n")
+            assert follower.wait_for(lambda logs: logs.stats()["total"] == 3, timeout=5)
+
+    def test_follow_command(self):
+        script = f"print({_nginx()!r}); print({_nginx(status=504)!r})"
+        with LogFollower().follow_command([sys.executable, "-c", script], "nginx") as follower:
+            assert follower.wait_for(lambda logs: logs.stats()["total"] == 2, timeout=10)
+            assert follower.aggregator.stats()["errors"] == 1
+
+    def test_compose_logs_command(self):
+        assert compose_logs_command("dj-ai-core", tail=10, files=["docker-compose.yml"]) == [
+            "docker-compose", "-f", "docker-compose.yml", "logs", "--no-color", "--no-log-prefix",
+            "--tail", "10", "--follow", "dj-ai-core",
+        ]
+        assert "--follow" not in compose_logs_command("nginx", follow=False, compose="docker compose")
+
+    def test_cli_fails_on_error_rate(self, tmp_path, capsys):
+        log = tmp_path / "nginx.log"
+        log.write_text(_nginx() + "\n" + _nginx(status=500) + "\n")
+
+        assert main([str(log), "--window", "0"]) == 0
+        assert main([str(log), "--max-error-rate", "0.1"]) == 1
+        assert "POST /api/analyze-track" in capsys.readouterr().out
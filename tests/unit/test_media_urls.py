@@ -0,0 +1,153 @@
+# DJ AI App - Signed Media URL Tests
+# Author: Sergie Code
+# Purpose: Unit tests for the signed /media/ URLs and the nginx auth_request endpoint
+
+import hashlib
+import re
+from pathlib import Path
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient
+
+from dj_ai_app.blobs import BlobStore
+from dj_ai_app.gateway import GatewaySettings, MediaSigner, create_app
+from dj_ai_app.gateway.media import EXPIRY_STEP, media_extension
+from dj_ai_app.jobs import JobStore
+
+AUDIO = b"ID3 fake mp3 bytes"
+HASH = hashlib.sha256(AUDIO).hexdigest()
+NGINX_CONF = Path(__file__).resolve().parents[2] / "config" / "nginx.conf"
+
+
+class TestMediaSigner:
+    """Test signing and verifying media URLs."""
+
+    def test_sign_and_verify(self, clock):
+        clock.now = 1_000_000.0
+        signer = MediaSigner("secret", ttl=3600, clock=clock)
+        url, expires = signer.sign(HASH, "Deep House Mix.MP3")
+
+        assert url.startswith(f"/media/{HASH}.mp3?expires={expires}&sig=")
+        assert expires >= clock.now + 3600 and expires % EXPIRY_STEP == 0
+        assert signer.verify(url) == (HASH, expires)
+        # The extension only picks the Content-Type
+        assert signer.verify(url.replace(".mp3", ".wav", 1)) == (HASH, expires)
+
+        clock.now = expires + 1
+        assert signer.verify(url) is None
+
+    def test_urls_are_stable_within_a_step(self, clock):
+        clock.now = EXPIRY_STEP * 1000
+        signer = MediaSigner("secret", clock=clock)
+        first, _ = signer.sign(HASH)
+        clock.now += EXPIRY_STEP - 1
+        assert signer.sign(HASH)[0] == first
+        clock.now += 1
+        assert signer.sign(HASH)[0] != first
+
+    def test_rejects_tampered_urls(self):
+        signer = MediaSigner("secret")
+        url, expires = signer.sign(HASH)
+        other = hashlib.sha256(b"other").hexdigest()
+
+        assert signer.verify(url.replace(HASH, other)) is None
+        assert signer.verify(url.replace(f"expires={expires}", f"expires={expires + EXPIRY_STEP}")) is None
+        assert MediaSigner("other secret").verify(url) is None
+        assert signer.verify(f"/media/{HASH}") is None
+        assert signer.verify(f"{url}&sig=0") is None
+        assert signer.verify(url.replace("/media/", "/media/../")) is None
+        with pytest.raises(ValueError):
+            MediaSigner("")
+
+    def test_media_extension(self):
+        assert media_extension("set.FLAC") == "flac"
+        assert media_extension("notes.txt") == ""
+        assert media_extension(None) == ""
+
+
+@pytest.fixture
+def gateway(tmp_path):
+    settings = GatewaySettings(
+        backend_url="http://backend", jobs_dir=str(tmp_path / "jobs"), uploads_dir=str(tmp_path / "uploads"),
+        media_secret="secret",
+    )
+    app = create_app(settings, transport=httpx.MockTransport(lambda request: httpx.Response(404)))
+    with TestClient(app) as client:
+        yield client
+
+
+class TestGatewayMediaEndpoints:
+    """Test URL issuing and the auth_request check nginx makes."""
+
+    def _upload(self, tmp_path, tenant):
+        store = JobStore(tmp_path / "jobs", blobs=BlobStore(tmp_path / "uploads"))
+        content_hash, payload, _ = store.blobs.put_bytes(AUDIO, pin=True)
+        return store.submit(store.new_id(), "track.mp3", "audio/mpeg", content_hash, payload_path=payload, tenant=tenant)
+
+    def test_signed_url_passes_the_auth_check(self, gateway, tmp_path):
+        self._upload(tmp_path, "dj-1")
+
+        issued = gateway.get(f"/gateway/media/{HASH}", params={"filename": "track.mp3"}, headers={"X-Tenant-ID": "dj-1"})
+        assert issued.status_code == 200
+        url = issued.json()["url"]
+        assert url.startswith(f"/media/{HASH}.mp3?")
+
+        allowed = gateway.get("/gateway/media-auth", headers={"X-Original-URI": url})
+        assert allowed.status_code == 204
+        assert 0 < int(allowed.headers["cache-control"].split("=")[1]) <= 60
+
+        tampered = url[:-1] + ("1" if url.endswith("0") else "0")
+        denied = gateway.get("/gateway/media-auth", headers={"X-Original-URI": tampered})
+        assert denied.status_code == 403
+        assert gateway.get("/gateway/media-auth").status_code == 403
+
+    def test_unknown_uploads_are_not_signed(self, gateway):
+        assert gateway.get(f"/gateway/media/{'0' * 64}").status_code == 404
+        assert gateway.get("/gateway/media/not-a-hash").status_code == 400
+
+    def test_only_the_uploader_gets_a_url(self, gateway, tmp_path):
+        self._upload(tmp_path, "dj-1")
+        assert gateway.get(f"/gateway/media/{HASH}", headers={"X-Tenant-ID": "dj-2"}).status_code == 404
+        assert gateway.get(f"/gateway/media/{HASH}").status_code == 404
+
+        # Without a tenant header the client address is the tenant
+        gateway.post("/jobs/analyze-track", files={"file": ("track.mp3", AUDIO, "audio/mpeg")})
+        assert gateway.get(f"/gateway/media/{HASH}").status_code == 200
+
+    def test_finished_jobs_carry_a_media_url(self, gateway, tmp_path):
+        store = JobStore(tmp_path / "jobs", blobs=BlobStore(tmp_path / "uploads"))
+        content_hash, payload, _ = store.blobs.put_bytes(AUDIO, pin=True)
+        job = store.submit(store.new_id(), "track.mp3", "audio/mpeg", content_hash, payload_path=payload)
+        assert "media_url" not in gateway.get(f"/jobs/{job.id}").json()
+
+        store.claim("w1")
+        store.complete(job.id, {"bpm": 128})
+        media_url = gateway.get(f"/jobs/{job.id}").json()["media_url"]
+        assert gateway.get("/gateway/media-auth", headers={"X-Original-URI": media_url}).status_code == 204
+
+    def test_disabled_without_a_secret(self, tmp_path):
+        app = create_app(GatewaySettings(backend_url="http://backend", uploads_dir=str(tmp_path / "uploads")))
+        with TestClient(app) as client:
+            assert client.get(f"/gateway/media/{HASH}").status_code == 404
+            assert client.get("/gateway/media-auth", headers={"X-Original-URI": f"/media/{HASH}"}).status_code == 403
+
+
+class TestNginxGatewayRoutes:
+    """Test that nginx decides the tenant and hides the gateway's own endpoints."""
+
+    def _locations(self):
+        text = NGINX_CONF.read_text()
+        return dict(re.findall(r"\n        location ([^{]+?) \{(.*?)\n        \}", text, re.DOTALL))
+
+    def test_clients_cannot_pick_a_tenant(self):
+        proxied = {path: body for path, body in self._locations().items() if "proxy_pass http://dj-ai-gateway;" in body}
+        assert "/api/" in proxied and "/api/gateway/media/" in proxied
+        for path, body in proxied.items():
+            assert 'proxy_set_header X-Tenant-ID "";' in body, path
+
+    def test_only_media_urls_are_public(self):
+        assert self._locations()["/api/gateway/"].split() == ["deny", "all;"]
@@ -0,0 +1,129 @@
+# DJ AI App - Page Load Benchmark Tests
+# Author: Sergie Code
+# Purpose: Unit tests for the cold/warm page-load benchmark
+
+import asyncio
+import gzip
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from dj_ai_app.bench.pageload import css_assets, freshness, html_assets, main, measure, render
+
+CONFIG = Path(__file__).resolve().parents[2] / "config"
+
+INDEX = """<!doctype html><html><head>
+<link rel="icon" href="/favicon.ico">
+<link rel="stylesheet" href="/assets/index-3f9a1c2b.css">
+<link rel="modulepreload" href="/assets/vendor-a81c77de.js">
+<script type="module" src="/assets/index-9d0e4b1a.js"></script>
+<link rel="canonical" href="https://example.com/">
+</head><body><img src="data:image/png;base64,AAAA"><div id="root"></div></body></html>"""
+
+FILES = {
+    "/": ("text/html", INDEX),
+    "/favicon.ico": ("image/x-icon", "\0" * 300),
+    "/assets/index-3f9a1c2b.css": ("text/css", "body{background:url(./bg-77aa11ff.png)} " + ".deck{}" * 2000),
+    "/assets/bg-77aa11ff.png": ("image/png", "\x89PNG" + "\0" * 500),
+    "/assets/vendor-a81c77de.js": ("application/javascript", "export const x = 1;" * 3000),
+    "/assets/index-9d0e4b1a.js": ("application/javascript", "import './vendor-a81c77de.js';" * 500),
+}
+
+
+def _site(optimized: bool):
+    """The same build served by the Node server (plain) or by nginx (gzip_static and caching)."""
+
+    def handler(request):
+        content_type, body = FILES.get(request.url.path, ("text/plain", None))
+        if body is None:
+            return httpx.Response(404)
+        etag = f'"{hash(body) & 0xffffffff:x}"'
+        headers = {"Content-Type": content_type, "ETag": etag}
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers=headers)
+        data = body.encode("latin1")
+        if optimized:
+            headers["Cache-Control"] = "no-cache" if request.url.path == "/" else "public, max-age=31536000, immutable"
+            if len(data) > 1024 and "gzip" in request.headers.get("accept-encoding", ""):
+                data = gzip.compress(data)
+                headers["Content-Encoding"] = "gzip"
+        return httpx.Response(200, headers=headers, content=data)
+
+    return httpx.MockTransport(handler)
+
+
+class TestAssetDiscovery:
+    """Test finding what a page makes the browser download."""
+
+    def test_html_and_css_references(self):
+        assets = html_assets(INDEX, "http://site/app/")
+        assert assets == [
+            "http://site/favicon.ico", "http://site/assets/index-3f9a1c2b.css",
+            "http://site/assets/vendor-a81c77de.js", "http://site/assets/index-9d0e4b1a.js",
+        ]
+        css = "@import 'theme.css'; a{background:url(\"../img/a.svg#x\")} b{src:url(data:font/woff2;base64,AA)}"
+        assert css_assets(css, "http://site/assets/app.css") == ["http://site/assets/theme.css", "http://site/img/a.svg"]
+
+    def test_freshness(self):
+        assert freshness(httpx.Headers({"Cache-Control": "public, max-age=31536000, immutable"})) == 31536000
+        assert freshness(httpx.Headers({"Cache-Control": "no-cache"})) == 0
+        assert freshness(httpx.Headers({})) == 0
+
+
+class TestPageLoad:
+    """Test cold and warm visits against both delivery paths."""
+
+    def test_optimized_delivery_costs_fewer_bytes_and_requests(self):
+        plain = asyncio.run(measure("http://node/", transport=_site(False)))
+        nginx = asyncio.run(measure("http://nginx/", transport=_site(True)))
+
+        assert plain.cold.requests == nginx.cold.requests == 6
+        assert not plain.cold.failed
+        assert nginx.cold.transferred < plain.cold.transferred / 2
+        # Without cache headers every asset is revalidated; immutable assets are not
+        assert plain.warm.requests == 6 and {f.status for f in plain.warm.fetches} == {304}
+        assert nginx.warm.requests == 1 and sum(f.cached for f in nginx.warm.fetches) == 5
+        assert nginx.warm.transferred < plain.warm.transferred
+
+        table = render([plain, nginx])
+        assert "| http://nginx/ | 6 |" in table and "http://nginx/ vs http://node/" in table
+
+    def test_cli_reports_missing_assets(self, tmp_path, monkeypatch, capsys):
+        def broken(request):
+            if request.url.path == "/":
+                return httpx.Response(200, headers={"Content-Type": "text/html"}, text=INDEX)
+            return httpx.Response(404)
+
+        client = httpx.AsyncClient
+        monkeypatch.setattr(
+            httpx, "AsyncClient", lambda transport=None, **kwargs: client(transport=httpx.MockTransport(broken), **kwargs),
+        )
+        out = tmp_path / "pageload.json"
+        assert main(["site/", "--json", str(out)]) == 1
+        assert "404 http://site/favicon.ico" in capsys.readouterr().err
+        assert json.loads(out.read_text())[0]["cold"]["requests"] == 5
+
+
+class TestNginxHeaders:
+    """Test the Cache-Control and security headers nginx adds."""
+
+    def _locations(self):
+        text = (CONFIG / "nginx.conf").read_text()
+        return dict(re.findall(r"\n        location (.+?) \{\n(.*?)\n        \}", text, re.DOTALL))
+
+    def test_frontend_cache_control_stays_on_the_frontend(self):
+        with_header = [path for path, body in self._locations().items() if "$frontend_cache_control" in body]
+        assert sorted(with_header) == ["/", "@frontend"]
+        assert (CONFIG / "nginx.conf").read_text().count("add_header Cache-Control $frontend_cache_control") == 2
+
+    def test_locations_with_their_own_headers_keep_the_security_headers(self):
+        locations = {path: body for path, body in self._locations().items() if "add_header" in body}
+        assert len(locations) >= 4
+        for path, body in locations.items():
+            assert "include /etc/nginx/security-headers.conf;" in body, path
+        headers = (CONFIG / "nginx-security-headers.conf").read_text()
+        assert "Content-Security-Policy" in headers and "X-Frame-Options" in headers
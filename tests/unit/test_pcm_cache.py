@@ -0,0 +1,145 @@
+# DJ AI App - PCM Cache Tests
+# Author: Sergie Code
+# Purpose: Unit tests for the memory-mapped decoded-PCM cache
+
+import io
+import os
+import sys
+from array import array
+from contextlib import contextmanager
+
+import pytest
+
+from dj_ai_app.pcm import DecodeError, PCMCache, ffmpeg_decode, npy_header, parse_npy_header
+from dj_ai_app.pcm.cache import ffmpeg_command
+
+HASH_A = "a" * 64
+HASH_B = "b" * 64
+
+
+def _samples(*values):
+    return array("f", values)
+
+
+class TestNpyFormat:
+    """Test the hand-written .npy header."""
+
+    def test_header_round_trip(self):
+        header = npy_header(22050)
+
+        assert len(header) == 128
+        assert parse_npy_header(header) == (128, 22050)
+
+    def test_numpy_reads_cached_files(self, tmp_path):
+        np = pytest.importorskip("numpy")
+        cache = PCMCache(tmp_path)
+        cache.put(HASH_A, 22050, _samples(0.0, 0.5, -1.0))
+
+        loaded = np.load(cache.path(HASH_A, 22050), mmap_mode="r")
+        assert loaded.dtype == np.float32
+        assert loaded.tolist() == [0.0, 0.5, -1.0]
+
+    def test_numpy_written_files_can_be_read(self, tmp_path):
+        np = pytest.importorskip("numpy")
+        cache = PCMCache(tmp_path)
+        path = cache.path(HASH_A, 44100)
+        path.parent.mkdir(parents=True)
+        np.save(path, np.array([0.25, 0.75], dtype="<f4"))
+
+        assert cache.get(HASH_A, 44100).tolist() == [0.25, 0.75]
+
+
+class TestPCMCache:
+    """Test lookups, decoding on a miss and LRU eviction."""
+
+    def test_samples_are_keyed_by_hash_and_sample_rate(self, tmp_path):
+        cache = PCMCache(tmp_path)
+        cache.put(HASH_A, 22050, _samples(1.0, 2.0))
+
+        assert cache.get(HASH_A, 22050).tolist() == [1.0, 2.0]
+        assert cache.get(HASH_A, 44100) is None
+        assert cache.path(HASH_A, 22050) == tmp_path / "22050" / "aa" / f"{HASH_A}.npy"
+
+    def test_stream_with_partial_chunks(self, tmp_path):
+        cache = PCMCache(tmp_path)
+        raw = _samples(0.1, 0.2, 0.3).tobytes()
+
+        view = cache.put_stream(HASH_A, 22050, io.BytesIO(raw + b"\x00"), chunk_size=3)
+
+        assert view.tolist() == pytest.approx([0.1, 0.2, 0.3])
+        assert list(cache.tmp_dir.iterdir()) == []
+
+    def test_decoder_runs_only_on_a_miss(self, tmp_path):
+        cache = PCMCache(tmp_path)
+        calls = []
+
+        @contextmanager
+        def decoder(path, sample_rate):
+            calls.append((path.name, sample_rate))
+            yield io.BytesIO(_samples(0.5).tobytes())
+
+        first = cache.get_or_decode(HASH_A, 22050, tmp_path / "track.mp3", decoder=decoder)
+        second = cache.get_or_decode(HASH_A, 22050, tmp_path / "track.mp3", decoder=decoder)
+
+        assert first.tolist() == second.tolist() == [0.5]
+        assert calls == [("track.mp3", 22050)]
+
+    def test_failed_decode_leaves_no_entry(self, tmp_path):
+        cache = PCMCache(tmp_path)
+
+        @contextmanager
+        def decoder(path, sample_rate):
+            yield io.BytesIO(b"\x00" * 8)
+            raise DecodeError("corrupt frame")
+
+        with pytest.raises(DecodeError):
+            cache.get_or_decode(HASH_A, 22050, tmp_path / "track.mp3", decoder=decoder)
+        assert cache.get(HASH_A, 22050) is None
+        assert list(cache.tmp_dir.iterdir()) == []
+
+    def test_least_recently_read_file_is_evicted(self, tmp_path):
+        clock = iter(range(1000, 2000)).__next__
+        cache = PCMCache(tmp_path, max_bytes=2 * (128 + 8), clock=lambda: float(clock()))
+        cache.put(HASH_A, 22050, _samples(1.0, 2.0))
+        cache.put(HASH_B, 22050, _samples(3.0, 4.0))
+        cache.get(HASH_A, 22050)
+        cache.put("c" * 64, 22050, _samples(5.0, 6.0))
+
+        assert cache.get(HASH_B, 22050) is None
+        assert cache.get(HASH_A, 22050) is not None
+        assert cache.total_bytes == 2 * (128 + 8)
+
+
+class TestFfmpegDecode:
+    """Test the ffmpeg decoding command."""
+
+    def test_command_outputs_mono_float32_at_the_sample_rate(self):
+        command = ffmpeg_command("track.mp3", 22050)
+
+        assert command[command.index("-f") + 1] == "f32le"
+        assert command[command.index("-ac") + 1] == "1"
+        assert command[command.index("-ar") + 1] == "22050"
+        assert command[-1] == "-"
+
+    def test_noisy_stderr_does_not_stall_the_decode(self, tmp_path, monkeypatch):
+        # More warnings than a pipe buffer holds, written before any samples
+        script = "import sys; sys.stderr.write('w' * 200000); sys.stdout.buffer.write(b'\\0' * 400000); sys.exit({})"
+        monkeypatch.setattr("dj_ai_app.pcm.cache.ffmpeg_command", lambda path, rate: [sys.executable, "-c", script.format(0)])
+        with ffmpeg_decode(tmp_path / "track.mp3", 22050) as stream:
+            assert len(stream.read()) == 400000
+
+        monkeypatch.setattr("dj_ai_app.pcm.cache.ffmpeg_command", lambda path, rate: [sys.executable, "-c", script.format(1)])
+        with pytest.raises(DecodeError, match="w{100}$"):
+            with ffmpeg_decode(tmp_path / "track.mp3", 22050) as stream:
+                stream.read()
+
+    @pytest.mark.skipif(not any(
+        os.access(os.path.join(d, "ffmpeg"), os.X_OK) for d in os.environ.get("PATH", "").split(os.pathsep)
+    ), reason="ffmpeg is not installed")
+    def test_undecodable_file_raises(self, tmp_path):
+        junk = tmp_path / "junk.mp3"
+        junk.write_bytes(b"not audio")
+
+        with pytest.raises(DecodeError):
+            with ffmpeg_decode(junk, 22050) as stream:
+                stream.read()
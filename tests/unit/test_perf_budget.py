@@ -0,0 +1,96 @@
+# DJ AI App - Latency Budget Plugin Tests
+# Author: Sergie Code
+# Purpose: Unit tests for the perf_budget pytest marker and its session report
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from dj_ai_app.bench.perf_budget import measure
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+BUDGETED_TESTS = '''
+import time
+import pytest
+
+CALLS = []
+
+@pytest.fixture
+def counter():
+    CALLS.append("setup")
+    return CALLS
+
+@pytest.mark.perf_budget(p95_ms=500, runs=5, warmup=2)
+def test_fast(counter):
+    counter.append("run")
+
+def test_fixture_set_up_once():
+    assert CALLS.count("setup") == 1 and CALLS.count("run") == 7
+
+@pytest.mark.perf_budget(p95_ms=1, runs=3)
+def test_slow():
+    time.sleep(0.01)
+
+@pytest.mark.perf_budget(p95_ms=500, runs=3)
+def test_broken():
+    assert False, "wrong answer"
+'''
+
+
+def _run(tmp_path, *args, **env):
+    (tmp_path / "pytest.ini").write_text("[pytest]\n")
+    (tmp_path / "test_budgets.py").write_text(textwrap.dedent(BUDGETED_TESTS))
+    environ = {**os.environ, "PYTHONPATH": str(REPO_ROOT), **env}
+    environ.pop("DJ_AI_PERF_BUDGET", None)
+    return subprocess.run(
+        [sys.executable, "-m", "pytest", "-p", "dj_ai_app.bench.perf_budget", "-p", "no:cacheprovider",
+         "-q", "-rA", "--perf-budget-json", "budgets.json", *args],
+        cwd=tmp_path, env=environ, capture_output=True, text=True, timeout=120,
+    )
+
+
+class TestPerfBudget:
+    """Test the perf_budget marker end to end in a separate pytest run."""
+
+    def test_budgets_are_enforced_and_reported(self, tmp_path):
+        result = _run(tmp_path)
+        assert "PASSED test_budgets.py::test_fast" in result.stdout
+        assert "PASSED test_budgets.py::test_fixture_set_up_once" in result.stdout
+        assert "Latency budget exceeded over 3 runs: p95_ms" in result.stdout
+        assert "wrong answer" in result.stdout
+        assert "latency budgets (ms)" in result.stdout
+        assert result.returncode == 1
+
+        report = json.loads((tmp_path / "budgets.json").read_text())
+        assert report["mode"] == "enforce"
+        by_test = {r["test"]: r for r in report["results"]}
+        assert by_test["test_budgets.py::test_fast"]["runs"] == 5
+        assert by_test["test_budgets.py::test_fast"]["passed"]
+        assert not by_test["test_budgets.py::test_slow"]["passed"]
+        assert by_test["test_budgets.py::test_slow"]["measured"]["p95_ms"] >= 10
+        # A failing body fails the test before it is timed to the end
+        assert "test_budgets.py::test_broken" not in by_test
+
+    def test_report_mode_and_scale(self, tmp_path):
+        result = _run(tmp_path, "--perf-budget", "report", "--perf-runs", "2")
+        assert "PASSED test_budgets.py::test_slow" in result.stdout
+        report = json.loads((tmp_path / "budgets.json").read_text())
+        assert {r["runs"] for r in report["results"]} == {2}
+
+        result = _run(tmp_path, "--perf-scale", "1000")
+        assert "PASSED test_budgets.py::test_slow" in result.stdout
+
+    def test_off_mode_runs_once(self, tmp_path):
+        result = _run(tmp_path, "--perf-budget", "off", "-k", "fast or once")
+        assert "FAILED test_budgets.py::test_fixture_set_up_once" in result.stdout
+        assert not (tmp_path / "budgets.json").exists()
+
+    def test_measure(self):
+        outcome = measure([0.01, 0.02, 0.03, 0.2], {"p50_ms": 25, "max_ms": 100})
+        assert outcome["measured"]["p50_ms"] == 20.0
+        assert outcome["violations"] == ["max_ms 200.0 > 100.0"]
+        assert measure([0.2], {"max_ms": 100}, scale=3)["violations"] == []
@@ -0,0 +1,147 @@
+# DJ AI App - Model Pre-warm Tests
+# Author: Sergie Code
+# Purpose: Unit tests for model artifact validation, page-cache priming and warm-up gating
+
+import io
+import json
+import time
+import wave
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient
+
+from dj_ai_app.bench.first_request import FirstRequestResult, render, wait_until_ready
+from dj_ai_app.gateway import GatewaySettings, create_app
+from dj_ai_app.prewarm import MANIFEST_NAME, prime_page_cache, synthetic_wav, validate_artifacts, write_manifest
+from dj_ai_app.prewarm.__main__ import main as init_main
+
+
+@pytest.fixture
+def models(tmp_path):
+    (tmp_path / "tempo.pkl").write_bytes(b"\x80\x04tempo model")
+    (tmp_path / "key").mkdir()
+    (tmp_path / "key" / "classifier.onnx").write_bytes(b"onnx" * 1000)
+    (tmp_path / ".gitkeep").write_bytes(b"")
+    return tmp_path
+
+
+class TestArtifactValidation:
+    """Test checks on the shared models volume."""
+
+    def test_valid_without_manifest(self, models):
+        report = validate_artifacts(models)
+        assert report.ok
+        assert report.files == 2
+
+    def test_manifest_round_trip(self, models):
+        write_manifest(models)
+        assert json.loads((models / MANIFEST_NAME).read_text())["files"]["key/classifier.onnx"]["size"] == 4000
+        assert validate_artifacts(models).ok
+
+    def test_corrupted_artifact_is_reported(self, models):
+        write_manifest(models)
+        (models / "tempo.pkl").write_bytes(b"\x80\x04tampered!!!")
+
+        report = validate_artifacts(models)
+        assert not report.ok
+        assert "tempo.pkl does not match" in report.errors[0]
+        assert validate_artifacts(models, verify_checksums=False).ok
+
+    def test_missing_and_empty_artifacts(self, models):
+        write_manifest(models)
+        (models / "key" / "classifier.onnx").unlink()
+        (models / "empty.bin").write_bytes(b"")
+
+        errors = validate_artifacts(models).errors
+        assert any("empty.bin is empty" in e for e in errors)
+        assert any("key/classifier.onnx is listed" in e for e in errors)
+
+    def test_init_stage_exit_codes(self, models, tmp_path_factory):
+        assert init_main([str(models)]) == 0
+        assert init_main([str(tmp_path_factory.mktemp("x") / "missing")]) == 1
+
+    def test_priming_reads_every_byte(self, models):
+        report = prime_page_cache(models, validate_artifacts(models))
+        assert report.primed_bytes == report.bytes
+
+
+class TestWarmupAudio:
+    """Test the synthetic warm-up track."""
+
+    def test_is_a_valid_wav(self):
+        with wave.open(io.BytesIO(synthetic_wav(seconds=1.0, sample_rate=8000))) as wav:
+            assert wav.getframerate() == 8000
+            assert wav.getnframes() == 8000
+
+
+class TestGatewayWarmup:
+    """Test that readiness waits for one successful warm-up analysis."""
+
+    def _probe_until_ready(self, client, attempts=50):
+        for _ in range(attempts):
+            response = client.get("/gateway/ready")
+            if response.status_code == 200:
+                return response
+            time.sleep(0.01)
+        return response
+
+    def test_ready_after_warmup(self):
+        analyses = []
+
+        def backend(request):
+            if request.url.path == "/analyze-track":
+                analyses.append(request)
+                return httpx.Response(200, json={"bpm": 120.0})
+            return httpx.Response(200, json={"status": "healthy"})
+
+        settings = GatewaySettings(backend_url="http://backend", warmup=True)
+        with TestClient(create_app(settings, transport=httpx.MockTransport(backend))) as client:
+            assert client.get("/gateway/ready").json()["status"] == "warming"
+            response = self._probe_until_ready(client)
+
+        assert response.status_code == 200
+        assert response.json()["warmup_seconds"] is not None
+        assert len(analyses) == 1
+        assert b"warmup.wav" in analyses[0].content
+
+    def test_failed_warmup_is_retried(self):
+        results = [500, 200]
+
+        def backend(request):
+            if request.url.path == "/analyze-track":
+                return httpx.Response(results.pop(0))
+            return httpx.Response(200, json={"status": "healthy"})
+
+        settings = GatewaySettings(backend_url="http://backend", warmup=True)
+        with TestClient(create_app(settings, transport=httpx.MockTransport(backend))) as client:
+            assert self._probe_until_ready(client).status_code == 200
+            assert client.app.state.warmup.attempts == 2
+
+
+class TestFirstRequestBenchmark:
+    """Test the helpers of the first-request latency report."""
+
+    def test_wait_until_ready(self):
+        answers = [503, 503, 200]
+        transport = httpx.MockTransport(lambda request: httpx.Response(answers.pop(0)))
+        sleeps = []
+
+        with httpx.Client(transport=transport) as client:
+            waited = wait_until_ready(client, "http://gw", timeout=60, sleep=sleeps.append)
+        assert sleeps == [0.5, 0.5]
+        assert waited >= 0
+
+    def test_wait_until_ready_times_out(self):
+        transport = httpx.MockTransport(lambda request: httpx.Response(503))
+        ticks = iter(range(100))
+
+        with httpx.Client(transport=transport) as client, pytest.raises(TimeoutError):
+            wait_until_ready(client, "http://gw", timeout=3, clock=lambda: next(ticks), sleep=lambda s: None)
+
+    def test_render(self):
+        table = render([FirstRequestResult("cold", 41.5, 9.876, 1.2), FirstRequestResult("warm", 47.0, 1.3, 1.2)])
+        assert "| cold | 41.50s | 9.876s | 1.200s |" in table
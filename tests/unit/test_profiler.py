@@ -0,0 +1,141 @@
+# DJ AI App - Sampling Profiler Tests
+# Author: Sergie Code
+# Purpose: Unit tests for py-spy capture, flamegraph/speedscope output and the p99 trigger
+
+import json
+import subprocess
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from dj_ai_app.bench.profiler import ProfilerError, ProfileTrigger, SamplingProfiler, main, write_profile
+from dj_ai_app.bench.stacks import parse_collapsed, render_flamegraph, render_top, split_frame, to_speedscope, top_functions
+
+PY_SPY_OUTPUT = """py-spy> Sampling process 100 times a second for 2 seconds. Press Control-C to exit.
+process 7:"uvicorn app.main:app";run (uvicorn/server.py:60);analyze (app/audio.py:42);decode (app/audio.py:10) 120
+process 7:"uvicorn app.main:app";run (uvicorn/server.py:60);analyze (app/audio.py:42);infer (app/model.py:88) 60
+process 7:"uvicorn app.main:app";run (uvicorn/server.py:60);select (selectors.py:468) 20
+py-spy> Wrote raw flamegraph data to '/dev/stdout'. Samples: 200 Errors: 0
+"""
+
+
+class FakeRunner:
+    def __init__(self, stdout=PY_SPY_OUTPUT, returncode=0, stderr=""):
+        self.stdout, self.returncode, self.stderr = stdout, returncode, stderr
+        self.commands = []
+
+    def __call__(self, command, **kwargs):
+        self.commands.append(command)
+        return subprocess.CompletedProcess(command, self.returncode, self.stdout, self.stderr)
+
+
+class TestStacks:
+    """Test folded-stack parsing and the report formats."""
+
+    def test_parse_skips_progress_lines(self):
+        stacks = parse_collapsed(PY_SPY_OUTPUT.splitlines())
+
+        assert sum(stacks.values()) == 200
+        assert len(stacks) == 3
+        assert split_frame("decode (app/audio.py:10)") == ("decode", "app/audio.py", 10)
+        assert split_frame('process 7:"uvicorn app.main:app"') == ('process 7:"uvicorn app.main:app"', None, None)
+
+    def test_top_functions(self):
+        stacks = parse_collapsed(PY_SPY_OUTPUT.splitlines())
+        top = top_functions(stacks, limit=2)
+
+        assert top[0] == ("decode (app/audio.py:10)", 120, 120)
+        assert top[1] == ("infer (app/model.py:88)", 60, 60)
+        assert dict((f, t) for f, _, t in top_functions(stacks))["analyze (app/audio.py:42)"] == 180
+        assert "60.0%" in render_top(stacks)
+
+    def test_speedscope_profile(self):
+        profile = to_speedscope(parse_collapsed(PY_SPY_OUTPUT.splitlines()), name="core")
+        frames = profile["shared"]["frames"]
+        sampled = profile["profiles"][0]
+
+        assert sampled["type"] == "sampled"
+        assert sampled["endValue"] == 200
+        assert sorted(sampled["weights"]) == [20, 60, 120]
+        assert {"name": "decode", "file": "app/audio.py", "line": 10} in frames
+        assert all(index < len(frames) for sample in sampled["samples"] for index in sample)
+
+    def test_flamegraph_is_valid_svg(self):
+        svg = render_flamegraph({("a <main>", "b & c"): 3, ("a <main>",): 1}, title="t")
+        root = ET.fromstring(svg)
+        titles = [t.text for t in root.iter("{http://www.w3.org/2000/svg}title")]
+
+        assert "b & c (3 samples, 75.0%)" in titles
+        assert any(t.startswith("all (4 samples") for t in titles)
+
+
+class TestSamplingProfiler:
+    """Test running py-spy and writing captures."""
+
+    def test_sidecar_and_exec_commands(self):
+        sidecar = SamplingProfiler(files=["docker-compose.yml"], compose="docker compose").command(10)
+        exec_ = SamplingProfiler("exec", container="core", nonblocking=True).command(2.4)
+
+        assert sidecar[:7] == ["docker", "compose", "-f", "docker-compose.yml", "--profile", "profiling", "run"]
+        assert "dj-ai-profiler" in sidecar and "--subprocesses" in sidecar
+        assert exec_[:3] == ["docker", "exec", "core"]
+        assert exec_[exec_.index("--duration") + 1] == "2"
+        assert "--nonblocking" in exec_
+        with pytest.raises(ValueError):
+            SamplingProfiler("ptrace")
+
+    def test_record_writes_every_format(self, tmp_path):
+        runner = FakeRunner()
+        result = SamplingProfiler(runner=runner).record(2, tmp_path, label="manual")
+
+        assert result.samples == 200
+        assert result.directory.name.endswith("-manual")
+        assert set(p.name for p in result.directory.iterdir()) == {
+            "stacks.folded", "flamegraph.svg", "profile.speedscope.json", "top.txt",
+        }
+        assert json.loads(result.files["speedscope"].read_text())["profiles"][0]["endValue"] == 200
+        assert "decode (app/audio.py:10)" in result.files["top"].read_text()
+
+    def test_failures_raise(self):
+        with pytest.raises(ProfilerError, match="Operation not permitted"):
+            SamplingProfiler(runner=FakeRunner("", 1, "Error: Operation not permitted (os error 1)")).capture(1)
+        with pytest.raises(ProfilerError, match="exit status 0"):
+            SamplingProfiler(runner=FakeRunner("py-spy> nothing\n")).capture(1)
+
+    def test_rerender_from_folded(self, tmp_path, capsys):
+        stacks = parse_collapsed(PY_SPY_OUTPUT.splitlines())
+        capture = write_profile(stacks, tmp_path / "capture")
+        capture.files["flamegraph"].unlink()
+
+        assert main(["--from-folded", str(capture.files["folded"]), "--top", "3"]) == 0
+        assert capture.files["flamegraph"].exists()
+        assert "200 samples" in capsys.readouterr().out
+
+
+class TestProfileTrigger:
+    """Test capturing automatically when p99 is over budget."""
+
+    def test_over_budget_starts_one_capture_per_cooldown(self, tmp_path, clock):
+        runner = FakeRunner()
+        trigger = ProfileTrigger(SamplingProfiler(runner=runner), p99_budget=0.5, seconds=1, cooldown=60,
+                                 output_dir=tmp_path, clock=clock)
+
+        assert not trigger.check(None)
+        assert not trigger.check(0.4)
+        assert trigger.check(0.9)
+        trigger.wait(5)
+        assert not trigger.check(0.9)
+        clock.now = 61
+        assert trigger.check(0.7)
+        trigger.wait(5)
+
+        assert len(runner.commands) == 2
+        assert [r.directory.name.split("-", 2)[2] for r in trigger.results] == ["p99-900ms", "p99-700ms"]
+
+    def test_capture_errors_are_kept(self, tmp_path):
+        trigger = ProfileTrigger(SamplingProfiler(runner=FakeRunner("", 1, "no such container")), 0.1, output_dir=tmp_path)
+
+        assert trigger.check(1.0)
+        trigger.wait(5)
+        assert trigger.results == []
+        assert "no such container" in trigger.errors[0]
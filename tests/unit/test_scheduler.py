@@ -0,0 +1,97 @@
+# DJ AI App - Scheduler Tests
+# Author: Sergie Code
+# Purpose: Unit tests for weighted fair queuing between interactive and bulk analyses
+
+import asyncio
+
+import pytest
+
+from dj_ai_app.gateway.scheduler import BULK, INTERACTIVE, FairScheduler
+
+
+async def _hold(scheduler, priority, tenant, order, duration=0.01):
+    async with scheduler.slot(priority, tenant):
+        order.append((priority, tenant))
+        await asyncio.sleep(duration)
+
+
+class TestFairScheduler:
+    """Test slot allocation across priority classes and tenants."""
+
+    def test_interactive_overtakes_queued_bulk_work(self):
+        async def scenario():
+            scheduler = FairScheduler(capacity=1, tenant_limit=10)
+            order = []
+            bulk = [asyncio.ensure_future(_hold(scheduler, BULK, "ingest", order)) for _ in range(6)]
+            await asyncio.sleep(0)
+            interactive = asyncio.ensure_future(_hold(scheduler, INTERACTIVE, "dj", order))
+            await asyncio.gather(interactive, *bulk)
+            return order
+
+        order = asyncio.run(scenario())
+        # One bulk analysis was already running; the DJ goes next
+        assert order.index((INTERACTIVE, "dj")) <= 2
+
+    def test_bulk_still_progresses_under_interactive_load(self):
+        async def scenario():
+            scheduler = FairScheduler(capacity=1, weights={INTERACTIVE: 4.0, BULK: 1.0}, tenant_limit=100)
+            order = []
+            tasks = [asyncio.ensure_future(_hold(scheduler, INTERACTIVE, f"dj{i}", order, 0)) for i in range(12)]
+            tasks += [asyncio.ensure_future(_hold(scheduler, BULK, f"ingest{i}", order, 0)) for i in range(3)]
+            await asyncio.gather(*tasks)
+            return order
+
+        order = asyncio.run(scenario())
+        first_ten = [priority for priority, _ in order[:10]]
+        assert BULK in first_ten
+        assert first_ten.count(INTERACTIVE) >= 6
+
+    def test_bulk_limit_keeps_a_slot_for_interactive(self):
+        async def scenario():
+            scheduler = FairScheduler(capacity=2, tenant_limit=10, class_limits={BULK: 1})
+            order = []
+            bulk = [asyncio.ensure_future(_hold(scheduler, BULK, "ingest", order, 0.05)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            assert scheduler.active_by_class[BULK] == 1
+            assert scheduler.active == 1
+            await _hold(scheduler, INTERACTIVE, "dj", order, 0)
+            interactive_waited = scheduler.wait_seconds_total[INTERACTIVE]
+            await asyncio.gather(*bulk)
+            return interactive_waited
+
+        assert asyncio.run(scenario()) < 0.01
+
+    def test_tenant_cap_lets_other_tenants_through(self):
+        async def scenario():
+            scheduler = FairScheduler(capacity=3, tenant_limit=1)
+            order = []
+            tasks = [asyncio.ensure_future(_hold(scheduler, INTERACTIVE, "venue-a", order, 0.05)) for _ in range(3)]
+            await asyncio.sleep(0)
+            tasks.append(asyncio.ensure_future(_hold(scheduler, INTERACTIVE, "venue-b", order, 0.05)))
+            await asyncio.sleep(0.01)
+            snapshot = dict(scheduler.active_by_tenant)
+            await asyncio.gather(*tasks)
+            return snapshot
+
+        snapshot = asyncio.run(scenario())
+        assert snapshot == {"venue-a": 1, "venue-b": 1}
+
+    def test_cancelled_waiter_leaves_the_queue(self):
+        async def scenario():
+            scheduler = FairScheduler(capacity=1)
+            order = []
+            running = asyncio.ensure_future(_hold(scheduler, BULK, "a", order, 0.05))
+            await asyncio.sleep(0)
+            waiting = asyncio.ensure_future(_hold(scheduler, BULK, "b", order))
+            await asyncio.sleep(0)
+            waiting.cancel()
+            await asyncio.gather(running, waiting, return_exceptions=True)
+            return scheduler
+
+        scheduler = asyncio.run(scenario())
+        assert scheduler.queued_by_class() == {INTERACTIVE: 0, BULK: 0}
+        assert scheduler.active == 0
+
+    def test_unknown_priority_is_rejected(self):
+        with pytest.raises(ValueError):
+            asyncio.run(FairScheduler().acquire("urgent", "dj"))
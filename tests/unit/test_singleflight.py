@@ -0,0 +1,145 @@
+# DJ AI App - Request Coalescing Tests
+# Author: Sergie Code
+# Purpose: Unit tests for the gateway singleflight layer and its metrics
+
+import asyncio
+import hashlib
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+
+from dj_ai_app.gateway import GatewaySettings, create_app
+from dj_ai_app.gateway.app import CONTENT_HASH_HEADER
+from dj_ai_app.gateway.metrics import MetricsRegistry
+from dj_ai_app.gateway.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent calls with the same key."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def scenario():
+            flights = SingleFlight()
+            results = await asyncio.gather(*(flights.do("track", work) for _ in range(5)))
+            return flights, results
+
+        flights, results = asyncio.run(scenario())
+
+        assert len(calls) == 1
+        assert [value for value, _ in results] == ["result"] * 5
+        assert sum(shared for _, shared in results) == 4
+        assert flights.leaders_total == 1
+        assert flights.coalesced_total == 4
+        assert flights.seconds_saved_total > 0
+        assert flights.in_flight == 0
+
+    def test_different_keys_run_independently(self):
+        async def scenario():
+            flights = SingleFlight()
+            results = await asyncio.gather(
+                flights.do("a", lambda: asyncio.sleep(0.01, "a")),
+                flights.do("b", lambda: asyncio.sleep(0.01, "b")),
+            )
+            return flights, results
+
+        flights, results = asyncio.run(scenario())
+        assert results == [("a", False), ("b", False)]
+        assert flights.coalesced_total == 0
+
+    def test_failures_reach_every_waiter(self):
+        async def boom():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("backend exploded")
+
+        async def scenario():
+            flights = SingleFlight()
+            return await asyncio.gather(flights.do("k", boom), flights.do("k", boom), return_exceptions=True)
+
+        results = asyncio.run(scenario())
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    def test_cancelled_leader_does_not_cancel_followers(self):
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def scenario():
+            flights = SingleFlight()
+            leader = asyncio.ensure_future(flights.do("k", work))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flights.do("k", work))
+            await asyncio.sleep(0.01)
+            assert flights.waiters == 1
+            leader.cancel()
+            return await follower
+
+        assert asyncio.run(scenario()) == ("done", True)
+
+
+class TestMetricsRegistry:
+    """Test Prometheus text rendering."""
+
+    def test_render_counters_and_gauges(self):
+        registry = MetricsRegistry()
+        requests_total = registry.counter("dj_requests_total", "Requests")
+        requests_total.inc(route="/health")
+        requests_total.inc(2, route="/health")
+        registry.gauge("dj_waiters", "Waiters", lambda: 3)
+
+        text = registry.render()
+        assert "# TYPE dj_requests_total counter" in text
+        assert 'dj_requests_total{route="/health"} 3' in text
+        assert "dj_waiters 3" in text
+
+    def test_duplicate_names_are_rejected(self):
+        registry = MetricsRegistry()
+        registry.counter("dj_total", "x")
+        with pytest.raises(ValueError):
+            registry.counter("dj_total", "x")
+
+
+class TestGatewayCoalescing:
+    """Test that identical concurrent uploads reach the backend once."""
+
+    def test_identical_uploads_coalesce(self):
+        audio = b"fake audio payload"
+        digest = hashlib.sha256(audio).hexdigest()
+        backend_calls = []
+
+        async def backend(request):
+            backend_calls.append(request.url.path)
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, json={"track_id": "t1", "bpm": 124.0})
+
+        async def scenario():
+            app = create_app(GatewaySettings(backend_url="http://backend"), transport=httpx.MockTransport(backend))
+            async with app.router.lifespan_context(app):
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+                    uploads = [
+                        client.post(
+                            "/analyze-track",
+                            files={"file": ("track.mp3", audio, "audio/mpeg")},
+                            headers={CONTENT_HASH_HEADER: digest},
+                        )
+                        for _ in range(4)
+                    ]
+                    responses = await asyncio.gather(*uploads)
+                    metrics = (await client.get("/gateway/metrics")).text
+            return responses, metrics
+
+        responses, metrics = asyncio.run(scenario())
+
+        assert backend_calls == ["/analyze-track"]
+        assert sorted(r.headers["X-Cache"] for r in responses) == ["COALESCED"] * 3 + ["MISS"]
+        assert all(r.json()["track_id"] == "t1" for r in responses)
+        assert "dj_gateway_singleflight_coalesced_total 3" in metrics
@@ -0,0 +1,106 @@
+# DJ AI App - Startup Profiler Tests
+# Author: Sergie Code
+# Purpose: Unit tests for the startup timeline and the gateway readiness probe
+
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient
+
+from dj_ai_app.bench.startup import ServiceProbe, StartupProfiler, Timeline, render
+from dj_ai_app.gateway import GatewaySettings, create_app
+from dj_ai_app.gateway.app import backend_ready
+
+
+class FakeStack:
+    """ComposeStack stand-in whose containers appear one poll after ``up``."""
+
+    def __init__(self, services):
+        self._services = services
+        self.is_up = False
+
+    def services(self):
+        return list(self._services)
+
+    def up(self, build=True):
+        self.is_up = True
+
+    def containers(self):
+        return {f"c-{name}": name for name in self._services} if self.is_up else {}
+
+
+class LoadingBackend:
+    """dj-ai-core that is healthy at once but loads its models for a few probes."""
+
+    def __init__(self, loading_probes=3):
+        self.loading_probes = loading_probes
+
+    def __call__(self, request):
+        if request.url.path == "/health":
+            self.loading_probes -= 1
+            return httpx.Response(200, json={"status": "healthy", "models_loaded": self.loading_probes < 0})
+        return httpx.Response(404)
+
+
+class TestBackendReady:
+    """Test how /health payloads map to readiness."""
+
+    @pytest.mark.parametrize("payload, ready", [
+        ({"status": "healthy"}, True),
+        ({"status": "healthy", "models_loaded": True}, True),
+        ({"status": "healthy", "models_loaded": False}, False),
+        ({"ready": False}, False),
+        ("ok", True),
+    ])
+    def test_payloads(self, payload, ready):
+        assert backend_ready(payload) is ready
+
+
+class TestGatewayReadiness:
+    """Test the /gateway/ready probe used by the compose healthcheck."""
+
+    def _client(self, backend):
+        return TestClient(create_app(GatewaySettings(backend_url="http://backend"), transport=httpx.MockTransport(backend)))
+
+    def test_waits_for_models(self):
+        with self._client(LoadingBackend(loading_probes=1)) as client:
+            assert client.get("/gateway/ready").status_code == 503
+            assert client.get("/gateway/ready").json()["status"] == "ready"
+
+    def test_backend_down_is_not_ready(self):
+        def backend(request):
+            raise httpx.ConnectError("refused")
+
+        with self._client(backend) as client:
+            response = client.get("/gateway/ready")
+            assert response.status_code == 503
+            assert client.get("/gateway/health").status_code == 200
+
+
+class TestStartupProfiler:
+    """Test that milestones are recorded in order for every service."""
+
+    def test_timeline(self):
+        stack = FakeStack(["dj-ai-core", "dj-ai-worker"])
+        probes = [ServiceProbe("dj-ai-core", 8000, "/health", "/health"), ServiceProbe("dj-ai-worker"), ServiceProbe("nginx", 80, "/health")]
+
+        async def port_open(host, port):
+            return True
+
+        profiler = StartupProfiler(
+            stack, probes, interval=0.01, transport=httpx.MockTransport(LoadingBackend()), port_open=port_open,
+        )
+        core, worker = asyncio.run(profiler.run(timeout=5))
+
+        assert core.service == "dj-ai-core"
+        assert core.started <= core.port_open <= core.healthy < core.ready
+        assert worker.ready == worker.started
+        assert worker.port_open is None
+
+    def test_render_marks_missed_milestones(self):
+        table = render([Timeline("dj-ai-core", 0.5, 1.25, 2.0, None)])
+        assert "| dj-ai-core | 0.50s | 1.25s | 2.00s | - |" in table
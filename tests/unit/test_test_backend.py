@@ -0,0 +1,107 @@
+# DJ AI App - Test Backend Tests
+# Author: Sergie Code
+# Purpose: Unit tests for the shared test backend daemon
+
+import os
+
+import pytest
+import requests
+
+pytest.importorskip("uvicorn")
+
+from dj_ai_app.testbackend import TestBackend, TestBackendError, free_port, source_hash
+from dj_ai_app.testbackend.__main__ import main
+
+APP = '''
+import os
+
+async def app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    body = ('{"status": "healthy", "pid": %d, "version": "%s"}' % (os.getpid(), VERSION)).encode()
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": body})
+
+VERSION = "1"
+'''
+
+
+@pytest.fixture
+def backend(tmp_path):
+    source = tmp_path / "dj-ai-core"
+    (source / "app").mkdir(parents=True)
+    (source / "app" / "__init__.py").write_text("")
+    (source / "app" / "main.py").write_text(APP)
+    backend = TestBackend(source, state_dir=tmp_path / "state", startup_timeout=20)
+    yield backend
+    backend.stop()
+
+
+def _health(info):
+    return requests.get(f"{info.url}/health", timeout=5).json()
+
+
+class TestTestBackend:
+    """Test starting, reusing and restarting the shared backend."""
+
+    def test_reused_until_the_source_changes(self, backend):
+        first = backend.ensure()
+        assert not first.reused
+        assert _health(first)["pid"] == first.pid
+
+        again = TestBackend(backend.source_dir, state_dir=backend.state_dir).ensure()
+        assert again.reused and (again.pid, again.port) == (first.pid, first.port)
+
+        # Caches and tests are not backend source
+        (backend.source_dir / "tests").mkdir()
+        (backend.source_dir / "tests" / "test_x.py").write_text("x = 1\n")
+        assert backend.ensure().reused
+
+        main_py = backend.source_dir / "app" / "main.py"
+        main_py.write_text(main_py.read_text().replace('VERSION = "1"', 'VERSION = "2"'))
+        restarted = backend.ensure()
+        assert not restarted.reused and restarted.pid != first.pid
+        assert _health(restarted)["version"] == "2"
+        assert not os.path.exists(f"/proc/{first.pid}") or not backend.owns(first)
+
+    def test_stop_and_restart_after_a_crash(self, backend):
+        info = backend.ensure()
+        assert backend.status().pid == info.pid
+        assert backend.stop()
+        assert backend.status() is None and not backend.stop()
+
+        info = backend.ensure()
+        os.killpg(info.pid, 9)
+        os.waitpid(info.pid, 0)
+        replacement = backend.ensure()
+        assert not replacement.reused and replacement.pid != info.pid
+
+    def test_broken_backend_reports_its_log(self, backend):
+        (backend.source_dir / "app" / "main.py").write_text("raise RuntimeError('model file missing')\n")
+        with pytest.raises(TestBackendError, match="model file missing"):
+            backend.ensure()
+        with pytest.raises(TestBackendError, match="not found"):
+            TestBackend(backend.source_dir / "missing", state_dir=backend.state_dir).ensure()
+
+    def test_source_hash_and_ports(self, tmp_path):
+        (tmp_path / "a.py").write_text("a = 1\n")
+        (tmp_path / "__pycache__").mkdir()
+        first = source_hash(tmp_path)
+        (tmp_path / "__pycache__" / "a.cpython-311.pyc").write_bytes(b"\0")
+        (tmp_path / "notes.md").write_text("docs")
+        assert source_hash(tmp_path) == first
+        assert source_hash(tmp_path, ["other-python"]) != first
+        (tmp_path / "a.py").write_text("a = 2\n")
+        assert source_hash(tmp_path) != first
+        assert 0 < free_port() < 65536
+
+    def test_cli(self, backend, monkeypatch, capsys):
+        monkeypatch.setenv("DJ_AI_CORE_DIR", str(backend.source_dir))
+        monkeypatch.setenv("DJ_AI_TEST_BACKEND_DIR", str(backend.state_dir))
+        assert main(["status"]) == 1
+        assert main(["start"]) == 0
+        assert main(["start"]) == 0
+        assert main(["status"]) == 0
+        assert main(["stop"]) == 0
+        out = capsys.readouterr().out
+        assert "Started http://127.0.0.1:" in out and "Reusing" in out and "Stopped" in out
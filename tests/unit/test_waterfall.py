@@ -0,0 +1,139 @@
+# DJ AI App - Request Waterfall Tests
+# Author: Sergie Code
+# Purpose: Unit tests for request ids, gateway spans and the waterfall collector
+
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from dj_ai_app.waterfall import WaterfallCollector, render_percentiles, render_waterfall
+
+NGINX_CONF = Path(__file__).resolve().parents[2] / "config" / "nginx.conf"
+
+
+def _nginx(request_id, request_time=2.0, upstream="1.5", connect="0.002", uri="/api/analyze-track?priority=bulk", msec=1000.0):
+    return json.dumps({
+        "msec": msec, "request_id": request_id, "method": "POST", "uri": uri, "status": 200,
+        "request_time": request_time, "upstream_connect_time": connect, "upstream_response_time": upstream,
+    })
+
+
+def _span(request_id, name, start, duration, service="gateway"):
+    return json.dumps({
+        "event": "span", "service": service, "request_id": request_id, "span": name,
+        "start": start, "duration": duration,
+    })
+
+
+class TestWaterfallCollector:
+    """Test joining nginx and span logs by request id."""
+
+    def test_lines_are_joined_by_request_id(self):
+        collector = WaterfallCollector()
+        fed = collector.feed_lines([
+            "dj-ai-gateway  | " + _span("r1", "gateway.upload", 998.1, 0.3),
+            _span("r1", "core.inference", 998.6, 1.0, service="dj-ai-core"),
+            "dj-ai-nginx  | " + _nginx("r1"),
+            "plain text line",
+            json.dumps({"level": "INFO", "message": "no request id"}),
+        ])
+
+        assert fed == 3
+        stages = collector.get("r1").stages()
+        assert stages["nginx.total"] == 2.0
+        assert stages["nginx.client"] == pytest.approx(0.5)
+        assert stages["nginx.upstream_connect"] == 0.002
+        assert stages["gateway.upload"] == 0.3
+        assert stages["core.inference"] == 1.0
+
+    def test_incomplete_requests_are_not_aggregated(self):
+        collector = WaterfallCollector()
+        collector.feed(_span("still-running", "gateway.backend", 0.0, 5.0))
+
+        assert collector.waterfalls() == []
+        assert collector.stage_percentiles() == {}
+        assert "No complete requests" in render_percentiles({})
+
+    def test_stage_percentiles(self):
+        collector = WaterfallCollector()
+        for i in range(1, 101):
+            collector.feed(_nginx(f"r{i}", request_time=i / 100, upstream="-"))
+        collector.feed(_nginx("docs", request_time=9.0, uri="/docs"))
+
+        percentiles = collector.stage_percentiles(uri_prefix="/api/")
+        assert percentiles["nginx.total"] == {50: 0.5, 90: 0.9, 99: 0.99}
+        assert "nginx.upstream" not in percentiles
+
+    def test_nginx_logs_the_uri_before_the_api_rewrite(self):
+        # $uri would log /analyze-track for /api/analyze-track and the /api/ prefix filter would drop it
+        log_format = re.search(r"log_format timing.*?;", NGINX_CONF.read_text(), re.DOTALL).group(0)
+        assert '"uri":"$request_uri"' in log_format
+
+    def test_memory_is_bounded(self):
+        collector = WaterfallCollector(max_requests=2)
+        for request_id in ("a", "b", "c"):
+            collector.feed(_nginx(request_id))
+
+        assert collector.get("a") is None
+        assert [w.request_id for w in collector.waterfalls()] == ["b", "c"]
+
+    def test_render_waterfall(self):
+        collector = WaterfallCollector()
+        collector.feed_lines([_nginx("r1", msec=1002.0), _span("r1", "gateway.backend", 1000.5, 1.5)])
+
+        text = render_waterfall(collector.get("r1"))
+        assert "request_id=r1" in text
+        assert "gateway.backend" in text
+        assert "1500.0 ms" in text
+
+
+class TestGatewayTracing:
+    """Test request id propagation and span logging in the gateway."""
+
+    @pytest.fixture
+    def gateway(self, tmp_path):
+        httpx = pytest.importorskip("httpx")
+        pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+
+        from dj_ai_app.gateway import GatewaySettings, create_app
+
+        seen = []
+
+        def backend(request):
+            seen.append(request.headers.get("X-Request-ID"))
+            return httpx.Response(200, json={"bpm": 128})
+
+        app = create_app(GatewaySettings(backend_url="http://backend", jobs_dir=str(tmp_path)), transport=httpx.MockTransport(backend))
+        spans = []
+        app.state.span_sink = spans.append
+        with TestClient(app) as client:
+            yield client, seen, spans
+
+    def test_request_id_is_forwarded_and_echoed(self, gateway):
+        client, seen, _ = gateway
+        response = client.post(
+            "/analyze-track", files={"file": ("a.mp3", b"audio", "audio/mpeg")}, headers={"X-Request-ID": "abc123"},
+        )
+
+        assert response.headers["X-Request-ID"] == "abc123"
+        assert seen == ["abc123"]
+
+    def test_missing_request_id_is_generated(self, gateway):
+        client, seen, _ = gateway
+        response = client.get("/supported-formats")
+
+        assert len(response.headers["X-Request-ID"]) == 32
+        assert seen == [response.headers["X-Request-ID"]]
+
+    def test_analysis_stages_are_logged_as_spans(self, gateway):
+        client, _, spans = gateway
+        client.post("/analyze-track", files={"file": ("a.mp3", b"audio", "audio/mpeg")}, headers={"X-Request-ID": "r1"})
+
+        names = [span["span"] for span in spans if span["request_id"] == "r1"]
+        assert names == ["gateway.upload", "gateway.queue", "gateway.backend", "gateway.total"]
+        collector = WaterfallCollector()
+        collector.feed_lines(json.dumps(span) for span in spans)
+        assert set(collector.get("r1").stages()) == set(names)
@@ -0,0 +1,183 @@
+# DJ AI App - Waveform Peaks Tests
+# Author: Sergie Code
+# Purpose: Unit tests for the .dat peak files, the peaks store and the worker's waveform stage
+
+import asyncio
+import hashlib
+import io
+import json
+import math
+from array import array
+from contextlib import contextmanager
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from dj_ai_app.jobs import JobStore, JobWorker, WorkerSettings
+from dj_ai_app.pcm import DecodeError, PCMCache
+from dj_ai_app.peaks import PeaksStore, coarsen, decode_dat, encode_dat, min_max, parse_levels, stream_min_max
+from dj_ai_app.peaks.__main__ import main
+
+HASH = "c" * 64
+
+
+def _sine(samples, period=100, amplitude=0.5):
+    return array("f", (amplitude * math.sin(2 * math.pi * i / period) for i in range(samples)))
+
+
+def _decoder(samples, calls=None):
+    @contextmanager
+    def decode(path, sample_rate):
+        if calls is not None:
+            calls.append((path, sample_rate))
+        yield io.BytesIO(samples.tobytes())
+    return decode
+
+
+class _Trickle(io.BytesIO):
+    """A pipe that hands out at most 1000 bytes per read."""
+
+    def read(self, size=-1):
+        return super().read(min(size, 1000))
+
+
+class TestPeakFormat:
+    """Test computing peaks and the audiowaveform .dat encoding."""
+
+    def test_min_max_per_pixel(self):
+        samples = memoryview(array("f", [0.1, -0.5, 0.25, 0.9, -1.0]))
+        mins, maxs = min_max(samples, 2)
+        assert mins.tolist() == pytest.approx([-0.5, 0.25, -1.0])
+        assert maxs.tolist() == pytest.approx([0.1, 0.9, -1.0])
+
+        coarse = coarsen((mins, maxs), 2)
+        assert coarse[0].tolist() == pytest.approx([-0.5, -1.0])
+        assert coarse[1].tolist() == pytest.approx([0.9, -1.0])
+
+    def test_streaming_matches_in_memory(self):
+        samples = _sine(10_007)
+        (mins, maxs), count = stream_min_max(_Trickle(samples.tobytes()), 64, pixels_per_read=3)
+        assert count == 10_007
+        assert (mins, maxs) == min_max(memoryview(samples), 64)
+
+    def test_dat_round_trip(self):
+        peaks = (array("f", [-0.5, -1.5, 0.0]), array("f", [0.5, 1.0, 0.01]))
+        data = encode_dat(peaks, 22050, 256)
+        assert len(data) == 24 + 3 * 2
+        waveform = decode_dat(data)
+        assert (waveform.version, waveform.bits, waveform.channels) == (2, 8, 1)
+        assert waveform.mins == [-64, -128, 0] and waveform.maxs == [64, 127, 1]
+        assert waveform.duration == pytest.approx(3 * 256 / 22050)
+
+        wide = decode_dat(encode_dat(peaks, 44100, 512, bits=16))
+        assert wide.bits == 16 and wide.maxs == [16384, 32767, 328]
+        with pytest.raises(ValueError):
+            encode_dat(peaks, 22050, 256, bits=12)
+
+    def test_reads_version_1_files(self):
+        # audiowaveform -b 8 output: no channel count in the header
+        data = bytes.fromhex("01000000" "01000000" "44ac0000" "00010000" "02000000") + bytes([0xF6, 10, 0xEC, 20])
+        waveform = decode_dat(data)
+        assert (waveform.version, waveform.sample_rate, waveform.samples_per_pixel) == (1, 44100, 256)
+        assert waveform.mins == [-10, -20] and waveform.maxs == [10, 20]
+
+
+class TestPeaksStore:
+    """Test generating and storing every zoom level of a track."""
+
+    def test_generate_writes_all_levels(self, tmp_path):
+        calls = []
+        store = PeaksStore(tmp_path / "peaks", levels=(1024, 256, 4096), decoder=_decoder(_sine(22050 * 2), calls))
+        index = store.generate(HASH, tmp_path / "track.mp3", 22050)
+
+        assert [level["samples_per_pixel"] for level in index["levels"]] == [256, 1024, 4096]
+        assert index["duration"] == 2.0 and index["levels"][0]["length"] == math.ceil(44100 / 256)
+        assert json.loads(store.index_path(HASH).read_text()) == index
+        assert store.index_path(HASH) == tmp_path / "peaks" / "cc" / HASH / "index.json"
+        for level in index["levels"]:
+            waveform = decode_dat(store.path(HASH, level["samples_per_pixel"]).read_bytes())
+            assert len(waveform.mins) == level["length"]
+            assert max(waveform.maxs) == 64 and min(waveform.mins) == -64
+        assert not list(store.tmp_dir.iterdir())
+
+        # Existing peaks are never decoded again
+        assert store.generate(HASH, tmp_path / "track.mp3", 22050) == index
+        assert len(calls) == 1
+
+    def test_decodes_through_the_pcm_cache(self, tmp_path):
+        cache = PCMCache(tmp_path / "pcm")
+        cache.put(HASH, 22050, _sine(5000))
+
+        def no_decode(path, sample_rate):
+            raise AssertionError("decoded although the PCM cache has the samples")
+
+        store = PeaksStore(tmp_path / "peaks", decoder=no_decode)
+        index = store.generate(HASH, tmp_path / "missing.mp3", 22050, cache)
+        assert index["duration"] == pytest.approx(5000 / 22050, abs=0.001)
+
+    def test_levels_must_share_a_base(self, tmp_path):
+        with pytest.raises(ValueError):
+            PeaksStore(tmp_path, levels=(256, 1000))
+        assert parse_levels("128, 512,") == (128, 512)
+
+    def test_backfill_cli(self, tmp_path, monkeypatch):
+        uploads = tmp_path / "uploads"
+        blob = uploads / "sha256" / "cc" / "cc" / HASH
+        blob.parent.mkdir(parents=True)
+        blob.write_bytes(b"audio")
+        broken = blob.parent / ("d" * 64)
+        broken.write_bytes(b"junk")
+
+        @contextmanager
+        def decode(path, sample_rate):
+            if path == broken:
+                raise DecodeError("ffmpeg could not decode junk")
+            yield io.BytesIO(_sine(3000).tobytes())
+
+        monkeypatch.setattr("dj_ai_app.peaks.waveform.ffmpeg_decode", decode)
+        out = tmp_path / "peaks"
+        assert main([str(uploads), "--out", str(out), "--levels", "512,2048"]) == 1
+        assert PeaksStore(out).index(HASH)["levels"][1]["samples_per_pixel"] == 2048
+        assert not PeaksStore(out).exists("d" * 64)
+
+
+class TestWorkerWaveformStage:
+    """Test that the worker writes peaks before posting the analysis."""
+
+    def _run(self, tmp_path, backend, decoder):
+        store = JobStore(tmp_path / "jobs")
+        job_id = store.new_id()
+        store.payload_path(job_id).write_bytes(b"RIFF fake wav")
+        job = store.submit(job_id, "track.wav", "audio/wav", hashlib.sha256(b"RIFF fake wav").hexdigest())
+        settings = WorkerSettings(backend_url="http://backend", peaks_dir=str(tmp_path / "peaks"))
+        worker = JobWorker(store, settings, transport=httpx.MockTransport(backend))
+        worker.peaks.decoder = decoder
+
+        async def scenario():
+            async with httpx.AsyncClient(base_url="http://backend", transport=worker.transport) as client:
+                await worker.process(client, store.claim("test"))
+
+        asyncio.run(scenario())
+        return store.get(job.id), worker.peaks
+
+    def test_peaks_exist_before_the_analysis_request(self, tmp_path):
+        seen = []
+
+        def backend(request):
+            seen.append(any((tmp_path / "peaks").glob("*/*/index.json")))
+            return httpx.Response(200, json={"bpm": 124.0})
+
+        job, peaks = self._run(tmp_path, backend, _decoder(_sine(4096)))
+        assert job.status == "done" and seen == [True]
+        assert peaks.exists(job.content_hash)
+
+    def test_decode_failure_does_not_fail_the_job(self, tmp_path):
+        @contextmanager
+        def broken(path, sample_rate):
+            raise DecodeError("not audio")
+            yield
+
+        job, peaks = self._run(tmp_path, lambda request: httpx.Response(200, json={}), broken)
+        assert job.status == "done"
+        assert not peaks.exists(job.content_hash)
@@ -0,0 +1,244 @@
+# DJ AI App - WebSocket Broker Tests
+# Author: Sergie Code
+# Purpose: Unit tests for the fan-out hub, the job watcher, the broker app and the fan-out benchmark
+
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient
+
+from dj_ai_app.broker import BrokerSettings, Hub, JobWatcher, create_app, job_topic, topic_name
+from dj_ai_app.gateway import GatewaySettings
+from dj_ai_app.gateway import create_app as create_gateway
+from dj_ai_app.jobs import JobStore
+
+
+SECRET = {"X-Broker-Secret": "s3cret"}
+
+
+def _drain(subscriber):
+    return [json.loads(text) for text in subscriber.drain()]
+
+
+class TestHub:
+    """Test fan-out, coalescing, retained messages and slow-consumer dropping."""
+
+    def test_publish_reaches_every_subscriber(self):
+        hub = Hub()
+        first, second, other = hub.connect(), hub.connect(), hub.connect()
+        hub.subscribe(first, "track:1")
+        hub.subscribe(second, "track:1")
+        hub.subscribe(other, "track:2")
+
+        assert hub.publish("track:1", {"type": "recommendations"}) == 2
+        assert _drain(first) == _drain(second) == [{"topic": "track:1", "type": "recommendations"}]
+        assert len(other) == 0
+
+        hub.remove(first)
+        assert hub.publish("track:1", {}) == 1
+        assert hub.subscription_count() == 2
+
+    def test_keyed_messages_coalesce(self):
+        hub = Hub()
+        subscriber = hub.connect()
+        hub.subscribe(subscriber, "job:a")
+        hub.publish("job:a", {"note": "first"})
+        for progress in (0.1, 0.5, 0.9):
+            hub.publish("job:a", {"progress": progress}, key="progress")
+        hub.publish("job:a", {"note": "last"})
+
+        assert [m.get("progress", m.get("note")) for m in _drain(subscriber)] == ["first", 0.9, "last"]
+        assert hub.stats.coalesced == 2 and hub.stats.delivered == 5
+
+    def test_full_queue_drops_the_slow_consumer(self):
+        hub = Hub()
+        slow, fast = hub.connect(limit=2), hub.connect(limit=2)
+        hub.subscribe(slow, "bench:0")
+        hub.subscribe(fast, "bench:0")
+        for seq in range(3):
+            hub.publish("bench:0", {"seq": seq})
+            _drain(fast)
+
+        assert slow.closed == "slow consumer" and len(slow) == 0
+        assert slow not in hub.subscribers and hub.topics["bench:0"] == {fast}
+        assert (hub.stats.dropped, hub.stats.slow_disconnects) == (3, 1)
+        assert slow.offer("{}") == "closed"
+
+    def test_retained_messages_greet_new_subscribers(self):
+        hub = Hub(max_retained=2)
+        for track in ("a", "b", "c"):
+            hub.publish(f"track:{track}", {"track": track}, retain=True)
+        assert list(hub.retained) == ["track:b", "track:c"]
+
+        subscriber = hub.connect()
+        hub.subscribe(subscriber, "track:c")
+        hub.subscribe(subscriber, "track:a")
+        assert _drain(subscriber) == [{"topic": "track:c", "track": "c"}]
+
+    def test_topic_names(self):
+        assert topic_name("0123abcd") == "job:0123abcd"
+        assert topic_name("track:42") == "track:42"
+
+
+class TestJobWatcher:
+    """Test that one batched poll publishes job progress to subscribers."""
+
+    def test_progress_and_completion(self, tmp_path):
+        store = JobStore(tmp_path / "jobs")
+        job = store.submit(store.new_id(), "track.wav", "audio/wav", "a" * 64)
+        hub = Hub()
+        watcher = JobWatcher(hub, store)
+        subscriber = hub.connect()
+        hub.subscribe(subscriber, job_topic(job.id))
+
+        assert watcher.poll() == 1 and watcher.poll() == 0
+        assert _drain(subscriber)[0]["status"] == "queued"
+
+        store.claim("w1")
+        store.update_progress(job.id, "analyzing", 0.25)
+        watcher.poll()
+        store.update_progress(job.id, "analyzing", 0.75)
+        watcher.poll()
+        # Not sent yet, so only the latest progress is left
+        assert [m["progress"] for m in _drain(subscriber)] == [0.75]
+
+        store.complete(job.id, {"bpm": 128})
+        watcher.poll()
+        assert _drain(subscriber) == [{**store.get(job.id).to_event(), "topic": job_topic(job.id)}]
+        assert watcher.watched() == []
+
+        late = hub.connect()
+        hub.subscribe(late, job_topic(job.id))
+        assert _drain(late)[0]["result"] == {"bpm": 128}
+
+    def test_unknown_jobs(self, tmp_path):
+        hub = Hub()
+        watcher = JobWatcher(hub, JobStore(tmp_path / "jobs"))
+        subscriber = hub.connect()
+        hub.subscribe(subscriber, job_topic("missing"))
+        watcher.poll()
+        assert _drain(subscriber) == [{"topic": "job:missing", "type": "job", "job_id": "missing", "status": "unknown"}]
+        assert not hub.topics and not subscriber.topics
+
+
+class TestBrokerApp:
+    """Test the /ws protocol, /publish and /metrics."""
+
+    def test_job_updates_with_the_gateway_protocol(self, tmp_path):
+        store = JobStore(tmp_path / "jobs")
+        job = store.submit(store.new_id(), "track.wav", "audio/wav", "b" * 64)
+        app = create_app(BrokerSettings(jobs_dir=str(tmp_path / "jobs"), poll_interval=0.05))
+        with TestClient(app) as client, client.websocket_connect("/ws") as ws:
+            ws.send_json({"subscribe": [job.id]})
+            assert ws.receive_json()["status"] == "queued"
+            store.claim("w1")
+            store.complete(job.id, {"bpm": 126})
+            message = ws.receive_json()
+            assert (message["status"], message["result"]) == ("done", {"bpm": 126})
+
+    def test_publish_endpoint(self):
+        app = create_app(BrokerSettings(jobs_dir="", publish_secret="s3cret"))
+        with TestClient(app, headers=SECRET) as client, client.websocket_connect("/ws") as ws:
+            ws.send_json({"subscribe": ["track:t1"]})
+            event = {"topic": "track:t1", "message": {"type": "recommendations", "items": [1]}, "retain": True}
+            assert client.post("/publish", json=[event]).status_code == 200
+            assert ws.receive_json() == {"topic": "track:t1", "type": "recommendations", "items": [1]}
+
+            assert client.post("/publish", json={"topic": "track:t1"}).status_code == 400
+            assert client.post("/publish", json={**event, "key": {"a": 1}}).status_code == 400
+            assert client.post("/publish", content=b"not json").status_code == 400
+            metrics = client.get("/metrics").text
+            assert "dj_broker_connections 1" in metrics and "dj_broker_process_cpu_seconds_total" in metrics
+            assert client.get("/health").json()["topics"] == 1
+
+    def test_publish_needs_the_secret(self):
+        event = {"topic": "track:t1", "message": {"n": 1}}
+        with TestClient(create_app(BrokerSettings(jobs_dir=""))) as client:
+            assert client.post("/publish", json=event, headers=SECRET).status_code == 404
+        with TestClient(create_app(BrokerSettings(jobs_dir="", publish_secret="s3cret"))) as client:
+            assert client.post("/publish", json=event).status_code == 403
+            assert client.post("/publish", json=event, headers={"X-Broker-Secret": "guess"}).status_code == 403
+            assert client.post("/publish", json=event, headers=SECRET).status_code == 200
+
+    def test_subscription_limit(self):
+        app = create_app(BrokerSettings(jobs_dir="", max_subscriptions=2, publish_secret="s3cret"))
+        with TestClient(app, headers=SECRET) as client, client.websocket_connect("/ws") as ws:
+            ws.send_json({"subscribe": ["track:1", "track:2", "track:3"]})
+            assert ws.receive_json() == {"type": "error", "detail": "Too many subscriptions"}
+            for bad in ({"subscribe": 5}, {"subscribe": [{}]}, {"unsubscribe": "track:1"}):
+                ws.send_json(bad)
+                assert ws.receive_json() == {"type": "error", "detail": "Expected lists of topic names"}
+            ws.send_json({"unsubscribe": ["track:1"], "subscribe": ["track:3"]})
+            client.post("/publish", json={"topic": "track:3", "message": {"n": 3}})
+            assert ws.receive_json() == {"topic": "track:3", "n": 3}
+
+
+class TestGatewayRecommendationUpdates:
+    """Test that the gateway forwards new recommendations to the broker."""
+
+    def test_recommendations_are_published(self, tmp_path):
+        published = []
+
+        def handler(request):
+            if request.url.host == "broker":
+                published.append((request.headers.get("X-Broker-Secret"), json.loads(request.content)))
+                return httpx.Response(200, json={"delivered": 1})
+            return httpx.Response(200, json={"recommendations": [{"track_id": "t2"}]})
+
+        settings = GatewaySettings(backend_url="http://backend", broker_url="http://broker",
+                                   broker_secret="s3cret", jobs_dir=str(tmp_path / "jobs"))
+        with TestClient(create_gateway(settings, transport=httpx.MockTransport(handler))) as client:
+            response = client.post("/recommend-transitions", json={"current_track_id": "t1"})
+            assert response.status_code == 200
+            deadline = time.monotonic() + 5
+            while not published and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        assert published == [("s3cret", {
+            "topic": "track:t1", "key": "recommendations", "retain": True,
+            "message": {"type": "recommendations", "track_id": "t1", "recommendations": response.json()},
+        })]
+
+
+@pytest.fixture
+def broker_url():
+    """A broker served by uvicorn on a thread; starting the --serve subprocess takes a second."""
+    uvicorn = pytest.importorskip("uvicorn")
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    app = create_app(BrokerSettings(jobs_dir="", publish_secret="s3cret"))
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started and thread.is_alive() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert server.started, "The broker did not start"
+    yield f"ws://127.0.0.1:{port}/ws"
+    server.should_exit = True
+    thread.join(10)
+
+
+class TestFanoutBenchmark:
+    """Test a short benchmark run against a local broker."""
+
+    def test_small_run(self, broker_url):
+        pytest.importorskip("websockets")
+        from dj_ai_app.bench.wsfanout import measure, render
+
+        result = asyncio.run(measure(broker_url, idle=20, active=10, slow=1, topics=2, rate=50, duration=0.2,
+                                     secret="s3cret"))
+
+        assert result.opened == 31 and result.held == 30
+        assert result.published >= 5 and result.received >= result.published * 4
+        assert result.broker["connections"] == 31
+        assert "| 31/31 | 30 |" in render(result)